@@ -25,6 +25,7 @@ if config.config_file_name is not None:
 # add your model's MetaData object here
 # for 'autogenerate' support
 from app.config.settings import settings
+from app.db.urls import sync_database_url
 
 target_metadata = Base.metadata
 logger = logging.getLogger("alembic.env")
@@ -47,7 +48,7 @@ def run_migrations_offline() -> None:
     script output.
 
     """
-    url = settings.DATABASE_URL
+    url = sync_database_url(settings.DATABASE_URL)
     context.configure(
         url=url,
         target_metadata=target_metadata,
@@ -67,7 +68,7 @@ def run_migrations_online() -> None:
 
     """
     configuration = config.get_section(config.config_ini_section)
-    configuration["sqlalchemy.url"] = settings.DATABASE_URL  # type: ignore[arg-type]
+    configuration["sqlalchemy.url"] = sync_database_url(settings.DATABASE_URL)  # type: ignore[arg-type]
     x_args: dict[str, Any] = context.get_x_argument(as_dictionary=True)
 
     # Fail fast in deploys instead of waiting forever on locks.
@@ -0,0 +1,36 @@
+"""add suggestion listing index
+
+Revision ID: 5a8e2d7c4b1f
+Revises: c3d8e91a4f2b
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5a8e2d7c4b1f"
+down_revision: Union[str, None] = "c3d8e91a4f2b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index suggestions for keyset pagination on (created_at, id) within a playlist/status."""
+    op.create_index(
+        "ix_votuna_track_suggestions_playlist_status_created",
+        "votuna_track_suggestions",
+        ["playlist_id", "status", sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Drop the suggestion listing index."""
+    op.drop_index(
+        "ix_votuna_track_suggestions_playlist_status_created",
+        table_name="votuna_track_suggestions",
+    )
@@ -0,0 +1,27 @@
+"""add user token expiry index
+
+Revision ID: 9d1f3b6e2a7c
+Revises: 5a8e2d7c4b1f
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9d1f3b6e2a7c"
+down_revision: Union[str, None] = "5a8e2d7c4b1f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index token expiry so the background refresher can scan soon-to-expire tokens."""
+    op.create_index("ix_users_token_expires_at", "users", ["token_expires_at"], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the token expiry index."""
+    op.drop_index("ix_users_token_expires_at", table_name="users")
@@ -0,0 +1,86 @@
+"""add votuna management jobs
+
+Revision ID: a4e8c2f6b1d9
+Revises: 9d1f3b6e2a7c
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a4e8c2f6b1d9"
+down_revision: Union[str, None] = "9d1f3b6e2a7c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the table backing background management transfer jobs."""
+    op.create_table(
+        "votuna_management_jobs",
+        sa.Column("playlist_id", sa.Integer(), nullable=False),
+        sa.Column("requested_by_user_id", sa.Integer(), nullable=False),
+        sa.Column("provider", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("request", sa.JSON(), nullable=False),
+        sa.Column("source_provider_playlist_id", sa.String(), nullable=False),
+        sa.Column("source_title", sa.String(), nullable=False),
+        sa.Column("destination_provider_playlist_id", sa.String(), nullable=True),
+        sa.Column("destination_title", sa.String(), nullable=False),
+        sa.Column("creates_destination", sa.Boolean(), nullable=False),
+        sa.Column("track_ids", sa.JSON(), nullable=True),
+        sa.Column("next_index", sa.Integer(), nullable=False),
+        sa.Column("matched_count", sa.Integer(), nullable=False),
+        sa.Column("added_count", sa.Integer(), nullable=False),
+        sa.Column("skipped_duplicate_count", sa.Integer(), nullable=False),
+        sa.Column("failed_items", sa.JSON(), nullable=False),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("available_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("locked_by", sa.String(), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["playlist_id"], ["votuna_playlists.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["requested_by_user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_votuna_management_jobs_id"), "votuna_management_jobs", ["id"], unique=False)
+    op.create_index(
+        op.f("ix_votuna_management_jobs_playlist_id"),
+        "votuna_management_jobs",
+        ["playlist_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_votuna_management_jobs_requested_by_user_id"),
+        "votuna_management_jobs",
+        ["requested_by_user_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_votuna_management_jobs_status_available_at",
+        "votuna_management_jobs",
+        ["status", "available_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Drop the management jobs table."""
+    op.drop_index("ix_votuna_management_jobs_status_available_at", table_name="votuna_management_jobs")
+    op.drop_index(
+        op.f("ix_votuna_management_jobs_requested_by_user_id"),
+        table_name="votuna_management_jobs",
+    )
+    op.drop_index(op.f("ix_votuna_management_jobs_playlist_id"), table_name="votuna_management_jobs")
+    op.drop_index(op.f("ix_votuna_management_jobs_id"), table_name="votuna_management_jobs")
+    op.drop_table("votuna_management_jobs")
@@ -0,0 +1,51 @@
+"""add suggestion vote tallies
+
+Revision ID: b2f6d4a8c1e3
+Revises: a4e8c2f6b1d9
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b2f6d4a8c1e3"
+down_revision: Union[str, None] = "a4e8c2f6b1d9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TALLY_COLUMNS = ("upvote_count", "downvote_count", "voter_count")
+
+
+def _member_votes_sql(reaction_filter: str = "") -> str:
+    return (
+        "(SELECT count(v.id) FROM votuna_track_votes v "
+        "JOIN votuna_playlist_members m "
+        "ON m.playlist_id = votuna_track_suggestions.playlist_id AND m.user_id = v.user_id "
+        f"WHERE v.suggestion_id = votuna_track_suggestions.id{reaction_filter})"
+    )
+
+
+def upgrade() -> None:
+    """Add reaction counters to suggestions and backfill them from current members' votes."""
+    for column in TALLY_COLUMNS:
+        op.add_column(
+            "votuna_track_suggestions",
+            sa.Column(column, sa.Integer(), server_default="0", nullable=False),
+        )
+    upvotes = _member_votes_sql(" AND v.reaction = 'up'")
+    downvotes = _member_votes_sql(" AND v.reaction = 'down'")
+    op.execute(
+        "UPDATE votuna_track_suggestions SET "
+        f"upvote_count = {upvotes}, downvote_count = {downvotes}, voter_count = {_member_votes_sql()}"
+    )
+
+
+def downgrade() -> None:
+    """Drop the suggestion reaction counters."""
+    for column in reversed(TALLY_COLUMNS):
+        op.drop_column("votuna_track_suggestions", column)
@@ -0,0 +1,32 @@
+"""add votuna playlist version
+
+Revision ID: c7a3e5d9f2b4
+Revises: b2f6d4a8c1e3
+Create Date: 2026-10-16 20:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c7a3e5d9f2b4"
+down_revision: Union[str, None] = "b2f6d4a8c1e3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the per-playlist version counter behind list ETags."""
+    op.add_column(
+        "votuna_playlists",
+        sa.Column("version", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Drop the per-playlist version counter."""
+    op.drop_column("votuna_playlists", "version")
@@ -7,7 +7,7 @@ from urllib.parse import quote
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from fastapi.responses import JSONResponse, RedirectResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.jwt import create_access_token
 from app.auth.sso import (
@@ -21,7 +21,8 @@ from app.auth.sso import (
 from app.config.settings import settings
 from app.crud.user import user_crud
 from app.crud.user_settings import user_settings_crud
-from app.db.session import get_db
+from app.db.session import get_async_db
+from app.db.unit_of_work import unit_of_work_async
 from app.services.music_providers import ProviderAPIError, ProviderAuthError, get_music_provider
 from app.services.votuna_invites import join_invite_by_token
 from app.utils.avatar_storage import (
@@ -135,7 +136,7 @@ async def login_provider(
 async def callback_provider(
     provider: AuthProvider,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Response:
     """Handle the OAuth callback, issue a session token, and redirect."""
     provider_error = request.query_params.get("error")
@@ -180,77 +181,82 @@ async def callback_provider(
     provider_permalink_url = None
     if provider is AuthProvider.soundcloud:
         provider_permalink_url = await _fetch_soundcloud_permalink_url(access_token, provider_user_id_str)
-    user = user_crud.get_by_provider_id(db, provider.value, provider_user_id_str)
-    if not user:
-        user = user_crud.create(
-            db,
-            {
-                "auth_provider": provider.value,
-                "provider_user_id": provider_user_id_str,
-                "email": email,
-                "first_name": first_name,
-                "last_name": last_name,
-                "display_name": display_name,
-                "avatar_url": None,
-                "permalink_url": provider_permalink_url,
-                "last_login_at": datetime.now(timezone.utc),
-            },
-        )
-        if provider_avatar_url:
-            stored_avatar = await save_avatar_from_url(str(provider_avatar_url), user.id)
-            if stored_avatar:
-                user = user_crud.update(db, user, {"avatar_url": stored_avatar})
+    existing_user = await db.run_sync(user_crud.get_by_provider_id, provider.value, provider_user_id_str)
+    # Downloading the avatar must not hold a connection, a transaction or the user's row lock.
+    await db.commit()
+    previous_avatar = existing_user.avatar_url if existing_user else None
+    previous_avatar_is_local = bool(previous_avatar) and not str(previous_avatar).startswith("http")
+    previous_avatar_missing = not previous_avatar_is_local or not _local_avatar_exists(previous_avatar)
+    stored_avatar = None
+    if existing_user and provider_avatar_url and previous_avatar_missing:
+        stored_avatar = await save_avatar_from_url(str(provider_avatar_url), existing_user.id)
+
+    # One login used to commit up to five times; the unit of work commits once.
+    try:
+        async with unit_of_work_async(db):
+            user = await db.run_sync(user_crud.get_by_provider_id, provider.value, provider_user_id_str)
+            if not user:
+                user = await user_crud.create_async(
+                    db,
+                    {
+                        "auth_provider": provider.value,
+                        "provider_user_id": provider_user_id_str,
+                        "email": email,
+                        "first_name": first_name,
+                        "last_name": last_name,
+                        "display_name": display_name,
+                        # Replaced by a local copy once the new user's id is known, below.
+                        "avatar_url": str(provider_avatar_url) if provider_avatar_url else None,
+                        "permalink_url": provider_permalink_url,
+                        "last_login_at": datetime.now(timezone.utc),
+                    },
+                )
             else:
-                user = user_crud.update(db, user, {"avatar_url": str(provider_avatar_url)})
-    else:
-        user = user_crud.update(
-            db,
-            user,
-            {
-                "email": email or user.email,
-                "first_name": first_name or user.first_name,
-                "last_name": last_name or user.last_name,
-                "display_name": display_name or user.display_name,
-                "permalink_url": provider_permalink_url or user.permalink_url,
-                "last_login_at": datetime.now(timezone.utc),
-            },
-        )
-        avatar_needs_refresh = (
-            not user.avatar_url or str(user.avatar_url).startswith("http") or not _local_avatar_exists(user.avatar_url)
-        )
-        if provider_avatar_url and avatar_needs_refresh:
-            previous_avatar = user.avatar_url
-            stored_avatar = await save_avatar_from_url(str(provider_avatar_url), user.id)
-            if stored_avatar:
-                if previous_avatar and not str(previous_avatar).startswith("http") and previous_avatar != stored_avatar:
-                    delete_avatar_if_exists(str(previous_avatar))
-                user = user_crud.update(db, user, {"avatar_url": stored_avatar})
-            elif not previous_avatar or not _local_avatar_exists(str(previous_avatar)):
-                user = user_crud.update(db, user, {"avatar_url": str(provider_avatar_url)})
-        elif (
-            user.avatar_url
-            and not str(user.avatar_url).startswith("http")
-            and not _local_avatar_exists(user.avatar_url)
-        ):
-            user = user_crud.update(db, user, {"avatar_url": None})
-
-    if access_token or refresh_token or expires_at:
-        updates: dict[str, Any] = {
-            "token_expires_at": expires_at,
-        }
-        if access_token:
-            updates["access_token"] = access_token
-        if refresh_token:
-            updates["refresh_token"] = refresh_token
-        user_crud.update(
-            db,
-            user,
-            updates,
-        )
-
-    user_id = cast(int, user.id)
-    if not user_settings_crud.get_by_user_id(db, user_id):
-        user_settings_crud.create(db, {"user_id": user_id})
+                profile_updates: dict[str, Any] = {
+                    "email": email or user.email,
+                    "first_name": first_name or user.first_name,
+                    "last_name": last_name or user.last_name,
+                    "display_name": display_name or user.display_name,
+                    "permalink_url": provider_permalink_url or user.permalink_url,
+                    "last_login_at": datetime.now(timezone.utc),
+                }
+                if stored_avatar:
+                    profile_updates["avatar_url"] = stored_avatar
+                elif provider_avatar_url and previous_avatar_missing:
+                    profile_updates["avatar_url"] = str(provider_avatar_url)
+                elif previous_avatar_is_local and previous_avatar_missing:
+                    profile_updates["avatar_url"] = None
+                user = await user_crud.update_async(db, user, profile_updates)
+
+            if access_token or refresh_token or expires_at:
+                updates: dict[str, Any] = {
+                    "token_expires_at": expires_at,
+                }
+                if access_token:
+                    updates["access_token"] = access_token
+                if refresh_token:
+                    updates["refresh_token"] = refresh_token
+                await user_crud.update_async(
+                    db,
+                    user,
+                    updates,
+                )
+
+            user_id = cast(int, user.id)
+            if not await db.run_sync(user_settings_crud.get_by_user_id, user_id):
+                await user_settings_crud.create_async(db, {"user_id": user_id})
+    except BaseException:
+        if stored_avatar:
+            delete_avatar_if_exists(stored_avatar)
+        raise
+
+    if stored_avatar and previous_avatar_is_local and previous_avatar != stored_avatar:
+        # Only once the new path is committed, so a failed login never points at a deleted file.
+        delete_avatar_if_exists(str(previous_avatar))
+    if existing_user is None and provider_avatar_url:
+        stored_avatar = await save_avatar_from_url(str(provider_avatar_url), user.id)
+        if stored_avatar:
+            user = await user_crud.update_async(db, user, {"avatar_url": stored_avatar})
 
     jwt_token = create_access_token(str(user.id))
 
@@ -262,7 +268,7 @@ async def callback_provider(
 
     if pending_invite_token:
         try:
-            joined_playlist = join_invite_by_token(db, pending_invite_token, user)
+            joined_playlist = await db.run_sync(join_invite_by_token, pending_invite_token, user)
             invite_joined_playlist_id = joined_playlist.id
         except HTTPException as exc:
             invite_error = str(exc.detail)
@@ -1,10 +1,11 @@
 """Provider playlist routes"""
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.v1.routes.votuna.common import provider_api_http_error
 from app.auth.dependencies import get_current_user
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.models.user import User
 from app.schemas.votuna_playlist import ProviderPlaylistOut, ProviderPlaylistCreate, MusicProvider
 from app.services.music_providers import (
@@ -17,7 +18,7 @@ from app.services.music_providers import (
 router = APIRouter()
 
 
-def _get_provider_client(provider: str, user: User, db: Session) -> MusicProviderClient:
+def _get_provider_client(provider: str, user: User, db: AsyncSession) -> MusicProviderClient:
     if not user.access_token:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -45,7 +46,7 @@ def _to_provider_playlist_out(playlist) -> ProviderPlaylistOut:
 @router.get("/providers/{provider}", response_model=list[ProviderPlaylistOut])
 async def list_provider_playlists(
     provider: MusicProvider,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """List playlists from the provider for the current user."""
@@ -55,7 +56,7 @@ async def list_provider_playlists(
     except ProviderAuthError as exc:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(exc)) from exc
     except ProviderAPIError as exc:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
+        raise provider_api_http_error(exc) from exc
     return [_to_provider_playlist_out(playlist) for playlist in playlists]
 
 
@@ -64,7 +65,7 @@ async def search_provider_playlists(
     provider: MusicProvider,
     q: str = Query(..., min_length=1),
     limit: int = Query(12, ge=1, le=25),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Search provider playlists by text."""
@@ -74,7 +75,7 @@ async def search_provider_playlists(
     except ProviderAuthError as exc:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(exc)) from exc
     except ProviderAPIError as exc:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
+        raise provider_api_http_error(exc) from exc
     return [_to_provider_playlist_out(playlist) for playlist in playlists]
 
 
@@ -82,7 +83,7 @@ async def search_provider_playlists(
 async def resolve_provider_playlist(
     provider: MusicProvider,
     url: str = Query(..., min_length=1),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Resolve a provider playlist URL into playlist metadata."""
@@ -93,7 +94,7 @@ async def resolve_provider_playlist(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(exc)) from exc
     except ProviderAPIError as exc:
         status_code = status.HTTP_400_BAD_REQUEST if exc.status_code in {400, 404} else status.HTTP_502_BAD_GATEWAY
-        raise HTTPException(status_code=status_code, detail=str(exc)) from exc
+        raise provider_api_http_error(exc, status_code) from exc
     return _to_provider_playlist_out(playlist)
 
 
@@ -101,7 +102,7 @@ async def resolve_provider_playlist(
 async def create_provider_playlist(
     provider: MusicProvider,
     payload: ProviderPlaylistCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Create a playlist on the provider."""
@@ -115,5 +116,5 @@ async def create_provider_playlist(
     except ProviderAuthError as exc:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(exc)) from exc
     except ProviderAPIError as exc:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
+        raise provider_api_http_error(exc) from exc
     return _to_provider_playlist_out(playlist)
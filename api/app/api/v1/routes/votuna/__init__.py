@@ -7,6 +7,7 @@ from app.api.v1.routes.votuna.members import router as members_router
 from app.api.v1.routes.votuna.invites import router as invites_router
 from app.api.v1.routes.votuna.suggestions import router as suggestions_router
 from app.api.v1.routes.votuna.management import router as management_router
+from app.api.v1.routes.votuna.events import router as events_router
 
 router = APIRouter()
 router.include_router(playlists_router)
@@ -14,3 +15,4 @@ router.include_router(members_router)
 router.include_router(invites_router)
 router.include_router(suggestions_router)
 router.include_router(management_router)
+router.include_router(events_router)
@@ -1,47 +1,42 @@
 """Shared helpers for Votuna routes."""
 
-from fastapi import HTTPException, status
+import math
+from dataclasses import dataclass
+from typing import Literal
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.auth.dependencies import get_current_principal
+from app.auth.principal_cache import AuthPrincipal
+from app.db.session import get_async_db, get_db
 from app.models.user import User
+from app.models.votuna_members import VotunaPlaylistMember
 from app.models.votuna_playlist import VotunaPlaylist
-from app.crud.user import user_crud
+from app.models.votuna_playlist_settings import VotunaPlaylistSettings
 from app.crud.votuna_playlist import votuna_playlist_crud
-from app.crud.votuna_playlist_member import votuna_playlist_member_crud
-from app.services.music_providers import MusicProviderClient, get_provider_client_for_user
+from app.services.music_providers import (
+    MusicProviderClient,
+    ProviderAPIError,
+    ProviderRateLimitError,
+    ProviderUnavailableError,
+    get_provider_client_for_user,
+)
 
 
-def get_playlist_or_404(db: Session, playlist_id: int) -> VotunaPlaylist:
-    playlist = votuna_playlist_crud.get(db, playlist_id)
+async def get_playlist_or_404_async(db: AsyncSession, playlist_id: int) -> VotunaPlaylist:
+    playlist = await votuna_playlist_crud.get_async(db, playlist_id)
     if not playlist:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Playlist not found")
     return playlist
 
 
-def require_member(db: Session, playlist_id: int, user_id: int):
-    member = votuna_playlist_member_crud.get_member(db, playlist_id, user_id)
-    if not member:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a playlist member")
-    return member
-
-
-def require_owner(db: Session, playlist_id: int, user_id: int) -> VotunaPlaylist:
-    playlist = get_playlist_or_404(db, playlist_id)
-    if playlist.owner_user_id != user_id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not playlist owner")
-    return playlist
-
-
-def has_collaborators(db: Session, playlist: VotunaPlaylist) -> bool:
-    """Return whether the playlist has any non-owner collaborators."""
-    return votuna_playlist_member_crud.has_non_owner_members(
-        db,
-        playlist.id,
-        playlist.owner_user_id,
-    )
-
-
-def get_provider_client(provider: str, user: User, db: Session | None = None) -> MusicProviderClient:
+def get_provider_client(
+    provider: str,
+    user: User,
+    db: Session | AsyncSession | None = None,
+) -> MusicProviderClient:
     if not user.access_token:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -53,11 +48,90 @@ def get_provider_client(provider: str, user: User, db: Session | None = None) ->
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
 
-def get_owner_client(db: Session, playlist: VotunaPlaylist) -> MusicProviderClient:
-    owner = user_crud.get(db, playlist.owner_user_id)
-    if not owner:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Playlist owner not found")
-    return get_provider_client(playlist.provider, owner, db=db)
+@dataclass
+class PlaylistAccessContext:
+    """A playlist plus everything routes check before real work, loaded in one query."""
+
+    playlist: VotunaPlaylist
+    membership: VotunaPlaylistMember | None
+    owner: User | None
+    settings: VotunaPlaylistSettings | None
+    collaborator_count: int
+    member_count: int
+
+    @property
+    def has_collaborators(self) -> bool:
+        return self.collaborator_count > 0
+
+    def owner_client(self, db: Session | AsyncSession) -> MusicProviderClient:
+        if not self.owner:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Playlist owner not found")
+        return get_provider_client(self.playlist.provider, self.owner, db=db)
+
+
+def load_playlist_access(
+    db: Session,
+    playlist_id: int,
+    user_id: int,
+    *,
+    require: Literal["member", "owner"] = "member",
+) -> PlaylistAccessContext:
+    """Load a playlist's access context, raising 404 if it is missing and 403 if the user lacks ``require``."""
+    row = votuna_playlist_crud.get_with_access(db, playlist_id, user_id)
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Playlist not found")
+    access = PlaylistAccessContext(*row)
+    if require == "owner" and access.playlist.owner_user_id != user_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not playlist owner")
+    if require == "member" and access.membership is None:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a playlist member")
+    return access
+
+
+async def load_playlist_access_async(
+    db: AsyncSession,
+    playlist_id: int,
+    user_id: int,
+    *,
+    require: Literal["member", "owner"] = "member",
+) -> PlaylistAccessContext:
+    return await db.run_sync(load_playlist_access, playlist_id, user_id, require=require)
+
+
+def get_member_access(
+    playlist_id: int,
+    db: Session = Depends(get_db),
+    current_user: AuthPrincipal = Depends(get_current_principal),
+) -> PlaylistAccessContext:
+    """Dependency: the path playlist's access context, for members only."""
+    return load_playlist_access(db, playlist_id, current_user.id)
+
+
+def get_owner_access(
+    playlist_id: int,
+    db: Session = Depends(get_db),
+    current_user: AuthPrincipal = Depends(get_current_principal),
+) -> PlaylistAccessContext:
+    """Dependency: the path playlist's access context, for its owner only."""
+    return load_playlist_access(db, playlist_id, current_user.id, require="owner")
+
+
+async def get_member_access_async(
+    playlist_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthPrincipal = Depends(get_current_principal),
+) -> PlaylistAccessContext:
+    """Async-session variant of ``get_member_access``."""
+    return await load_playlist_access_async(db, playlist_id, current_user.id)
+
+
+async def get_owner_access_async(
+    playlist_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthPrincipal = Depends(get_current_principal),
+) -> PlaylistAccessContext:
+    """Async-session variant of ``get_owner_access``."""
+    return await load_playlist_access_async(db, playlist_id, current_user.id, require="owner")
 
 
 def _provider_display_name(provider: str | None) -> str:
@@ -74,7 +148,7 @@ def _provider_display_name(provider: str | None) -> str:
 
 
 def raise_provider_auth(
-    current_user: User,
+    current_user: User | AuthPrincipal,
     owner_id: int | None = None,
     provider: str | None = None,
 ) -> None:
@@ -89,3 +163,23 @@ def raise_provider_auth(
         status_code=status.HTTP_409_CONFLICT,
         detail=f"Playlist owner must reconnect {provider_name}",
     )
+
+
+def provider_api_http_error(
+    exc: ProviderAPIError,
+    status_code: int = status.HTTP_502_BAD_GATEWAY,
+) -> HTTPException:
+    """Map a provider failure to an HTTP error.
+
+    Rate limits become 429 and an unavailable provider (open circuit, timeout) becomes 503,
+    both with ``Retry-After`` when known.
+    """
+    if isinstance(exc, (ProviderRateLimitError, ProviderUnavailableError)):
+        headers = {"Retry-After": str(math.ceil(exc.retry_after))} if exc.retry_after is not None else None
+        error_status = (
+            status.HTTP_429_TOO_MANY_REQUESTS
+            if isinstance(exc, ProviderRateLimitError)
+            else status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+        return HTTPException(status_code=error_status, detail=str(exc), headers=headers)
+    return HTTPException(status_code=status_code, detail=str(exc))
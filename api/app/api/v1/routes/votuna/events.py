@@ -0,0 +1,37 @@
+"""Votuna live event routes."""
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.routes.votuna.common import load_playlist_access_async
+from app.auth.dependencies import get_current_principal_async
+from app.auth.principal_cache import AuthPrincipal
+from app.db.session import get_async_db
+from app.services.playlist_events import playlist_event_stream
+
+router = APIRouter()
+
+
+@router.get("/playlists/{playlist_id}/events", response_class=StreamingResponse)
+async def stream_playlist_events(
+    playlist_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthPrincipal = Depends(get_current_principal_async),
+):
+    """Stream suggestion and track changes for a playlist as server-sent events.
+
+    Event names are ``suggestion.created``, ``suggestion.voted``, ``suggestion.resolved``,
+    ``track.added``, ``track.removed`` and ``track.reordered``; each ``data`` line is a JSON
+    delta. Per-viewer fields such as ``my_reaction`` are not included, and ``track.reordered``
+    carries no order, so clients refetch the track list.
+    """
+    # Dependencies are only torn down once the stream ends, so this route uses a single async
+    # session (no sync ``get_db``) and hands its connection back before streaming.
+    await load_playlist_access_async(db, playlist_id, current_user.id)
+    await db.close()
+    return StreamingResponse(
+        playlist_event_stream(playlist_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -7,17 +7,25 @@ from urllib.parse import quote
 
 from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, status
 from fastapi.responses import RedirectResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.v1.routes.votuna.common import get_owner_client, raise_provider_auth, require_owner
-from app.auth.dependencies import get_current_user, get_optional_current_user
+from app.api.v1.routes.votuna.common import (
+    PlaylistAccessContext,
+    get_owner_access,
+    get_owner_access_async,
+    provider_api_http_error,
+    raise_provider_auth,
+)
+from app.auth.dependencies import get_current_principal, get_current_user, get_optional_current_user
+from app.auth.principal_cache import AuthPrincipal
 from app.auth.sso import AuthProvider
 from app.config.settings import settings
 from app.crud.user import user_crud
 from app.crud.votuna_playlist import votuna_playlist_crud
 from app.crud.votuna_playlist_invite import votuna_playlist_invite_crud
 from app.crud.votuna_playlist_member import votuna_playlist_member_crud
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
 from app.models.user import User
 from app.models.votuna_playlist import VotunaPlaylist
 from app.schemas.votuna_invite import (
@@ -36,6 +44,7 @@ from app.services.votuna_invites import (
     join_invite,
     join_invite_by_token,
 )
+from app.utils.etag import conditional_response, weak_etag
 
 router = APIRouter()
 
@@ -111,15 +120,17 @@ async def list_invite_candidates(
     playlist_id: int,
     q: str = Query(..., min_length=1),
     limit: int = Query(default=10, ge=1, le=25),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    access: PlaylistAccessContext = Depends(get_owner_access_async),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
     """Search invite candidates: registered users first, then provider users fallback."""
-    playlist = require_owner(db, playlist_id, current_user.id)
-    member_ids = {member.user_id for member, _ in votuna_playlist_member_crud.list_members(db, playlist_id)}
+    playlist = access.playlist
+    member_rows = await db.run_sync(votuna_playlist_member_crud.list_members, playlist_id)
+    member_ids = {member.user_id for member, _ in member_rows}
 
-    local_candidates = user_crud.search_by_provider_identity(
-        db=db,
+    local_candidates = await db.run_sync(
+        user_crud.search_by_provider_identity,
         provider=playlist.provider,
         query=q,
         limit=limit,
@@ -141,14 +152,14 @@ async def list_invite_candidates(
             if user.provider_user_id != current_user.provider_user_id
         ]
 
-    client = get_owner_client(db, playlist)
+    client = access.owner_client(db)
     try:
         provider_users = await client.search_users(q, limit=limit)
     except ProviderAuthError:
         raise_provider_auth(current_user, owner_id=playlist.owner_user_id, provider=playlist.provider)
         raise AssertionError("unreachable")
     except ProviderAPIError as exc:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
+        raise provider_api_http_error(exc) from exc
 
     candidates: list[VotunaInviteCandidateOut] = []
     seen_provider_ids: set[str] = set()
@@ -160,7 +171,7 @@ async def list_invite_candidates(
         if provider_user_id == current_user.provider_user_id:
             continue
 
-        registered_user = user_crud.get_by_provider_id(db, playlist.provider, provider_user_id)
+        registered_user = await db.run_sync(user_crud.get_by_provider_id, playlist.provider, provider_user_id)
         if registered_user and registered_user.id in member_ids:
             continue
 
@@ -189,12 +200,18 @@ async def list_invite_candidates(
 async def list_playlist_invites(
     playlist_id: int,
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    access: PlaylistAccessContext = Depends(get_owner_access_async),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
     """List active invites for a playlist (owner-only)."""
-    playlist = require_owner(db, playlist_id, current_user.id)
-    invites = votuna_playlist_invite_crud.list_active_for_playlist(db, playlist_id)
+    playlist = access.playlist
+    invites = await db.run_sync(votuna_playlist_invite_crud.list_active_for_playlist, playlist_id)
+    # Invites expire without a write, so the active set is part of the tag; checked before any provider lookup.
+    etag = weak_etag("invites", playlist_id, playlist.version, *(invite.id for invite in invites))
+    if (not_modified := conditional_response(request, response, etag)) is not None:
+        return not_modified
 
     user_invite_profile: dict[int, tuple[str | None, str | None, str | None, str | None]] = {}
     user_cache: dict[int, User | None] = {}
@@ -203,7 +220,7 @@ async def list_playlist_invites(
     if user_invites:
         client = None
         try:
-            client = get_owner_client(db, playlist)
+            client = access.owner_client(db)
         except HTTPException:
             client = None
 
@@ -214,7 +231,7 @@ async def list_playlist_invites(
             target_user = None
             if invite.target_user_id:
                 if invite.target_user_id not in user_cache:
-                    user_cache[invite.target_user_id] = user_crud.get(db, invite.target_user_id)
+                    user_cache[invite.target_user_id] = await user_crud.get_async(db, invite.target_user_id)
                 target_user = user_cache[invite.target_user_id]
                 if target_user:
                     display_name = _display_name(target_user)
@@ -306,15 +323,17 @@ def list_pending_invites(
     return payload
 
 
-@router.delete("/playlists/{playlist_id}/invites/{invite_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/playlists/{playlist_id}/invites/{invite_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(get_owner_access)],
+)
 def cancel_playlist_invite(
     playlist_id: int,
     invite_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
 ):
     """Cancel a pending invite (owner-only)."""
-    require_owner(db, playlist_id, current_user.id)
     invite = votuna_playlist_invite_crud.get(db, invite_id)
     if not invite or invite.playlist_id != playlist_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invite not found")
@@ -335,11 +354,12 @@ async def create_invite(
     playlist_id: int,
     payload: Annotated[VotunaPlaylistInviteCreate, Body(discriminator="kind")],
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    access: PlaylistAccessContext = Depends(get_owner_access_async),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
     """Create either a targeted user invite or a shareable invite link."""
-    playlist = require_owner(db, playlist_id, current_user.id)
+    playlist = access.playlist
 
     if isinstance(payload, VotunaPlaylistInviteCreateUser):
         target_provider_user_id = payload.target_provider_user_id.strip()
@@ -354,8 +374,8 @@ async def create_invite(
                 detail="Cannot invite yourself",
             )
 
-        existing_invite = votuna_playlist_invite_crud.get_active_user_invite(
-            db=db,
+        existing_invite = await db.run_sync(
+            votuna_playlist_invite_crud.get_active_user_invite,
             playlist_id=playlist_id,
             auth_provider=playlist.provider,
             provider_user_id=target_provider_user_id,
@@ -364,7 +384,9 @@ async def create_invite(
             try:
                 ensure_invite_is_active(existing_invite)
                 target_user = (
-                    user_crud.get(db, existing_invite.target_user_id) if existing_invite.target_user_id else None
+                    await user_crud.get_async(db, existing_invite.target_user_id)
+                    if existing_invite.target_user_id
+                    else None
                 )
                 return _to_invite_out(
                     existing_invite,
@@ -379,7 +401,7 @@ async def create_invite(
                 # If stale, continue and create a fresh invite.
                 pass
 
-        client = get_owner_client(db, playlist)
+        client = access.owner_client(db)
         try:
             provider_user = await client.get_user(target_provider_user_id)
         except ProviderAuthError:
@@ -391,15 +413,15 @@ async def create_invite(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Target user not found in provider",
                 ) from exc
-            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
+            raise provider_api_http_error(exc) from exc
 
-        registered_target = user_crud.get_by_provider_id(
-            db,
+        registered_target = await db.run_sync(
+            user_crud.get_by_provider_id,
             playlist.provider,
             target_provider_user_id,
         )
-        if registered_target and votuna_playlist_member_crud.get_member(
-            db,
+        if registered_target and await db.run_sync(
+            votuna_playlist_member_crud.get_member,
             playlist_id,
             registered_target.id,
         ):
@@ -408,7 +430,7 @@ async def create_invite(
                 detail="User is already a collaborator",
             )
 
-        invite = votuna_playlist_invite_crud.create(
+        invite = await votuna_playlist_invite_crud.create_async(
             db,
             {
                 "playlist_id": playlist_id,
@@ -446,7 +468,7 @@ async def create_invite(
     payload = payload if isinstance(payload, VotunaPlaylistInviteCreateLink) else VotunaPlaylistInviteCreateLink()
     expires_in_hours = payload.expires_in_hours or DEFAULT_LINK_EXPIRES_HOURS
     max_uses = payload.max_uses if payload.max_uses is not None else DEFAULT_LINK_MAX_USES
-    invite = votuna_playlist_invite_crud.create(
+    invite = await votuna_playlist_invite_crud.create_async(
         db,
         {
             "playlist_id": playlist_id,
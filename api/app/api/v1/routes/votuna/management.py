@@ -1,23 +1,27 @@
 """Playlist management routes for import/export workflows."""
 
+from collections.abc import AsyncIterator
+from contextlib import aclosing
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Iterable, Sequence
+from typing import Sequence
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.routes.votuna.common import (
-    get_owner_client,
-    get_playlist_or_404,
+    PlaylistAccessContext,
+    get_owner_access_async,
+    get_playlist_or_404_async,
+    provider_api_http_error,
     raise_provider_auth,
-    require_owner,
 )
-from app.auth.dependencies import get_current_user
-from app.db.session import get_db
-from app.models.user import User
+from app.auth.dependencies import get_current_principal, get_current_principal_async
+from app.auth.principal_cache import AuthPrincipal
+from app.crud.votuna_management_job import votuna_management_job_crud
+from app.db.session import get_async_db
+from app.models.votuna_management_jobs import VotunaManagementJob
 from app.models.votuna_playlist import VotunaPlaylist
-from app.crud.votuna_track_addition import votuna_track_addition_crud
 from app.schemas.votuna_playlist import MusicProvider, ProviderTrackOut
 from app.schemas.votuna_playlist_management import (
     ManagementFacetCount,
@@ -26,20 +30,37 @@ from app.schemas.votuna_playlist_management import (
     ManagementDestinationCreate,
     ManagementExecuteResponse,
     ManagementFailedItem,
+    ManagementJobOut,
     ManagementPlaylistRef,
     ManagementPlaylistSummary,
     ManagementPreviewResponse,
-    ManagementSelectionMode,
     ManagementSourceTracksRequest,
     ManagementSourceTracksResponse,
     ManagementTransferRequest,
 )
-from app.services.music_providers import MusicProviderClient, ProviderAPIError, ProviderAuthError, ProviderTrack
+from app.services.music_providers import (
+    MusicProviderClient,
+    ProviderAPIError,
+    ProviderAuthError,
+    ProviderRateLimitError,
+    ProviderTrack,
+    ProviderUnavailableError,
+)
+from app.services.management_jobs import notify_management_job_queued
+from app.services.playlist_transfers import (
+    ADD_CHUNK_SIZE,
+    add_track_chunk,
+    chunk_values,
+    dedupe_tracks_by_id,
+    filter_tracks_by_selection,
+    normalize_selection_value,
+    publish_transfer_additions,
+    record_transfer_additions,
+)
 
 router = APIRouter()
 
 MAX_TRACKS_PER_ACTION = 500
-ADD_CHUNK_SIZE = 100
 FACETS_LIMIT = 100
 
 
@@ -57,15 +78,11 @@ class ResolvedProviderPlaylist:
         )
 
 
-def _normalize(value: str) -> str:
-    return value.strip().lower()
-
-
 def _sanitize_selection_values(values: Sequence[str]) -> list[str]:
     cleaned: list[str] = []
     seen: set[str] = set()
     for value in values:
-        normalized = _normalize(value)
+        normalized = normalize_selection_value(value)
         if not normalized or normalized in seen:
             continue
         seen.add(normalized)
@@ -127,66 +144,35 @@ def _contains_search(track: ProviderTrack, needle: str) -> bool:
     return needle in title or needle in artist or needle in genre
 
 
-def _build_facet_counts(values: Iterable[str | None]) -> list[ManagementFacetCount]:
-    counts: dict[str, int] = {}
-    display_values: dict[str, str] = {}
+class _FacetTally:
+    """Running facet counts keyed by normalized value, keeping the first display spelling."""
+
+    def __init__(self) -> None:
+        self.counts: dict[str, int] = {}
+        self.display_values: dict[str, str] = {}
 
-    for raw_value in values:
+    def add(self, raw_value: str | None) -> None:
         if raw_value is None:
-            continue
+            return
         value = raw_value.strip()
         if not value:
-            continue
-        normalized = _normalize(value)
-        counts[normalized] = counts.get(normalized, 0) + 1
-        if normalized not in display_values:
-            display_values[normalized] = value
+            return
+        normalized = normalize_selection_value(value)
+        self.counts[normalized] = self.counts.get(normalized, 0) + 1
+        if normalized not in self.display_values:
+            self.display_values[normalized] = value
 
-    facets = [ManagementFacetCount(value=display_values[key], count=counts[key]) for key in counts]
-    facets.sort(key=lambda facet: (-facet.count, facet.value.lower(), facet.value))
-    return facets[:FACETS_LIMIT]
-
-
-def _filter_tracks_by_selection(
-    tracks: Sequence[ProviderTrack],
-    selection_mode: ManagementSelectionMode,
-    cleaned_values: list[str],
-) -> list[ProviderTrack]:
-    if selection_mode == "all":
-        return list(tracks)
-    if selection_mode == "songs":
-        selected_ids = set(cleaned_values)
-        return [track for track in tracks if _normalize(track.provider_track_id) in selected_ids]
-    if selection_mode == "artist":
-        selected_artists = set(cleaned_values)
-        return [track for track in tracks if track.artist and _normalize(track.artist) in selected_artists]
-    # selection_mode == "genre"
-    selected_genres = set(cleaned_values)
-    return [track for track in tracks if track.genre and _normalize(track.genre) in selected_genres]
-
-
-def _dedupe_tracks_by_id(tracks: Sequence[ProviderTrack]) -> list[ProviderTrack]:
-    deduped: list[ProviderTrack] = []
-    seen: set[str] = set()
-    for track in tracks:
-        track_id = track.provider_track_id
-        if not track_id or track_id in seen:
-            continue
-        seen.add(track_id)
-        deduped.append(track)
-    return deduped
-
-
-def _chunks(values: Sequence[str], chunk_size: int) -> Iterable[list[str]]:
-    for index in range(0, len(values), chunk_size):
-        yield list(values[index : index + chunk_size])
+    def top(self) -> list[ManagementFacetCount]:
+        facets = [ManagementFacetCount(value=self.display_values[key], count=self.counts[key]) for key in self.counts]
+        facets.sort(key=lambda facet: (-facet.count, facet.value.lower(), facet.value))
+        return facets[:FACETS_LIMIT]
 
 
 async def _safe_get_playlist(
     *,
     client: MusicProviderClient,
     provider_playlist_id: str,
-    current_user: User,
+    current_user: AuthPrincipal,
     owner_id: int,
     provider: str,
 ) -> ResolvedProviderPlaylist:
@@ -196,7 +182,7 @@ async def _safe_get_playlist(
         raise_provider_auth(current_user, owner_id=owner_id, provider=provider)
         raise AssertionError("unreachable")
     except ProviderAPIError as exc:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
+        raise provider_api_http_error(exc) from exc
     return ResolvedProviderPlaylist(
         provider=provider_playlist.provider,  # type: ignore[arg-type]
         provider_playlist_id=provider_playlist.provider_playlist_id,
@@ -208,7 +194,7 @@ async def _safe_list_tracks(
     *,
     client: MusicProviderClient,
     provider_playlist_id: str,
-    current_user: User,
+    current_user: AuthPrincipal,
     owner_id: int,
     provider: str,
 ) -> list[ProviderTrack]:
@@ -218,15 +204,35 @@ async def _safe_list_tracks(
         raise_provider_auth(current_user, owner_id=owner_id, provider=provider)
         raise AssertionError("unreachable")
     except ProviderAPIError as exc:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
+        raise provider_api_http_error(exc) from exc
     return list(tracks)
 
 
+async def _safe_iter_tracks(
+    *,
+    client: MusicProviderClient,
+    provider_playlist_id: str,
+    current_user: AuthPrincipal,
+    owner_id: int,
+    provider: str,
+) -> AsyncIterator[ProviderTrack]:
+    """Stream playlist tracks, mapping provider failures like ``_safe_list_tracks``."""
+    try:
+        async with aclosing(client.iter_tracks(provider_playlist_id)) as tracks:
+            async for track in tracks:
+                yield track
+    except ProviderAuthError:
+        raise_provider_auth(current_user, owner_id=owner_id, provider=provider)
+        raise AssertionError("unreachable")
+    except ProviderAPIError as exc:
+        raise provider_api_http_error(exc) from exc
+
+
 async def _resolve_playlist_ref(
     *,
-    db: Session,
+    db: AsyncSession,
     current_playlist: VotunaPlaylist,
-    current_user: User,
+    current_user: AuthPrincipal,
     client: MusicProviderClient,
     ref: ManagementPlaylistRef,
 ) -> ResolvedProviderPlaylist:
@@ -249,7 +255,7 @@ async def _resolve_playlist_ref(
             title=resolved.title,
         )
 
-    other_playlist = get_playlist_or_404(db, ref.votuna_playlist_id)
+    other_playlist = await get_playlist_or_404_async(db, ref.votuna_playlist_id)
     if other_playlist.owner_user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -288,9 +294,9 @@ def _build_preview_destination_for_create(
 
 async def _resolve_transfer_endpoints(
     *,
-    db: Session,
+    db: AsyncSession,
     current_playlist: VotunaPlaylist,
-    current_user: User,
+    current_user: AuthPrincipal,
     client: MusicProviderClient,
     payload: ManagementTransferRequest,
 ) -> tuple[ResolvedProviderPlaylist, ResolvedProviderPlaylist, bool]:
@@ -346,12 +352,13 @@ async def _resolve_transfer_endpoints(
 async def list_management_source_tracks(
     playlist_id: int,
     payload: ManagementSourceTracksRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    access: PlaylistAccessContext = Depends(get_owner_access_async),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
     """List source playlist tracks for transfer picking."""
-    current_playlist = require_owner(db, playlist_id, current_user.id)
-    client = get_owner_client(db, current_playlist)
+    current_playlist = access.playlist
+    client = access.owner_client(db)
     source = await _resolve_playlist_ref(
         db=db,
         current_playlist=current_playlist,
@@ -359,19 +366,33 @@ async def list_management_source_tracks(
         client=client,
         ref=payload.source,
     )
-    tracks = await _safe_list_tracks(
+    needle = normalize_selection_value(payload.search or "")
+    page_end = payload.offset + payload.limit
+    paged_tracks: list[ProviderTrack] = []
+    matched_count = 0
+    has_more = False
+    tracks = _safe_iter_tracks(
         client=client,
         provider_playlist_id=source.provider_playlist_id,
         current_user=current_user,
         owner_id=current_playlist.owner_user_id,
         provider=current_playlist.provider,
     )
-    needle = _normalize(payload.search or "")
-    filtered_tracks = [track for track in tracks if _contains_search(track, needle)]
-    paged_tracks = filtered_tracks[payload.offset : payload.offset + payload.limit]
+    async with aclosing(tracks):
+        async for track in tracks:
+            if not _contains_search(track, needle):
+                continue
+            matched_count += 1
+            # One match past the page is enough to know another page exists.
+            if matched_count > page_end:
+                has_more = True
+                break
+            if matched_count > payload.offset:
+                paged_tracks.append(track)
     return ManagementSourceTracksResponse(
         tracks=[_provider_track_to_out(track) for track in paged_tracks],
-        total_count=len(filtered_tracks),
+        total_count=matched_count,
+        has_more=has_more,
         limit=payload.limit,
         offset=payload.offset,
     )
@@ -384,12 +405,13 @@ async def list_management_source_tracks(
 async def list_management_facets(
     playlist_id: int,
     payload: ManagementFacetsRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    access: PlaylistAccessContext = Depends(get_owner_access_async),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
     """List aggregated source facets for genre and artist suggestions."""
-    current_playlist = require_owner(db, playlist_id, current_user.id)
-    client = get_owner_client(db, current_playlist)
+    current_playlist = access.playlist
+    client = access.owner_client(db)
     source = await _resolve_playlist_ref(
         db=db,
         current_playlist=current_playlist,
@@ -397,18 +419,26 @@ async def list_management_facets(
         client=client,
         ref=payload.source,
     )
-    tracks = await _safe_list_tracks(
+    genres = _FacetTally()
+    artists = _FacetTally()
+    total_tracks_considered = 0
+    tracks = _safe_iter_tracks(
         client=client,
         provider_playlist_id=source.provider_playlist_id,
         current_user=current_user,
         owner_id=current_playlist.owner_user_id,
         provider=current_playlist.provider,
     )
+    async with aclosing(tracks):
+        async for track in tracks:
+            genres.add(track.genre)
+            artists.add(track.artist)
+            total_tracks_considered += 1
 
     return ManagementFacetsResponse(
-        genres=_build_facet_counts(track.genre for track in tracks),
-        artists=_build_facet_counts(track.artist for track in tracks),
-        total_tracks_considered=len(tracks),
+        genres=genres.top(),
+        artists=artists.top(),
+        total_tracks_considered=total_tracks_considered,
     )
 
 
@@ -416,15 +446,16 @@ async def list_management_facets(
 async def preview_management_transfer(
     playlist_id: int,
     payload: ManagementTransferRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    access: PlaylistAccessContext = Depends(get_owner_access_async),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
     """Preview a management transfer without mutating provider playlists."""
-    current_playlist = require_owner(db, playlist_id, current_user.id)
+    current_playlist = access.playlist
     cleaned_values = _sanitize_selection_values(payload.selection_values)
     _validate_transfer_payload(payload, cleaned_values)
 
-    client = get_owner_client(db, current_playlist)
+    client = access.owner_client(db)
     source, destination, destination_is_created = await _resolve_transfer_endpoints(
         db=db,
         current_playlist=current_playlist,
@@ -440,8 +471,8 @@ async def preview_management_transfer(
         owner_id=current_playlist.owner_user_id,
         provider=current_playlist.provider,
     )
-    matched_tracks = _dedupe_tracks_by_id(
-        _filter_tracks_by_selection(source_tracks, payload.selection_mode, cleaned_values)
+    matched_tracks = dedupe_tracks_by_id(
+        filter_tracks_by_selection(source_tracks, payload.selection_mode, cleaned_values)
     )
 
     destination_track_ids: set[str] = set()
@@ -482,15 +513,16 @@ async def preview_management_transfer(
 async def execute_management_transfer(
     playlist_id: int,
     payload: ManagementTransferRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    access: PlaylistAccessContext = Depends(get_owner_access_async),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
     """Execute a management transfer against provider playlists."""
-    current_playlist = require_owner(db, playlist_id, current_user.id)
+    current_playlist = access.playlist
     cleaned_values = _sanitize_selection_values(payload.selection_values)
     _validate_transfer_payload(payload, cleaned_values)
 
-    client = get_owner_client(db, current_playlist)
+    client = access.owner_client(db)
     source, destination_preview, destination_is_created = await _resolve_transfer_endpoints(
         db=db,
         current_playlist=current_playlist,
@@ -506,8 +538,8 @@ async def execute_management_transfer(
         owner_id=current_playlist.owner_user_id,
         provider=current_playlist.provider,
     )
-    matched_tracks = _dedupe_tracks_by_id(
-        _filter_tracks_by_selection(source_tracks, payload.selection_mode, cleaned_values)
+    matched_tracks = dedupe_tracks_by_id(
+        filter_tracks_by_selection(source_tracks, payload.selection_mode, cleaned_values)
     )
 
     created_destination_summary: ManagementPlaylistSummary | None = None
@@ -528,7 +560,7 @@ async def execute_management_transfer(
             )
             raise AssertionError("unreachable")
         except ProviderAPIError as exc:
-            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
+            raise provider_api_http_error(exc) from exc
 
         destination = ResolvedProviderPlaylist(
             provider=current_playlist.provider,  # type: ignore[arg-type]
@@ -562,15 +594,19 @@ async def execute_management_transfer(
     added_count = 0
     successfully_added_track_ids: list[str] = []
     failed_items: list[ManagementFailedItem] = []
+    deferred_error: ProviderRateLimitError | ProviderUnavailableError | None = None
 
-    for chunk in _chunks(to_add_track_ids, ADD_CHUNK_SIZE):
+    for chunk in chunk_values(to_add_track_ids, ADD_CHUNK_SIZE):
         if not chunk:
             continue
-        try:
-            await client.add_tracks(destination.provider_playlist_id, chunk)
-            added_count += len(chunk)
-            successfully_added_track_ids.extend(chunk)
+        if deferred_error is not None:
+            # The scheduler already waited out what it could; more calls would only be rejected.
+            failed_items.extend(
+                ManagementFailedItem(provider_track_id=track_id, error=str(deferred_error)) for track_id in chunk
+            )
             continue
+        try:
+            result = await add_track_chunk(client, destination.provider_playlist_id, chunk)
         except ProviderAuthError:
             raise_provider_auth(
                 current_user,
@@ -578,50 +614,36 @@ async def execute_management_transfer(
                 provider=current_playlist.provider,
             )
             raise AssertionError("unreachable")
-        except ProviderAPIError:
-            # Fall back to per-track retries for best-effort behavior.
-            pass
-
-        for track_id in chunk:
-            try:
-                await client.add_tracks(destination.provider_playlist_id, [track_id])
-                added_count += 1
-                successfully_added_track_ids.append(track_id)
-            except ProviderAuthError:
-                raise_provider_auth(
-                    current_user,
-                    owner_id=current_playlist.owner_user_id,
-                    provider=current_playlist.provider,
-                )
-                raise AssertionError("unreachable")
-            except ProviderAPIError as exc:
-                failed_items.append(ManagementFailedItem(provider_track_id=track_id, error=str(exc)))
-            except Exception as exc:  # pragma: no cover - defensive fallback
-                failed_items.append(ManagementFailedItem(provider_track_id=track_id, error=str(exc)))
+        added_count += len(result.added_track_ids)
+        successfully_added_track_ids.extend(result.added_track_ids)
+        failed_items.extend(result.failed_items)
+        if result.deferred_error is not None:
+            deferred_error = result.deferred_error
+            failed_items.extend(
+                ManagementFailedItem(provider_track_id=track_id, error=str(deferred_error))
+                for track_id in result.deferred_track_ids
+            )
 
     if successfully_added_track_ids:
-        destination_playlists = (
-            db.query(VotunaPlaylist)
-            .filter(
-                VotunaPlaylist.provider == current_playlist.provider,
-                VotunaPlaylist.provider_playlist_id == destination.provider_playlist_id,
-            )
-            .all()
-        )
         added_at = datetime.now(timezone.utc)
-        for destination_playlist in destination_playlists:
-            for track_id in successfully_added_track_ids:
-                votuna_track_addition_crud.create(
-                    db,
-                    {
-                        "playlist_id": destination_playlist.id,
-                        "provider_track_id": track_id,
-                        "source": "playlist_utils",
-                        "added_at": added_at,
-                        "added_by_user_id": current_user.id,
-                        "suggestion_id": None,
-                    },
-                )
+        playlist_ids = await db.run_sync(
+            record_transfer_additions,
+            provider=current_playlist.provider,
+            provider_playlist_id=destination.provider_playlist_id,
+            track_ids=successfully_added_track_ids,
+            added_by_user_id=current_user.id,
+            added_at=added_at,
+        )
+        publish_transfer_additions(
+            playlist_ids,
+            successfully_added_track_ids,
+            added_at=added_at,
+            added_by_user_id=current_user.id,
+            tracks_by_id={track.provider_track_id: track for track in matched_tracks},
+        )
+    if isinstance(deferred_error, ProviderUnavailableError):
+        # Tracks added so far are recorded above and are skipped as duplicates on a retry.
+        raise provider_api_http_error(deferred_error) from deferred_error
 
     return ManagementExecuteResponse(
         source=source.to_summary(),
@@ -633,3 +655,100 @@ async def execute_management_transfer(
         failed_count=len(failed_items),
         failed_items=failed_items,
     )
+
+
+def _job_to_out(job: VotunaManagementJob) -> ManagementJobOut:
+    provider: MusicProvider = job.provider  # type: ignore[assignment]
+    destination = ManagementPlaylistSummary(
+        provider=provider,
+        provider_playlist_id=job.destination_provider_playlist_id or "(new)",
+        title=job.destination_title,
+    )
+    failed_items = [ManagementFailedItem.model_validate(item) for item in job.failed_items or []]
+    return ManagementJobOut(
+        id=job.id,
+        playlist_id=job.playlist_id,
+        status=job.status,  # type: ignore[arg-type]
+        source=ManagementPlaylistSummary(
+            provider=provider,
+            provider_playlist_id=job.source_provider_playlist_id,
+            title=job.source_title,
+        ),
+        destination=destination,
+        created_destination=(destination if job.creates_destination and job.destination_provider_playlist_id else None),
+        total_count=len(job.track_ids or []),
+        processed_count=job.next_index,
+        matched_count=job.matched_count,
+        added_count=job.added_count,
+        skipped_duplicate_count=job.skipped_duplicate_count,
+        failed_count=len(failed_items),
+        failed_items=failed_items,
+        error=job.error,
+        attempts=job.attempts,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+@router.post(
+    "/playlists/{playlist_id}/management/jobs",
+    response_model=ManagementJobOut,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def enqueue_management_job(
+    playlist_id: int,
+    payload: ManagementTransferRequest,
+    db: AsyncSession = Depends(get_async_db),
+    access: PlaylistAccessContext = Depends(get_owner_access_async),
+    current_user: AuthPrincipal = Depends(get_current_principal),
+):
+    """Queue a management transfer to run in the background.
+
+    Unlike ``/management/execute`` this is not capped at ``MAX_TRACKS_PER_ACTION``; poll
+    ``GET /management/jobs/{job_id}`` for progress.
+    """
+    current_playlist = access.playlist
+    cleaned_values = _sanitize_selection_values(payload.selection_values)
+    _validate_transfer_payload(payload, cleaned_values)
+
+    client = access.owner_client(db)
+    source, destination, destination_is_created = await _resolve_transfer_endpoints(
+        db=db,
+        current_playlist=current_playlist,
+        current_user=current_user,
+        client=client,
+        payload=payload,
+    )
+
+    request = payload.model_copy(update={"selection_values": cleaned_values})
+    job = await votuna_management_job_crud.create_async(
+        db,
+        {
+            "playlist_id": current_playlist.id,
+            "requested_by_user_id": current_user.id,
+            "provider": current_playlist.provider,
+            "request": request.model_dump(mode="json"),
+            "source_provider_playlist_id": source.provider_playlist_id,
+            "source_title": source.title,
+            "destination_provider_playlist_id": None if destination_is_created else destination.provider_playlist_id,
+            "destination_title": destination.title,
+            "creates_destination": destination_is_created,
+            "available_at": datetime.now(timezone.utc),
+        },
+    )
+    notify_management_job_queued()
+    return _job_to_out(job)
+
+
+@router.get("/management/jobs/{job_id}", response_model=ManagementJobOut)
+async def get_management_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthPrincipal = Depends(get_current_principal_async),
+):
+    """Return the status and progress of a background management transfer."""
+    job = await votuna_management_job_crud.get_async(db, job_id)
+    if not job or job.requested_by_user_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Management job not found")
+    return _job_to_out(job)
@@ -1,16 +1,17 @@
 """Votuna member routes."""
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from app.auth.dependencies import get_current_user
 from app.db.session import get_db
-from app.models.user import User
+from app.db.unit_of_work import unit_of_work
 from app.models.votuna_suggestions import VotunaTrackSuggestion
 from app.schemas.votuna_member import VotunaPlaylistMemberOut
 from app.crud.votuna_playlist_member import votuna_playlist_member_crud
-from app.api.v1.routes.votuna.common import get_playlist_or_404, require_member, require_owner
+from app.crud.votuna_track_vote import votuna_track_vote_crud
+from app.api.v1.routes.votuna.common import PlaylistAccessContext, get_member_access, get_owner_access
+from app.utils.etag import conditional_response, weak_etag
 
 router = APIRouter()
 
@@ -18,11 +19,15 @@ router = APIRouter()
 @router.get("/playlists/{playlist_id}/members", response_model=list[VotunaPlaylistMemberOut])
 def list_votuna_members(
     playlist_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    access: PlaylistAccessContext = Depends(get_member_access),
 ):
     """List members for a Votuna playlist."""
-    require_member(db, playlist_id, current_user.id)
+    etag = weak_etag("members", playlist_id, access.playlist.version)
+    if (not_modified := conditional_response(request, response, etag)) is not None:
+        return not_modified
     suggestion_count_rows = (
         db.query(
             VotunaTrackSuggestion.suggested_by_user_id,
@@ -60,20 +65,19 @@ def list_votuna_members(
 
 @router.delete("/playlists/{playlist_id}/members/me", status_code=status.HTTP_204_NO_CONTENT)
 def leave_votuna_playlist(
-    playlist_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    access: PlaylistAccessContext = Depends(get_member_access),
 ):
     """Allow a collaborator to leave a playlist."""
-    playlist = get_playlist_or_404(db, playlist_id)
-    membership = require_member(db, playlist_id, current_user.id)
-    if playlist.owner_user_id == current_user.id:
+    membership = access.membership
+    if access.playlist.owner_user_id == membership.user_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Playlist owner cannot leave the playlist",
         )
-    db.delete(membership)
-    db.commit()
+    with unit_of_work(db):
+        votuna_track_vote_crud.clear_member_reactions(db, access.playlist.id, membership.user_id)
+        db.delete(membership)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
@@ -82,10 +86,10 @@ def remove_votuna_member(
     playlist_id: int,
     member_user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    access: PlaylistAccessContext = Depends(get_owner_access),
 ):
     """Allow a playlist owner to remove a collaborator."""
-    playlist = require_owner(db, playlist_id, current_user.id)
+    playlist = access.playlist
     if member_user_id == playlist.owner_user_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -96,6 +100,7 @@ def remove_votuna_member(
     if not membership:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Member not found")
 
-    db.delete(membership)
-    db.commit()
+    with unit_of_work(db):
+        votuna_track_vote_crud.clear_member_reactions(db, playlist_id, member_user_id)
+        db.delete(membership)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -3,28 +3,33 @@
 import random
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api.v1.routes.votuna.common import (
-    get_owner_client,
-    get_playlist_or_404,
+    PlaylistAccessContext,
+    get_member_access,
+    get_member_access_async,
+    get_owner_access,
+    get_owner_access_async,
     get_provider_client,
-    has_collaborators,
+    provider_api_http_error,
     raise_provider_auth,
-    require_member,
-    require_owner,
 )
-from app.auth.dependencies import get_current_user
+from app.auth.dependencies import get_current_principal, get_current_user
+from app.auth.principal_cache import AuthPrincipal
 from app.crud.votuna_playlist import votuna_playlist_crud
 from app.crud.votuna_playlist_member import votuna_playlist_member_crud
 from app.crud.votuna_playlist_settings import votuna_playlist_settings_crud
 from app.crud.votuna_track_addition import votuna_track_addition_crud
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
+from app.db.unit_of_work import unit_of_work_async
 from app.models.user import User
 from app.models.votuna_invites import VotunaPlaylistInvite
 from app.models.votuna_members import VotunaPlaylistMember
 from app.models.votuna_suggestions import VotunaTrackSuggestion
+from app.models.votuna_track_additions import VotunaTrackAddition
 from app.schemas.votuna_playlist import (
     ProviderTrackAddRequest,
     ProviderTrackOut,
@@ -38,6 +43,10 @@ from app.schemas.votuna_playlist_settings import (
     VotunaPlaylistSettingsUpdate,
 )
 from app.services.music_providers import ProviderAPIError, ProviderAuthError
+from app.services.playlist_events import publish_playlist_event
+from app.services.music_providers.track_cache import track_list_fingerprint
+from app.services.track_recommendations import schedule_recommendation_warm
+from app.utils.etag import conditional_response, weak_etag
 
 router = APIRouter()
 
@@ -57,10 +66,16 @@ def _to_votuna_playlist_out(playlist, owner_profile_url: str | None = None) -> V
 
 @router.get("/playlists", response_model=list[VotunaPlaylistOut])
 def list_votuna_playlists(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """List Votuna playlists for the current user."""
+    versions = votuna_playlist_crud.list_versions_for_user(db, current_user.id)
+    etag = weak_etag("playlists", current_user.id, *(f"{row.id}:{row.version}" for row in versions))
+    if (not_modified := conditional_response(request, response, etag)) is not None:
+        return not_modified
     playlists = list(votuna_playlist_crud.list_for_user(db, current_user.id))
     owner_ids = {playlist.owner_user_id for playlist in playlists}
     owner_profile_by_id: dict[int, str | None] = {}
@@ -79,7 +94,7 @@ def list_votuna_playlists(
 @router.post("/playlists", response_model=VotunaPlaylistDetail)
 async def create_votuna_playlist(
     payload: VotunaPlaylistCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Create or enable a Votuna playlist."""
@@ -92,7 +107,11 @@ async def create_votuna_playlist(
     client = get_provider_client(payload.provider, current_user, db=db)
 
     if payload.provider_playlist_id:
-        existing = votuna_playlist_crud.get_by_provider_playlist_id(db, payload.provider, payload.provider_playlist_id)
+        existing = await db.run_sync(
+            votuna_playlist_crud.get_by_provider_playlist_id,
+            payload.provider,
+            payload.provider_playlist_id,
+        )
         if existing:
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Playlist already enabled")
         try:
@@ -100,7 +119,7 @@ async def create_votuna_playlist(
         except ProviderAuthError:
             raise_provider_auth(current_user, provider=payload.provider)
         except ProviderAPIError as exc:
-            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
+            raise provider_api_http_error(exc) from exc
     else:
         try:
             provider_playlist = await client.create_playlist(
@@ -111,40 +130,41 @@ async def create_votuna_playlist(
         except ProviderAuthError:
             raise_provider_auth(current_user, provider=payload.provider)
         except ProviderAPIError as exc:
-            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
-
-    playlist = votuna_playlist_crud.create(
-        db,
-        {
-            "owner_user_id": current_user.id,
-            "provider": provider_playlist.provider,
-            "provider_playlist_id": provider_playlist.provider_playlist_id,
-            "title": provider_playlist.title,
-            "description": provider_playlist.description,
-            "image_url": provider_playlist.image_url,
-            "is_active": True,
-            "last_synced_at": datetime.now(timezone.utc),
-        },
-    )
+            raise provider_api_http_error(exc) from exc
+
+    async with unit_of_work_async(db):
+        playlist = await votuna_playlist_crud.create_async(
+            db,
+            {
+                "owner_user_id": current_user.id,
+                "provider": provider_playlist.provider,
+                "provider_playlist_id": provider_playlist.provider_playlist_id,
+                "title": provider_playlist.title,
+                "description": provider_playlist.description,
+                "image_url": provider_playlist.image_url,
+                "is_active": True,
+                "last_synced_at": datetime.now(timezone.utc),
+            },
+        )
 
-    settings = votuna_playlist_settings_crud.create(
-        db,
-        {
-            "playlist_id": playlist.id,
-            "required_vote_percent": 60,
-            "tie_break_mode": "add",
-        },
-    )
+        settings = await votuna_playlist_settings_crud.create_async(
+            db,
+            {
+                "playlist_id": playlist.id,
+                "required_vote_percent": 60,
+                "tie_break_mode": "add",
+            },
+        )
 
-    votuna_playlist_member_crud.create(
-        db,
-        {
-            "playlist_id": playlist.id,
-            "user_id": current_user.id,
-            "role": "owner",
-            "joined_at": datetime.now(timezone.utc),
-        },
-    )
+        await votuna_playlist_member_crud.create_async(
+            db,
+            {
+                "playlist_id": playlist.id,
+                "user_id": current_user.id,
+                "role": "owner",
+                "joined_at": datetime.now(timezone.utc),
+            },
+        )
 
     return VotunaPlaylistDetail(
         **_to_votuna_playlist_out(playlist, owner_profile_url=current_user.permalink_url).model_dump(),
@@ -153,32 +173,26 @@ async def create_votuna_playlist(
 
 
 @router.get("/playlists/{playlist_id}", response_model=VotunaPlaylistDetail)
-def get_votuna_playlist(
-    playlist_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
+def get_votuna_playlist(access: PlaylistAccessContext = Depends(get_member_access)):
     """Fetch a Votuna playlist by id."""
-    playlist = get_playlist_or_404(db, playlist_id)
-    require_member(db, playlist_id, current_user.id)
-    settings = votuna_playlist_settings_crud.get_by_playlist_id(db, playlist_id)
-    owner = db.query(User).filter(User.id == playlist.owner_user_id).first()
+    owner = access.owner
     return VotunaPlaylistDetail(
-        **_to_votuna_playlist_out(playlist, owner_profile_url=owner.permalink_url if owner else None).model_dump(),
-        settings=VotunaPlaylistSettingsOut.model_validate(settings) if settings else None,
+        **_to_votuna_playlist_out(
+            access.playlist,
+            owner_profile_url=owner.permalink_url if owner else None,
+        ).model_dump(),
+        settings=VotunaPlaylistSettingsOut.model_validate(access.settings) if access.settings else None,
     )
 
 
 @router.patch("/playlists/{playlist_id}/settings", response_model=VotunaPlaylistSettingsOut)
 def update_votuna_settings(
-    playlist_id: int,
     payload: VotunaPlaylistSettingsUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    access: PlaylistAccessContext = Depends(get_owner_access),
 ):
     """Update settings for a Votuna playlist."""
-    playlist = require_owner(db, playlist_id, current_user.id)
-    if not has_collaborators(db, playlist):
+    if not access.has_collaborators:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail={
@@ -186,30 +200,28 @@ def update_votuna_settings(
                 "message": "Voting settings are disabled for personal playlists",
             },
         )
-    settings = votuna_playlist_settings_crud.get_by_playlist_id(db, playlist_id)
-    if not settings:
+    if not access.settings:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Settings not found")
-    updated = votuna_playlist_settings_crud.update(db, settings, payload.model_dump(exclude_unset=True))
+    updated = votuna_playlist_settings_crud.update(db, access.settings, payload.model_dump(exclude_unset=True))
     return updated
 
 
 @router.post("/playlists/{playlist_id}/sync", response_model=VotunaPlaylistOut)
 async def sync_votuna_playlist(
-    playlist_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    access: PlaylistAccessContext = Depends(get_member_access_async),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
     """Sync playlist metadata from the provider."""
-    playlist = get_playlist_or_404(db, playlist_id)
-    require_member(db, playlist_id, current_user.id)
-    client = get_owner_client(db, playlist)
+    playlist = access.playlist
+    client = access.owner_client(db)
     try:
         provider_playlist = await client.get_playlist(playlist.provider_playlist_id)
     except ProviderAuthError:
         raise_provider_auth(current_user, owner_id=playlist.owner_user_id, provider=playlist.provider)
     except ProviderAPIError as exc:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
-    updated = votuna_playlist_crud.update(
+        raise provider_api_http_error(exc) from exc
+    updated = await votuna_playlist_crud.update_async(
         db,
         playlist,
         {
@@ -219,20 +231,21 @@ async def sync_votuna_playlist(
             "last_synced_at": datetime.now(timezone.utc),
         },
     )
-    owner = db.query(User).filter(User.id == updated.owner_user_id).first()
+    owner = access.owner
     return _to_votuna_playlist_out(updated, owner_profile_url=owner.permalink_url if owner else None)
 
 
 @router.post("/playlists/{playlist_id}/tracks", response_model=ProviderTrackOut)
 async def add_votuna_track(
-    playlist_id: int,
     payload: ProviderTrackAddRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    access: PlaylistAccessContext = Depends(get_owner_access_async),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
     """Add a track directly to a personal playlist (owner only)."""
-    playlist = require_owner(db, playlist_id, current_user.id)
-    if has_collaborators(db, playlist):
+    playlist = access.playlist
+    if access.has_collaborators:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail={
@@ -241,7 +254,7 @@ async def add_votuna_track(
             },
         )
 
-    client = get_owner_client(db, playlist)
+    client = access.owner_client(db)
     provider_track_id = (payload.provider_track_id or "").strip()
     track_title = payload.track_title
     track_artist = payload.track_artist
@@ -262,7 +275,7 @@ async def add_votuna_track(
         except ProviderAPIError as exc:
             if exc.status_code in {400, 404}:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
-            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
+            raise provider_api_http_error(exc) from exc
 
         provider_track_id = resolved_track.provider_track_id
         track_title = track_title or resolved_track.title
@@ -289,10 +302,10 @@ async def add_votuna_track(
     except ProviderAuthError:
         raise_provider_auth(current_user, owner_id=playlist.owner_user_id, provider=playlist.provider)
     except ProviderAPIError as exc:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
+        raise provider_api_http_error(exc) from exc
 
     now = datetime.now(timezone.utc)
-    votuna_track_addition_crud.create(
+    await votuna_track_addition_crud.create_async(
         db,
         {
             "playlist_id": playlist.id,
@@ -303,6 +316,28 @@ async def add_votuna_track(
             "suggestion_id": None,
         },
     )
+    publish_playlist_event(
+        playlist.id,
+        "track.added",
+        {
+            "provider_track_id": provider_track_id,
+            "title": track_title or provider_track_id,
+            "artist": track_artist,
+            "artwork_url": track_artwork_url,
+            "url": track_url,
+            "added_at": now.isoformat(),
+            "added_source": "personal_add",
+            "added_by_user_id": current_user.id,
+            "suggestion_id": None,
+        },
+    )
+    schedule_recommendation_warm(
+        background_tasks,
+        client,
+        provider=playlist.provider,
+        playlist_id=playlist.id,
+        provider_playlist_id=playlist.provider_playlist_id,
+    )
 
     return ProviderTrackOut(
         provider_track_id=provider_track_id,
@@ -322,10 +357,11 @@ async def add_votuna_track(
 def personalize_playlist(
     playlist_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    access: PlaylistAccessContext = Depends(get_owner_access),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
     """Convert a collaborative playlist back to personal mode."""
-    playlist = require_owner(db, playlist_id, current_user.id)
+    playlist = access.playlist
     now = datetime.now(timezone.utc)
 
     collaborator_rows = (
@@ -378,24 +414,18 @@ def personalize_playlist(
     )
 
 
-@router.get("/playlists/{playlist_id}/tracks", response_model=list[ProviderTrackOut])
-async def list_votuna_tracks(
+def _load_track_provenance(
+    db: Session,
     playlist_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    """List provider tracks for the playlist."""
-    playlist = get_playlist_or_404(db, playlist_id)
-    require_member(db, playlist_id, current_user.id)
-    client = get_owner_client(db, playlist)
-    try:
-        tracks = await client.list_tracks(playlist.provider_playlist_id)
-    except ProviderAuthError:
-        raise_provider_auth(current_user, owner_id=playlist.owner_user_id, provider=playlist.provider)
-    except ProviderAPIError as exc:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
-
-    track_ids = [track.provider_track_id for track in tracks if track.provider_track_id]
+    track_ids: list[str],
+    current_user_id: int,
+) -> tuple[
+    dict[str, VotunaTrackAddition],
+    dict[str, tuple[int | None, str | None, datetime | None]],
+    dict[int, VotunaTrackSuggestion],
+    dict[int, User],
+]:
+    """Load addition, suggestion and user rows used to label playlist tracks."""
     latest_additions_by_track = votuna_track_addition_crud.list_latest_for_tracks(
         db,
         playlist_id,
@@ -420,7 +450,7 @@ async def list_votuna_tracks(
                 continue
             suggested_by_name = (
                 "You"
-                if suggestion.suggested_by_user_id == current_user.id
+                if suggestion.suggested_by_user_id == current_user_id
                 else (_display_name(suggested_by_user) if suggested_by_user else None)
             )
             suggestion_lookup[suggestion.provider_track_id] = (
@@ -451,6 +481,52 @@ async def list_votuna_tracks(
     if user_ids:
         user_rows = db.query(User).filter(User.id.in_(list(user_ids))).all()
         users_by_id = {user.id: user for user in user_rows}
+    return latest_additions_by_track, suggestion_lookup, suggestions_by_id, users_by_id
+
+
+@router.get("/playlists/{playlist_id}/tracks", response_model=list[ProviderTrackOut])
+async def list_votuna_tracks(
+    playlist_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    access: PlaylistAccessContext = Depends(get_member_access_async),
+    current_user: AuthPrincipal = Depends(get_current_principal),
+):
+    """List provider tracks for the playlist.
+
+    The weak ``ETag`` covers the provider track list as well as Votuna provenance. While the
+    track cache is fresh a matching ``If-None-Match`` gets a 304 without calling the provider;
+    otherwise the list is fetched (or revalidated) first.
+    """
+    playlist = access.playlist
+    client = access.owner_client(db)
+
+    def _tracks_etag(fingerprint: str) -> str:
+        return weak_etag("tracks", playlist.id, playlist.version, current_user.id, fingerprint)
+
+    fingerprint = client.cached_tracks_fingerprint(playlist.provider_playlist_id)
+    if fingerprint is not None:
+        if (not_modified := conditional_response(request, response, _tracks_etag(fingerprint))) is not None:
+            return not_modified
+    try:
+        tracks = await client.list_tracks(playlist.provider_playlist_id)
+    except ProviderAuthError:
+        raise_provider_auth(current_user, owner_id=playlist.owner_user_id, provider=playlist.provider)
+    except ProviderAPIError as exc:
+        raise provider_api_http_error(exc) from exc
+    if fingerprint is None:
+        etag = _tracks_etag(track_list_fingerprint(tracks))
+        if (not_modified := conditional_response(request, response, etag)) is not None:
+            return not_modified
+
+    track_ids = [track.provider_track_id for track in tracks if track.provider_track_id]
+    latest_additions_by_track, suggestion_lookup, suggestions_by_id, users_by_id = await db.run_sync(
+        _load_track_provenance,
+        playlist_id,
+        track_ids,
+        current_user.id,
+    )
 
     payload: list[ProviderTrackOut] = []
     for track in tracks:
@@ -538,14 +614,15 @@ async def list_votuna_tracks(
 
 @router.delete("/playlists/{playlist_id}/tracks/{provider_track_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def remove_votuna_track(
-    playlist_id: int,
     provider_track_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    access: PlaylistAccessContext = Depends(get_owner_access_async),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
     """Remove a track from the provider playlist (owner only)."""
-    playlist = require_owner(db, playlist_id, current_user.id)
-    client = get_owner_client(db, playlist)
+    playlist = access.playlist
+    client = access.owner_client(db)
     track_id = provider_track_id.strip()
     if not track_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Track id is required")
@@ -554,52 +631,64 @@ async def remove_votuna_track(
     except ProviderAuthError:
         raise_provider_auth(current_user, owner_id=playlist.owner_user_id, provider=playlist.provider)
     except ProviderAPIError as exc:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
+        raise provider_api_http_error(exc) from exc
+    publish_playlist_event(playlist.id, "track.removed", {"provider_track_id": track_id})
+    schedule_recommendation_warm(
+        background_tasks,
+        client,
+        provider=playlist.provider,
+        playlist_id=playlist.id,
+        provider_playlist_id=playlist.provider_playlist_id,
+    )
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @router.post("/playlists/{playlist_id}/shuffle", response_model=dict[str, str])
 async def shuffle_votuna_playlist(
-    playlist_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    access: PlaylistAccessContext = Depends(get_owner_access_async),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
     """Shuffle all tracks in a playlist (owner only)."""
-    playlist = require_owner(db, playlist_id, current_user.id)
-    client = get_owner_client(db, playlist)
-    
+    playlist = access.playlist
+    client = access.owner_client(db)
+
     try:
         # Get all current tracks in the playlist
         tracks = await client.list_tracks(playlist.provider_playlist_id)
     except ProviderAuthError:
         raise_provider_auth(current_user, owner_id=playlist.owner_user_id, provider=playlist.provider)
     except ProviderAPIError as exc:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
-    
+        raise provider_api_http_error(exc) from exc
+
     if not tracks:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Playlist has no tracks to shuffle",
         )
-    
+
     # Extract track IDs and shuffle them
     track_ids = [track.provider_track_id for track in tracks]
     shuffled_track_ids = track_ids.copy()
     random.shuffle(shuffled_track_ids)
-    
+
     try:
-        # Remove all tracks from the playlist
-        await client.remove_tracks(playlist.provider_playlist_id, track_ids)
-        
-        # Re-add tracks in shuffled order
-        # Spotify has a limit of 100 tracks per add request, so we need to batch them
-        batch_size = 100
-        for i in range(0, len(shuffled_track_ids), batch_size):
-            batch = shuffled_track_ids[i:i + batch_size]
-            await client.add_tracks(playlist.provider_playlist_id, batch)
+        # Reorder in place so the live playlist is never emptied or truncated.
+        await client.reorder_tracks(playlist.provider_playlist_id, shuffled_track_ids)
     except ProviderAuthError:
         raise_provider_auth(current_user, owner_id=playlist.owner_user_id, provider=playlist.provider)
     except ProviderAPIError as exc:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
-    
+        raise provider_api_http_error(exc) from exc
+
+    # The new order is left out: it can outgrow a NOTIFY payload, and members refetch anyway.
+    publish_playlist_event(playlist.id, "track.reordered", {"track_count": len(shuffled_track_ids)})
+    # Shuffling reorders the default recommendation seeds.
+    schedule_recommendation_warm(
+        background_tasks,
+        client,
+        provider=playlist.provider,
+        playlist_id=playlist.id,
+        provider_playlist_id=playlist.provider_playlist_id,
+    )
     return {"message": f"Successfully shuffled {len(shuffled_track_ids)} tracks in the playlist"}
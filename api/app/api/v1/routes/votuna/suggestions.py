@@ -1,29 +1,33 @@
 """Votuna suggestion routes."""
 
-import hashlib
+from collections.abc import Sequence
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api.v1.routes.votuna.common import (
-    get_owner_client,
-    get_playlist_or_404,
-    has_collaborators,
+    PlaylistAccessContext,
+    get_member_access,
+    get_member_access_async,
+    load_playlist_access,
+    load_playlist_access_async,
+    provider_api_http_error,
     raise_provider_auth,
-    require_member,
-    require_owner,
 )
-from app.auth.dependencies import get_current_user
+from app.auth.dependencies import get_current_principal
+from app.auth.principal_cache import AuthPrincipal
+from app.config.settings import settings
 from app.crud.votuna_playlist_member import votuna_playlist_member_crud
-from app.crud.votuna_playlist_settings import votuna_playlist_settings_crud
 from app.crud.votuna_track_addition import votuna_track_addition_crud
 from app.crud.votuna_track_recommendation_decline import (
     votuna_track_recommendation_decline_crud,
 )
 from app.crud.votuna_track_suggestion import votuna_track_suggestion_crud
 from app.crud.votuna_track_vote import votuna_track_vote_crud
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
+from app.db.unit_of_work import unit_of_work_async
 from app.models.user import User
 from app.models.votuna_playlist import VotunaPlaylist
 from app.models.votuna_suggestions import VotunaTrackSuggestion
@@ -36,14 +40,31 @@ from app.schemas.votuna_suggestion import (
 )
 from app.services.music_providers import ProviderAPIError, ProviderAuthError
 from app.services.music_providers.base import ProviderTrack
+from app.services.playlist_events import publish_playlist_event
+from app.services.track_cooccurrence import track_cooccurrence_index
+from app.services.track_recommendations import (
+    get_ranked_recommendations,
+    schedule_recommendation_warm,
+    select_recommendations,
+)
+from app.utils.etag import conditional_response, weak_etag
+from app.utils.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
 
 router = APIRouter()
 
 REJECTED_TRACK_ERROR_CODE = "TRACK_PREVIOUSLY_REJECTED"
 PERSONAL_SUGGESTIONS_ERROR_CODE = "PERSONAL_PLAYLIST_SUGGESTIONS_DISABLED"
-RECOMMENDATION_SEED_LIMIT = 8
-RECOMMENDATION_RELATED_LIMIT_PER_SEED = 25
-RECOMMENDATION_MAX_TRACKS_PER_ARTIST = 2
+SUGGESTIONS_PAGE_DEFAULT_LIMIT = 100
+SUGGESTIONS_PAGE_MAX_LIMIT = 200
+# Fields that depend on who is looking, or that can grow with the member list, stay out of live events.
+_SUGGESTION_EVENT_EXCLUDE = {
+    "my_reaction",
+    "can_cancel",
+    "can_force_add",
+    "upvoter_display_names",
+    "downvoter_display_names",
+    "collaborators_left_to_vote_names",
+}
 
 
 def _display_name(user: User) -> str:
@@ -65,32 +86,6 @@ def _raise_resuggest_conflict() -> None:
     )
 
 
-def _ordered_seed_track_ids(
-    current_tracks: list[ProviderTrack],
-    refresh_nonce: str | None,
-) -> list[str]:
-    track_ids: list[str] = []
-    seen: set[str] = set()
-    for track in current_tracks:
-        track_id = (track.provider_track_id or "").strip()
-        if not track_id or track_id in seen:
-            continue
-        seen.add(track_id)
-        track_ids.append(track_id)
-    if not track_ids:
-        return []
-    if not refresh_nonce:
-        return track_ids[:RECOMMENDATION_SEED_LIMIT]
-    nonce = refresh_nonce.strip()
-    if not nonce:
-        return track_ids[:RECOMMENDATION_SEED_LIMIT]
-    ranked = sorted(
-        track_ids,
-        key=lambda track_id: hashlib.sha256(f"{nonce}:{track_id}".encode("utf-8")).hexdigest(),
-    )
-    return ranked[:RECOMMENDATION_SEED_LIMIT]
-
-
 def _serialize_provider_track(track: ProviderTrack) -> ProviderTrackOut:
     return ProviderTrackOut(
         provider_track_id=track.provider_track_id,
@@ -102,14 +97,14 @@ def _serialize_provider_track(track: ProviderTrack) -> ProviderTrackOut:
     )
 
 
-def _serialize_suggestion(
-    db: Session,
+def _build_suggestion_out(
     playlist: VotunaPlaylist,
     suggestion: VotunaTrackSuggestion,
     current_user_id: int,
+    *,
+    reaction_by_user: dict[int, str],
+    member_names: dict[int, str],
 ) -> VotunaTrackSuggestionOut:
-    reaction_by_user = votuna_track_vote_crud.get_reaction_by_user(db, suggestion.id)
-    member_names = _member_name_by_user_id(db, suggestion.playlist_id)
     filtered_reactions = {
         user_id: reaction for user_id, reaction in reaction_by_user.items() if user_id in member_names
     }
@@ -152,6 +147,51 @@ def _serialize_suggestion(
     )
 
 
+def _serialize_suggestions(
+    db: Session,
+    playlist: VotunaPlaylist,
+    suggestions: Sequence[VotunaTrackSuggestion],
+    current_user_id: int,
+) -> list[VotunaTrackSuggestionOut]:
+    """Serialize a page of suggestions with one vote query and one member query."""
+    if not suggestions:
+        return []
+    member_names = _member_name_by_user_id(db, playlist.id)
+    reactions_by_suggestion = votuna_track_vote_crud.get_reactions_by_suggestion(
+        db,
+        [suggestion.id for suggestion in suggestions],
+    )
+    return [
+        _build_suggestion_out(
+            playlist,
+            suggestion,
+            current_user_id,
+            reaction_by_user=reactions_by_suggestion.get(suggestion.id, {}),
+            member_names=member_names,
+        )
+        for suggestion in suggestions
+    ]
+
+
+def _publish_suggestion_event(suggestion_out: VotunaTrackSuggestionOut, *, created: bool = False) -> None:
+    data = suggestion_out.model_dump(mode="json", exclude=_SUGGESTION_EVENT_EXCLUDE)
+    if created:
+        publish_playlist_event(suggestion_out.playlist_id, "suggestion.created", data)
+    if suggestion_out.status != "pending":
+        publish_playlist_event(suggestion_out.playlist_id, "suggestion.resolved", data)
+    elif not created:
+        publish_playlist_event(suggestion_out.playlist_id, "suggestion.voted", data)
+
+
+def _serialize_suggestion(
+    db: Session,
+    playlist: VotunaPlaylist,
+    suggestion: VotunaTrackSuggestion,
+    current_user_id: int,
+) -> VotunaTrackSuggestionOut:
+    return _serialize_suggestions(db, playlist, [suggestion], current_user_id)[0]
+
+
 def _resolve_without_add(
     db: Session,
     suggestion: VotunaTrackSuggestion,
@@ -174,17 +214,19 @@ def _resolve_without_add(
 
 
 async def _accept_suggestion(
-    db: Session,
-    playlist: VotunaPlaylist,
+    db: AsyncSession,
+    access: PlaylistAccessContext,
     suggestion: VotunaTrackSuggestion,
     *,
     resolution_reason: str,
     resolved_by_user_id: int,
+    background_tasks: BackgroundTasks,
 ) -> VotunaTrackSuggestion:
     now = datetime.now(timezone.utc)
-    client = get_owner_client(db, playlist)
+    playlist = access.playlist
+    client = access.owner_client(db)
     await client.add_tracks(playlist.provider_playlist_id, [suggestion.provider_track_id])
-    accepted = votuna_track_suggestion_crud.update(
+    accepted = await votuna_track_suggestion_crud.update_async(
         db,
         suggestion,
         {
@@ -194,7 +236,7 @@ async def _accept_suggestion(
             "resolution_reason": resolution_reason,
         },
     )
-    votuna_track_addition_crud.create(
+    await votuna_track_addition_crud.create_async(
         db,
         {
             "playlist_id": playlist.id,
@@ -205,66 +247,81 @@ async def _accept_suggestion(
             "suggestion_id": suggestion.id,
         },
     )
+    publish_playlist_event(
+        playlist.id,
+        "track.added",
+        {
+            "provider_track_id": suggestion.provider_track_id,
+            "title": suggestion.track_title,
+            "artist": suggestion.track_artist,
+            "artwork_url": suggestion.track_artwork_url,
+            "url": suggestion.track_url,
+            "added_at": now.isoformat(),
+            "added_source": "suggestion",
+            "added_by_user_id": resolved_by_user_id,
+            "suggestion_id": suggestion.id,
+        },
+    )
+    schedule_recommendation_warm(
+        background_tasks,
+        client,
+        provider=playlist.provider,
+        playlist_id=playlist.id,
+        provider_playlist_id=playlist.provider_playlist_id,
+    )
     return accepted
 
 
-async def _resolve_if_all_collaborators_voted(
+def _voting_outcome(
     db: Session,
-    playlist: VotunaPlaylist,
+    access: PlaylistAccessContext,
+    suggestion: VotunaTrackSuggestion,
+) -> str | None:
+    """Return the resolution reason once every member has voted, otherwise None."""
+    settings = access.settings
+    if not settings or not access.member_count:
+        return None
+
+    tally = votuna_track_suggestion_crud.refresh_tally(db, suggestion)
+    if tally.voter_count < access.member_count:
+        return None
+
+    if tally.upvote_count == tally.downvote_count:
+        return "tie_add" if settings.tie_break_mode == "add" else "tie_reject"
+
+    upvote_percent = (tally.upvote_count / access.member_count) * 100
+    if upvote_percent >= settings.required_vote_percent:
+        return "threshold_met"
+    return "threshold_not_met"
+
+
+async def _resolve_if_all_collaborators_voted(
+    db: AsyncSession,
+    access: PlaylistAccessContext,
     suggestion: VotunaTrackSuggestion,
     *,
     actor_user_id: int,
+    background_tasks: BackgroundTasks,
 ) -> VotunaTrackSuggestion:
     if suggestion.status != "pending":
         return suggestion
-    settings = votuna_playlist_settings_crud.get_by_playlist_id(db, playlist.id)
-    if not settings:
-        return suggestion
-
-    member_rows = votuna_playlist_member_crud.list_members(db, playlist.id)
-    eligible_voter_ids = [member.user_id for member, _user in member_rows]
-    if not eligible_voter_ids:
+    resolution_reason = await db.run_sync(_voting_outcome, access, suggestion)
+    if resolution_reason is None:
         return suggestion
-
-    reactions_by_user = votuna_track_vote_crud.get_reaction_by_user(db, suggestion.id)
-    has_all_votes = all(user_id in reactions_by_user for user_id in eligible_voter_ids)
-    if not has_all_votes:
-        return suggestion
-
-    upvotes = sum(1 for user_id in eligible_voter_ids if reactions_by_user.get(user_id) == "up")
-    downvotes = sum(1 for user_id in eligible_voter_ids if reactions_by_user.get(user_id) == "down")
-
-    if upvotes == downvotes:
-        if settings.tie_break_mode == "add":
-            return await _accept_suggestion(
-                db,
-                playlist,
-                suggestion,
-                resolution_reason="tie_add",
-                resolved_by_user_id=actor_user_id,
-            )
-        return _resolve_without_add(
-            db,
-            suggestion,
-            status_value="rejected",
-            resolution_reason="tie_reject",
-            resolved_by_user_id=actor_user_id,
-        )
-
-    upvote_percent = (upvotes / len(eligible_voter_ids)) * 100
-    if upvote_percent >= settings.required_vote_percent:
+    if resolution_reason in {"tie_add", "threshold_met"}:
         return await _accept_suggestion(
             db,
-            playlist,
+            access,
             suggestion,
-            resolution_reason="threshold_met",
+            resolution_reason=resolution_reason,
             resolved_by_user_id=actor_user_id,
+            background_tasks=background_tasks,
         )
-    return _resolve_without_add(
-        db,
+    return await db.run_sync(
+        _resolve_without_add,
         suggestion,
         status_value="rejected",
-        resolution_reason="threshold_not_met",
+        resolution_reason=resolution_reason,
         resolved_by_user_id=actor_user_id,
     )
 
@@ -272,15 +329,48 @@ async def _resolve_if_all_collaborators_voted(
 @router.get("/playlists/{playlist_id}/suggestions", response_model=list[VotunaTrackSuggestionOut])
 def list_suggestions(
     playlist_id: int,
+    request: Request,
+    response: Response,
     status: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = Query(None, ge=1, le=SUGGESTIONS_PAGE_MAX_LIMIT),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    access: PlaylistAccessContext = Depends(get_member_access),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
-    """List suggestions for a playlist."""
-    playlist = get_playlist_or_404(db, playlist_id)
-    require_member(db, playlist_id, current_user.id)
-    suggestions = votuna_track_suggestion_crud.list_for_playlist(db, playlist_id, status)
-    return [_serialize_suggestion(db, playlist, suggestion, current_user.id) for suggestion in suggestions]
+    """List suggestions for a playlist, newest first.
+
+    Pagination is opt-in: without ``limit`` or ``cursor`` every suggestion is returned.
+    When a page is requested and more suggestions remain, the cursor for the next page
+    is returned in the ``X-Next-Cursor`` response header. Responses carry a weak ``ETag``; a matching
+    ``If-None-Match`` gets a 304 before any suggestion is loaded.
+    """
+    playlist = access.playlist
+    etag = weak_etag("suggestions", playlist.id, playlist.version, current_user.id, status, cursor, limit)
+    if (not_modified := conditional_response(request, response, etag)) is not None:
+        return not_modified
+    after_id = None
+    if cursor:
+        try:
+            after_id = decode_cursor(cursor)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+        # A deleted anchor would match no rows and read as the end of the list.
+        anchor = votuna_track_suggestion_crud.get(db, after_id)
+        if anchor is None or anchor.playlist_id != playlist_id:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    page_size = limit if limit is not None or cursor is None else SUGGESTIONS_PAGE_DEFAULT_LIMIT
+    suggestions = votuna_track_suggestion_crud.list_page_for_playlist(
+        db,
+        playlist_id,
+        status,
+        limit=None if page_size is None else page_size + 1,
+        after_id=after_id,
+    )
+    if page_size is not None and len(suggestions) > page_size:
+        suggestions = suggestions[:page_size]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(suggestions[-1].id)
+    return _serialize_suggestions(db, playlist, suggestions, current_user.id)
 
 
 @router.get("/playlists/{playlist_id}/tracks/search", response_model=list[ProviderTrackOut])
@@ -288,13 +378,13 @@ async def search_tracks_for_suggestions(
     playlist_id: int,
     q: str = Query(..., min_length=1),
     limit: int = Query(10, ge=1, le=25),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    access: PlaylistAccessContext = Depends(get_member_access_async),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
     """Search provider tracks to suggest for voting."""
-    playlist = get_playlist_or_404(db, playlist_id)
-    require_member(db, playlist_id, current_user.id)
-    client = get_owner_client(db, playlist)
+    playlist = access.playlist
+    client = access.owner_client(db)
     query = q.strip()
     if not query:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Search query is required")
@@ -303,7 +393,7 @@ async def search_tracks_for_suggestions(
     except ProviderAuthError:
         raise_provider_auth(current_user, owner_id=playlist.owner_user_id, provider=playlist.provider)
     except ProviderAPIError as exc:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
+        raise provider_api_http_error(exc) from exc
     return [
         ProviderTrackOut(
             provider_track_id=track.provider_track_id,
@@ -323,110 +413,56 @@ async def list_recommended_tracks(
     limit: int = Query(5, ge=1, le=50),
     offset: int = Query(0, ge=0),
     refresh_nonce: str | None = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    access: PlaylistAccessContext = Depends(get_member_access_async),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
     """List personalized track recommendations based on current playlist tracks."""
-    playlist = get_playlist_or_404(db, playlist_id)
-    require_member(db, playlist_id, current_user.id)
-    if playlist.provider == "spotify":
-        # Spotify recommendations endpoint is deprecated. Keep this stable until phase 2.
-        return []
-    client = get_owner_client(db, playlist)
+    playlist = access.playlist
+    client = access.owner_client(db)
+    # The background refresher does the bulk of the work; a request only tops up a few rows and
+    # skips even that while another refresh is running.
+    await db.run_sync(
+        track_cooccurrence_index.refresh,
+        max_rows=settings.TRACK_COOCCURRENCE_REQUEST_ROW_BUDGET,
+        blocking=False,
+    )
     try:
-        current_tracks = list(await client.list_tracks(playlist.provider_playlist_id))
+        candidates = await get_ranked_recommendations(
+            client,
+            playlist.id,
+            playlist.provider_playlist_id,
+            refresh_nonce,
+            provider=playlist.provider,
+        )
     except ProviderAuthError:
         raise_provider_auth(current_user, owner_id=playlist.owner_user_id, provider=playlist.provider)
     except ProviderAPIError as exc:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
-
-    if not current_tracks:
-        return []
+        raise provider_api_http_error(exc) from exc
 
-    seed_track_ids = _ordered_seed_track_ids(current_tracks, refresh_nonce)
-    if not seed_track_ids:
+    if not candidates:
         return []
 
-    existing_track_ids = {
-        (track.provider_track_id or "").strip() for track in current_tracks if (track.provider_track_id or "").strip()
-    }
+    # Pending suggestions and declines change independently of the cached ranking, so filter at read time.
     pending_track_ids = {
         suggestion.provider_track_id
-        for suggestion in votuna_track_suggestion_crud.list_for_playlist(
-            db,
+        for suggestion in await db.run_sync(
+            votuna_track_suggestion_crud.list_for_playlist,
             playlist_id,
             status="pending",
         )
     }
-    declined_track_ids = votuna_track_recommendation_decline_crud.list_declined_track_ids(
-        db,
+    declined_track_ids = await db.run_sync(
+        votuna_track_recommendation_decline_crud.list_declined_track_ids,
         playlist_id=playlist_id,
         user_id=current_user.id,
     )
-
-    score_by_track_id: dict[str, tuple[int, int, ProviderTrack]] = {}
-    for seed_index, seed_track_id in enumerate(seed_track_ids):
-        try:
-            related_tracks = await client.related_tracks(
-                seed_track_id,
-                limit=RECOMMENDATION_RELATED_LIMIT_PER_SEED,
-                offset=0,
-            )
-        except ProviderAuthError:
-            raise_provider_auth(current_user, owner_id=playlist.owner_user_id, provider=playlist.provider)
-        except ProviderAPIError as exc:
-            if exc.status_code in {400, 404}:
-                continue
-            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
-
-        for track in related_tracks:
-            track_id = (track.provider_track_id or "").strip()
-            if not track_id:
-                continue
-            existing_entry = score_by_track_id.get(track_id)
-            if not existing_entry:
-                score_by_track_id[track_id] = (1, seed_index, track)
-                continue
-            score, first_seed_index, existing_track = existing_entry
-            next_first_seed_index = min(seed_index, first_seed_index)
-            score_by_track_id[track_id] = (score + 1, next_first_seed_index, existing_track)
-
-    if not score_by_track_id:
-        return []
-
-    ranked_entries = sorted(
-        score_by_track_id.items(),
-        key=lambda entry: (
-            -entry[1][0],
-            entry[1][1],
-            entry[0],
-        ),
+    page = select_recommendations(
+        candidates,
+        excluded_track_ids=pending_track_ids | declined_track_ids,
+        limit=limit,
+        offset=offset,
     )
-
-    filtered_tracks: list[ProviderTrack] = []
-    artist_counts: dict[str, int] = {}
-    for _track_id, (_score, _first_seed_index, track) in ranked_entries:
-        track_id = (track.provider_track_id or "").strip()
-        if not track_id:
-            continue
-        if track_id in existing_track_ids:
-            continue
-        if track_id in pending_track_ids:
-            continue
-        if track_id in declined_track_ids:
-            continue
-        artist_key = (track.artist or "").strip().lower()
-        if artist_key:
-            current_count = artist_counts.get(artist_key, 0)
-            if current_count >= RECOMMENDATION_MAX_TRACKS_PER_ARTIST:
-                continue
-            artist_counts[artist_key] = current_count + 1
-        filtered_tracks.append(track)
-
-    if not filtered_tracks:
-        return []
-
-    page = filtered_tracks[offset : offset + limit]
     return [_serialize_provider_track(track) for track in page]
 
 
@@ -435,14 +471,13 @@ async def list_recommended_tracks(
     status_code=status.HTTP_204_NO_CONTENT,
 )
 def decline_track_recommendation(
-    playlist_id: int,
     payload: VotunaTrackRecommendationDeclineCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    access: PlaylistAccessContext = Depends(get_member_access),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
     """Persist a declined recommendation for one user and playlist."""
-    playlist = get_playlist_or_404(db, playlist_id)
-    require_member(db, playlist_id, current_user.id)
+    playlist = access.playlist
     provider_track_id = payload.provider_track_id.strip()
     if not provider_track_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="provider_track_id is required")
@@ -461,13 +496,14 @@ def decline_track_recommendation(
 async def create_suggestion(
     playlist_id: int,
     payload: VotunaTrackSuggestionCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    access: PlaylistAccessContext = Depends(get_member_access_async),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
     """Suggest a track for a playlist."""
-    playlist = get_playlist_or_404(db, playlist_id)
-    require_member(db, playlist_id, current_user.id)
-    if not has_collaborators(db, playlist):
+    playlist = access.playlist
+    if not access.has_collaborators:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail={
@@ -475,7 +511,7 @@ async def create_suggestion(
                 "message": "Suggestions are disabled for personal playlists",
             },
         )
-    client = get_owner_client(db, playlist)
+    client = access.owner_client(db)
     provider_track_id = (payload.provider_track_id or "").strip()
     track_title = payload.track_title
     track_artist = payload.track_artist
@@ -496,7 +532,7 @@ async def create_suggestion(
         except ProviderAPIError as exc:
             if exc.status_code in {400, 404}:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
-            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
+            raise provider_api_http_error(exc) from exc
 
         provider_track_id = resolved_track.provider_track_id
         track_title = track_title or resolved_track.title
@@ -518,88 +554,96 @@ async def create_suggestion(
     except HTTPException:
         raise
 
-    existing = votuna_track_suggestion_crud.get_pending_by_track(
-        db,
+    existing = await db.run_sync(
+        votuna_track_suggestion_crud.get_pending_by_track,
         playlist_id,
         provider_track_id,
     )
     if existing:
-        votuna_track_vote_crud.set_reaction(db, existing.id, current_user.id, "up")
+        await db.run_sync(votuna_track_vote_crud.set_reaction, existing.id, current_user.id, "up")
         try:
             existing = await _resolve_if_all_collaborators_voted(
                 db,
-                playlist,
+                access,
                 existing,
                 actor_user_id=current_user.id,
+                background_tasks=background_tasks,
             )
         except ProviderAuthError:
             raise_provider_auth(current_user, owner_id=playlist.owner_user_id, provider=playlist.provider)
         except ProviderAPIError as exc:
-            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
-        return _serialize_suggestion(db, playlist, existing, current_user.id)
+            raise provider_api_http_error(exc) from exc
+        suggestion_out = await db.run_sync(_serialize_suggestion, playlist, existing, current_user.id)
+        _publish_suggestion_event(suggestion_out)
+        return suggestion_out
 
     if not payload.allow_resuggest:
-        latest_rejected = votuna_track_suggestion_crud.get_latest_rejected_by_track(
-            db,
+        latest_rejected = await db.run_sync(
+            votuna_track_suggestion_crud.get_latest_rejected_by_track,
             playlist_id,
             provider_track_id,
         )
         if latest_rejected:
             _raise_resuggest_conflict()
 
-    suggestion = votuna_track_suggestion_crud.create(
-        db,
-        {
-            "playlist_id": playlist_id,
-            "provider_track_id": provider_track_id,
-            "track_title": track_title,
-            "track_artist": track_artist,
-            "track_artwork_url": track_artwork_url,
-            "track_url": track_url,
-            "suggested_by_user_id": current_user.id,
-            "status": "pending",
-        },
-    )
-    votuna_track_vote_crud.set_reaction(db, suggestion.id, current_user.id, "up")
+    async with unit_of_work_async(db):
+        suggestion = await votuna_track_suggestion_crud.create_async(
+            db,
+            {
+                "playlist_id": playlist_id,
+                "provider_track_id": provider_track_id,
+                "track_title": track_title,
+                "track_artist": track_artist,
+                "track_artwork_url": track_artwork_url,
+                "track_url": track_url,
+                "suggested_by_user_id": current_user.id,
+                "status": "pending",
+            },
+        )
+        await db.run_sync(votuna_track_vote_crud.set_reaction, suggestion.id, current_user.id, "up")
     try:
         suggestion = await _resolve_if_all_collaborators_voted(
             db,
-            playlist,
+            access,
             suggestion,
             actor_user_id=current_user.id,
+            background_tasks=background_tasks,
         )
     except ProviderAuthError:
         raise_provider_auth(current_user, owner_id=playlist.owner_user_id, provider=playlist.provider)
     except ProviderAPIError as exc:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
-    return _serialize_suggestion(db, playlist, suggestion, current_user.id)
+        raise provider_api_http_error(exc) from exc
+    suggestion_out = await db.run_sync(_serialize_suggestion, playlist, suggestion, current_user.id)
+    _publish_suggestion_event(suggestion_out, created=True)
+    return suggestion_out
 
 
 @router.put("/suggestions/{suggestion_id}/reaction", response_model=VotunaTrackSuggestionOut)
 async def set_suggestion_reaction(
     suggestion_id: int,
     payload: VotunaTrackReactionUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
     """Create/update/remove a reaction on a suggestion."""
-    suggestion = votuna_track_suggestion_crud.get(db, suggestion_id)
+    suggestion = await votuna_track_suggestion_crud.get_async(db, suggestion_id)
     if not suggestion:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Suggestion not found")
-    playlist = get_playlist_or_404(db, suggestion.playlist_id)
-    require_member(db, suggestion.playlist_id, current_user.id)
+    access = await load_playlist_access_async(db, suggestion.playlist_id, current_user.id)
+    playlist = access.playlist
     if suggestion.status != "pending":
-        return _serialize_suggestion(db, playlist, suggestion, current_user.id)
+        return await db.run_sync(_serialize_suggestion, playlist, suggestion, current_user.id)
 
-    existing = votuna_track_vote_crud.get_vote(db, suggestion.id, current_user.id)
+    existing = await db.run_sync(votuna_track_vote_crud.get_vote, suggestion.id, current_user.id)
     if payload.reaction is None:
         if existing:
-            votuna_track_vote_crud.clear_reaction(db, suggestion.id, current_user.id)
+            await db.run_sync(votuna_track_vote_crud.clear_reaction, suggestion.id, current_user.id)
     elif existing and existing.reaction == payload.reaction:
-        votuna_track_vote_crud.clear_reaction(db, suggestion.id, current_user.id)
+        await db.run_sync(votuna_track_vote_crud.clear_reaction, suggestion.id, current_user.id)
     else:
-        votuna_track_vote_crud.set_reaction(
-            db,
+        await db.run_sync(
+            votuna_track_vote_crud.set_reaction,
             suggestion.id,
             current_user.id,
             payload.reaction,
@@ -608,29 +652,31 @@ async def set_suggestion_reaction(
     try:
         suggestion = await _resolve_if_all_collaborators_voted(
             db,
-            playlist,
+            access,
             suggestion,
             actor_user_id=current_user.id,
+            background_tasks=background_tasks,
         )
     except ProviderAuthError:
         raise_provider_auth(current_user, owner_id=playlist.owner_user_id, provider=playlist.provider)
     except ProviderAPIError as exc:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
-    return _serialize_suggestion(db, playlist, suggestion, current_user.id)
+        raise provider_api_http_error(exc) from exc
+    suggestion_out = await db.run_sync(_serialize_suggestion, playlist, suggestion, current_user.id)
+    _publish_suggestion_event(suggestion_out)
+    return suggestion_out
 
 
 @router.post("/suggestions/{suggestion_id}/cancel", response_model=VotunaTrackSuggestionOut)
 def cancel_suggestion(
     suggestion_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
     """Cancel a pending suggestion (suggester or owner only)."""
     suggestion = votuna_track_suggestion_crud.get(db, suggestion_id)
     if not suggestion:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Suggestion not found")
-    playlist = get_playlist_or_404(db, suggestion.playlist_id)
-    require_member(db, suggestion.playlist_id, current_user.id)
+    playlist = load_playlist_access(db, suggestion.playlist_id, current_user.id).playlist
     if suggestion.status != "pending":
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -653,20 +699,24 @@ def cancel_suggestion(
         resolution_reason=reason,
         resolved_by_user_id=current_user.id,
     )
-    return _serialize_suggestion(db, playlist, suggestion, current_user.id)
+    suggestion_out = _serialize_suggestion(db, playlist, suggestion, current_user.id)
+    _publish_suggestion_event(suggestion_out)
+    return suggestion_out
 
 
 @router.post("/suggestions/{suggestion_id}/force-add", response_model=VotunaTrackSuggestionOut)
 async def force_add_suggestion(
     suggestion_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
     """Force-add a pending suggestion (playlist owner only)."""
-    suggestion = votuna_track_suggestion_crud.get(db, suggestion_id)
+    suggestion = await votuna_track_suggestion_crud.get_async(db, suggestion_id)
     if not suggestion:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Suggestion not found")
-    playlist = require_owner(db, suggestion.playlist_id, current_user.id)
+    access = await load_playlist_access_async(db, suggestion.playlist_id, current_user.id, require="owner")
+    playlist = access.playlist
     if suggestion.status != "pending":
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -676,13 +726,16 @@ async def force_add_suggestion(
     try:
         suggestion = await _accept_suggestion(
             db,
-            playlist,
+            access,
             suggestion,
             resolution_reason="force_add",
             resolved_by_user_id=current_user.id,
+            background_tasks=background_tasks,
         )
     except ProviderAuthError:
         raise_provider_auth(current_user, owner_id=playlist.owner_user_id, provider=playlist.provider)
     except ProviderAPIError as exc:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
-    return _serialize_suggestion(db, playlist, suggestion, current_user.id)
+        raise provider_api_http_error(exc) from exc
+    suggestion_out = await db.run_sync(_serialize_suggestion, playlist, suggestion, current_user.id)
+    _publish_suggestion_event(suggestion_out)
+    return suggestion_out
@@ -1,8 +1,9 @@
-from app.auth.dependencies import get_current_user
+from app.auth.dependencies import get_current_principal, get_current_user
 from app.auth.jwt import create_access_token, decode_access_token
 from app.auth.sso import get_sso
 
 __all__ = [
+    "get_current_principal",
     "get_current_user",
     "create_access_token",
     "decode_access_token",
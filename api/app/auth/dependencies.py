@@ -1,12 +1,15 @@
 """Auth dependencies"""
 
 from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.auth.jwt import decode_access_token
+from app.auth.principal_cache import AuthPrincipal, principal_cache, principal_cache_key
 from app.config.settings import settings
 from app.crud.user import user_crud
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
 
 AUTH_EXPIRED_HEADER = "X-Votuna-Auth-Expired"
 
@@ -21,43 +24,100 @@ def _get_token_from_request(request: Request) -> str | None:
     return request.cookies.get(cookie_name)
 
 
-def get_current_user(
-    request: Request,
-    db: Session = Depends(get_db),
-):
-    """Resolve the authenticated user from the request token."""
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={AUTH_EXPIRED_HEADER: "1"},
+    )
+
+
+def _authenticate_request(request: Request) -> tuple[str, int]:
+    """Return the request token and the user id it was issued for."""
     token = _get_token_from_request(request)
     if not token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated",
-            headers={AUTH_EXPIRED_HEADER: "1"},
-        )
+        raise _unauthorized("Not authenticated")
 
     try:
         payload = decode_access_token(token)
     except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token",
-            headers={AUTH_EXPIRED_HEADER: "1"},
-        )
+        raise _unauthorized("Invalid token")
 
     user_id = payload.get("sub")
     if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token",
-            headers={AUTH_EXPIRED_HEADER: "1"},
-        )
+        raise _unauthorized("Invalid token")
+    return token, int(user_id)
 
-    user = user_crud.get(db, int(user_id))
+
+def get_current_principal(
+    request: Request,
+    db: Session = Depends(get_db),
+) -> AuthPrincipal:
+    """Resolve the authenticated principal, skipping the user lookup while it is cached.
+
+    The JWT is still verified on every request, so expiry is exact; only the database
+    lookup is cached. Use this instead of ``get_current_user`` on endpoints that only
+    need the caller's id.
+    """
+    token, user_id = _authenticate_request(request)
+    principal = _cached_principal(token, user_id)
+    if principal is None:
+        principal = _remember_principal(token, user_crud.get_auth_columns(db, user_id))
+    if not principal.is_active:
+        raise _unauthorized("Inactive user")
+    return principal
+
+
+async def get_current_principal_async(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+) -> AuthPrincipal:
+    """Async-session variant of ``get_current_principal``.
+
+    For routes that must not hold a sync session open, such as long-lived streams.
+    """
+    token, user_id = _authenticate_request(request)
+    principal = _cached_principal(token, user_id)
+    if principal is None:
+        principal = _remember_principal(token, await db.run_sync(user_crud.get_auth_columns, user_id))
+    if not principal.is_active:
+        raise _unauthorized("Inactive user")
+    return principal
+
+
+def _cached_principal(token: str, user_id: int) -> AuthPrincipal | None:
+    principal = principal_cache.get(principal_cache_key(token))
+    if principal is None or principal.id != user_id:
+        return None
+    return principal
+
+
+def _remember_principal(token: str, row: Row | None) -> AuthPrincipal:
+    if row is None:
+        raise _unauthorized("Inactive user")
+    principal = AuthPrincipal(*row)
+    principal_cache.set(principal_cache_key(token), principal)
+    return principal
+
+
+def get_current_user(
+    request: Request,
+    db: Session = Depends(get_db),
+):
+    """Resolve the authenticated user from the request token."""
+    token, user_id = _authenticate_request(request)
+    user = user_crud.get(db, user_id)
     if not user or not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Inactive user",
-            headers={AUTH_EXPIRED_HEADER: "1"},
-        )
+        raise _unauthorized("Inactive user")
+    principal_cache.set(
+        principal_cache_key(token),
+        AuthPrincipal(
+            id=user.id,
+            auth_provider=user.auth_provider,
+            provider_user_id=user.provider_user_id,
+            is_active=user.is_active,
+        ),
+    )
     return user
 
 
@@ -0,0 +1,74 @@
+"""Process-wide cache of authenticated principals, keyed by access-token hash.
+
+Entries hold only the user columns auth needs, never provider tokens. Committing a change to
+a user's ``is_active`` flag or provider tokens drops that user's entries; other processes see
+the change once their short TTL runs out.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.models.user import User
+from app.utils.ttl_cache import TTLCache
+
+_INVALIDATING_COLUMNS = ("is_active", "access_token", "refresh_token")
+_PENDING_INVALIDATIONS_KEY = "principal_cache_pending_user_ids"
+
+
+@dataclass(frozen=True)
+class AuthPrincipal:
+    id: int
+    auth_provider: str
+    provider_user_id: str
+    is_active: bool
+
+
+principal_cache: TTLCache[AuthPrincipal] = TTLCache(
+    max_entries=settings.AUTH_PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def principal_cache_key(token: str) -> str:
+    """Hash the raw token so the cache never holds usable credentials."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def invalidate_principals(user_ids: Iterable[int]) -> None:
+    """Drop cached principals of the given users."""
+    targets = set(user_ids)
+    if targets:
+        principal_cache.pop_where(lambda principal: principal.id in targets)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session: Session, flush_context) -> None:
+    pending: set[int] = session.info.setdefault(_PENDING_INVALIDATIONS_KEY, set())
+    for obj in session.deleted:
+        if isinstance(obj, User) and obj.id is not None:
+            pending.add(obj.id)
+    for obj in session.dirty:
+        if not isinstance(obj, User) or obj.id is None:
+            continue
+        attrs = inspect(obj).attrs
+        if any(attrs[column].history.has_changes() for column in _INVALIDATING_COLUMNS):
+            pending.add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    pending = session.info.pop(_PENDING_INVALIDATIONS_KEY, None)
+    if pending:
+        invalidate_principals(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS_KEY, None)
@@ -13,6 +13,16 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = ""
     SQLALCHEMY_ECHO: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    # Server-side per-statement limit; 0 leaves the database default.
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+    # Open a fresh connection per checkout when an external pooler (PgBouncer) does the pooling.
+    DB_USE_NULL_POOL: bool = False
+    # Bearer token for GET /metrics; the endpoint answers 404 while this is empty.
+    METRICS_TOKEN: str = ""
 
     # Auth (SSO + JWT)
     SPOTIFY_CLIENT_ID: str = ""
@@ -25,11 +35,83 @@ class Settings(BaseSettings):
     SOUNDCLOUD_REDIRECT_URI: str = ""
     SOUNDCLOUD_API_BASE_URL: str = "https://api.soundcloud.com"
     SOUNDCLOUD_TOKEN_URL: str = "https://secure.soundcloud.com/oauth/token"
+
+    # Shared provider HTTP client (connection pool)
+    PROVIDER_HTTP_MAX_CONNECTIONS: int = 100
+    PROVIDER_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    PROVIDER_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    PROVIDER_HTTP_TIMEOUT_SECONDS: float = 15.0
+    PROVIDER_HTTP2_ENABLED: bool = True
+    # Offset pages fetched concurrently once a paged listing reports its total (1 pages serially)
+    PROVIDER_PAGE_FETCH_CONCURRENCY: int = 4
+
+    # Provider request scheduling: token buckets per provider and per access token (rate 0 disables)
+    PROVIDER_RATE_LIMIT_PER_SECOND: float = 50.0
+    PROVIDER_RATE_LIMIT_BURST: int = 100
+    PROVIDER_RATE_LIMIT_PER_TOKEN_PER_SECOND: float = 10.0
+    PROVIDER_RATE_LIMIT_PER_TOKEN_BURST: int = 20
+    PROVIDER_RATE_LIMIT_MAX_TRACKED_TOKENS: int = 10000
+    # Retries for 429s and failed reads; a Retry-After longer than the max delay fails fast
+    PROVIDER_RETRY_MAX_ATTEMPTS: int = 3
+    PROVIDER_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    PROVIDER_RETRY_MAX_DELAY_SECONDS: float = 10.0
+
+    # Per-provider circuit breaker (threshold 0 disables) and hedged reads after the recent p95
+    PROVIDER_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    PROVIDER_CIRCUIT_OPEN_SECONDS: float = 30.0
+    PROVIDER_CIRCUIT_SLOW_CALL_SECONDS: float = 5.0
+    PROVIDER_HEDGE_ENABLED: bool = True
+    PROVIDER_HEDGE_MIN_DELAY_SECONDS: float = 0.2
+
+    # Provider playlist track cache (TTL <= 0 disables it)
+    PROVIDER_TRACK_CACHE_TTL_SECONDS: float = 60.0
+    PROVIDER_TRACK_CACHE_MAX_ENTRIES: int = 256
+
+    # Ranked recommendation cache per (playlist, refresh nonce) (TTL <= 0 disables it)
+    RECOMMENDATION_CACHE_TTL_SECONDS: float = 600.0
+    RECOMMENDATION_CACHE_MAX_ENTRIES: int = 512
+    # In-process track co-occurrence index, built and refreshed in the background
+    TRACK_COOCCURRENCE_REFRESH_ENABLED: bool = True
+    TRACK_COOCCURRENCE_REFRESH_INTERVAL_SECONDS: float = 60.0
+    # Rows a recommendations request may fold in itself; the rest waits for the background pass
+    TRACK_COOCCURRENCE_REQUEST_ROW_BUDGET: int = 2000
+    # Most recently active baskets kept in memory
+    TRACK_COOCCURRENCE_MAX_BASKETS: int = 20000
+    # Pair counts kept in memory; least recently active baskets are dropped beyond it
+    TRACK_COOCCURRENCE_MAX_PAIRS: int = 1000000
+    # Tracks whose display metadata is kept for neighbor results (LRU)
+    TRACK_COOCCURRENCE_MAX_METADATA: int = 50000
+
+    # Background refresh of playlist owners' provider tokens ahead of expiry
+    TOKEN_REFRESH_SCHEDULER_ENABLED: bool = True
+    TOKEN_REFRESH_SCHEDULER_INTERVAL_SECONDS: float = 60.0
+    TOKEN_REFRESH_SCHEDULER_JITTER_SECONDS: float = 15.0
+    TOKEN_REFRESH_LEAD_SECONDS: float = 600.0
+    TOKEN_REFRESH_BATCH_SIZE: int = 50
+    TOKEN_REFRESH_MAX_PER_SECOND: float = 2.0
+
+    # Background management transfer jobs, polled from the votuna_management_jobs table
+    MANAGEMENT_JOB_WORKER_ENABLED: bool = True
+    MANAGEMENT_JOB_POLL_INTERVAL_SECONDS: float = 2.0
+    # A running job whose worker has not saved progress for this long is taken over
+    MANAGEMENT_JOB_STALE_AFTER_SECONDS: float = 300.0
+    MANAGEMENT_JOB_MAX_ATTEMPTS: int = 5
+    MANAGEMENT_JOB_MAX_TRACKS: int = 10000
+    MANAGEMENT_JOB_RETRY_DELAY_SECONDS: float = 30.0
+    # Live playlist events over SSE; on Postgres, LISTEN/NOTIFY fans them out across workers
+    PLAYLIST_EVENTS_NOTIFY_ENABLED: bool = True
+    PLAYLIST_EVENTS_HEARTBEAT_SECONDS: float = 15.0
+    # Events buffered per subscriber; the oldest are dropped when a client falls behind
+    PLAYLIST_EVENTS_QUEUE_SIZE: int = 100
+
     AUTH_SECRET_KEY: str = ""
     AUTH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7
     AUTH_COOKIE_NAME: str = "votuna_access_token"
     AUTH_COOKIE_SECURE: bool = False
     AUTH_COOKIE_SAMESITE: Literal["lax", "strict", "none"] = "lax"
+    # Authenticated principals cached per token hash (TTL <= 0 disables it)
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+    AUTH_PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
     FRONTEND_URL: str = "http://localhost:3000"
     USER_FILES_DIR: str = "user_files"
     MAX_AVATAR_BYTES: int = 5 * 1024 * 1024
@@ -1,12 +1,17 @@
 """Base CRUD operations for database models"""
 
 import logging
+from collections.abc import Sequence
 from typing import Any, Generic, TypeVar
 
 from pydantic import BaseModel as SchemaModel
+from sqlalchemy import Insert, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.db.unit_of_work import in_unit_of_work
 from app.models import BaseModel
 
 logger = logging.getLogger(__name__)
@@ -23,6 +28,26 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """Store the SQLAlchemy model class for CRUD operations."""
         self.model = model
 
+    @staticmethod
+    def _commit(db: Session, db_obj: Any = None, *, refresh: bool = False) -> None:
+        """Commit, or only flush inside a unit of work; optionally reload server-side values"""
+        if in_unit_of_work(db):
+            db.flush()
+            return
+        db.commit()
+        if refresh and db_obj is not None:
+            db.refresh(db_obj)
+
+    @staticmethod
+    async def _commit_async(db: AsyncSession, db_obj: Any = None, *, refresh: bool = False) -> None:
+        """Commit, or only flush inside a unit of work; optionally reload server-side values (async)"""
+        if in_unit_of_work(db):
+            await db.flush()
+            return
+        await db.commit()
+        if refresh and db_obj is not None:
+            await db.refresh(db_obj)
+
     def get(self, db: Session, id: Any) -> ModelType | None:
         """Get a single record by ID"""
         try:
@@ -39,7 +64,13 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             logger.error(f"Error getting all {self.model.__name__}: {e}")
             raise
 
-    def create(self, db: Session, obj_in: CreateSchemaType | dict[str, Any]) -> ModelType:
+    def create(
+        self,
+        db: Session,
+        obj_in: CreateSchemaType | dict[str, Any],
+        *,
+        refresh: bool = True,
+    ) -> ModelType:
         """Create a new record"""
         try:
             # Handle both Pydantic models and dicts for backwards compatibility
@@ -50,15 +81,74 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
             db_obj = self.model(**obj_data)
             db.add(db_obj)
-            db.commit()
-            db.refresh(db_obj)
+            self._commit(db, db_obj, refresh=refresh)
             return db_obj
         except SQLAlchemyError as e:
             db.rollback()
             logger.error(f"Error creating {self.model.__name__}: {e}")
             raise
 
-    def update(self, db: Session, db_obj: ModelType, obj_in: UpdateSchemaType | dict[str, Any]) -> ModelType:
+    def bulk_create(self, db: Session, objs_in: Sequence[CreateSchemaType | dict[str, Any]]) -> list[ModelType]:
+        """Create many records with one multi-row INSERT ... RETURNING in a single transaction"""
+        rows = [self._obj_data(obj_in) for obj_in in objs_in]
+        if not rows:
+            return []
+        try:
+            created = list(db.scalars(insert(self.model).returning(self.model), rows))
+            self._commit(db)
+            return created
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Error bulk creating {self.model.__name__}: {e}")
+            raise
+
+    def _upsert_statement(
+        self,
+        dialect_name: str,
+        conflict_columns: Sequence[str],
+        update_columns: Sequence[str],
+    ) -> Insert:
+        """Build an INSERT ... ON CONFLICT DO UPDATE for the session's database"""
+        if dialect_name == "postgresql":
+            stmt = postgresql.insert(self.model)
+        elif dialect_name == "sqlite":
+            stmt = sqlite.insert(self.model)
+        else:
+            raise NotImplementedError(f"bulk_upsert is not supported on {dialect_name}")
+        values = {column: stmt.excluded[column] for column in update_columns}
+        values["updated_at"] = func.now()
+        return stmt.on_conflict_do_update(index_elements=list(conflict_columns), set_=values).returning(self.model)
+
+    def bulk_upsert(
+        self,
+        db: Session,
+        objs_in: Sequence[CreateSchemaType | dict[str, Any]],
+        *,
+        conflict_columns: Sequence[str],
+        update_columns: Sequence[str],
+    ) -> list[ModelType]:
+        """Insert many records, updating ``update_columns`` of rows that already match ``conflict_columns``"""
+        rows = [self._obj_data(obj_in) for obj_in in objs_in]
+        if not rows:
+            return []
+        try:
+            stmt = self._upsert_statement(db.get_bind().dialect.name, conflict_columns, update_columns)
+            upserted = list(db.scalars(stmt, rows, execution_options={"populate_existing": True}))
+            self._commit(db)
+            return upserted
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Error bulk upserting {self.model.__name__}: {e}")
+            raise
+
+    def update(
+        self,
+        db: Session,
+        db_obj: ModelType,
+        obj_in: UpdateSchemaType | dict[str, Any],
+        *,
+        refresh: bool = True,
+    ) -> ModelType:
         """Update an existing record"""
         try:
             # Handle both Pydantic models and dicts for backwards compatibility
@@ -72,8 +162,7 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                     setattr(db_obj, key, value)
 
             db.add(db_obj)
-            db.commit()
-            db.refresh(db_obj)
+            self._commit(db, db_obj, refresh=refresh)
             return db_obj
         except SQLAlchemyError as e:
             db.rollback()
@@ -86,7 +175,7 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             db_obj = db.query(self.model).filter(self.model.id == id).first()
             if db_obj:
                 db.delete(db_obj)
-                db.commit()
+                self._commit(db)
                 return True
             return False
         except SQLAlchemyError as e:
@@ -109,3 +198,140 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         except SQLAlchemyError as e:
             logger.error(f"Error counting {self.model.__name__}: {e}")
             raise
+
+    @staticmethod
+    def _obj_data(obj_in: Any) -> dict[str, Any]:
+        # Handle both Pydantic models and dicts for backwards compatibility
+        if isinstance(obj_in, dict):
+            return obj_in
+        return obj_in.model_dump(exclude_unset=True)
+
+    async def get_async(self, db: AsyncSession, id: Any) -> ModelType | None:
+        """Get a single record by ID (async)"""
+        try:
+            result = await db.execute(select(self.model).where(self.model.id == id))
+            return result.scalars().first()
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting {self.model.__name__} with id {id}: {e}")
+            raise
+
+    async def get_all_async(self, db: AsyncSession, skip: int = 0, limit: int = 100) -> list[ModelType]:
+        """Get all records with pagination (async)"""
+        try:
+            result = await db.execute(select(self.model).offset(skip).limit(limit))
+            return list(result.scalars().all())
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting all {self.model.__name__}: {e}")
+            raise
+
+    async def create_async(
+        self,
+        db: AsyncSession,
+        obj_in: CreateSchemaType | dict[str, Any],
+        *,
+        refresh: bool = True,
+    ) -> ModelType:
+        """Create a new record (async)"""
+        try:
+            db_obj = self.model(**self._obj_data(obj_in))
+            db.add(db_obj)
+            await self._commit_async(db, db_obj, refresh=refresh)
+            return db_obj
+        except SQLAlchemyError as e:
+            await db.rollback()
+            logger.error(f"Error creating {self.model.__name__}: {e}")
+            raise
+
+    async def bulk_create_async(
+        self,
+        db: AsyncSession,
+        objs_in: Sequence[CreateSchemaType | dict[str, Any]],
+    ) -> list[ModelType]:
+        """Create many records with one multi-row INSERT ... RETURNING in a single transaction (async)"""
+        rows = [self._obj_data(obj_in) for obj_in in objs_in]
+        if not rows:
+            return []
+        try:
+            created = list(await db.scalars(insert(self.model).returning(self.model), rows))
+            await self._commit_async(db)
+            return created
+        except SQLAlchemyError as e:
+            await db.rollback()
+            logger.error(f"Error bulk creating {self.model.__name__}: {e}")
+            raise
+
+    async def bulk_upsert_async(
+        self,
+        db: AsyncSession,
+        objs_in: Sequence[CreateSchemaType | dict[str, Any]],
+        *,
+        conflict_columns: Sequence[str],
+        update_columns: Sequence[str],
+    ) -> list[ModelType]:
+        """Insert many records, updating ``update_columns`` of rows that already match ``conflict_columns`` (async)"""
+        rows = [self._obj_data(obj_in) for obj_in in objs_in]
+        if not rows:
+            return []
+        try:
+            stmt = self._upsert_statement(db.get_bind().dialect.name, conflict_columns, update_columns)
+            upserted = list(await db.scalars(stmt, rows, execution_options={"populate_existing": True}))
+            await self._commit_async(db)
+            return upserted
+        except SQLAlchemyError as e:
+            await db.rollback()
+            logger.error(f"Error bulk upserting {self.model.__name__}: {e}")
+            raise
+
+    async def update_async(
+        self,
+        db: AsyncSession,
+        db_obj: ModelType,
+        obj_in: UpdateSchemaType | dict[str, Any],
+        *,
+        refresh: bool = True,
+    ) -> ModelType:
+        """Update an existing record (async)"""
+        try:
+            for key, value in self._obj_data(obj_in).items():
+                if hasattr(db_obj, key):
+                    setattr(db_obj, key, value)
+
+            db.add(db_obj)
+            await self._commit_async(db, db_obj, refresh=refresh)
+            return db_obj
+        except SQLAlchemyError as e:
+            await db.rollback()
+            logger.error(f"Error updating {self.model.__name__}: {e}")
+            raise
+
+    async def delete_async(self, db: AsyncSession, id: Any) -> bool:
+        """Delete a record by ID (async)"""
+        try:
+            db_obj = await self.get_async(db, id)
+            if db_obj:
+                await db.delete(db_obj)
+                await self._commit_async(db)
+                return True
+            return False
+        except SQLAlchemyError as e:
+            await db.rollback()
+            logger.error(f"Error deleting {self.model.__name__} with id {id}: {e}")
+            raise
+
+    async def exists_async(self, db: AsyncSession, id: Any) -> bool:
+        """Check if a record exists by ID (async)"""
+        try:
+            result = await db.execute(select(self.model.id).where(self.model.id == id).limit(1))
+            return result.first() is not None
+        except SQLAlchemyError as e:
+            logger.error(f"Error checking if {self.model.__name__} with id {id} exists: {e}")
+            raise
+
+    async def count_async(self, db: AsyncSession) -> int:
+        """Count total records (async)"""
+        try:
+            result = await db.execute(select(func.count()).select_from(self.model))
+            return int(result.scalar_one())
+        except SQLAlchemyError as e:
+            logger.error(f"Error counting {self.model.__name__}: {e}")
+            raise
@@ -1,15 +1,23 @@
 """User CRUD helpers"""
 
+from datetime import datetime
 from typing import Optional
-from sqlalchemy import or_
+from sqlalchemy import Row, or_, select
 from sqlalchemy.orm import Session
 
 from app.crud.base import BaseCRUD
 from app.models.user import User
+from app.models.votuna_playlist import VotunaPlaylist
 from app.schemas import UserCreate, UserUpdate
 
 
 class UserCRUD(BaseCRUD[User, UserCreate, UserUpdate]):
+    def get_auth_columns(self, db: Session, user_id: int) -> Optional[Row[tuple[int, str, str, bool]]]:
+        """Return only the columns auth needs (id, provider, provider user id, active flag), not tokens."""
+        return db.execute(
+            select(User.id, User.auth_provider, User.provider_user_id, User.is_active).where(User.id == user_id)
+        ).first()
+
     def get_by_provider_id(self, db: Session, provider: str, provider_user_id: str) -> Optional[User]:
         """Return a user by provider and provider user id."""
         return db.query(User).filter(User.auth_provider == provider, User.provider_user_id == provider_user_id).first()
@@ -48,5 +56,29 @@ class UserCRUD(BaseCRUD[User, UserCreate, UserUpdate]):
             return candidates
         return [candidate for candidate in candidates if candidate.id not in exclude_user_ids]
 
+    def list_playlist_owners_expiring_before(
+        self,
+        db: Session,
+        expires_before: datetime,
+        limit: int = 50,
+        exclude_user_ids: set[int] | None = None,
+    ) -> list[User]:
+        """Return owners of active playlists whose refreshable tokens expire before the cutoff, soonest first."""
+        owns_active_playlist = (
+            db.query(VotunaPlaylist.id)
+            .filter(VotunaPlaylist.owner_user_id == User.id, VotunaPlaylist.is_active.is_(True))
+            .exists()
+        )
+        query = db.query(User).filter(
+            User.token_expires_at.is_not(None),
+            User.token_expires_at <= expires_before,
+            User.refresh_token.is_not(None),
+            User.is_active.is_(True),
+            owns_active_playlist,
+        )
+        if exclude_user_ids:
+            query = query.filter(User.id.not_in(exclude_user_ids))
+        return query.order_by(User.token_expires_at.asc()).limit(limit).all()
+
 
 user_crud = UserCRUD(User)
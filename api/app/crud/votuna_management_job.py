@@ -0,0 +1,76 @@
+"""CRUD helpers for background management jobs."""
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import and_, or_, update
+from sqlalchemy.orm import Session
+
+from app.crud.base import BaseCRUD
+from app.models.votuna_management_jobs import VotunaManagementJob
+from app.schemas import ManagementJobCreate, ManagementJobUpdate
+
+
+class VotunaManagementJobCRUD(BaseCRUD[VotunaManagementJob, ManagementJobCreate, ManagementJobUpdate]):
+    def claim_next(
+        self,
+        db: Session,
+        *,
+        worker_id: str,
+        now: datetime,
+        stale_before: datetime,
+        max_attempts: int,
+    ) -> VotunaManagementJob | None:
+        """Lock and return the next runnable job, taking over running jobs whose worker went silent.
+
+        ``FOR UPDATE SKIP LOCKED`` lets several workers poll the same table without handing
+        out one job twice; databases without row locks (SQLite in tests) ignore it. A stale
+        job that already used ``max_attempts`` claims is failed instead of being run again.
+        """
+        while True:
+            job = (
+                db.query(VotunaManagementJob)
+                .filter(
+                    or_(
+                        and_(VotunaManagementJob.status == "queued", VotunaManagementJob.available_at <= now),
+                        and_(
+                            VotunaManagementJob.status == "running",
+                            VotunaManagementJob.heartbeat_at < stale_before,
+                        ),
+                    )
+                )
+                .order_by(VotunaManagementJob.available_at, VotunaManagementJob.id)
+                .with_for_update(skip_locked=True)
+                .first()
+            )
+            if job is None:
+                db.commit()
+                return None
+            if job.status == "running" and job.attempts >= max_attempts:
+                job.status = "failed"
+                job.error = f"Job stopped responding {job.attempts} times"
+                job.locked_by = None
+                job.finished_at = now
+                db.commit()
+                continue
+            job.status = "running"
+            job.locked_by = worker_id
+            job.heartbeat_at = now
+            job.started_at = job.started_at or now
+            job.attempts += 1
+            db.commit()
+            db.refresh(job)
+            return job
+
+    def update_if_locked(self, db: Session, job_id: int, worker_id: str, values: dict[str, Any]) -> bool:
+        """Write ``values`` only while ``worker_id`` still holds the job; return whether it did."""
+        result = db.execute(
+            update(VotunaManagementJob)
+            .where(VotunaManagementJob.id == job_id, VotunaManagementJob.locked_by == worker_id)
+            .values(**values)
+        )
+        self._commit(db)
+        return result.rowcount == 1
+
+
+votuna_management_job_crud = VotunaManagementJobCRUD(VotunaManagementJob)
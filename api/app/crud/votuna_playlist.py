@@ -1,11 +1,14 @@
 """Votuna playlist CRUD helpers"""
 
 from typing import Optional, Sequence
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import Row, and_, func, or_, select
 
 from app.crud.base import BaseCRUD
+from app.models.user import User
+from app.models.votuna_members import VotunaPlaylistMember
 from app.models.votuna_playlist import VotunaPlaylist
+from app.models.votuna_playlist_settings import VotunaPlaylistSettings
 from app.schemas import VotunaPlaylistSettingsCreate, VotunaPlaylistSettingsUpdate
 
 
@@ -26,10 +29,45 @@ class VotunaPlaylistCRUD(BaseCRUD[VotunaPlaylist, VotunaPlaylistSettingsCreate,
             .first()
         )
 
+    def get_with_access(
+        self,
+        db: Session,
+        playlist_id: int,
+        user_id: int,
+    ) -> Optional[
+        Row[tuple[VotunaPlaylist, VotunaPlaylistMember | None, User | None, VotunaPlaylistSettings | None, int, int]]
+    ]:
+        """Return the playlist with the user's membership, owner, settings and member counts in one query.
+
+        The last two columns are the collaborator count (members other than the owner) and the
+        total member count.
+        """
+        membership = aliased(VotunaPlaylistMember)
+        collaborator_count = (
+            select(func.count(VotunaPlaylistMember.id))
+            .where(
+                VotunaPlaylistMember.playlist_id == VotunaPlaylist.id,
+                VotunaPlaylistMember.user_id != VotunaPlaylist.owner_user_id,
+            )
+            .correlate(VotunaPlaylist)
+            .scalar_subquery()
+        )
+        member_count = (
+            select(func.count(VotunaPlaylistMember.id))
+            .where(VotunaPlaylistMember.playlist_id == VotunaPlaylist.id)
+            .correlate(VotunaPlaylist)
+            .scalar_subquery()
+        )
+        return db.execute(
+            select(VotunaPlaylist, membership, User, VotunaPlaylistSettings, collaborator_count, member_count)
+            .outerjoin(membership, and_(membership.playlist_id == VotunaPlaylist.id, membership.user_id == user_id))
+            .outerjoin(User, User.id == VotunaPlaylist.owner_user_id)
+            .outerjoin(VotunaPlaylistSettings, VotunaPlaylistSettings.playlist_id == VotunaPlaylist.id)
+            .where(VotunaPlaylist.id == playlist_id)
+        ).first()
+
     def list_for_user(self, db: Session, user_id: int) -> Sequence[VotunaPlaylist]:
         """Return playlists owned by or shared with the user."""
-        from app.models.votuna_members import VotunaPlaylistMember
-
         return (
             db.query(VotunaPlaylist)
             .outerjoin(VotunaPlaylistMember, VotunaPlaylistMember.playlist_id == VotunaPlaylist.id)
@@ -43,5 +81,21 @@ class VotunaPlaylistCRUD(BaseCRUD[VotunaPlaylist, VotunaPlaylistSettingsCreate,
             .all()
         )
 
+    def list_versions_for_user(self, db: Session, user_id: int) -> Sequence[Row]:
+        """Return (id, version) rows for the playlists ``list_for_user`` returns, ordered by id."""
+        return (
+            db.query(VotunaPlaylist.id, VotunaPlaylist.version)
+            .outerjoin(VotunaPlaylistMember, VotunaPlaylistMember.playlist_id == VotunaPlaylist.id)
+            .filter(
+                or_(
+                    VotunaPlaylist.owner_user_id == user_id,
+                    VotunaPlaylistMember.user_id == user_id,
+                )
+            )
+            .distinct()
+            .order_by(VotunaPlaylist.id)
+            .all()
+        )
+
 
 votuna_playlist_crud = VotunaPlaylistCRUD(VotunaPlaylist)
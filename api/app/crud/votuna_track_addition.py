@@ -1,13 +1,45 @@
 """Votuna track addition provenance CRUD helpers."""
 
+from collections.abc import Collection, Sequence
+from typing import Any
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.crud.base import BaseCRUD
+from app.db.playlist_versions import bump_playlist_versions
+from app.db.unit_of_work import unit_of_work, unit_of_work_async
+from app.models.votuna_playlist import VotunaPlaylist
 from app.models.votuna_track_additions import VotunaTrackAddition
 from app.schemas import VotunaTrackAdditionCreate, VotunaTrackAdditionUpdate
 
 
 class VotunaTrackAdditionCRUD(BaseCRUD[VotunaTrackAddition, VotunaTrackAdditionCreate, VotunaTrackAdditionUpdate]):
+    def bulk_create(
+        self,
+        db: Session,
+        objs_in: Sequence[VotunaTrackAdditionCreate | dict[str, Any]],
+    ) -> list[VotunaTrackAddition]:
+        """Insert provenance rows and bump the owning playlists' versions in the same transaction."""
+        with unit_of_work(db):
+            created = super().bulk_create(db, objs_in)
+            bump_playlist_versions(db, playlist_ids=[row.playlist_id for row in created])
+        return created
+
+    async def bulk_create_async(
+        self,
+        db: AsyncSession,
+        objs_in: Sequence[VotunaTrackAdditionCreate | dict[str, Any]],
+    ) -> list[VotunaTrackAddition]:
+        """Async variant of ``bulk_create``."""
+        async with unit_of_work_async(db):
+            created = await super().bulk_create_async(db, objs_in)
+            await db.run_sync(
+                lambda sync_db: bump_playlist_versions(sync_db, playlist_ids=[row.playlist_id for row in created])
+            )
+        return created
+
     def list_latest_for_tracks(
         self,
         db: Session,
@@ -36,5 +68,31 @@ class VotunaTrackAdditionCRUD(BaseCRUD[VotunaTrackAddition, VotunaTrackAdditionC
             latest_by_track[row.provider_track_id] = row
         return latest_by_track
 
+    def list_cooccurrence_rows(
+        self,
+        db: Session,
+        *,
+        after_id: int = 0,
+        ids: Collection[int] | None = None,
+        limit: int,
+    ) -> Sequence[Row]:
+        """Return (id, playlist_id, provider, provider_track_id) rows.
+
+        Rows have ids above ``after_id``, or one of the given ``ids`` when those are passed.
+        """
+        return (
+            db.query(
+                VotunaTrackAddition.id,
+                VotunaTrackAddition.playlist_id,
+                VotunaPlaylist.provider,
+                VotunaTrackAddition.provider_track_id,
+            )
+            .join(VotunaPlaylist, VotunaPlaylist.id == VotunaTrackAddition.playlist_id)
+            .filter(VotunaTrackAddition.id.in_(ids) if ids is not None else VotunaTrackAddition.id > after_id)
+            .order_by(VotunaTrackAddition.id)
+            .limit(limit)
+            .all()
+        )
+
 
 votuna_track_addition_crud = VotunaTrackAdditionCRUD(VotunaTrackAddition)
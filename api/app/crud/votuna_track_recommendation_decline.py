@@ -2,7 +2,6 @@
 
 from datetime import datetime
 
-from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.crud.base import BaseCRUD
@@ -60,25 +59,20 @@ class VotunaTrackRecommendationDeclineCRUD(
         declined_at: datetime,
     ) -> VotunaTrackRecommendationDecline:
         """Create or update a decline row and return it."""
-        existing = self.get_for_track(db, playlist_id, user_id, provider_track_id)
-        if existing:
-            return self.update(db, existing, {"declined_at": declined_at})
-        try:
-            return self.create(
-                db,
+        (decline,) = self.bulk_upsert(
+            db,
+            [
                 {
                     "playlist_id": playlist_id,
                     "user_id": user_id,
                     "provider_track_id": provider_track_id,
                     "declined_at": declined_at,
-                },
-            )
-        except IntegrityError:
-            db.rollback()
-            conflict = self.get_for_track(db, playlist_id, user_id, provider_track_id)
-            if not conflict:
-                raise
-            return self.update(db, conflict, {"declined_at": declined_at})
+                }
+            ],
+            conflict_columns=("playlist_id", "user_id", "provider_track_id"),
+            update_columns=("declined_at",),
+        )
+        return decline
 
 
 votuna_track_recommendation_decline_crud = VotunaTrackRecommendationDeclineCRUD(VotunaTrackRecommendationDecline)
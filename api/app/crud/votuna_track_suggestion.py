@@ -1,16 +1,26 @@
 """Votuna track suggestion CRUD helpers"""
 
+from collections.abc import Collection
 from typing import Optional, Sequence
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, select, tuple_
+from sqlalchemy.orm import Session, aliased
 
 from app.crud.base import BaseCRUD
+from app.models.votuna_playlist import VotunaPlaylist
 from app.models.votuna_suggestions import VotunaTrackSuggestion
 from app.schemas import VotunaTrackSuggestionCreate, VotunaTrackSuggestionUpdate
 
+TALLY_COLUMNS = ("upvote_count", "downvote_count", "voter_count")
+
 
 class VotunaTrackSuggestionCRUD(
     BaseCRUD[VotunaTrackSuggestion, VotunaTrackSuggestionCreate, VotunaTrackSuggestionUpdate]
 ):
+    def refresh_tally(self, db: Session, suggestion: VotunaTrackSuggestion) -> VotunaTrackSuggestion:
+        """Reload only the vote counters of ``suggestion``, which reactions update in SQL."""
+        db.refresh(suggestion, attribute_names=TALLY_COLUMNS)
+        return suggestion
+
     def get_pending_by_track(
         self,
         db: Session,
@@ -40,6 +50,35 @@ class VotunaTrackSuggestionCRUD(
             query = query.filter(VotunaTrackSuggestion.status == status)
         return query.order_by(VotunaTrackSuggestion.created_at.desc()).all()
 
+    def list_page_for_playlist(
+        self,
+        db: Session,
+        playlist_id: int,
+        status: str | None = None,
+        *,
+        limit: int | None = None,
+        after_id: int | None = None,
+    ) -> Sequence[VotunaTrackSuggestion]:
+        """Return one newest-first page of suggestions, keyed on (created_at, id).
+
+        ``after_id`` is the last suggestion of the previous page. Its key is read in SQL rather
+        than round-tripped through the client so the comparison uses the stored timestamp verbatim.
+        A ``limit`` of ``None`` returns every remaining suggestion.
+        """
+        query = db.query(VotunaTrackSuggestion).filter(VotunaTrackSuggestion.playlist_id == playlist_id)
+        if status:
+            query = query.filter(VotunaTrackSuggestion.status == status)
+        if after_id is not None:
+            anchor = aliased(VotunaTrackSuggestion)
+            anchor_created_at = select(anchor.created_at).where(anchor.id == after_id).scalar_subquery()
+            query = query.filter(
+                tuple_(VotunaTrackSuggestion.created_at, VotunaTrackSuggestion.id) < tuple_(anchor_created_at, after_id)
+            )
+        query = query.order_by(VotunaTrackSuggestion.created_at.desc(), VotunaTrackSuggestion.id.desc())
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
     def get_latest_rejected_by_track(
         self,
         db: Session,
@@ -58,5 +97,35 @@ class VotunaTrackSuggestionCRUD(
             .first()
         )
 
+    def list_cooccurrence_rows(
+        self,
+        db: Session,
+        *,
+        after_id: int = 0,
+        ids: Collection[int] | None = None,
+        limit: int,
+    ) -> Sequence[Row]:
+        """Return suggestion rows with the playlist provider and track metadata.
+
+        Rows have ids above ``after_id``, or one of the given ``ids`` when those are passed.
+        """
+        return (
+            db.query(
+                VotunaTrackSuggestion.id,
+                VotunaTrackSuggestion.playlist_id,
+                VotunaPlaylist.provider,
+                VotunaTrackSuggestion.provider_track_id,
+                VotunaTrackSuggestion.track_title,
+                VotunaTrackSuggestion.track_artist,
+                VotunaTrackSuggestion.track_artwork_url,
+                VotunaTrackSuggestion.track_url,
+            )
+            .join(VotunaPlaylist, VotunaPlaylist.id == VotunaTrackSuggestion.playlist_id)
+            .filter(VotunaTrackSuggestion.id.in_(ids) if ids is not None else VotunaTrackSuggestion.id > after_id)
+            .order_by(VotunaTrackSuggestion.id)
+            .limit(limit)
+            .all()
+        )
+
 
 votuna_track_suggestion_crud = VotunaTrackSuggestionCRUD(VotunaTrackSuggestion)
@@ -1,9 +1,17 @@
 """Votuna track vote CRUD helpers"""
 
+from collections.abc import Collection, Sequence
+
+from sqlalchemy import Row, and_, delete, func, select, update
 from sqlalchemy.orm import Session
 
 from app.crud.base import BaseCRUD
+from app.db.playlist_versions import bump_playlist_versions, lock_playlists
+from app.db.unit_of_work import unit_of_work
 from app.models.user import User
+from app.models.votuna_members import VotunaPlaylistMember
+from app.models.votuna_playlist import VotunaPlaylist
+from app.models.votuna_suggestions import VotunaTrackSuggestion
 from app.models.votuna_votes import VotunaTrackVote
 from app.schemas import VotunaTrackSuggestionCreate, VotunaTrackSuggestionUpdate
 
@@ -24,26 +32,134 @@ class VotunaTrackVoteCRUD(BaseCRUD[VotunaTrackVote, VotunaTrackSuggestionCreate,
         """Return whether the user already reacted for the suggestion."""
         return self.get_vote(db, suggestion_id, user_id) is not None
 
-    def set_reaction(self, db: Session, suggestion_id: int, user_id: int, reaction: str) -> VotunaTrackVote:
-        """Create or update a user's reaction for a suggestion."""
-        existing = self.get_vote(db, suggestion_id, user_id)
-        if existing:
-            return self.update(db, existing, {"reaction": reaction})
-        return self.create(
-            db,
-            {
-                "suggestion_id": suggestion_id,
-                "user_id": user_id,
-                "reaction": reaction,
-            },
+    def _lock_previous_reaction(self, db: Session, suggestion_id: int, user_id: int) -> str | None:
+        """Lock the suggestion's tally row and return the user's current reaction, if any.
+
+        The lock serializes concurrent reactions on one suggestion so each tally delta is
+        computed against the reaction it replaces. The playlist row is locked first, matching
+        the order ORM flushes use when they bump its version.
+        """
+        lock_playlists(db, suggestion_ids=[suggestion_id])
+        return db.execute(
+            select(VotunaTrackVote.reaction)
+            .select_from(VotunaTrackSuggestion)
+            .outerjoin(
+                VotunaTrackVote,
+                and_(VotunaTrackVote.suggestion_id == VotunaTrackSuggestion.id, VotunaTrackVote.user_id == user_id),
+            )
+            .where(VotunaTrackSuggestion.id == suggestion_id)
+            .with_for_update(of=VotunaTrackSuggestion)
+        ).scalar()
+
+    @staticmethod
+    def _apply_tally_delta(db: Session, suggestion_id: int, previous: str | None, current: str | None) -> None:
+        """Move the suggestion's counters from ``previous`` to ``current`` in SQL."""
+        upvotes = (current == "up") - (previous == "up")
+        downvotes = (current == "down") - (previous == "down")
+        voters = (current is not None) - (previous is not None)
+        if not (upvotes or downvotes or voters):
+            return
+        db.execute(
+            update(VotunaTrackSuggestion)
+            .where(VotunaTrackSuggestion.id == suggestion_id)
+            .values(
+                upvote_count=VotunaTrackSuggestion.upvote_count + upvotes,
+                downvote_count=VotunaTrackSuggestion.downvote_count + downvotes,
+                voter_count=VotunaTrackSuggestion.voter_count + voters,
+            )
+            .execution_options(synchronize_session=False)
         )
+        bump_playlist_versions(db, suggestion_ids=[suggestion_id])
+
+    def set_reaction(self, db: Session, suggestion_id: int, user_id: int, reaction: str) -> VotunaTrackVote:
+        """Create or update a user's reaction for a suggestion and adjust its tallies."""
+        with unit_of_work(db):
+            previous = self._lock_previous_reaction(db, suggestion_id, user_id)
+            (vote,) = self.bulk_upsert(
+                db,
+                [{"suggestion_id": suggestion_id, "user_id": user_id, "reaction": reaction}],
+                conflict_columns=("suggestion_id", "user_id"),
+                update_columns=("reaction",),
+            )
+            self._apply_tally_delta(db, suggestion_id, previous, reaction)
+        return vote
 
     def clear_reaction(self, db: Session, suggestion_id: int, user_id: int) -> bool:
-        """Delete a user's reaction for a suggestion."""
-        existing = self.get_vote(db, suggestion_id, user_id)
-        if not existing:
-            return False
-        return self.delete(db, existing.id)
+        """Delete a user's reaction for a suggestion and adjust its tallies."""
+        with unit_of_work(db):
+            previous = self._lock_previous_reaction(db, suggestion_id, user_id)
+            if previous is None:
+                return False
+            db.execute(
+                delete(VotunaTrackVote).where(
+                    VotunaTrackVote.suggestion_id == suggestion_id,
+                    VotunaTrackVote.user_id == user_id,
+                )
+            )
+            self._apply_tally_delta(db, suggestion_id, previous, None)
+        return True
+
+    def clear_member_reactions(self, db: Session, playlist_id: int, user_id: int) -> None:
+        """Take a departing member's reactions out of the playlist's tallies.
+
+        Reactions on pending suggestions are deleted so they cannot count if the user rejoins;
+        reactions on resolved suggestions are kept as history.
+        """
+        lock_playlists(db, playlist_ids=[playlist_id])
+        rows = db.execute(
+            select(VotunaTrackVote.suggestion_id, VotunaTrackVote.reaction, VotunaTrackSuggestion.status)
+            .join(VotunaTrackSuggestion, VotunaTrackSuggestion.id == VotunaTrackVote.suggestion_id)
+            .where(VotunaTrackSuggestion.playlist_id == playlist_id, VotunaTrackVote.user_id == user_id)
+            .with_for_update(of=VotunaTrackSuggestion)
+        ).all()
+        pending_ids = [suggestion_id for suggestion_id, _reaction, status in rows if status == "pending"]
+        if pending_ids:
+            db.execute(
+                delete(VotunaTrackVote).where(
+                    VotunaTrackVote.suggestion_id.in_(pending_ids),
+                    VotunaTrackVote.user_id == user_id,
+                )
+            )
+        for suggestion_id, reaction, _status in rows:
+            self._apply_tally_delta(db, suggestion_id, reaction, None)
+        self._commit(db)
+
+    def recount_tallies(self, db: Session, *, min_id: int, max_id: int) -> int:
+        """Recompute tallies of suggestions with ids in ``[min_id, max_id]`` from current members' votes.
+
+        Returns the number of suggestions rewritten.
+        """
+
+        def _member_votes(reaction: str | None = None):
+            query = (
+                select(func.count(VotunaTrackVote.id))
+                .join(
+                    VotunaPlaylistMember,
+                    and_(
+                        VotunaPlaylistMember.playlist_id == VotunaTrackSuggestion.playlist_id,
+                        VotunaPlaylistMember.user_id == VotunaTrackVote.user_id,
+                    ),
+                )
+                .where(VotunaTrackVote.suggestion_id == VotunaTrackSuggestion.id)
+            )
+            if reaction is not None:
+                query = query.where(VotunaTrackVote.reaction == reaction)
+            return query.scalar_subquery()
+
+        # Bump (and so lock) the playlists before touching their suggestion rows.
+        bump_playlist_versions(db, suggestion_ids=range(min_id, max_id + 1))
+        result = db.execute(
+            update(VotunaTrackSuggestion)
+            .where(VotunaTrackSuggestion.id.between(min_id, max_id))
+            .values(
+                upvote_count=_member_votes("up"),
+                downvote_count=_member_votes("down"),
+                voter_count=_member_votes(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self._commit(db)
+        return result.rowcount
 
     def count_reactions(self, db: Session, suggestion_id: int) -> dict[str, int]:
         """Return up/down/total reaction counts for the suggestion."""
@@ -70,6 +186,24 @@ class VotunaTrackVoteCRUD(BaseCRUD[VotunaTrackVote, VotunaTrackSuggestionCreate,
         )
         return {user_id: reaction for user_id, reaction in rows}
 
+    def get_reactions_by_suggestion(
+        self,
+        db: Session,
+        suggestion_ids: Sequence[int],
+    ) -> dict[int, dict[int, str]]:
+        """Return suggestion_id -> (user_id -> reaction) for many suggestions in one query."""
+        reactions: dict[int, dict[int, str]] = {suggestion_id: {} for suggestion_id in suggestion_ids}
+        if not reactions:
+            return reactions
+        rows = (
+            db.query(VotunaTrackVote.suggestion_id, VotunaTrackVote.user_id, VotunaTrackVote.reaction)
+            .filter(VotunaTrackVote.suggestion_id.in_(list(reactions)))
+            .all()
+        )
+        for suggestion_id, user_id, reaction in rows:
+            reactions[suggestion_id][user_id] = reaction
+        return reactions
+
     def list_reactor_display_names(
         self,
         db: Session,
@@ -93,5 +227,34 @@ class VotunaTrackVoteCRUD(BaseCRUD[VotunaTrackVote, VotunaTrackSuggestionCreate,
             names.append(display_name)
         return names
 
+    def list_vote_cooccurrence_rows(
+        self,
+        db: Session,
+        *,
+        after_id: int = 0,
+        ids: Collection[int] | None = None,
+        limit: int,
+    ) -> Sequence[Row]:
+        """Return (id, user_id, provider, provider_track_id, reaction) for votes.
+
+        Votes have ids above ``after_id``, or one of the given ``ids`` when those are passed.
+        Every reaction is returned so a reader's id watermark also moves past down-votes.
+        """
+        return (
+            db.query(
+                VotunaTrackVote.id,
+                VotunaTrackVote.user_id,
+                VotunaPlaylist.provider,
+                VotunaTrackSuggestion.provider_track_id,
+                VotunaTrackVote.reaction,
+            )
+            .join(VotunaTrackSuggestion, VotunaTrackSuggestion.id == VotunaTrackVote.suggestion_id)
+            .join(VotunaPlaylist, VotunaPlaylist.id == VotunaTrackSuggestion.playlist_id)
+            .filter(VotunaTrackVote.id.in_(ids) if ids is not None else VotunaTrackVote.id > after_id)
+            .order_by(VotunaTrackVote.id)
+            .limit(limit)
+            .all()
+        )
+
 
 votuna_track_vote_crud = VotunaTrackVoteCRUD(VotunaTrackVote)
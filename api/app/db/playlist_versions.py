@@ -0,0 +1,117 @@
+"""Per-playlist version counter that changes whenever a playlist's list endpoints would.
+
+ORM writes are caught at flush time: suggestions, votes, members, invites and track additions
+bump their playlist, edits to the playlist row bump itself, and profile edits bump every
+playlist the user owns or belongs to. Writes issued as bulk SQL statements bypass the flush and call
+``bump_playlist_versions`` themselves.
+
+Lock order: a transaction that writes both a playlist's version and its suggestion rows must
+lock the playlist row first. The flush listener does so naturally, since it bumps before the
+flush writes any row; code that locks suggestions with ``FOR UPDATE`` takes
+``lock_playlists`` beforehand, or two such transactions can deadlock on Postgres.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from itertools import chain
+
+from sqlalchemy import event, inspect, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.models.votuna_invites import VotunaPlaylistInvite
+from app.models.votuna_members import VotunaPlaylistMember
+from app.models.votuna_playlist import VotunaPlaylist
+from app.models.votuna_suggestions import VotunaTrackSuggestion
+from app.models.votuna_track_additions import VotunaTrackAddition
+from app.models.votuna_votes import VotunaTrackVote
+
+_PLAYLIST_CHILDREN = (VotunaTrackSuggestion, VotunaPlaylistMember, VotunaPlaylistInvite, VotunaTrackAddition)
+# User columns shown in member, suggestion and track listings.
+_PROFILE_COLUMNS = ("email", "first_name", "last_name", "display_name", "avatar_url", "permalink_url")
+
+
+def bump_playlist_versions(
+    db: Session,
+    *,
+    playlist_ids: Iterable[int] = (),
+    suggestion_ids: Iterable[int] = (),
+    member_user_ids: Iterable[int] = (),
+) -> None:
+    """Bump the playlists given directly, owning the suggestions, or owned by or shared with the users."""
+    conditions = []
+    if playlist_ids := sorted(set(playlist_ids)):
+        conditions.append(VotunaPlaylist.id.in_(playlist_ids))
+    if suggestion_ids := sorted(set(suggestion_ids)):
+        conditions.append(
+            VotunaPlaylist.id.in_(
+                select(VotunaTrackSuggestion.playlist_id).where(VotunaTrackSuggestion.id.in_(suggestion_ids))
+            )
+        )
+    if member_user_ids := sorted(set(member_user_ids)):
+        conditions.append(VotunaPlaylist.owner_user_id.in_(member_user_ids))
+        conditions.append(
+            VotunaPlaylist.id.in_(
+                select(VotunaPlaylistMember.playlist_id).where(VotunaPlaylistMember.user_id.in_(member_user_ids))
+            )
+        )
+    if not conditions:
+        return
+    db.execute(
+        update(VotunaPlaylist)
+        .where(or_(*conditions))
+        # Keep updated_at meaning "playlist metadata changed", not "something in the playlist did".
+        .values(version=VotunaPlaylist.version + 1, updated_at=VotunaPlaylist.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def lock_playlists(db: Session, *, playlist_ids: Iterable[int] = (), suggestion_ids: Iterable[int] = ()) -> None:
+    """Row-lock the given playlists, or those owning the suggestions, in id order."""
+    conditions = []
+    if playlist_ids := sorted(set(playlist_ids)):
+        conditions.append(VotunaPlaylist.id.in_(playlist_ids))
+    if suggestion_ids := sorted(set(suggestion_ids)):
+        conditions.append(
+            VotunaPlaylist.id.in_(
+                select(VotunaTrackSuggestion.playlist_id).where(VotunaTrackSuggestion.id.in_(suggestion_ids))
+            )
+        )
+    if not conditions:
+        return
+    db.execute(select(VotunaPlaylist.id).where(or_(*conditions)).order_by(VotunaPlaylist.id).with_for_update())
+
+
+def _has_changes(obj: object, columns: Iterable[str] | None = None) -> bool:
+    state = inspect(obj)
+    if columns is None:
+        columns = [attr.key for attr in state.mapper.column_attrs if attr.key not in {"version", "updated_at"}]
+    return any(state.attrs[column].history.has_changes() for column in columns)
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_versions_for_flush(session: Session, flush_context, instances) -> None:
+    playlist_ids: set[int] = set()
+    suggestion_ids: set[int] = set()
+    member_user_ids: set[int] = set()
+    dirty = session.dirty
+    for obj in chain(session.new, session.deleted, dirty):
+        if isinstance(obj, User):
+            if obj in dirty and _has_changes(obj, _PROFILE_COLUMNS):
+                member_user_ids.add(obj.id)
+            continue
+        if obj in dirty and not _has_changes(obj):
+            continue
+        if isinstance(obj, _PLAYLIST_CHILDREN) and obj.playlist_id is not None:
+            playlist_ids.add(obj.playlist_id)
+        elif isinstance(obj, VotunaTrackVote) and obj.suggestion_id is not None:
+            suggestion_ids.add(obj.suggestion_id)
+        elif isinstance(obj, VotunaPlaylist) and obj in dirty:
+            playlist_ids.add(obj.id)
+    bump_playlist_versions(
+        session,
+        playlist_ids=playlist_ids,
+        suggestion_ids=suggestion_ids,
+        member_user_ids=member_user_ids,
+    )
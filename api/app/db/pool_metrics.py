@@ -0,0 +1,77 @@
+"""Connection pool classes that record checkout waits, and snapshots of pool usage for metrics."""
+
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolCheckoutStats:
+    """Running totals of how long checkouts waited for a pooled connection."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, wait_seconds: float, *, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += wait_seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+
+    def snapshot(self) -> dict[str, float | int]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.timeouts,
+                "checkout_wait_ms_total": round(self.wait_seconds_total * 1000, 1),
+                "checkout_wait_ms_max": round(self.wait_seconds_max * 1000, 1),
+            }
+
+
+class _TimedCheckoutMixin:
+    # Class-level so the totals survive ``Pool.recreate()``, which builds a new instance on dispose.
+    checkout_stats: PoolCheckoutStats
+
+    def _do_get(self) -> Any:
+        started_at = time.perf_counter()
+        try:
+            entry = super()._do_get()  # type: ignore[misc]
+        except exc.TimeoutError:
+            self.checkout_stats.record(time.perf_counter() - started_at, timed_out=True)
+            raise
+        self.checkout_stats.record(time.perf_counter() - started_at)
+        return entry
+
+
+def timed_pool_class(*, is_async: bool) -> type[QueuePool]:
+    """Return a fresh ``QueuePool`` subclass with its own checkout stats, for one engine."""
+    base = AsyncAdaptedQueuePool if is_async else QueuePool
+    return type(f"Timed{base.__name__}", (_TimedCheckoutMixin, base), {"checkout_stats": PoolCheckoutStats()})
+
+
+def pool_snapshot(engine: Engine) -> dict[str, object]:
+    """Current size, usage and checkout waits of ``engine``'s pool, for the metrics endpoint."""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"pool": type(pool).__name__}
+    snapshot: dict[str, object] = {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+    stats = getattr(pool, "checkout_stats", None)
+    if isinstance(stats, PoolCheckoutStats):
+        snapshot.update(stats.snapshot())
+    return snapshot
@@ -1,19 +1,54 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
-from typing import Generator
+from sqlalchemy.pool import NullPool
+from typing import Any, AsyncGenerator, Generator
 
 from app.config.settings import settings
+from app.db.pool_metrics import timed_pool_class
+from app.db.urls import async_database_url, sync_database_url
 from app.models.base import BaseModel
 
+
+def engine_options(url: str, *, is_async: bool) -> dict[str, Any]:
+    """Pool and connection keyword arguments for ``create_engine`` built from settings."""
+    options: dict[str, Any] = {
+        "echo": settings.SQLALCHEMY_ECHO,
+        "pool_pre_ping": True,  # Verify connections before using them
+    }
+    if settings.DB_USE_NULL_POOL:
+        # PgBouncer already pools server connections; a second pool here would pin them.
+        options["poolclass"] = NullPool
+    else:
+        options.update(
+            poolclass=timed_pool_class(is_async=is_async),
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        )
+    timeout_ms = settings.DB_STATEMENT_TIMEOUT_MS
+    if timeout_ms > 0 and make_url(url).drivername.startswith("postgresql"):
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(timeout_ms)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout_ms}"}
+    return options
+
+
 # Create SQLAlchemy engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    echo=settings.SQLALCHEMY_ECHO,
-    pool_pre_ping=True,  # Verify connections before using them
-)
+_sync_url = sync_database_url(settings.DATABASE_URL)
+engine = create_engine(_sync_url, **engine_options(_sync_url, is_async=False))
+
+# Async engine (asyncpg) for async routes so DB I/O does not block the event loop
+_async_url = async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(_async_url, **engine_options(_async_url, is_async=True))
 
-# Create session factory
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects stay usable after commit; async sessions cannot lazy-load expired attributes.
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
 
 # Use the shared declarative base used by all ORM models.
 Base = BaseModel
@@ -26,3 +61,9 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for getting an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,52 @@
+"""Opt-in unit of work: CRUD writes only flush, and one commit happens at the end of the block."""
+
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+UNIT_OF_WORK_KEY = "unit_of_work_depth"
+
+
+def in_unit_of_work(db: Session | AsyncSession) -> bool:
+    """Return whether CRUD writes on ``db`` should flush instead of committing."""
+    return db.info.get(UNIT_OF_WORK_KEY, 0) > 0
+
+
+@contextmanager
+def unit_of_work(db: Session) -> Iterator[Session]:
+    """Group CRUD writes into one transaction, committed when the outermost block exits.
+
+    CRUD helpers flush inside the block so generated ids are still available, and skip the
+    per-row refresh. Any exception rolls the whole unit back.
+    """
+    outermost = not in_unit_of_work(db)
+    db.info[UNIT_OF_WORK_KEY] = db.info.get(UNIT_OF_WORK_KEY, 0) + 1
+    try:
+        yield db
+        if outermost:
+            db.commit()
+    except BaseException:
+        if outermost:
+            db.rollback()
+        raise
+    finally:
+        db.info[UNIT_OF_WORK_KEY] -= 1
+
+
+@asynccontextmanager
+async def unit_of_work_async(db: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """Async variant of ``unit_of_work``."""
+    outermost = not in_unit_of_work(db)
+    db.info[UNIT_OF_WORK_KEY] = db.info.get(UNIT_OF_WORK_KEY, 0) + 1
+    try:
+        yield db
+        if outermost:
+            await db.commit()
+    except BaseException:
+        if outermost:
+            await db.rollback()
+        raise
+    finally:
+        db.info[UNIT_OF_WORK_KEY] -= 1
@@ -0,0 +1,31 @@
+"""Helpers for deriving driver-specific database URLs from DATABASE_URL."""
+
+from sqlalchemy.engine import make_url
+
+ASYNC_POSTGRES_DRIVER = "postgresql+asyncpg"
+SYNC_POSTGRES_DRIVER = "postgresql+psycopg2"
+
+
+def sync_database_url(url: str) -> str:
+    """Return a URL usable by the synchronous (psycopg2) engine."""
+    parsed = make_url(url)
+    if parsed.drivername != ASYNC_POSTGRES_DRIVER:
+        return url
+    query = dict(parsed.query)
+    ssl = query.pop("ssl", None)
+    if ssl and "sslmode" not in query:
+        query["sslmode"] = ssl
+    return parsed.set(drivername=SYNC_POSTGRES_DRIVER, query=query).render_as_string(hide_password=False)
+
+
+def async_database_url(url: str) -> str:
+    """Return a URL usable by the asyncio (asyncpg) engine."""
+    parsed = make_url(url)
+    if not parsed.drivername.startswith("postgresql"):
+        return url
+    query = dict(parsed.query)
+    # asyncpg does not understand libpq's sslmode; it takes the same values as `ssl`.
+    sslmode = query.pop("sslmode", None)
+    if sslmode and "ssl" not in query:
+        query["ssl"] = sslmode
+    return parsed.set(drivername=ASYNC_POSTGRES_DRIVER, query=query).render_as_string(hide_password=False)
@@ -10,6 +10,8 @@ class BaseModel(DeclarativeBase):
     """Base model with common fields for all database models"""
 
     __abstract__ = True
+    # Load server-generated timestamps via RETURNING on flush so writes need no extra refresh.
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -10,6 +10,7 @@ from app.models.base import BaseModel
 
 if TYPE_CHECKING:
     from app.models.user_settings import UserSettings
+    from app.models.votuna_management_jobs import VotunaManagementJob
     from app.models.votuna_members import VotunaPlaylistMember
     from app.models.votuna_playlist import VotunaPlaylist
     from app.models.votuna_track_additions import VotunaTrackAddition
@@ -34,7 +35,7 @@ class User(BaseModel):
 
     access_token: Mapped[str | None]
     refresh_token: Mapped[str | None]
-    token_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    token_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
     last_login_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     is_active: Mapped[bool] = mapped_column(default=True, nullable=False)
@@ -63,3 +64,7 @@ class User(BaseModel):
         back_populates="user",
         cascade="all, delete-orphan",
     )
+    votuna_management_jobs: Mapped[list["VotunaManagementJob"]] = relationship(
+        back_populates="requested_by_user",
+        cascade="all, delete-orphan",
+    )
@@ -0,0 +1,59 @@
+"""Durable background jobs for playlist management transfers."""
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import JSON, DateTime, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base import BaseModel
+
+if TYPE_CHECKING:
+    from app.models.user import User
+    from app.models.votuna_playlist import VotunaPlaylist
+
+
+class VotunaManagementJob(BaseModel):
+    """A queued or running management transfer and its resumable progress.
+
+    ``track_ids`` is the planned list of tracks to add and ``next_index`` the cursor into it,
+    so a worker that picks up a crashed job continues where the last one stopped.
+    """
+
+    __tablename__ = "votuna_management_jobs"
+    __table_args__ = (Index("ix_votuna_management_jobs_status_available_at", "status", "available_at"),)
+
+    playlist_id: Mapped[int] = mapped_column(
+        ForeignKey("votuna_playlists.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    requested_by_user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    provider: Mapped[str] = mapped_column(nullable=False)
+    status: Mapped[str] = mapped_column(nullable=False, default="queued")
+    request: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+
+    source_provider_playlist_id: Mapped[str] = mapped_column(nullable=False)
+    source_title: Mapped[str] = mapped_column(nullable=False)
+    # Empty until the worker has created the destination for ``destination_create`` requests.
+    destination_provider_playlist_id: Mapped[str | None]
+    destination_title: Mapped[str] = mapped_column(nullable=False)
+    creates_destination: Mapped[bool] = mapped_column(default=False, nullable=False)
+
+    track_ids: Mapped[list[str] | None] = mapped_column(JSON)
+    next_index: Mapped[int] = mapped_column(default=0, nullable=False)
+    matched_count: Mapped[int] = mapped_column(default=0, nullable=False)
+    added_count: Mapped[int] = mapped_column(default=0, nullable=False)
+    skipped_duplicate_count: Mapped[int] = mapped_column(default=0, nullable=False)
+    failed_items: Mapped[list[dict[str, str]]] = mapped_column(JSON, default=list, nullable=False)
+    error: Mapped[str | None]
+
+    attempts: Mapped[int] = mapped_column(default=0, nullable=False)
+    available_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    locked_by: Mapped[str | None]
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+    playlist: Mapped["VotunaPlaylist"] = relationship(back_populates="management_jobs")
+    requested_by_user: Mapped["User"] = relationship("User", back_populates="votuna_management_jobs")
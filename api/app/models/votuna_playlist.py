@@ -11,6 +11,7 @@ from app.models.base import BaseModel
 if TYPE_CHECKING:
     from app.models.user import User
     from app.models.votuna_invites import VotunaPlaylistInvite
+    from app.models.votuna_management_jobs import VotunaManagementJob
     from app.models.votuna_members import VotunaPlaylistMember
     from app.models.votuna_playlist_settings import VotunaPlaylistSettings
     from app.models.votuna_suggestions import VotunaTrackSuggestion
@@ -34,6 +35,8 @@ class VotunaPlaylist(BaseModel):
     image_url: Mapped[str | None]
     is_active: Mapped[bool] = mapped_column(default=True, nullable=False)
     last_synced_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # Bumped on every write that changes what the playlist's list endpoints return; drives their ETags.
+    version: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
 
     owner: Mapped["User"] = relationship(back_populates="votuna_playlists")
     settings: Mapped["VotunaPlaylistSettings"] = relationship(
@@ -61,3 +64,7 @@ class VotunaPlaylist(BaseModel):
         back_populates="playlist",
         cascade="all, delete-orphan",
     )
+    management_jobs: Mapped[list["VotunaManagementJob"]] = relationship(
+        back_populates="playlist",
+        cascade="all, delete-orphan",
+    )
@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey
+from sqlalchemy import DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import BaseModel
@@ -18,6 +18,16 @@ class VotunaTrackSuggestion(BaseModel):
     """Track suggestions for Votuna playlists."""
 
     __tablename__ = "votuna_track_suggestions"
+    __table_args__ = (
+        # Serves keyset-paginated suggestion listing (newest first, optionally by status).
+        Index(
+            "ix_votuna_track_suggestions_playlist_status_created",
+            "playlist_id",
+            "status",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+    )
 
     playlist_id: Mapped[int] = mapped_column(
         ForeignKey("votuna_playlists.id", ondelete="CASCADE"), nullable=False, index=True
@@ -32,6 +42,10 @@ class VotunaTrackSuggestion(BaseModel):
     resolved_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     resolved_by_user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"))
     resolution_reason: Mapped[str | None]
+    # Tallies of reactions from current playlist members, kept in step with votuna_track_votes.
+    upvote_count: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
+    downvote_count: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
+    voter_count: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
 
     playlist: Mapped["VotunaPlaylist"] = relationship(back_populates="suggestions")
     votes: Mapped[list["VotunaTrackVote"]] = relationship(
@@ -31,6 +31,10 @@ from app.schemas.votuna_playlist_management import (
     ManagementFacetsRequest,
     ManagementFacetsResponse,
     ManagementFailedItem,
+    ManagementJobCreate,
+    ManagementJobOut,
+    ManagementJobStatus,
+    ManagementJobUpdate,
     ManagementPlaylistRef,
     ManagementPlaylistSummary,
     ManagementPreviewResponse,
@@ -103,6 +107,10 @@ __all__ = [
     "ManagementFacetsRequest",
     "ManagementFacetsResponse",
     "ManagementFailedItem",
+    "ManagementJobCreate",
+    "ManagementJobOut",
+    "ManagementJobStatus",
+    "ManagementJobUpdate",
     "ManagementPlaylistRef",
     "ManagementPlaylistSummary",
     "ManagementPreviewResponse",
@@ -1,6 +1,7 @@
 """Schemas for playlist management transfer flows."""
 
-from typing import Annotated, Literal
+from datetime import datetime
+from typing import Annotated, Any, Literal
 
 from pydantic import BaseModel, Field
 
@@ -8,6 +9,7 @@ from app.schemas.votuna_playlist import MusicProvider, ProviderTrackOut
 
 ManagementDirection = Literal["import_to_current", "export_from_current"]
 ManagementSelectionMode = Literal["all", "genre", "artist", "songs"]
+ManagementJobStatus = Literal["queued", "running", "succeeded", "failed"]
 
 
 class ManagementProviderPlaylistRef(BaseModel):
@@ -42,7 +44,9 @@ class ManagementSourceTracksRequest(BaseModel):
 
 class ManagementSourceTracksResponse(BaseModel):
     tracks: list[ProviderTrackOut] = Field(default_factory=list)
+    # Matches seen so far; a lower bound on the full count while ``has_more`` is true.
     total_count: int
+    has_more: bool = False
     limit: int
     offset: int
 
@@ -103,3 +107,54 @@ class ManagementExecuteResponse(BaseModel):
     skipped_duplicate_count: int
     failed_count: int
     failed_items: list[ManagementFailedItem] = Field(default_factory=list)
+
+
+class ManagementJobCreate(BaseModel):
+    playlist_id: int
+    requested_by_user_id: int
+    provider: MusicProvider
+    request: dict[str, Any]
+    source_provider_playlist_id: str
+    source_title: str
+    destination_provider_playlist_id: str | None = None
+    destination_title: str
+    creates_destination: bool = False
+    available_at: datetime
+
+
+class ManagementJobUpdate(BaseModel):
+    status: ManagementJobStatus | None = None
+    destination_provider_playlist_id: str | None = None
+    destination_title: str | None = None
+    track_ids: list[str] | None = None
+    next_index: int | None = None
+    matched_count: int | None = None
+    added_count: int | None = None
+    skipped_duplicate_count: int | None = None
+    failed_items: list[dict[str, str]] | None = None
+    error: str | None = None
+    available_at: datetime | None = None
+    heartbeat_at: datetime | None = None
+    finished_at: datetime | None = None
+
+
+class ManagementJobOut(BaseModel):
+    id: int
+    playlist_id: int
+    status: ManagementJobStatus
+    source: ManagementPlaylistSummary
+    destination: ManagementPlaylistSummary
+    created_destination: ManagementPlaylistSummary | None = None
+    # Zero until the worker has planned the transfer.
+    total_count: int
+    processed_count: int
+    matched_count: int
+    added_count: int
+    skipped_duplicate_count: int
+    failed_count: int
+    failed_items: list[ManagementFailedItem] = Field(default_factory=list)
+    error: str | None = None
+    attempts: int
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
@@ -0,0 +1,377 @@
+"""Durable background execution of playlist management transfers.
+
+``POST /management/jobs`` only records a job row; workers in every API process poll the
+``votuna_management_jobs`` table, so no external broker is needed. A job first plans its
+transfer (the track ids to add), checks it against the per-job cap, creates the destination
+playlist if asked to and then adds the tracks chunk by chunk, persisting the cursor after
+each chunk in the same transaction as that chunk's provenance rows. A side task heartbeats while the job runs, so slow planning or a long provider
+call does not look like a crash. A worker that dies mid-job stops heartbeating, and another
+worker takes the job over from the last saved chunk once the heartbeat is stale.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import socket
+import uuid
+from collections.abc import Callable
+from contextlib import asynccontextmanager, suppress
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Any, AsyncIterator, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.crud.user import user_crud
+from app.crud.votuna_management_job import votuna_management_job_crud
+from app.db.session import AsyncSessionLocal
+from app.db.unit_of_work import unit_of_work
+from app.models.votuna_management_jobs import VotunaManagementJob
+from app.schemas.votuna_playlist_management import ManagementTransferRequest
+from app.services.music_providers import (
+    MusicProviderClient,
+    ProviderAPIError,
+    ProviderAuthError,
+    ProviderRateLimitError,
+    ProviderUnavailableError,
+    get_provider_client_for_user,
+)
+from app.services.playlist_transfers import (
+    ADD_CHUNK_SIZE,
+    add_track_chunk,
+    dedupe_tracks_by_id,
+    filter_tracks_by_selection,
+    publish_transfer_additions,
+    record_transfer_additions,
+)
+
+logger = logging.getLogger(__name__)
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+_worker_task: asyncio.Task | None = None
+_worker_stop: asyncio.Event | None = None
+_worker_wake: asyncio.Event | None = None
+
+_T = TypeVar("_T")
+
+
+class _LeaseLost(Exception):
+    """The job was taken over by another worker; stop touching it."""
+
+
+class _JobRun:
+    """Progress of one claimed job, written back only while this worker holds the lease."""
+
+    def __init__(self, db: AsyncSession, job: VotunaManagementJob, worker_id: str) -> None:
+        self.db = db
+        self.job = job
+        # Kept apart from ``job``: a rolled-back save expires it, and reloading would need IO.
+        self.job_id = job.id
+        self.worker_id = worker_id
+
+    async def save(self, values: dict[str, Any]) -> None:
+        await self.save_with(values, lambda session: None)
+
+    async def save_with(self, values: dict[str, Any], write: Callable[[Session], _T]) -> _T:
+        """Run ``write`` and save ``values`` in one transaction, committed only while the lease is held."""
+        values = {"heartbeat_at": datetime.now(timezone.utc), **values}
+
+        def _write_and_save(session: Session) -> _T:
+            with unit_of_work(session):
+                written = write(session)
+                if not votuna_management_job_crud.update_if_locked(session, self.job_id, self.worker_id, values):
+                    raise _LeaseLost()
+            return written
+
+        return await self.db.run_sync(_write_and_save)
+
+    @asynccontextmanager
+    async def heartbeating(self) -> AsyncIterator[None]:
+        """Keep the lease fresh from a side task while the body runs, however long one step takes."""
+        task = asyncio.create_task(self._heartbeat())
+        try:
+            yield
+        finally:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+    async def _heartbeat(self) -> None:
+        interval = settings.MANAGEMENT_JOB_STALE_AFTER_SECONDS / 3
+        # Own session: the job's session is busy with the step being covered.
+        async with AsyncSession(self.db.bind) as session:
+            while True:
+                await asyncio.sleep(interval)
+                values = {"heartbeat_at": datetime.now(timezone.utc)}
+                try:
+                    alive = await session.run_sync(
+                        lambda sync_session: votuna_management_job_crud.update_if_locked(
+                            sync_session, self.job_id, self.worker_id, values
+                        )
+                    )
+                except Exception:
+                    logger.exception("Heartbeat for management job %s failed", self.job_id)
+                    await session.rollback()
+                    continue
+                if not alive:
+                    # The step in flight finishes; its save then raises _LeaseLost.
+                    return
+
+    async def finish(self, status: str, *, error: str | None = None) -> None:
+        await self.save(
+            {"status": status, "error": error, "locked_by": None, "finished_at": datetime.now(timezone.utc)}
+        )
+
+    async def requeue(self, delay_seconds: float) -> None:
+        """Hand the job back to the queue; the next claim resumes from the saved cursor."""
+        await self.save(
+            {
+                "status": "queued",
+                "locked_by": None,
+                # Deliberate hand-offs do not count towards the crash limit.
+                "attempts": 0,
+                "available_at": datetime.now(timezone.utc) + timedelta(seconds=max(delay_seconds, 0.0)),
+            }
+        )
+
+
+async def _destination_track_ids(client: MusicProviderClient, provider_playlist_id: str) -> set[str]:
+    tracks = await client.list_tracks(provider_playlist_id)
+    return {track.provider_track_id for track in tracks if track.provider_track_id}
+
+
+async def _plan(run: _JobRun, client: MusicProviderClient, request: ManagementTransferRequest) -> list[str]:
+    job = run.job
+    source_tracks = await client.list_tracks(job.source_provider_playlist_id)
+    matched_tracks = dedupe_tracks_by_id(
+        filter_tracks_by_selection(source_tracks, request.selection_mode, request.selection_values)
+    )
+    destination_track_ids: set[str] = set()
+    if not job.creates_destination:
+        # A destination to create does not exist yet: it is only created once the plan is accepted.
+        assert job.destination_provider_playlist_id is not None
+        destination_track_ids = await _destination_track_ids(client, job.destination_provider_playlist_id)
+    to_add_track_ids = [
+        track.provider_track_id for track in matched_tracks if track.provider_track_id not in destination_track_ids
+    ]
+    await run.save(
+        {
+            "track_ids": to_add_track_ids,
+            "next_index": 0,
+            "matched_count": len(matched_tracks),
+            "skipped_duplicate_count": len(matched_tracks) - len(to_add_track_ids),
+        }
+    )
+    return to_add_track_ids
+
+
+async def _execute(run: _JobRun, client: MusicProviderClient, stop_event: asyncio.Event | None) -> None:
+    job = run.job
+    request = ManagementTransferRequest.model_validate(job.request)
+
+    already_present: set[str] = set()
+    if job.track_ids is None:
+        track_ids = await _plan(run, client, request)
+        if len(track_ids) > settings.MANAGEMENT_JOB_MAX_TRACKS:
+            # Checked before creating a destination so a rejected job leaves no empty playlist behind.
+            await run.finish(
+                "failed",
+                error=f"Transfer exceeds max tracks per job ({settings.MANAGEMENT_JOB_MAX_TRACKS})",
+            )
+            return
+    else:
+        track_ids = list(job.track_ids)
+        if job.next_index < len(track_ids) and job.destination_provider_playlist_id is not None:
+            # A previous worker may have added part of a chunk before it stopped.
+            already_present = await _destination_track_ids(client, job.destination_provider_playlist_id)
+
+    if job.creates_destination and job.destination_provider_playlist_id is None:
+        assert request.destination_create is not None
+        created = await client.create_playlist(
+            title=request.destination_create.title,
+            description=request.destination_create.description,
+            is_public=request.destination_create.is_public,
+        )
+        job.destination_provider_playlist_id = created.provider_playlist_id
+        job.destination_title = created.title
+        # Saved before adding anything so a resumed job never creates a second playlist.
+        await run.save(
+            {"destination_provider_playlist_id": created.provider_playlist_id, "destination_title": created.title}
+        )
+    destination_id = job.destination_provider_playlist_id
+    assert destination_id is not None
+
+    next_index = job.next_index
+    added_count = job.added_count
+    failed_items = list(job.failed_items or [])
+    while next_index < len(track_ids):
+        if stop_event is not None and stop_event.is_set():
+            await run.requeue(0)
+            return
+        chunk = track_ids[next_index : next_index + ADD_CHUNK_SIZE]
+        pending = [track_id for track_id in chunk if track_id not in already_present]
+        result = await add_track_chunk(client, destination_id, pending) if pending else None
+        processed = len(chunk)
+        if result is not None and result.deferred_track_ids:
+            # Planned ids are unique, so the first deferred id marks where to resume.
+            processed = chunk.index(result.deferred_track_ids[0])
+        added_track_ids = [track_id for track_id in chunk[:processed] if track_id in already_present]
+        if result is not None:
+            added_track_ids.extend(result.added_track_ids)
+            failed_items.extend(item.model_dump() for item in result.failed_items)
+
+        next_index += processed
+        added_count += len(added_track_ids)
+        progress = {"next_index": next_index, "added_count": added_count, "failed_items": failed_items}
+        if added_track_ids:
+            added_at = datetime.now(timezone.utc)
+            # Provenance commits with the cursor, so a takeover never records this chunk twice.
+            playlist_ids = await run.save_with(
+                progress,
+                partial(
+                    record_transfer_additions,
+                    provider=job.provider,
+                    provider_playlist_id=destination_id,
+                    track_ids=added_track_ids,
+                    added_by_user_id=job.requested_by_user_id,
+                    added_at=added_at,
+                ),
+            )
+            publish_transfer_additions(
+                playlist_ids,
+                added_track_ids,
+                added_at=added_at,
+                added_by_user_id=job.requested_by_user_id,
+            )
+        else:
+            await run.save(progress)
+
+        if result is not None and result.deferred_error is not None:
+            retry_after = result.deferred_error.retry_after
+            await run.requeue(retry_after if retry_after is not None else settings.MANAGEMENT_JOB_RETRY_DELAY_SECONDS)
+            return
+
+    await run.finish("succeeded")
+
+
+async def run_management_job(
+    db: AsyncSession,
+    job: VotunaManagementJob,
+    *,
+    worker_id: str = WORKER_ID,
+    stop_event: asyncio.Event | None = None,
+) -> None:
+    """Run a claimed job until it finishes, the provider defers it or the worker is asked to stop.
+
+    A rate limit or an unavailable provider hands the job back to the queue until its
+    ``Retry-After`` has passed.
+    """
+    run = _JobRun(db, job, worker_id)
+    try:
+        owner = await user_crud.get_async(db, job.requested_by_user_id)
+        if owner is None or not owner.access_token:
+            await run.finish("failed", error="Playlist owner is no longer connected to the provider")
+            return
+        try:
+            client = get_provider_client_for_user(job.provider, owner, db=db)
+        except ValueError as exc:
+            await run.finish("failed", error=str(exc))
+            return
+        try:
+            async with run.heartbeating():
+                await _execute(run, client, stop_event)
+        except ProviderAuthError:
+            await run.finish("failed", error="Provider authorization expired or invalid")
+        except (ProviderRateLimitError, ProviderUnavailableError) as exc:
+            retry_after = exc.retry_after
+            await run.requeue(retry_after if retry_after is not None else settings.MANAGEMENT_JOB_RETRY_DELAY_SECONDS)
+        except ProviderAPIError as exc:
+            await run.finish("failed", error=str(exc))
+    except _LeaseLost:
+        logger.warning("Management job %s was taken over by another worker", run.job_id)
+
+
+async def run_pending_management_jobs(
+    db: AsyncSession,
+    *,
+    worker_id: str = WORKER_ID,
+    stop_event: asyncio.Event | None = None,
+) -> int:
+    """Claim and run runnable jobs one after another until none are left; return how many ran."""
+    ran = 0
+    while stop_event is None or not stop_event.is_set():
+        now = datetime.now(timezone.utc)
+        job = await db.run_sync(
+            lambda session: votuna_management_job_crud.claim_next(
+                session,
+                worker_id=worker_id,
+                now=now,
+                stale_before=now - timedelta(seconds=settings.MANAGEMENT_JOB_STALE_AFTER_SECONDS),
+                max_attempts=settings.MANAGEMENT_JOB_MAX_ATTEMPTS,
+            )
+        )
+        if job is None:
+            break
+        job_id = job.id
+        try:
+            await run_management_job(db, job, worker_id=worker_id, stop_event=stop_event)
+        except Exception:
+            logger.exception("Management job %s failed unexpectedly", job_id)
+            await db.rollback()
+            # Left running; the stale-heartbeat takeover retries it up to the attempt limit.
+        ran += 1
+    return ran
+
+
+async def _run_worker(stop_event: asyncio.Event, wake_event: asyncio.Event) -> None:
+    while not stop_event.is_set():
+        wake_event.clear()
+        try:
+            async with AsyncSessionLocal() as db:
+                await run_pending_management_jobs(db, stop_event=stop_event)
+        except Exception:
+            logger.exception("Management job poll failed")
+        # Jitter keeps workers that started together from polling in lockstep.
+        delay = settings.MANAGEMENT_JOB_POLL_INTERVAL_SECONDS * random.uniform(1.0, 1.5)
+        try:
+            await asyncio.wait_for(wake_event.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+
+def notify_management_job_queued() -> None:
+    """Wake this process's worker so a freshly queued job does not wait for the next poll."""
+    if _worker_wake is not None:
+        _worker_wake.set()
+
+
+def start_management_job_worker() -> None:
+    """Start the job worker for this process if enabled and not yet running."""
+    global _worker_task, _worker_stop, _worker_wake
+    if not settings.MANAGEMENT_JOB_WORKER_ENABLED:
+        return
+    if _worker_task is not None and not _worker_task.done():
+        return
+    _worker_stop = asyncio.Event()
+    _worker_wake = asyncio.Event()
+    _worker_task = asyncio.create_task(_run_worker(_worker_stop, _worker_wake))
+
+
+async def stop_management_job_worker() -> None:
+    """Stop the job worker, handing an in-flight job back to the queue after its current chunk."""
+    global _worker_task, _worker_stop, _worker_wake
+    task, stop_event, wake_event = _worker_task, _worker_stop, _worker_wake
+    _worker_task = None
+    _worker_stop = None
+    _worker_wake = None
+    if task is None or stop_event is None or wake_event is None:
+        return
+    stop_event.set()
+    wake_event.set()
+    await task
@@ -5,8 +5,11 @@ from app.services.music_providers.base import (
     ProviderUser,
     ProviderAuthError,
     ProviderAPIError,
+    ProviderRateLimitError,
+    ProviderUnavailableError,
 )
 from app.services.music_providers.factory import get_music_provider
+from app.services.music_providers.mutations import PlaylistMutation
 from app.services.music_providers.session import get_provider_client_for_user
 
 __all__ = [
@@ -16,6 +19,9 @@ __all__ = [
     "ProviderUser",
     "ProviderAuthError",
     "ProviderAPIError",
+    "ProviderRateLimitError",
+    "ProviderUnavailableError",
+    "PlaylistMutation",
     "get_music_provider",
     "get_provider_client_for_user",
 ]
@@ -1,19 +1,25 @@
 """Base classes for music provider integrations."""
 
+from collections.abc import AsyncIterator
+from contextlib import AbstractAsyncContextManager
 from dataclasses import dataclass
-from typing import Sequence
+from typing import Any, Sequence
 
-
-class ProviderAuthError(Exception):
-    """Raised when provider auth is missing or expired."""
-
-
-class ProviderAPIError(Exception):
-    """Raised when provider API returns a non-auth error."""
-
-    def __init__(self, message: str, status_code: int | None = None) -> None:
-        super().__init__(message)
-        self.status_code = status_code
+from app.services.music_providers.errors import (  # noqa: F401 - re-exported
+    ProviderAPIError,
+    ProviderAuthError,
+    ProviderRateLimitError,
+    ProviderUnavailableError,
+)
+from app.services.music_providers.http_client import provider_http_client
+from app.services.music_providers.mutations import PlaylistMutation
+from app.services.music_providers.track_cache import (
+    CachedTrackList,
+    playlist_track_cache,
+    token_digest,
+    track_cache_key,
+    track_list_fingerprint,
+)
 
 
 @dataclass
@@ -38,6 +44,16 @@ class ProviderTrack:
     url: str | None = None
 
 
+@dataclass
+class FetchedTracks:
+    """Result of a (possibly conditional) playlist track fetch."""
+
+    tracks: Sequence[ProviderTrack]
+    validator: str | None = None
+    not_modified: bool = False
+    title: str | None = None
+
+
 @dataclass
 class ProviderUser:
     provider_user_id: str
@@ -55,6 +71,10 @@ class MusicProviderClient:
     def __init__(self, access_token: str):
         self.access_token = access_token
 
+    def _http_client(self, **kwargs: Any) -> AbstractAsyncContextManager[Any]:
+        """Open a provider HTTP client whose requests are scheduled under this access token."""
+        return provider_http_client(provider=self.provider, access_token=self.access_token, **kwargs)
+
     async def list_playlists(self) -> Sequence[ProviderPlaylist]:
         raise NotImplementedError
 
@@ -77,15 +97,147 @@ class MusicProviderClient:
     ) -> ProviderPlaylist:
         raise NotImplementedError
 
+    def _track_cache_key(self, provider_playlist_id: str) -> tuple[str, str]:
+        return track_cache_key(self.provider, provider_playlist_id)
+
     async def list_tracks(self, provider_playlist_id: str) -> Sequence[ProviderTrack]:
+        """List playlist tracks, serving and revalidating the shared track cache.
+
+        Entries are only served without a provider call to the token that filled them; any other
+        token revalidates, so the provider still decides whether it may see the playlist.
+        """
+        cache_key = self._track_cache_key(provider_playlist_id)
+        entry = playlist_track_cache.get_entry(cache_key)
+        if entry is not None and entry.is_fresh and self._filled_cache(entry.value):
+            return list(entry.value.tracks)
+        validator = entry.value.validator if entry is not None else None
+        fetched = await self.fetch_tracks(provider_playlist_id, validator=validator)
+        if fetched.not_modified and entry is not None:
+            playlist_track_cache.touch(cache_key)
+            return list(entry.value.tracks)
+        self._store_cached_tracks(
+            provider_playlist_id,
+            fetched.tracks,
+            validator=fetched.validator,
+            title=fetched.title,
+        )
+        return list(fetched.tracks)
+
+    @property
+    def _token_digest(self) -> str:
+        return token_digest(self.access_token)
+
+    def _filled_cache(self, cached: CachedTrackList) -> bool:
+        """Whether this client's token filled ``cached`` and may read it without asking the provider."""
+        return cached.filled_by == self._token_digest
+
+    def _own_fresh_cached_tracks(self, provider_playlist_id: str) -> CachedTrackList | None:
+        """Return the cached list while it is fresh and was filled by this client's token."""
+        entry = playlist_track_cache.get_entry(self._track_cache_key(provider_playlist_id))
+        if entry is None or not entry.is_fresh or not self._filled_cache(entry.value):
+            return None
+        return entry.value
+
+    def cached_tracks_fingerprint(self, provider_playlist_id: str) -> str | None:
+        """Fingerprint of this token's cached track list while it is fresh, without calling the provider."""
+        cached = self._own_fresh_cached_tracks(provider_playlist_id)
+        return track_list_fingerprint(cached.tracks) if cached is not None else None
+
+    async def iter_tracks(self, provider_playlist_id: str) -> AsyncIterator[ProviderTrack]:
+        """Yield playlist tracks in order, fetching one provider page at a time when uncached.
+
+        Callers may stop early. A cached list is served (and revalidated) through
+        ``list_tracks``; a stream that runs to the end is stored in the track cache.
+        """
+        cache_key = self._track_cache_key(provider_playlist_id)
+        if playlist_track_cache.get_entry(cache_key) is not None:
+            for track in await self.list_tracks(provider_playlist_id):
+                yield track
+            return
+        collected: list[ProviderTrack] = []
+        last_page: FetchedTracks | None = None
+        async for page in self._iter_track_pages(provider_playlist_id):
+            last_page = page
+            for track in page.tracks:
+                collected.append(track)
+                yield track
+        self._store_cached_tracks(
+            provider_playlist_id,
+            collected,
+            validator=last_page.validator if last_page is not None else None,
+            title=last_page.title if last_page is not None else None,
+        )
+
+    async def _iter_track_pages(self, provider_playlist_id: str) -> AsyncIterator[FetchedTracks]:
+        """Yield playlist tracks page by page; providers with paged listings override this."""
+        yield await self.fetch_tracks(provider_playlist_id)
+
+    async def fetch_tracks(
+        self,
+        provider_playlist_id: str,
+        validator: str | None = None,
+    ) -> FetchedTracks:
+        """Fetch playlist tracks from the provider, skipping the body when ``validator`` still matches."""
         raise NotImplementedError
 
+    def _store_cached_tracks(
+        self,
+        provider_playlist_id: str,
+        tracks: Sequence[ProviderTrack],
+        validator: str | None = None,
+        title: str | None = None,
+    ) -> None:
+        playlist_track_cache.set(
+            self._track_cache_key(provider_playlist_id),
+            CachedTrackList(tracks=tuple(tracks), validator=validator, title=title, filled_by=self._token_digest),
+        )
+
+    def _patch_cached_tracks(self, provider_playlist_id: str, removed_keys: set[str]) -> None:
+        """Drop removed tracks from a cached list without refetching it."""
+        cache_key = self._track_cache_key(provider_playlist_id)
+        entry = playlist_track_cache.get_entry(cache_key)
+        if entry is None or not entry.is_fresh or not self._filled_cache(entry.value):
+            playlist_track_cache.pop(cache_key)
+            return
+        kept = [
+            track for track in entry.value.tracks if self._cached_track_key(track.provider_track_id) not in removed_keys
+        ]
+        # The provider-side revision moved on; force a full fetch on the next revalidation.
+        playlist_track_cache.set(
+            cache_key,
+            CachedTrackList(tracks=tuple(kept), validator=None, title=entry.value.title, filled_by=self._token_digest),
+        )
+
+    def _cached_track_key(self, provider_track_id: str) -> str:
+        return provider_track_id.strip()
+
+    def invalidate_cached_tracks(self, provider_playlist_id: str) -> None:
+        """Forget the cached track list for a playlist."""
+        playlist_track_cache.pop(self._track_cache_key(provider_playlist_id))
+
     async def add_tracks(self, provider_playlist_id: str, track_ids: Sequence[str]) -> None:
         raise NotImplementedError
 
     async def remove_tracks(self, provider_playlist_id: str, track_ids: Sequence[str]) -> None:
         raise NotImplementedError
 
+    async def reorder_tracks(self, provider_playlist_id: str, ordered_ids: Sequence[str]) -> None:
+        """Reorder playlist tracks in place; tracks missing from ``ordered_ids`` keep their order at the end."""
+        raise NotImplementedError
+
+    async def apply_track_mutation(self, provider_playlist_id: str, mutation: PlaylistMutation) -> None:
+        """Apply a batch of adds, removes and an optional reorder to a playlist.
+
+        This fallback issues separate remove/add/reorder calls; providers that rewrite the
+        whole track list per update override it to apply the batch in one write.
+        """
+        if mutation.remove:
+            await self.remove_tracks(provider_playlist_id, mutation.remove)
+        if mutation.add:
+            await self.add_tracks(provider_playlist_id, mutation.add)
+        if mutation.order is not None:
+            await self.reorder_tracks(provider_playlist_id, mutation.order)
+
     async def search_tracks(self, query: str, limit: int = 10) -> Sequence[ProviderTrack]:
         """Search tracks by free-text query."""
         raise NotImplementedError
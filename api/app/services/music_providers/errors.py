@@ -0,0 +1,29 @@
+"""Errors raised by music provider integrations."""
+
+
+class ProviderAuthError(Exception):
+    """Raised when provider auth is missing or expired."""
+
+
+class ProviderAPIError(Exception):
+    """Raised when provider API returns a non-auth error."""
+
+    def __init__(self, message: str, status_code: int | None = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ProviderRateLimitError(ProviderAPIError):
+    """Raised when the provider keeps rate-limiting a request after scheduled retries."""
+
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        super().__init__(message, status_code=429)
+        self.retry_after = retry_after
+
+
+class ProviderUnavailableError(ProviderAPIError):
+    """Raised without calling the provider while its circuit breaker is open, or when a call times out."""
+
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        super().__init__(message, status_code=503)
+        self.retry_after = retry_after
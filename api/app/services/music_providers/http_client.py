@@ -0,0 +1,152 @@
+"""Shared HTTP transport for provider API calls.
+
+The application opens a single pooled ``httpx.AsyncClient`` at startup so
+provider calls reuse TCP/TLS connections (and HTTP/2 streams when ``h2`` is
+installed) instead of paying a new handshake per request. Code running
+outside the app lifespan (scripts, tests) transparently falls back to a
+short-lived client per call.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+import httpx
+
+from app.config.settings import settings
+from app.services.music_providers.rate_limit import ScheduledProviderClient, rate_limit_token_key
+
+logger = logging.getLogger(__name__)
+
+_shared_client: httpx.AsyncClient | None = None
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def build_pool_limits() -> httpx.Limits:
+    """Build connection pool limits from settings."""
+    return httpx.Limits(
+        max_connections=settings.PROVIDER_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.PROVIDER_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.PROVIDER_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    )
+
+
+async def open_shared_client() -> httpx.AsyncClient:
+    """Create the process-wide provider HTTP client if it does not exist yet."""
+    global _shared_client
+    if _shared_client is not None and not _shared_client.is_closed:
+        return _shared_client
+    use_http2 = settings.PROVIDER_HTTP2_ENABLED and _http2_available()
+    if settings.PROVIDER_HTTP2_ENABLED and not use_http2:
+        logger.info("HTTP/2 requested for provider calls but h2 is not installed; using HTTP/1.1")
+    _shared_client = httpx.AsyncClient(
+        limits=build_pool_limits(),
+        http2=use_http2,
+        timeout=settings.PROVIDER_HTTP_TIMEOUT_SECONDS,
+    )
+    return _shared_client
+
+
+async def close_shared_client() -> None:
+    """Close the process-wide provider HTTP client and release its connections."""
+    global _shared_client
+    client = _shared_client
+    _shared_client = None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+def get_shared_client() -> httpx.AsyncClient | None:
+    """Return the open shared client, if any."""
+    if _shared_client is None or _shared_client.is_closed:
+        return None
+    return _shared_client
+
+
+class BoundProviderClient:
+    """View over the shared client with a fixed base URL, timeout and redirect policy."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        *,
+        base_url: str | None,
+        timeout: float,
+        follow_redirects: bool,
+    ) -> None:
+        self._client = client
+        self._base_url = (base_url or "").rstrip("/")
+        self._timeout = timeout
+        self._follow_redirects = follow_redirects
+
+    def _resolve_url(self, url: str) -> str:
+        if url.startswith(("http://", "https://")) or not self._base_url:
+            return url
+        return f"{self._base_url}/{url.lstrip('/')}"
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        kwargs.setdefault("timeout", self._timeout)
+        kwargs.setdefault("follow_redirects", self._follow_redirects)
+        return await self._client.request(method, self._resolve_url(url), **kwargs)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+
+@asynccontextmanager
+async def provider_http_client(
+    *,
+    base_url: str | None = None,
+    timeout: float = 15,
+    follow_redirects: bool = False,
+    provider: str | None = None,
+    access_token: str | None = None,
+) -> AsyncIterator[Any]:
+    """Yield an HTTP client for provider calls, reusing the shared pool when open.
+
+    When ``provider`` is given, requests go through the provider request scheduler, keyed
+    by ``access_token``, so they respect rate limits and retry 429s.
+    """
+    shared = get_shared_client()
+    if shared is not None:
+        client: Any = BoundProviderClient(
+            shared,
+            base_url=base_url,
+            timeout=timeout,
+            follow_redirects=follow_redirects,
+        )
+        yield _scheduled(client, provider, access_token)
+        return
+
+    client_kwargs: dict[str, Any] = {"timeout": timeout}
+    if base_url:
+        client_kwargs["base_url"] = base_url
+    if follow_redirects:
+        client_kwargs["follow_redirects"] = True
+    async with httpx.AsyncClient(**client_kwargs) as client:
+        yield _scheduled(client, provider, access_token)
+
+
+def _scheduled(client: Any, provider: str | None, access_token: str | None) -> Any:
+    if provider is None:
+        return client
+    return ScheduledProviderClient(client, provider=provider, token_key=rate_limit_token_key(access_token))
@@ -0,0 +1,116 @@
+"""Batched playlist track mutations and the planner that applies them to a track list."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class PlaylistMutation:
+    """A batch of track changes to apply to one playlist in a single step."""
+
+    add: Sequence[str] = ()
+    remove: Sequence[str] = ()
+    # Desired track order after adds/removes; tracks it leaves out keep their relative order at the end.
+    order: Sequence[str] | None = None
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.add and not self.remove and self.order is None
+
+
+def plan_track_ids(
+    current_track_ids: Sequence[str],
+    mutation: PlaylistMutation,
+    key: Callable[[str], str],
+) -> list[str]:
+    """Return the track ids a playlist should hold after ``mutation``, deduplicated by ``key``.
+
+    Removals apply first, then additions are appended in request order, then ``order`` is
+    applied as a stable reorder.
+    """
+    remove_keys = {key(track_id) for track_id in mutation.remove}
+    planned: list[str] = []
+    seen: set[str] = set()
+    for track_id in [*current_track_ids, *mutation.add]:
+        track_key = key(track_id)
+        if not track_key or track_key in remove_keys or track_key in seen:
+            continue
+        seen.add(track_key)
+        planned.append(track_id)
+    if mutation.order is None:
+        return planned
+
+    by_key = {key(track_id): track_id for track_id in planned}
+    ordered: list[str] = []
+    placed: set[str] = set()
+    for track_id in mutation.order:
+        track_key = key(track_id)
+        if track_key in by_key and track_key not in placed:
+            placed.add(track_key)
+            ordered.append(by_key[track_key])
+    ordered.extend(track_id for track_id in planned if key(track_id) not in placed)
+    return ordered
+
+
+def _longest_increasing_subsequence(values: Sequence[int]) -> set[int]:
+    """Return the indexes of one longest strictly increasing subsequence of ``values``."""
+    tail_indexes: list[int] = []
+    previous: list[int] = [-1] * len(values)
+    for index, value in enumerate(values):
+        low, high = 0, len(tail_indexes)
+        while low < high:
+            middle = (low + high) // 2
+            if values[tail_indexes[middle]] < value:
+                low = middle + 1
+            else:
+                high = middle
+        if low > 0:
+            previous[index] = tail_indexes[low - 1]
+        if low == len(tail_indexes):
+            tail_indexes.append(index)
+        else:
+            tail_indexes[low] = index
+    kept: set[int] = set()
+    index = tail_indexes[-1] if tail_indexes else -1
+    while index >= 0:
+        kept.add(index)
+        index = previous[index]
+    return kept
+
+
+def plan_reorder_moves(current_track_ids: Sequence[str], ordered_track_ids: Sequence[str]) -> list[tuple[int, int]]:
+    """Plan single-item moves that turn the current order into the requested one.
+
+    Returns ``(range_start, insert_before)`` pairs in the provider's pre-move coordinates,
+    applied one after another. Tracks on the longest increasing subsequence stay put, so the
+    plan uses the minimum number of single-item moves. Duplicate entries move as a group
+    and tracks missing from ``ordered_track_ids`` keep their relative order at the end, so
+    no track is ever dropped.
+    """
+    positions_by_id: dict[str, list[int]] = {}
+    for position, track_id in enumerate(current_track_ids):
+        positions_by_id.setdefault(track_id, []).append(position)
+    target: list[int] = []
+    for track_id in ordered_track_ids:
+        target.extend(positions_by_id.pop(track_id, []))
+    placed = set(target)
+    target.extend(position for position in range(len(current_track_ids)) if position not in placed)
+
+    rank = {position: index for index, position in enumerate(target)}
+    kept_positions = _longest_increasing_subsequence([rank[position] for position in range(len(target))])
+
+    working = list(range(len(target)))
+    moves: list[tuple[int, int]] = []
+    for index, position in enumerate(target):
+        if position in kept_positions:
+            continue
+        range_start = working.index(position)
+        insert_before = working.index(target[index - 1]) + 1 if index > 0 else 0
+        if insert_before in (range_start, range_start + 1):
+            continue
+        moves.append((range_start, insert_before))
+        working.pop(range_start)
+        working.insert(insert_before - 1 if insert_before > range_start else insert_before, position)
+    return moves
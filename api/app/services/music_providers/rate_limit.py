@@ -0,0 +1,285 @@
+"""Rate-limit-aware scheduling for provider API calls.
+
+Every provider request takes a token from two buckets: one shared by the whole provider
+(the app-wide quota) and one per access token (the per-user quota). A 429 pauses the
+offending token's bucket for ``Retry-After`` seconds, so later calls queue here instead of
+being rejected upstream. Rate-limited requests, and 5xx responses to idempotent reads, are
+retried with jittered exponential backoff. Each attempt also passes the provider's circuit
+breaker, and slow reads are hedged (see ``resilience``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+import httpx
+
+from app.config.settings import settings
+from app.services.music_providers.errors import ProviderUnavailableError
+from app.services.music_providers.resilience import provider_health
+
+RETRYABLE_SERVER_METHODS = frozenset({"GET", "HEAD"})
+# Token buckets idle for this long are full again and can be forgotten.
+IDLE_BUCKET_SECONDS = 300.0
+
+
+def parse_retry_after(response: httpx.Response, *, now: datetime | None = None) -> float | None:
+    """Return the ``Retry-After`` delay in seconds, accepting both delta-seconds and HTTP dates."""
+    raw_value = response.headers.get("Retry-After")
+    if not raw_value:
+        return None
+    raw_value = raw_value.strip()
+    try:
+        return max(float(raw_value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(raw_value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    current = now or datetime.now(timezone.utc)
+    return max((retry_at - current).total_seconds(), 0.0)
+
+
+@dataclass
+class _TokenBucket:
+    rate: float
+    capacity: float
+    tokens: float
+    updated_at: float
+    blocked_until: float = 0.0
+    waiting: int = 0
+
+    def refill(self, now: float) -> None:
+        if now > self.updated_at:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token can be taken, or 0 when one is available now."""
+        self.refill(now)
+        if self.blocked_until > now:
+            return self.blocked_until - now
+        if self.tokens >= 1 or self.rate <= 0:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class ProviderRequestScheduler:
+    """Token buckets per provider and per access token, with 429 pauses and queue metrics."""
+
+    def __init__(
+        self,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ) -> None:
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets: dict[tuple[str, str], _TokenBucket] = {}
+
+    def clear(self) -> None:
+        """Forget every bucket, pause and queue counter."""
+        self._buckets.clear()
+
+    def _bucket(self, provider: str, token_key: str) -> _TokenBucket:
+        key = (provider, token_key)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if token_key:
+                rate = settings.PROVIDER_RATE_LIMIT_PER_TOKEN_PER_SECOND
+                capacity = settings.PROVIDER_RATE_LIMIT_PER_TOKEN_BURST
+            else:
+                rate = settings.PROVIDER_RATE_LIMIT_PER_SECOND
+                capacity = settings.PROVIDER_RATE_LIMIT_BURST
+            capacity = max(float(capacity), 1.0)
+            bucket = _TokenBucket(rate=rate, capacity=capacity, tokens=capacity, updated_at=self._clock())
+            self._buckets[key] = bucket
+        return bucket
+
+    def _prune(self, now: float) -> None:
+        for key, bucket in list(self._buckets.items()):
+            idle = not bucket.waiting and bucket.blocked_until <= now
+            if key[1] and idle and now - bucket.updated_at > IDLE_BUCKET_SECONDS:
+                del self._buckets[key]
+
+    async def acquire(self, provider: str, token_key: str) -> None:
+        """Wait until both the provider bucket and the token bucket grant a request."""
+        buckets = (self._bucket(provider, ""), self._bucket(provider, token_key))
+        for bucket in buckets:
+            bucket.waiting += 1
+        try:
+            while True:
+                now = self._clock()
+                delay = max(bucket.wait_time(now) for bucket in buckets)
+                if delay <= 0:
+                    for bucket in buckets:
+                        bucket.tokens -= 1
+                    break
+                await self._sleep(delay)
+        finally:
+            for bucket in buckets:
+                bucket.waiting -= 1
+        if len(self._buckets) > settings.PROVIDER_RATE_LIMIT_MAX_TRACKED_TOKENS:
+            self._prune(self._clock())
+
+    def pause(self, provider: str, token_key: str, seconds: float) -> None:
+        """Hold back requests made with ``token_key`` for ``seconds`` after a 429."""
+        bucket = self._bucket(provider, token_key)
+        bucket.blocked_until = max(bucket.blocked_until, self._clock() + seconds)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._sleep(seconds)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given zero-based retry attempt."""
+        ceiling = min(
+            settings.PROVIDER_RETRY_MAX_DELAY_SECONDS,
+            settings.PROVIDER_RETRY_BASE_DELAY_SECONDS * (2**attempt),
+        )
+        return random.uniform(0, ceiling)
+
+    def snapshot(self) -> dict[str, dict[str, float | int]]:
+        """Per-provider queue depth and pause state, for health and metrics endpoints."""
+        now = self._clock()
+        stats: dict[str, dict[str, float | int]] = {}
+        for (provider, token_key), bucket in self._buckets.items():
+            provider_stats = stats.setdefault(
+                provider,
+                {"queued_requests": 0, "paused_tokens": 0, "max_pause_seconds": 0.0},
+            )
+            if not token_key:
+                provider_stats["queued_requests"] = bucket.waiting
+            elif bucket.blocked_until > now:
+                provider_stats["paused_tokens"] += 1
+                provider_stats["max_pause_seconds"] = max(
+                    provider_stats["max_pause_seconds"],
+                    round(bucket.blocked_until - now, 3),
+                )
+        return stats
+
+
+provider_request_scheduler = ProviderRequestScheduler()
+
+
+def rate_limit_token_key(access_token: str | None) -> str:
+    """Derive a bucket key from an access token without keeping the token itself around."""
+    if not access_token:
+        return "anonymous"
+    return hashlib.sha256(access_token.encode("utf-8")).hexdigest()[:16]
+
+
+class ScheduledProviderClient:
+    """Client wrapper that schedules, circuit-breaks, hedges and retries provider requests."""
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        provider: str,
+        token_key: str,
+        scheduler: ProviderRequestScheduler | None = None,
+    ) -> None:
+        self._client = client
+        self._provider = provider
+        self._token_key = token_key
+        self._scheduler = scheduler or provider_request_scheduler
+        self._health = provider_health(provider)
+
+    async def _attempt(self, method: str, call: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """Send one request through the rate limiter and the provider's circuit breaker."""
+        breaker = self._health.breaker
+        await self._scheduler.acquire(self._provider, self._token_key)
+        if not breaker.allow_request():
+            raise ProviderUnavailableError(
+                f"{self._provider} is temporarily unavailable",
+                retry_after=breaker.retry_after(),
+            )
+        started_at = time.monotonic()
+        try:
+            response = await call()
+        except httpx.TransportError as exc:
+            breaker.record_failure()
+            raise ProviderUnavailableError(f"{self._provider} request failed: {exc.__class__.__name__}") from exc
+        except BaseException:
+            breaker.release_probe()
+            raise
+        elapsed = time.monotonic() - started_at
+        if response.status_code >= 500 or elapsed > settings.PROVIDER_CIRCUIT_SLOW_CALL_SECONDS:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        if method in RETRYABLE_SERVER_METHODS and response.status_code < 500:
+            self._health.read_latency.record(elapsed)
+        return response
+
+    async def _hedged_attempt(self, method: str, call: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """Send a read, and a second copy if the first is slower than the recent p95."""
+        hedge_delay = self._health.read_latency.hedge_delay()
+        if hedge_delay is None:
+            return await self._attempt(method, call)
+        pending = {asyncio.ensure_future(self._attempt(method, call))}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=hedge_delay)
+            if not done:
+                pending.add(asyncio.ensure_future(self._attempt(method, call)))
+            while True:
+                if not done:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Use the first copy that produced a response; if every copy failed, surface its error.
+                succeeded = [task for task in done if task.exception() is None]
+                if succeeded or not pending:
+                    return (succeeded or list(done))[0].result()
+                done = set()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _send(self, method: str, url: str, call: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        max_attempts = max(settings.PROVIDER_RETRY_MAX_ATTEMPTS, 1)
+        attempt = 0
+        while True:
+            if method in RETRYABLE_SERVER_METHODS:
+                response = await self._hedged_attempt(method, call)
+            else:
+                response = await self._attempt(method, call)
+            status_code = response.status_code
+            rate_limited = status_code == 429
+            server_error = status_code >= 500 and method in RETRYABLE_SERVER_METHODS
+            if not rate_limited and not server_error:
+                return response
+            retry_after = parse_retry_after(response)
+            delay = retry_after if retry_after is not None else self._scheduler.backoff_delay(attempt)
+            if rate_limited:
+                self._scheduler.pause(self._provider, self._token_key, delay)
+            attempt += 1
+            # Give up rather than park a request for longer than callers are willing to wait.
+            if attempt >= max_attempts or delay > settings.PROVIDER_RETRY_MAX_DELAY_SECONDS:
+                return response
+            if not rate_limited:
+                await self._scheduler.sleep(delay)
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        return await self._send(method.upper(), url, lambda: self._client.request(method, url, **kwargs))
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self._send("GET", url, lambda: self._client.get(url, **kwargs))
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self._send("POST", url, lambda: self._client.post(url, **kwargs))
+
+    async def put(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self._send("PUT", url, lambda: self._client.put(url, **kwargs))
+
+    async def delete(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self._send("DELETE", url, lambda: self._client.delete(url, **kwargs))
@@ -0,0 +1,154 @@
+"""Per-provider circuit breaking and latency tracking for hedged reads."""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+
+from app.config.settings import settings
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+LATENCY_WINDOW_SIZE = 200
+HEDGE_MIN_SAMPLES = 20
+
+
+class CircuitBreaker:
+    """Fail fast once a provider keeps timing out, erroring or answering slowly.
+
+    After ``PROVIDER_CIRCUIT_FAILURE_THRESHOLD`` consecutive failures the circuit opens and
+    calls are rejected for ``PROVIDER_CIRCUIT_OPEN_SECONDS``. Then a single probe is let
+    through: success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = CIRCUIT_CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def enabled(self) -> bool:
+        return settings.PROVIDER_CIRCUIT_FAILURE_THRESHOLD > 0
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a probe through."""
+        remaining = self._opened_at + settings.PROVIDER_CIRCUIT_OPEN_SECONDS - self._clock()
+        return max(remaining, 0.0)
+
+    def allow_request(self) -> bool:
+        """Return whether a call may go out now, claiming the probe slot when half-open."""
+        if not self.enabled:
+            return True
+        with self._lock:
+            if self.state == CIRCUIT_OPEN:
+                if self.retry_after() > 0:
+                    return False
+                self.state = CIRCUIT_HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == CIRCUIT_HALF_OPEN:
+                if self._probe_in_flight:
+                    return False
+                self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CIRCUIT_CLOSED
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._consecutive_failures += 1
+            if self.state == CIRCUIT_HALF_OPEN or (
+                self._consecutive_failures >= settings.PROVIDER_CIRCUIT_FAILURE_THRESHOLD
+            ):
+                self.state = CIRCUIT_OPEN
+                self._opened_at = self._clock()
+                self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Give the half-open probe slot back when a probe ended without a verdict (e.g. it was cancelled)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+
+class LatencyWindow:
+    """Rolling window of recent read latencies, used to decide when to hedge."""
+
+    def __init__(self, size: int = LATENCY_WINDOW_SIZE) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> float | None:
+        with self._lock:
+            if len(self._samples) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(math.ceil(fraction * len(ordered)) - 1, 0))
+        return ordered[index]
+
+    def hedge_delay(self) -> float | None:
+        """Delay after which a second copy of a read should go out, or ``None`` to not hedge."""
+        if not settings.PROVIDER_HEDGE_ENABLED:
+            return None
+        p95 = self.percentile(0.95)
+        if p95 is None:
+            return None
+        return max(p95, settings.PROVIDER_HEDGE_MIN_DELAY_SECONDS)
+
+
+class ProviderHealth:
+    """Circuit breaker and read-latency window for one provider."""
+
+    def __init__(self) -> None:
+        self.breaker = CircuitBreaker()
+        self.read_latency = LatencyWindow()
+
+
+_provider_health: dict[str, ProviderHealth] = {}
+_registry_lock = threading.Lock()
+
+
+def provider_health(provider: str) -> ProviderHealth:
+    """Return the shared health state for ``provider``, creating it on first use."""
+    with _registry_lock:
+        health = _provider_health.get(provider)
+        if health is None:
+            health = ProviderHealth()
+            _provider_health[provider] = health
+        return health
+
+
+def clear_provider_health() -> None:
+    """Reset every provider's circuit and latency window."""
+    with _registry_lock:
+        _provider_health.clear()
+
+
+def provider_health_snapshot() -> dict[str, dict[str, object]]:
+    """Circuit state and read p95 per provider, for health and metrics endpoints."""
+    with _registry_lock:
+        items = list(_provider_health.items())
+    snapshot: dict[str, dict[str, object]] = {}
+    for provider, health in items:
+        p95 = health.read_latency.percentile(0.95)
+        snapshot[provider] = {
+            "circuit": health.breaker.state,
+            "read_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        }
+    return snapshot
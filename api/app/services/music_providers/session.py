@@ -2,26 +2,39 @@
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import inspect
 import logging
+import weakref
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
 from typing import cast
 
-import httpx
+from sqlalchemy import select, text, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.auth.principal_cache import invalidate_principals
 from app.config.settings import settings
 from app.crud.user import user_crud
+from app.db.session import async_engine
 from app.models.user import User
 from app.services.music_providers.base import MusicProviderClient, ProviderAuthError
 from app.services.music_providers.factory import get_music_provider
+from app.services.music_providers.http_client import provider_http_client
 from app.utils.token_expiry import coerce_expires_at, expires_at_from_payload
 
 logger = logging.getLogger(__name__)
 
 TOKEN_REFRESH_TIMEOUT_SECONDS = 15
 TOKEN_EXPIRY_SKEW_SECONDS = 60
+# First key of the two-int advisory lock; the second is the user id.
+TOKEN_REFRESH_ADVISORY_LOCK_NAMESPACE = 0x766F74
+
+_refresh_locks: weakref.WeakValueDictionary[tuple[str, int], asyncio.Lock] = weakref.WeakValueDictionary()
 
 
 def _is_expired(token_expires_at: datetime | None) -> bool:
@@ -34,19 +47,29 @@ def _is_expired(token_expires_at: datetime | None) -> bool:
     return expires_at <= now
 
 
-def _persist_refreshed_tokens(
+async def _persist_refreshed_tokens(
     *,
     user: User,
     access_token: str,
     refresh_token: str,
     token_expires_at: datetime | None,
-    db: Session | None = None,
+    db: Session | AsyncSession | None = None,
 ) -> None:
     updates = {
         "access_token": access_token,
         "refresh_token": refresh_token,
         "token_expires_at": token_expires_at,
     }
+    if isinstance(db, AsyncSession):
+        # The user may belong to another (sync) session, so write by primary key
+        # and mirror the committed values without marking the instance dirty.
+        await db.execute(update(User).where(User.id == user.id).values(**updates))
+        await db.commit()
+        # Core updates bypass the flush hook that normally invalidates cached principals.
+        invalidate_principals([user.id])
+        for key, value in updates.items():
+            set_committed_value(user, key, value)
+        return
     db_session = db if db is not None else object_session(user)
     if db_session:
         user_crud.update(db_session, user, updates)
@@ -56,7 +79,7 @@ def _persist_refreshed_tokens(
         user.token_expires_at = token_expires_at
 
 
-async def refresh_soundcloud_access_token(user: User, db: Session | None = None) -> str | None:
+async def refresh_soundcloud_access_token(user: User, db: Session | AsyncSession | None = None) -> str | None:
     """Refresh the SoundCloud access token for a user when possible."""
     refresh_token = (user.refresh_token or "").strip()
     if not refresh_token:
@@ -72,7 +95,7 @@ async def refresh_soundcloud_access_token(user: User, db: Session | None = None)
         "client_secret": settings.SOUNDCLOUD_CLIENT_SECRET,
     }
     try:
-        async with httpx.AsyncClient(timeout=TOKEN_REFRESH_TIMEOUT_SECONDS) as client:
+        async with provider_http_client(timeout=TOKEN_REFRESH_TIMEOUT_SECONDS) as client:
             response = await client.post(
                 settings.SOUNDCLOUD_TOKEN_URL,
                 data=payload,
@@ -113,7 +136,7 @@ async def refresh_soundcloud_access_token(user: User, db: Session | None = None)
 
     token_expires_at = expires_at_from_payload(token_payload)
 
-    _persist_refreshed_tokens(
+    await _persist_refreshed_tokens(
         user=user,
         access_token=next_access_token,
         refresh_token=next_refresh_token,
@@ -123,7 +146,7 @@ async def refresh_soundcloud_access_token(user: User, db: Session | None = None)
     return next_access_token
 
 
-async def refresh_spotify_access_token(user: User, db: Session | None = None) -> str | None:
+async def refresh_spotify_access_token(user: User, db: Session | AsyncSession | None = None) -> str | None:
     """Refresh the Spotify access token for a user when possible."""
     refresh_token = (user.refresh_token or "").strip()
     if not refresh_token:
@@ -143,7 +166,7 @@ async def refresh_spotify_access_token(user: User, db: Session | None = None) ->
         "Authorization": f"Basic {auth_header}",
     }
     try:
-        async with httpx.AsyncClient(timeout=TOKEN_REFRESH_TIMEOUT_SECONDS) as client:
+        async with provider_http_client(timeout=TOKEN_REFRESH_TIMEOUT_SECONDS) as client:
             response = await client.post(
                 settings.SPOTIFY_TOKEN_URL,
                 data=payload,
@@ -184,7 +207,7 @@ async def refresh_spotify_access_token(user: User, db: Session | None = None) ->
 
     token_expires_at = expires_at_from_payload(token_payload)
 
-    _persist_refreshed_tokens(
+    await _persist_refreshed_tokens(
         user=user,
         access_token=next_access_token,
         refresh_token=next_refresh_token,
@@ -194,6 +217,61 @@ async def refresh_spotify_access_token(user: User, db: Session | None = None) ->
     return next_access_token
 
 
+def _refresh_lock(provider: str, user_id: int) -> asyncio.Lock:
+    """Return the in-process lock serializing token refreshes for one user."""
+    key = (provider, user_id)
+    lock = _refresh_locks.get(key)
+    if lock is None:
+        lock = asyncio.Lock()
+        _refresh_locks[key] = lock
+    return lock
+
+
+def _advisory_lock_engine(db: Session | AsyncSession | None) -> AsyncEngine | None:
+    if isinstance(db, AsyncSession):
+        bind = db.bind
+    elif isinstance(db, Session):
+        bind = db.get_bind()
+    else:
+        return None
+    if bind is None or bind.dialect.name != "postgresql":
+        return None
+    # Sync sessions point at the same database; take the lock without blocking the event loop.
+    return bind if isinstance(bind, AsyncEngine) else async_engine
+
+
+@asynccontextmanager
+async def _worker_refresh_lock(user_id: int, db: Session | AsyncSession | None) -> AsyncIterator[None]:
+    """Hold a Postgres advisory lock so only one worker refreshes a user's token at a time."""
+    engine = _advisory_lock_engine(db)
+    if engine is None:
+        yield
+        return
+    # A dedicated connection keeps the lock independent of the request transaction.
+    async with engine.connect() as connection:
+        async with connection.begin():
+            await connection.execute(
+                text("SELECT pg_advisory_xact_lock(:namespace, :user_id)"),
+                {"namespace": TOKEN_REFRESH_ADVISORY_LOCK_NAMESPACE, "user_id": user_id},
+            )
+            yield
+
+
+async def _reload_persisted_tokens(user: User, db: Session | AsyncSession | None) -> None:
+    """Replace the user's token fields with the latest committed values."""
+    if db is None or user.id is None:
+        return
+    statement = select(User.access_token, User.refresh_token, User.token_expires_at).where(User.id == user.id)
+    if isinstance(db, AsyncSession):
+        row = (await db.execute(statement)).first()
+    else:
+        row = db.execute(statement).first()
+    if row is None:
+        return
+    for key, value in zip(("access_token", "refresh_token", "token_expires_at"), row):
+        set_committed_value(user, key, value)
+
+
 class ProviderClientWithRefresh:
     """Thin proxy that refreshes provider tokens once on auth failures."""
 
@@ -201,26 +279,47 @@ class ProviderClientWithRefresh:
         self,
         provider: str,
         user: User,
-        db: Session | None = None,
+        db: Session | AsyncSession | None = None,
     ) -> None:
         self._provider = provider.lower()
         self._user = user
         self._db = db if db is not None else object_session(user)
-        access_token = user.access_token or ""
-        self._client: MusicProviderClient = get_music_provider(self._provider, access_token)
+        self._access_token = user.access_token or ""
+        self._client: MusicProviderClient = get_music_provider(self._provider, self._access_token)
+
+    def _use_access_token(self, access_token: str) -> None:
+        self._access_token = access_token
+        self._client = get_music_provider(self._provider, access_token)
+
+    async def _adopt_persisted_token(self) -> bool:
+        """Switch to a token another request or worker already refreshed, if there is one."""
+        await _reload_persisted_tokens(self._user, self._db)
+        access_token = self._user.access_token or ""
+        if not access_token or access_token == self._access_token or _is_expired(self._user.token_expires_at):
+            return False
+        self._use_access_token(access_token)
+        return True
 
     async def _refresh_access_token(self, *, force: bool = False) -> bool:
         if not force and not _is_expired(self._user.token_expires_at):
             return False
-        if self._provider == "soundcloud":
-            next_access_token = await refresh_soundcloud_access_token(self._user, self._db)
-        elif self._provider == "spotify":
-            next_access_token = await refresh_spotify_access_token(self._user, self._db)
-        else:
+        if self._provider not in {"soundcloud", "spotify"}:
             return False
+        # Single-flight: concurrent callers wait here and reuse the token the first one persisted,
+        # so rotating refresh tokens are never spent twice.
+        async with _refresh_lock(self._provider, self._user.id):
+            if await self._adopt_persisted_token():
+                return True
+            async with _worker_refresh_lock(self._user.id, self._db):
+                if await self._adopt_persisted_token():
+                    return True
+                if self._provider == "soundcloud":
+                    next_access_token = await refresh_soundcloud_access_token(self._user, self._db)
+                else:
+                    next_access_token = await refresh_spotify_access_token(self._user, self._db)
         if not next_access_token:
             return False
-        self._client = get_music_provider(self._provider, next_access_token)
+        self._use_access_token(next_access_token)
         return True
 
     def __getattr__(self, name: str):
@@ -245,10 +344,16 @@ class ProviderClientWithRefresh:
         return _wrapped
 
 
+async def refresh_user_token(provider: str, user: User, db: Session | AsyncSession | None = None) -> bool:
+    """Refresh a user's provider token ahead of expiry through the single-flight path."""
+    client = ProviderClientWithRefresh(provider, user, db=db)
+    return await client._refresh_access_token(force=True)
+
+
 def get_provider_client_for_user(
     provider: str,
     user: User,
-    db: Session | None = None,
+    db: Session | AsyncSession | None = None,
 ) -> MusicProviderClient:
     """Build a provider client tied to a persisted user session."""
     if not user.access_token:
@@ -1,22 +1,30 @@
 """SoundCloud provider integration."""
 
 import logging
+from collections.abc import AsyncIterator
 from typing import Any, Sequence
 from urllib.parse import urlparse
 import httpx
 
 from app.config.settings import settings
 from app.services.music_providers.base import (
+    FetchedTracks,
     MusicProviderClient,
     ProviderPlaylist,
     ProviderTrack,
     ProviderUser,
     ProviderAuthError,
+    ProviderRateLimitError,
     ProviderAPIError,
 )
+from app.services.music_providers.mutations import PlaylistMutation, plan_track_ids
+from app.services.music_providers.rate_limit import parse_retry_after
 
 logger = logging.getLogger(__name__)
 
+SOUNDCLOUD_MUTATION_MAX_ATTEMPTS = 3
+SOUNDCLOUD_TRACK_PAGE_SIZE = 200
+
 
 class SoundcloudProvider(MusicProviderClient):
     provider = "soundcloud"
@@ -55,6 +63,12 @@ class SoundcloudProvider(MusicProviderClient):
                     request_body_preview or "-",
                 )
                 raise ProviderAuthError("SoundCloud authorization expired or invalid") from exc
+            if status_code == 429:
+                logger.warning("SoundCloud rate limit on %s %s", request_method, request_path)
+                raise ProviderRateLimitError(
+                    "SoundCloud rate limit reached",
+                    retry_after=parse_retry_after(exc.response),
+                ) from exc
             logger.error(
                 "SoundCloud API error on %s %s (status=%s, message=%s, body=%s, request_body=%s)",
                 request_method,
@@ -293,7 +307,7 @@ class SoundcloudProvider(MusicProviderClient):
         return value
 
     async def _resolve_user_by_handle(self, handle: str) -> ProviderUser | None:
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=15, follow_redirects=True) as client:
+        async with self._http_client(base_url=self.base_url, timeout=15, follow_redirects=True) as client:
             response = await client.get(
                 "/resolve",
                 headers=self._headers(),
@@ -317,7 +331,7 @@ class SoundcloudProvider(MusicProviderClient):
         return self._to_provider_user(payload)
 
     async def list_playlists(self) -> Sequence[ProviderPlaylist]:
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=15) as client:
+        async with self._http_client(base_url=self.base_url, timeout=15) as client:
             response = await client.get(
                 "/me/playlists",
                 headers=self._headers(),
@@ -333,7 +347,7 @@ class SoundcloudProvider(MusicProviderClient):
         return playlists
 
     async def get_playlist(self, provider_playlist_id: str) -> ProviderPlaylist:
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=15) as client:
+        async with self._http_client(base_url=self.base_url, timeout=15) as client:
             response = await client.get(
                 f"/playlists/{provider_playlist_id}",
                 headers=self._headers(),
@@ -351,7 +365,7 @@ class SoundcloudProvider(MusicProviderClient):
         if not search_query:
             return []
         safe_limit = max(1, min(limit, 25))
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=15) as client:
+        async with self._http_client(base_url=self.base_url, timeout=15) as client:
             response = await client.get(
                 "/playlists",
                 headers=self._headers(),
@@ -376,7 +390,7 @@ class SoundcloudProvider(MusicProviderClient):
         playlist_url = url.strip()
         if not playlist_url:
             raise ProviderAPIError("Playlist URL is required", status_code=400)
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=15, follow_redirects=True) as client:
+        async with self._http_client(base_url=self.base_url, timeout=15, follow_redirects=True) as client:
             response = await client.get(
                 "/resolve",
                 headers=self._headers(),
@@ -410,7 +424,7 @@ class SoundcloudProvider(MusicProviderClient):
                 "sharing": "public" if is_public else "private",
             }
         }
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=15) as client:
+        async with self._http_client(base_url=self.base_url, timeout=15) as client:
             response = await client.post(
                 "/playlists",
                 headers=self._headers(),
@@ -433,28 +447,89 @@ class SoundcloudProvider(MusicProviderClient):
             is_public=mapped.is_public,
         )
 
-    async def list_tracks(self, provider_playlist_id: str) -> Sequence[ProviderTrack]:
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=15) as client:
+    def _cached_track_key(self, provider_track_id: str) -> str:
+        return self._track_reference_key(provider_track_id)
+
+    def _map_playlist_tracks(self, payload: Any) -> list[ProviderTrack]:
+        tracks: list[ProviderTrack] = []
+        raw_tracks = payload.get("tracks") if isinstance(payload, dict) else None
+        for track in raw_tracks or []:
+            mapped_track = self._to_provider_track(track)
+            if mapped_track:
+                tracks.append(mapped_track)
+        return tracks
+
+    def _cache_tracks_from_update(self, provider_playlist_id: str, response: httpx.Response) -> None:
+        """Refresh the cached track list from a playlist update response."""
+        try:
+            payload = response.json() if response.content else None
+        except ValueError:
+            payload = None
+        if not isinstance(payload, dict) or not isinstance(payload.get("tracks"), list):
+            self.invalidate_cached_tracks(provider_playlist_id)
+            return
+        self._store_cached_tracks(
+            provider_playlist_id,
+            self._map_playlist_tracks(payload),
+            validator=response.headers.get("ETag"),
+            title=payload.get("title"),
+        )
+
+    async def fetch_tracks(
+        self,
+        provider_playlist_id: str,
+        validator: str | None = None,
+    ) -> FetchedTracks:
+        headers = self._headers()
+        if validator:
+            headers["If-None-Match"] = validator
+        async with self._http_client(base_url=self.base_url, timeout=15) as client:
             response = await client.get(
                 f"/playlists/{provider_playlist_id}",
-                headers=self._headers(),
+                headers=headers,
                 params=self._params(),
             )
+            if validator and response.status_code == 304:
+                return FetchedTracks(tracks=[], validator=validator, not_modified=True)
             self._raise_for_status(response)
             payload = response.json()
-        tracks = []
-        for track in payload.get("tracks", []) or []:
-            mapped_track = self._to_provider_track(track)
-            if mapped_track:
-                tracks.append(mapped_track)
-        return tracks
+        return FetchedTracks(
+            tracks=self._map_playlist_tracks(payload),
+            validator=response.headers.get("ETag"),
+            title=payload.get("title") if isinstance(payload, dict) else None,
+        )
+
+    async def _iter_track_pages(self, provider_playlist_id: str) -> AsyncIterator[FetchedTracks]:
+        """Page through ``/playlists/{id}/tracks`` with linked partitioning instead of one big playlist read."""
+        next_url: str | None = f"/playlists/{provider_playlist_id}/tracks"
+        params: dict[str, Any] | None = {
+            **self._params(),
+            "limit": SOUNDCLOUD_TRACK_PAGE_SIZE,
+            "linked_partitioning": 1,
+        }
+        async with self._http_client(base_url=self.base_url, timeout=15) as client:
+            while next_url:
+                response = await client.get(next_url, headers=self._headers(), params=params)
+                self._raise_for_status(response)
+                payload = response.json()
+                if isinstance(payload, list):
+                    raw_items, raw_next = payload, None
+                elif isinstance(payload, dict):
+                    collection = payload.get("collection")
+                    raw_items = collection if isinstance(collection, list) else []
+                    raw_next = payload.get("next_href")
+                else:
+                    break
+                yield FetchedTracks(tracks=self._map_playlist_tracks({"tracks": raw_items}))
+                next_url = raw_next if isinstance(raw_next, str) and raw_next else None
+                params = None
 
     async def search_tracks(self, query: str, limit: int = 10) -> Sequence[ProviderTrack]:
         search_query = query.strip()
         if not search_query:
             return []
         safe_limit = max(1, min(limit, 25))
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=15) as client:
+        async with self._http_client(base_url=self.base_url, timeout=15) as client:
             response = await client.get(
                 "/tracks",
                 headers=self._headers(),
@@ -486,7 +561,7 @@ class SoundcloudProvider(MusicProviderClient):
             return []
         safe_limit = max(1, min(limit, 50))
         safe_offset = max(0, offset)
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=15) as client:
+        async with self._http_client(base_url=self.base_url, timeout=15) as client:
             response = await client.get(
                 f"/tracks/{track_id}/related",
                 headers=self._headers(),
@@ -518,7 +593,7 @@ class SoundcloudProvider(MusicProviderClient):
         track_url = url.strip()
         if not track_url:
             raise ProviderAPIError("Track URL is required", status_code=400)
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=15, follow_redirects=True) as client:
+        async with self._http_client(base_url=self.base_url, timeout=15, follow_redirects=True) as client:
             response = await client.get(
                 "/resolve",
                 headers=self._headers(),
@@ -546,7 +621,7 @@ class SoundcloudProvider(MusicProviderClient):
         safe_limit = max(1, min(limit, 25))
         results: list[ProviderUser] = []
         try:
-            async with httpx.AsyncClient(base_url=self.base_url, timeout=15) as client:
+            async with self._http_client(base_url=self.base_url, timeout=15) as client:
                 response = await client.get(
                     "/users",
                     headers=self._headers(),
@@ -589,7 +664,7 @@ class SoundcloudProvider(MusicProviderClient):
         user_id = provider_user_id.strip()
         if not user_id:
             raise ProviderAPIError("Provider user id is required", status_code=400)
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=15) as client:
+        async with self._http_client(base_url=self.base_url, timeout=15) as client:
             response = await client.get(
                 f"/users/{user_id}",
                 headers=self._headers(),
@@ -602,96 +677,96 @@ class SoundcloudProvider(MusicProviderClient):
             raise ProviderAPIError("Provider user not found", status_code=404)
         return mapped_user
 
+    async def _load_mutation_base(
+        self,
+        client: httpx.AsyncClient,
+        provider_playlist_id: str,
+        *,
+        use_cache: bool,
+    ) -> tuple[list[str], str | None, str | None]:
+        """Return (track ids, title, ETag) to plan an update against, preferring the cached list."""
+        if use_cache:
+            cached = self._own_fresh_cached_tracks(provider_playlist_id)
+            # Only a list with a validator can be checked with If-Match; the title must be resent.
+            if cached is not None and cached.validator and cached.title is not None:
+                return (
+                    [track.provider_track_id for track in cached.tracks],
+                    cached.title,
+                    cached.validator,
+                )
+        response = await client.get(
+            f"/playlists/{provider_playlist_id}",
+            headers=self._headers(),
+            params=self._params(),
+        )
+        self._raise_for_status(response)
+        payload = response.json()
+        track_ids: list[str] = []
+        for track in payload.get("tracks", []) or []:
+            reference = self._extract_track_reference_from_payload(track)
+            if reference:
+                track_ids.append(reference[0]["id"])
+        return track_ids, payload.get("title"), response.headers.get("ETag")
+
+    async def apply_track_mutation(self, provider_playlist_id: str, mutation: PlaylistMutation) -> None:
+        """Apply a whole batch in one read-modify-write of the playlist's track list.
+
+        SoundCloud only accepts full track lists, so the batch is planned against the cached
+        list (or one GET) and written with a single PUT guarded by ``If-Match``. If the
+        playlist changed in between, the update is replanned against a fresh GET.
+        """
+        if mutation.is_empty:
+            return
+        async with self._http_client(base_url=self.base_url, timeout=20) as client:
+            for attempt in range(SOUNDCLOUD_MUTATION_MAX_ATTEMPTS):
+                current_track_ids, title, etag = await self._load_mutation_base(
+                    client,
+                    provider_playlist_id,
+                    use_cache=attempt == 0,
+                )
+                planned = plan_track_ids(current_track_ids, mutation, key=self._track_reference_key)
+                if [self._track_reference_key(track_id) for track_id in planned] == [
+                    self._track_reference_key(track_id) for track_id in current_track_ids
+                ]:
+                    return
+                track_refs = [
+                    reference[0]
+                    for reference in (self._build_track_reference(str(track_id)) for track_id in planned)
+                    if reference
+                ]
+                headers = self._headers()
+                if etag:
+                    headers["If-Match"] = etag
+                update_response = await client.put(
+                    f"/playlists/{provider_playlist_id}",
+                    headers=headers,
+                    params=self._params(),
+                    json={"playlist": {"title": title or "Untitled", "tracks": track_refs}},
+                )
+                if update_response.status_code == 412:
+                    self.invalidate_cached_tracks(provider_playlist_id)
+                    continue
+                self._raise_for_status(update_response)
+                break
+            else:
+                raise ProviderAPIError(
+                    "Playlist changed while it was being updated; please retry",
+                    status_code=409,
+                )
+        self._cache_tracks_from_update(provider_playlist_id, update_response)
+
     async def add_tracks(self, provider_playlist_id: str, track_ids: Sequence[str]) -> None:
         if not track_ids:
             return
-        # SoundCloud requires sending the full track list when updating playlists.
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=20) as client:
-            response = await client.get(
-                f"/playlists/{provider_playlist_id}",
-                headers=self._headers(),
-                params=self._params(),
-            )
-            self._raise_for_status(response)
-            payload = response.json()
-            existing_tracks = payload.get("tracks", []) or []
-            existing_track_refs: list[dict[str, str]] = []
-            existing_keys: set[str] = set()
-            for track in existing_tracks:
-                reference = self._extract_track_reference_from_payload(track)
-                if not reference:
-                    continue
-                track_ref, track_key = reference
-                if track_key in existing_keys:
-                    continue
-                existing_track_refs.append(track_ref)
-                existing_keys.add(track_key)
-            for track_id in track_ids:
-                reference = self._build_track_reference(str(track_id))
-                if not reference:
-                    continue
-                track_ref, track_key = reference
-                if track_key in existing_keys:
-                    continue
-                existing_track_refs.append(track_ref)
-                existing_keys.add(track_key)
-            update_payload = {
-                "playlist": {
-                    "title": payload.get("title") or "Untitled",
-                    "tracks": existing_track_refs,
-                }
-            }
-            update_response = await client.put(
-                f"/playlists/{provider_playlist_id}",
-                headers=self._headers(),
-                params=self._params(),
-                json=update_payload,
-            )
-            self._raise_for_status(update_response)
+        await self.apply_track_mutation(provider_playlist_id, PlaylistMutation(add=list(track_ids)))
 
     async def remove_tracks(self, provider_playlist_id: str, track_ids: Sequence[str]) -> None:
         if not track_ids:
             return
-        remove_keys = {
-            reference[1]
-            for reference in (self._build_track_reference(str(track_id)) for track_id in track_ids)
-            if reference
-        }
-        if not remove_keys:
-            return
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=20) as client:
-            response = await client.get(
-                f"/playlists/{provider_playlist_id}",
-                headers=self._headers(),
-                params=self._params(),
-            )
-            self._raise_for_status(response)
-            payload = response.json()
-            existing_tracks = payload.get("tracks", []) or []
-            kept_track_refs: list[dict[str, str]] = []
-            seen_keys: set[str] = set()
-            for track in existing_tracks:
-                reference = self._extract_track_reference_from_payload(track)
-                if not reference:
-                    continue
-                track_ref, track_key = reference
-                if track_key in remove_keys or track_key in seen_keys:
-                    continue
-                kept_track_refs.append(track_ref)
-                seen_keys.add(track_key)
-            update_payload = {
-                "playlist": {
-                    "title": payload.get("title") or "Untitled",
-                    "tracks": kept_track_refs,
-                }
-            }
-            update_response = await client.put(
-                f"/playlists/{provider_playlist_id}",
-                headers=self._headers(),
-                params=self._params(),
-                json=update_payload,
-            )
-            self._raise_for_status(update_response)
+        await self.apply_track_mutation(provider_playlist_id, PlaylistMutation(remove=list(track_ids)))
+
+    async def reorder_tracks(self, provider_playlist_id: str, ordered_ids: Sequence[str]) -> None:
+        await self.apply_track_mutation(provider_playlist_id, PlaylistMutation(order=list(ordered_ids)))
 
     async def track_exists(self, provider_playlist_id: str, track_id: str) -> bool:
         track_reference = self._build_track_reference(track_id)
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import AsyncIterator
 from typing import Any, Sequence
 from urllib.parse import urlparse
 
@@ -9,13 +11,18 @@ import httpx
 
 from app.config.settings import settings
 from app.services.music_providers.base import (
+    FetchedTracks,
     MusicProviderClient,
     ProviderAPIError,
     ProviderAuthError,
     ProviderPlaylist,
+    ProviderRateLimitError,
     ProviderTrack,
     ProviderUser,
 )
+from app.services.music_providers.mutations import plan_reorder_moves
+from app.services.music_providers.rate_limit import parse_retry_after
+
 
 class SpotifyProvider(MusicProviderClient):
     provider = "spotify"
@@ -87,6 +94,11 @@ class SpotifyProvider(MusicProviderClient):
 
             if status_code in {401, 403}:
                 raise ProviderAuthError("Spotify authorization expired or invalid") from exc
+            if status_code == 429:
+                raise ProviderRateLimitError(
+                    "Spotify rate limit reached",
+                    retry_after=parse_retry_after(exc.response),
+                ) from exc
 
             detail_suffix = f": {provider_message}" if provider_message else ""
             raise ProviderAPIError(
@@ -193,6 +205,21 @@ class SpotifyProvider(MusicProviderClient):
             url=track_url if isinstance(track_url, str) else None,
         )
 
+    def _map_playlist_items(self, items: Sequence[Any]) -> list[ProviderTrack]:
+        tracks: list[ProviderTrack] = []
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            # Spotify currently returns playlist entries as `item`,
+            # while older payloads and some SDK shapes use `track`.
+            track_payload = item.get("item")
+            if not isinstance(track_payload, dict):
+                track_payload = item.get("track")
+            mapped = self._to_provider_track(track_payload)
+            if mapped:
+                tracks.append(mapped)
+        return tracks
+
     def _to_provider_user(self, payload: Any) -> ProviderUser | None:
         if not isinstance(payload, dict):
             return None
@@ -209,7 +236,7 @@ class SpotifyProvider(MusicProviderClient):
             profile_url=profile_url if isinstance(profile_url, str) else None,
         )
 
-    async def _fetch_current_user_id(self, client: httpx.AsyncClient) -> str:
+    async def _fetch_current_user_id(self, client: Any) -> str:
         response = await client.get(
             "/me",
             headers=self._headers(),
@@ -223,33 +250,100 @@ class SpotifyProvider(MusicProviderClient):
             raise ProviderAPIError("Unable to fetch Spotify user profile", status_code=502)
         return user_id
 
+    async def _fetch_page_items(self, client: Any, path: str, params: dict[str, int | str]) -> list[Any]:
+        """Return the raw ``items`` of every page of a paged listing, in order.
+
+        Once the first page reports ``total``, the remaining offset pages are fetched
+        concurrently (at most ``PROVIDER_PAGE_FETCH_CONCURRENCY`` at a time) and stitched
+        back by offset. Listings without a total, and everything from the first page Spotify
+        rate-limits onwards, are paged sequentially through ``next`` links instead.
+        """
+        response = await client.get(path, headers=self._headers(), params=params)
+        self._raise_for_status(response)
+        return await self._collect_page_items(client, path, params, response.json())
+
+    async def _collect_page_items(
+        self,
+        client: Any,
+        path: str,
+        params: dict[str, int | str],
+        payload: Any,
+    ) -> list[Any]:
+        """Return the raw ``items`` of ``payload``, the page at ``params``, and of every page after it."""
+        items: list[Any] = []
+        if not isinstance(payload, dict):
+            return items
+        page_items = payload.get("items")
+        if isinstance(page_items, list):
+            items.extend(page_items)
+        raw_next = payload.get("next")
+        next_url: str | None = raw_next if isinstance(raw_next, str) and raw_next else None
+        next_params: dict[str, int | str] | None = None
+
+        total = payload.get("total")
+        page_size = int(params["limit"])
+        concurrency = settings.PROVIDER_PAGE_FETCH_CONCURRENCY
+        if next_url and isinstance(total, int) and concurrency > 1:
+            offsets = range(int(params.get("offset", 0)) + page_size, total, page_size)
+            semaphore = asyncio.Semaphore(concurrency)
+            rate_limited = False
+
+            async def _fetch_offset(offset: int) -> list[Any] | None:
+                nonlocal rate_limited
+                async with semaphore:
+                    if rate_limited:
+                        return None
+                    page_response = await client.get(
+                        path,
+                        headers=self._headers(),
+                        params={**params, "offset": offset},
+                    )
+                if page_response.status_code == 429:
+                    rate_limited = True
+                    return None
+                self._raise_for_status(page_response)
+                page_payload = page_response.json()
+                fetched = page_payload.get("items") if isinstance(page_payload, dict) else None
+                return fetched if isinstance(fetched, list) else []
+
+            pages = await asyncio.gather(*(_fetch_offset(offset) for offset in offsets))
+            next_url = None
+            for offset, page in zip(offsets, pages):
+                if page is None:
+                    # Resume one page at a time from the first page that was not fetched.
+                    next_url, next_params = path, {**params, "offset": offset}
+                    break
+                items.extend(page)
+
+        while next_url:
+            response = await client.get(next_url, headers=self._headers(), params=next_params)
+            self._raise_for_status(response)
+            payload = response.json()
+            if not isinstance(payload, dict):
+                break
+            page_items = payload.get("items")
+            if isinstance(page_items, list):
+                items.extend(page_items)
+            raw_next = payload.get("next")
+            next_url = raw_next if isinstance(raw_next, str) and raw_next else None
+            next_params = None
+        return items
+
     async def list_playlists(self) -> Sequence[ProviderPlaylist]:
         playlists: list[ProviderPlaylist] = []
-        next_url: str | None = "/me/playlists"
-        params: dict[str, int] | None = {"limit": 50}
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=15) as client:
-            while next_url:
-                response = await client.get(next_url, headers=self._headers(), params=params)
-                self._raise_for_status(response)
-                payload = response.json()
-                if not isinstance(payload, dict):
-                    break
-                items = payload.get("items")
-                if isinstance(items, list):
-                    for item in items:
-                        mapped = self._to_provider_playlist(item)
-                        if mapped:
-                            playlists.append(mapped)
-                raw_next = payload.get("next")
-                next_url = raw_next if isinstance(raw_next, str) and raw_next else None
-                params = None
+        async with self._http_client(base_url=self.base_url, timeout=15) as client:
+            items = await self._fetch_page_items(client, "/me/playlists", {"limit": 50, "offset": 0})
+        for item in items:
+            mapped = self._to_provider_playlist(item)
+            if mapped:
+                playlists.append(mapped)
         return playlists
 
     async def get_playlist(self, provider_playlist_id: str) -> ProviderPlaylist:
         playlist_id = self._normalize_resource_id(provider_playlist_id, "playlist")
         if not playlist_id:
             raise ProviderAPIError("Playlist id is required", status_code=400)
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=15) as client:
+        async with self._http_client(base_url=self.base_url, timeout=15) as client:
             response = await client.get(
                 f"/playlists/{playlist_id}",
                 headers=self._headers(),
@@ -266,7 +360,7 @@ class SpotifyProvider(MusicProviderClient):
         if not search_query:
             return []
         safe_limit = max(1, min(limit, 25))
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=15) as client:
+        async with self._http_client(base_url=self.base_url, timeout=15) as client:
             response = await client.get(
                 "/search",
                 headers=self._headers(),
@@ -308,7 +402,7 @@ class SpotifyProvider(MusicProviderClient):
         description: str | None = None,
         is_public: bool | None = None,
     ) -> ProviderPlaylist:
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=15) as client:
+        async with self._http_client(base_url=self.base_url, timeout=15) as client:
             user_id = await self._fetch_current_user_id(client)
             response = await client.post(
                 f"/users/{user_id}/playlists",
@@ -335,14 +429,82 @@ class SpotifyProvider(MusicProviderClient):
             is_public=mapped.is_public,
         )
 
-    async def list_tracks(self, provider_playlist_id: str) -> Sequence[ProviderTrack]:
+    def _track_cache_key(self, provider_playlist_id: str) -> tuple[str, str]:
+        playlist_id = self._normalize_resource_id(provider_playlist_id, "playlist")
+        return super()._track_cache_key(playlist_id or provider_playlist_id)
+
+    def _cached_track_key(self, provider_track_id: str) -> str:
+        return self._normalize_resource_id(provider_track_id, "track") or provider_track_id.strip()
+
+    async def _fetch_snapshot_id(self, client: Any, playlist_id: str) -> str | None:
+        response = await client.get(
+            f"/playlists/{playlist_id}",
+            headers=self._headers(),
+            params={"fields": "snapshot_id"},
+        )
+        self._raise_for_status(response)
+        payload = response.json()
+        snapshot_id = payload.get("snapshot_id") if isinstance(payload, dict) else None
+        return snapshot_id if isinstance(snapshot_id, str) and snapshot_id else None
+
+    async def _fetch_playlist_first_page(self, client: Any, playlist_id: str) -> tuple[str | None, Any]:
+        """Return the playlist's snapshot id and the first page of items embedded in the playlist object."""
+        response = await client.get(f"/playlists/{playlist_id}", headers=self._headers())
+        self._raise_for_status(response)
+        payload = response.json()
+        if not isinstance(payload, dict):
+            return None, None
+        snapshot_id = payload.get("snapshot_id")
+        # Embedded under `items` in current payloads and under `tracks` historically.
+        first_page = next(
+            (payload[key] for key in ("items", "tracks") if isinstance(payload.get(key), dict)),
+            None,
+        )
+        return (snapshot_id if isinstance(snapshot_id, str) and snapshot_id else None), first_page
+
+    async def fetch_tracks(
+        self,
+        provider_playlist_id: str,
+        validator: str | None = None,
+    ) -> FetchedTracks:
+        playlist_id = self._normalize_resource_id(provider_playlist_id, "playlist")
+        if not playlist_id:
+            raise ProviderAPIError("Playlist id is required", status_code=400)
+        items_path = f"/playlists/{playlist_id}/items"
+        params: dict[str, int | str] = {"limit": 100, "offset": 0}
+        async with self._http_client(base_url=self.base_url, timeout=15) as client:
+            if validator:
+                # The playlist snapshot id changes on every edit, so it doubles as a cheap validator.
+                snapshot_id = await self._fetch_snapshot_id(client, playlist_id)
+                if snapshot_id == validator:
+                    return FetchedTracks(tracks=[], validator=validator, not_modified=True)
+                items = await self._fetch_page_items(client, items_path, params)
+            else:
+                # Nothing to compare against: the playlist fetch yields the snapshot id and the first page.
+                snapshot_id, first_page = await self._fetch_playlist_first_page(client, playlist_id)
+                if first_page is None:
+                    items = await self._fetch_page_items(client, items_path, params)
+                else:
+                    items = await self._collect_page_items(client, items_path, params, first_page)
+        return FetchedTracks(tracks=self._map_playlist_items(items), validator=snapshot_id)
+
+    async def _iter_track_pages(self, provider_playlist_id: str) -> AsyncIterator[FetchedTracks]:
         playlist_id = self._normalize_resource_id(provider_playlist_id, "playlist")
         if not playlist_id:
             raise ProviderAPIError("Playlist id is required", status_code=400)
-        tracks: list[ProviderTrack] = []
         next_url: str | None = f"/playlists/{playlist_id}/items"
         params: dict[str, int | str] | None = {"limit": 100, "offset": 0}
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=15) as client:
+        async with self._http_client(base_url=self.base_url, timeout=15) as client:
+            snapshot_id, first_page = await self._fetch_playlist_first_page(client, playlist_id)
+            if first_page is not None:
+                first_items = first_page.get("items")
+                yield FetchedTracks(
+                    tracks=self._map_playlist_items(first_items if isinstance(first_items, list) else []),
+                    validator=snapshot_id,
+                )
+                raw_next = first_page.get("next")
+                next_url = raw_next if isinstance(raw_next, str) and raw_next else None
+                params = None
             while next_url:
                 response = await client.get(next_url, headers=self._headers(), params=params)
                 self._raise_for_status(response)
@@ -350,22 +512,13 @@ class SpotifyProvider(MusicProviderClient):
                 if not isinstance(payload, dict):
                     break
                 items = payload.get("items")
-                if isinstance(items, list):
-                    for item in items:
-                        if not isinstance(item, dict):
-                            continue
-                        # Spotify currently returns playlist entries as `item`,
-                        # while older payloads and some SDK shapes use `track`.
-                        track_payload = item.get("item")
-                        if not isinstance(track_payload, dict):
-                            track_payload = item.get("track")
-                        mapped = self._to_provider_track(track_payload)
-                        if mapped:
-                            tracks.append(mapped)
+                yield FetchedTracks(
+                    tracks=self._map_playlist_items(items if isinstance(items, list) else []),
+                    validator=snapshot_id,
+                )
                 raw_next = payload.get("next")
                 next_url = raw_next if isinstance(raw_next, str) and raw_next else None
                 params = None
-        return tracks
 
     async def add_tracks(self, provider_playlist_id: str, track_ids: Sequence[str]) -> None:
         playlist_id = self._normalize_resource_id(provider_playlist_id, "playlist")
@@ -381,13 +534,15 @@ class SpotifyProvider(MusicProviderClient):
             normalized_uris.append(track_uri)
         if not normalized_uris:
             return
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=15) as client:
+        async with self._http_client(base_url=self.base_url, timeout=15) as client:
             response = await client.post(
                 f"/playlists/{playlist_id}/items",
                 headers=self._headers(),
                 json={"uris": normalized_uris},
             )
             self._raise_for_status(response)
+        # Added items carry no metadata in the response, so refetch on next read.
+        self.invalidate_cached_tracks(playlist_id)
 
     async def remove_tracks(self, provider_playlist_id: str, track_ids: Sequence[str]) -> None:
         playlist_id = self._normalize_resource_id(provider_playlist_id, "playlist")
@@ -403,7 +558,7 @@ class SpotifyProvider(MusicProviderClient):
             normalized_tracks_payload.append({"uri": track_uri})
         if not normalized_tracks_payload:
             return
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=15) as client:
+        async with self._http_client(base_url=self.base_url, timeout=15) as client:
             response = await client.request(
                 "DELETE",
                 f"/playlists/{playlist_id}/items",
@@ -411,13 +566,61 @@ class SpotifyProvider(MusicProviderClient):
                 json={"tracks": normalized_tracks_payload},
             )
             self._raise_for_status(response)
+        self._patch_cached_tracks(
+            playlist_id,
+            {uri.rsplit(":", 1)[-1] for uri in seen_uris},
+        )
+
+    async def _fetch_position_track_ids(self, client: Any, playlist_id: str) -> list[str]:
+        """Return one id per playlist position so list indexes match Spotify's positions."""
+        track_ids: list[str] = []
+        items = await self._fetch_page_items(
+            client,
+            f"/playlists/{playlist_id}/items",
+            {"limit": 100, "offset": 0, "fields": "total,next,items(item(id),track(id))"},
+        )
+        for item in items:
+            track_payload = item.get("item") if isinstance(item, dict) else None
+            if not isinstance(track_payload, dict) and isinstance(item, dict):
+                track_payload = item.get("track")
+            track_id = self._clean_id(str(track_payload.get("id") or "")) if isinstance(track_payload, dict) else ""
+            # Local files and unavailable entries have no id but still occupy a position.
+            track_ids.append(track_id or f"position:{len(track_ids)}")
+        return track_ids
+
+    async def reorder_tracks(self, provider_playlist_id: str, ordered_ids: Sequence[str]) -> None:
+        """Reorder in place with the fewest single-item moves, chaining each move on the last snapshot."""
+        playlist_id = self._normalize_resource_id(provider_playlist_id, "playlist")
+        if not playlist_id:
+            raise ProviderAPIError("Playlist id is required", status_code=400)
+        target_ids = [self._normalize_resource_id(str(track_id), "track") or "" for track_id in ordered_ids]
+        async with self._http_client(base_url=self.base_url, timeout=15) as client:
+            snapshot_id = await self._fetch_snapshot_id(client, playlist_id)
+            current_ids = await self._fetch_position_track_ids(client, playlist_id)
+            moves = plan_reorder_moves(current_ids, target_ids)
+            for range_start, insert_before in moves:
+                body: dict[str, int | str] = {
+                    "range_start": range_start,
+                    "insert_before": insert_before,
+                    "range_length": 1,
+                }
+                if snapshot_id:
+                    body["snapshot_id"] = snapshot_id
+                response = await client.put(f"/playlists/{playlist_id}/items", headers=self._headers(), json=body)
+                self._raise_for_status(response)
+                payload = response.json() if response.content else None
+                next_snapshot_id = payload.get("snapshot_id") if isinstance(payload, dict) else None
+                if isinstance(next_snapshot_id, str) and next_snapshot_id:
+                    snapshot_id = next_snapshot_id
+        if moves:
+            self.invalidate_cached_tracks(playlist_id)
 
     async def search_tracks(self, query: str, limit: int = 10) -> Sequence[ProviderTrack]:
         search_query = query.strip()
         if not search_query:
             return []
         safe_limit = max(1, min(limit, 25))
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=15) as client:
+        async with self._http_client(base_url=self.base_url, timeout=15) as client:
             response = await client.get(
                 "/search",
                 headers=self._headers(),
@@ -460,7 +663,7 @@ class SpotifyProvider(MusicProviderClient):
         track_id = self._normalize_resource_id(track_ref, "track")
         if not track_id:
             raise ProviderAPIError("Resolved URL is not a track", status_code=400)
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=15) as client:
+        async with self._http_client(base_url=self.base_url, timeout=15) as client:
             response = await client.get(
                 f"/tracks/{track_id}",
                 headers=self._headers(),
@@ -480,7 +683,7 @@ class SpotifyProvider(MusicProviderClient):
         user_id = self._normalize_resource_id(provider_user_id, "user")
         if not user_id:
             raise ProviderAPIError("Provider user id is required", status_code=400)
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=15) as client:
+        async with self._http_client(base_url=self.base_url, timeout=15) as client:
             response = await client.get(
                 f"/users/{user_id}",
                 headers=self._headers(),
@@ -0,0 +1,52 @@
+"""Process-wide cache of provider playlist track lists."""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from app.config.settings import settings
+from app.utils.ttl_cache import TTLCache
+
+if TYPE_CHECKING:
+    from app.services.music_providers.base import ProviderTrack
+
+
+@dataclass(frozen=True)
+class CachedTrackList:
+    tracks: tuple[ProviderTrack, ...]
+    # Provider-specific revalidation token (SoundCloud ETag, Spotify snapshot_id).
+    validator: str | None = None
+    # Playlist title, for providers whose track updates must resend it (SoundCloud).
+    title: str | None = None
+    # Digest of the access token that filled the entry; other tokens must revalidate with the provider.
+    filled_by: str | None = None
+
+
+playlist_track_cache: TTLCache[CachedTrackList] = TTLCache(
+    max_entries=settings.PROVIDER_TRACK_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PROVIDER_TRACK_CACHE_TTL_SECONDS,
+)
+
+
+def track_cache_key(provider: str, provider_playlist_id: str) -> tuple[str, str]:
+    """Build the cache key for a provider playlist."""
+    return provider.lower(), provider_playlist_id.strip()
+
+
+def token_digest(access_token: str) -> str:
+    """Identify an access token in cache entries without keeping the token itself."""
+    return hashlib.sha256(access_token.encode("utf-8")).hexdigest()[:32]
+
+
+def track_list_fingerprint(tracks: Iterable[ProviderTrack]) -> str:
+    """Hash the track fields shown in listings, in order, into a short stable digest."""
+    digest = hashlib.sha256()
+    for track in tracks:
+        for value in (track.provider_track_id, track.title, track.artist, track.genre, track.artwork_url, track.url):
+            digest.update((value or "").encode("utf-8"))
+            digest.update(b"\x1f")
+        digest.update(b"\x1e")
+    return digest.hexdigest()[:32]
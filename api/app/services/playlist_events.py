@@ -0,0 +1,229 @@
+"""Live playlist events pushed to members over server-sent events.
+
+Routes publish suggestion and track deltas once their writes have committed. Each process fans
+them out to its own subscribers through an in-memory bus. On Postgres every process also
+``LISTEN``s on one channel and forwards its events with ``NOTIFY``, so a client streaming from
+one worker sees writes handled by the others. Delivery is best effort: a client that reconnects
+or falls behind should refetch the lists it shows.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import uuid
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from app.config.settings import settings
+from app.db.session import async_engine
+
+logger = logging.getLogger(__name__)
+
+PlaylistEventType = Literal[
+    "suggestion.created",
+    "suggestion.voted",
+    "suggestion.resolved",
+    "track.added",
+    "track.removed",
+    "track.reordered",
+]
+
+NOTIFY_CHANNEL = "votuna_playlist_events"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more; larger events stay on this worker.
+MAX_NOTIFY_PAYLOAD_BYTES = 7900
+# Lets the listener skip this process's own events, which the local bus already delivered.
+ORIGIN_ID = uuid.uuid4().hex
+STREAM_RETRY_MS = 3000
+_BRIDGE_RECONNECT_SECONDS = 5.0
+_BRIDGE_HEALTH_CHECK_SECONDS = 30.0
+
+
+@dataclass(frozen=True)
+class PlaylistEvent:
+    playlist_id: int
+    type: PlaylistEventType
+    data: dict[str, Any] = field(default_factory=dict)
+
+    def to_sse(self) -> str:
+        return f"event: {self.type}\ndata: {json.dumps(self.data)}\n\n"
+
+    def to_notify_payload(self) -> str:
+        return json.dumps({"origin": ORIGIN_ID, "playlist_id": self.playlist_id, "type": self.type, "data": self.data})
+
+    @classmethod
+    def from_notify_payload(cls, payload: str) -> tuple[str, PlaylistEvent]:
+        """Return the origin id and event carried by a NOTIFY payload."""
+        message = json.loads(payload)
+        return message["origin"], cls(int(message["playlist_id"]), message["type"], dict(message["data"]))
+
+
+class PlaylistEventBus:
+    """Per-process fan-out of playlist events to subscriber queues, owned by the app's event loop.
+
+    Queues are only touched on that loop; ``publish`` hops onto it so sync routes running in the
+    threadpool can publish too.
+    """
+
+    def __init__(self) -> None:
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._subscribers: dict[int, set[asyncio.Queue[PlaylistEvent | None]]] = {}
+        self._outbox: asyncio.Queue[str] | None = None
+
+    def bind(self, loop: asyncio.AbstractEventLoop | None, outbox: asyncio.Queue[str] | None = None) -> None:
+        """Attach the bus to the app's loop and, when fanning out across workers, the NOTIFY outbox."""
+        self._loop = loop
+        self._outbox = outbox
+
+    @contextlib.contextmanager
+    def subscribe(self, playlist_id: int) -> Iterator[asyncio.Queue[PlaylistEvent | None]]:
+        """Register a queue for the playlist's events; ``None`` in the queue means the stream should end."""
+        queue: asyncio.Queue[PlaylistEvent | None] = asyncio.Queue(maxsize=max(1, settings.PLAYLIST_EVENTS_QUEUE_SIZE))
+        subscribers = self._subscribers.setdefault(playlist_id, set())
+        subscribers.add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers.discard(queue)
+            if not subscribers and self._subscribers.get(playlist_id) is subscribers:
+                del self._subscribers[playlist_id]
+
+    def subscriber_count(self, playlist_id: int) -> int:
+        return len(self._subscribers.get(playlist_id, ()))
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue[PlaylistEvent | None], item: PlaylistEvent | None) -> None:
+        if queue.full():
+            # A client that stopped reading loses its oldest events rather than stalling publishers.
+            queue.get_nowait()
+        queue.put_nowait(item)
+
+    def deliver(self, event: PlaylistEvent) -> None:
+        """Hand ``event`` to this process's subscribers; must run on the bus loop."""
+        for queue in list(self._subscribers.get(event.playlist_id, ())):
+            self._offer(queue, event)
+
+    def publish(self, event: PlaylistEvent) -> None:
+        """Deliver ``event`` here and to other workers; safe to call from any thread."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is loop:
+            self._publish_on_loop(event)
+        else:
+            loop.call_soon_threadsafe(self._publish_on_loop, event)
+
+    def _publish_on_loop(self, event: PlaylistEvent) -> None:
+        self.deliver(event)
+        if self._outbox is None:
+            return
+        payload = event.to_notify_payload()
+        if len(payload.encode("utf-8")) > MAX_NOTIFY_PAYLOAD_BYTES:
+            logger.warning("Playlist event %s for playlist %s is too large to NOTIFY", event.type, event.playlist_id)
+            return
+        self._outbox.put_nowait(payload)
+
+    def close_subscribers(self) -> None:
+        """End every open stream, e.g. on shutdown."""
+        for subscribers in list(self._subscribers.values()):
+            for queue in list(subscribers):
+                self._offer(queue, None)
+
+
+playlist_event_bus = PlaylistEventBus()
+_bridge_task: asyncio.Task | None = None
+
+
+def publish_playlist_event(playlist_id: int, event_type: PlaylistEventType, data: dict[str, Any]) -> None:
+    """Push a JSON-serializable delta to the playlist's live subscribers."""
+    playlist_event_bus.publish(PlaylistEvent(playlist_id, event_type, data))
+
+
+async def playlist_event_stream(playlist_id: int) -> AsyncIterator[str]:
+    """Yield SSE frames for one playlist until the client goes away or the process shuts down."""
+    heartbeat_seconds = max(settings.PLAYLIST_EVENTS_HEARTBEAT_SECONDS, 1.0)
+    with playlist_event_bus.subscribe(playlist_id) as queue:
+        yield f"retry: {STREAM_RETRY_MS}\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=heartbeat_seconds)
+            except asyncio.TimeoutError:
+                # Comment frames keep proxies from closing an idle stream.
+                yield ": keep-alive\n\n"
+                continue
+            if event is None:
+                return
+            yield event.to_sse()
+
+
+async def _forward_outbox(connection: Any, outbox: asyncio.Queue[str]) -> None:
+    while True:
+        try:
+            payload = await asyncio.wait_for(outbox.get(), timeout=_BRIDGE_HEALTH_CHECK_SECONDS)
+        except asyncio.TimeoutError:
+            if connection.is_closed():
+                raise ConnectionError("Playlist event listener connection closed")
+            continue
+        await connection.execute("SELECT pg_notify($1, $2)", NOTIFY_CHANNEL, payload)
+
+
+async def _run_notify_bridge(bus: PlaylistEventBus, outbox: asyncio.Queue[str]) -> None:
+    def _on_notify(_connection: Any, _pid: int, _channel: str, payload: str) -> None:
+        try:
+            origin, event = PlaylistEvent.from_notify_payload(payload)
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed playlist event payload")
+            return
+        if origin != ORIGIN_ID:
+            bus.deliver(event)
+
+    while True:
+        try:
+            # Holds one pooled connection for as long as the process serves streams.
+            async with async_engine.connect() as conn:
+                connection = (await conn.get_raw_connection()).driver_connection
+                await connection.add_listener(NOTIFY_CHANNEL, _on_notify)
+                try:
+                    await _forward_outbox(connection, outbox)
+                finally:
+                    if not connection.is_closed():
+                        await connection.remove_listener(NOTIFY_CHANNEL, _on_notify)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Playlist event bridge failed; reconnecting")
+        await asyncio.sleep(_BRIDGE_RECONNECT_SECONDS)
+
+
+def start_playlist_events() -> None:
+    """Bind the bus to the running loop and, on Postgres, start the cross-worker NOTIFY bridge."""
+    global _bridge_task
+    loop = asyncio.get_running_loop()
+    if not settings.PLAYLIST_EVENTS_NOTIFY_ENABLED or async_engine.dialect.name != "postgresql":
+        playlist_event_bus.bind(loop)
+        return
+    if _bridge_task is not None and not _bridge_task.done():
+        return
+    outbox: asyncio.Queue[str] = asyncio.Queue()
+    playlist_event_bus.bind(loop, outbox)
+    _bridge_task = asyncio.create_task(_run_notify_bridge(playlist_event_bus, outbox))
+
+
+async def stop_playlist_events() -> None:
+    """End open streams, stop the NOTIFY bridge and detach the bus from the loop."""
+    global _bridge_task
+    playlist_event_bus.close_subscribers()
+    playlist_event_bus.bind(None)
+    task, _bridge_task = _bridge_task, None
+    if task is None:
+        return
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
@@ -0,0 +1,178 @@
+"""Track selection and best-effort adds shared by inline and background management transfers."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from sqlalchemy.orm import Session
+
+from app.crud.votuna_track_addition import votuna_track_addition_crud
+from app.models.votuna_playlist import VotunaPlaylist
+from app.schemas.votuna_playlist_management import ManagementFailedItem, ManagementSelectionMode
+from app.services.music_providers.base import (
+    MusicProviderClient,
+    ProviderAPIError,
+    ProviderAuthError,
+    ProviderRateLimitError,
+    ProviderTrack,
+    ProviderUnavailableError,
+)
+from app.services.playlist_events import publish_playlist_event
+
+ADD_CHUNK_SIZE = 100
+
+
+def normalize_selection_value(value: str) -> str:
+    return value.strip().lower()
+
+
+def filter_tracks_by_selection(
+    tracks: Sequence[ProviderTrack],
+    selection_mode: ManagementSelectionMode,
+    cleaned_values: list[str],
+) -> list[ProviderTrack]:
+    if selection_mode == "all":
+        return list(tracks)
+    if selection_mode == "songs":
+        selected_ids = set(cleaned_values)
+        return [track for track in tracks if normalize_selection_value(track.provider_track_id) in selected_ids]
+    if selection_mode == "artist":
+        selected_artists = set(cleaned_values)
+        return [
+            track for track in tracks if track.artist and normalize_selection_value(track.artist) in selected_artists
+        ]
+    # selection_mode == "genre"
+    selected_genres = set(cleaned_values)
+    return [track for track in tracks if track.genre and normalize_selection_value(track.genre) in selected_genres]
+
+
+def dedupe_tracks_by_id(tracks: Sequence[ProviderTrack]) -> list[ProviderTrack]:
+    deduped: list[ProviderTrack] = []
+    seen: set[str] = set()
+    for track in tracks:
+        track_id = track.provider_track_id
+        if not track_id or track_id in seen:
+            continue
+        seen.add(track_id)
+        deduped.append(track)
+    return deduped
+
+
+def chunk_values(values: Sequence[str], chunk_size: int) -> Iterable[list[str]]:
+    for index in range(0, len(values), chunk_size):
+        yield list(values[index : index + chunk_size])
+
+
+def record_transfer_additions(
+    db: Session,
+    *,
+    provider: str,
+    provider_playlist_id: str,
+    track_ids: Sequence[str],
+    added_by_user_id: int,
+    added_at: datetime | None = None,
+) -> list[int]:
+    """Record track additions for every Votuna playlist backed by the destination; return their ids."""
+    destination_playlists = (
+        db.query(VotunaPlaylist)
+        .filter(
+            VotunaPlaylist.provider == provider,
+            VotunaPlaylist.provider_playlist_id == provider_playlist_id,
+        )
+        .all()
+    )
+    added_at = added_at or datetime.now(timezone.utc)
+    votuna_track_addition_crud.bulk_create(
+        db,
+        [
+            {
+                "playlist_id": destination_playlist.id,
+                "provider_track_id": track_id,
+                "source": "playlist_utils",
+                "added_at": added_at,
+                "added_by_user_id": added_by_user_id,
+                "suggestion_id": None,
+            }
+            for destination_playlist in destination_playlists
+            for track_id in track_ids
+        ],
+    )
+    return [destination_playlist.id for destination_playlist in destination_playlists]
+
+
+def publish_transfer_additions(
+    playlist_ids: Sequence[int],
+    track_ids: Sequence[str],
+    *,
+    added_at: datetime,
+    added_by_user_id: int,
+    tracks_by_id: Mapping[str, ProviderTrack] | None = None,
+) -> None:
+    """Publish ``track.added`` for recorded transfer additions; call once they have committed."""
+    tracks_by_id = tracks_by_id or {}
+    for track_id in track_ids:
+        track = tracks_by_id.get(track_id)
+        data = {
+            "provider_track_id": track_id,
+            "title": (track.title if track else None) or track_id,
+            "artist": track.artist if track else None,
+            "artwork_url": track.artwork_url if track else None,
+            "url": track.url if track else None,
+            "added_at": added_at.isoformat(),
+            "added_source": "playlist_utils",
+            "added_by_user_id": added_by_user_id,
+        }
+        for playlist_id in playlist_ids:
+            publish_playlist_event(playlist_id, "track.added", data)
+
+
+@dataclass
+class ChunkAddResult:
+    added_track_ids: list[str] = field(default_factory=list)
+    failed_items: list[ManagementFailedItem] = field(default_factory=list)
+    # Tracks not attempted because the provider rate limited us or was unavailable (open circuit,
+    # timeout); always a suffix of the chunk, and worth retrying once ``deferred_error.retry_after`` passes.
+    deferred_track_ids: list[str] = field(default_factory=list)
+    deferred_error: ProviderRateLimitError | ProviderUnavailableError | None = None
+
+
+async def add_track_chunk(
+    client: MusicProviderClient,
+    provider_playlist_id: str,
+    chunk: Sequence[str],
+) -> ChunkAddResult:
+    """Add one chunk of tracks, falling back to per-track adds if the chunk is rejected.
+
+    Stops at the first rate limit or unavailable provider and reports the tracks it did not
+    get to. Auth errors propagate so callers can map them to their own session handling.
+    """
+    result = ChunkAddResult()
+    try:
+        await client.add_tracks(provider_playlist_id, list(chunk))
+        result.added_track_ids.extend(chunk)
+        return result
+    except (ProviderRateLimitError, ProviderUnavailableError) as exc:
+        result.deferred_track_ids.extend(chunk)
+        result.deferred_error = exc
+        return result
+    except ProviderAPIError:
+        # Fall back to per-track retries for best-effort behavior.
+        pass
+
+    for index, track_id in enumerate(chunk):
+        try:
+            await client.add_tracks(provider_playlist_id, [track_id])
+            result.added_track_ids.append(track_id)
+        except ProviderAuthError:
+            raise
+        except (ProviderRateLimitError, ProviderUnavailableError) as exc:
+            result.deferred_track_ids.extend(chunk[index:])
+            result.deferred_error = exc
+            break
+        except ProviderAPIError as exc:
+            result.failed_items.append(ManagementFailedItem(provider_track_id=track_id, error=str(exc)))
+        except Exception as exc:  # pragma: no cover - defensive fallback
+            result.failed_items.append(ManagementFailedItem(provider_track_id=track_id, error=str(exc)))
+    return result
@@ -0,0 +1,112 @@
+"""Background refresh of playlist owners' provider tokens before they expire.
+
+Requests refresh lazily when a token is already expired, which puts an OAuth round-trip on
+the critical path. This scheduler scans ``users.token_expires_at`` and refreshes owners of
+active playlists shortly before expiry, so interactive requests almost never have to. It
+runs in every worker; the single-flight refresh path keeps workers from refreshing the same
+token twice.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import settings
+from app.crud.user import user_crud
+from app.db.session import AsyncSessionLocal
+from app.services.music_providers.session import refresh_user_token
+
+logger = logging.getLogger(__name__)
+
+TOKEN_REFRESH_FAILURE_BACKOFF_SECONDS = 30 * 60
+
+_scheduler_task: asyncio.Task | None = None
+_scheduler_stop: asyncio.Event | None = None
+# user id -> monotonic time before which a failed refresh is not retried
+_failed_until: dict[int, float] = {}
+
+
+async def refresh_expiring_tokens(db: AsyncSession, *, now: datetime | None = None) -> int:
+    """Refresh tokens of active playlist owners that expire within the lead window.
+
+    Returns how many owners now hold a fresh token. Refreshes are spaced out to stay under
+    ``TOKEN_REFRESH_MAX_PER_SECOND``, and owners whose refresh failed are skipped for a while.
+    """
+    current = now or datetime.now(timezone.utc)
+    monotonic_now = time.monotonic()
+    for user_id, retry_at in list(_failed_until.items()):
+        if retry_at <= monotonic_now:
+            _failed_until.pop(user_id, None)
+
+    owners = await db.run_sync(
+        user_crud.list_playlist_owners_expiring_before,
+        current + timedelta(seconds=settings.TOKEN_REFRESH_LEAD_SECONDS),
+        settings.TOKEN_REFRESH_BATCH_SIZE,
+        exclude_user_ids=set(_failed_until),
+    )
+    max_per_second = settings.TOKEN_REFRESH_MAX_PER_SECOND
+    spacing = 1.0 / max_per_second if max_per_second > 0 else 0.0
+    refreshed = 0
+    for index, owner in enumerate(owners):
+        if index and spacing:
+            await asyncio.sleep(spacing)
+        try:
+            ok = await refresh_user_token(owner.auth_provider, owner, db)
+        except Exception:
+            logger.exception("Background token refresh failed for user %s", owner.id)
+            await db.rollback()
+            ok = False
+        if ok:
+            refreshed += 1
+        else:
+            _failed_until[owner.id] = time.monotonic() + TOKEN_REFRESH_FAILURE_BACKOFF_SECONDS
+    if owners:
+        logger.info("Background token refresh: %s of %s owner tokens refreshed", refreshed, len(owners))
+    return refreshed
+
+
+async def _run_scheduler(stop_event: asyncio.Event) -> None:
+    while not stop_event.is_set():
+        # Jitter keeps workers that started together from scanning in lockstep.
+        delay = settings.TOKEN_REFRESH_SCHEDULER_INTERVAL_SECONDS + random.uniform(
+            0, max(settings.TOKEN_REFRESH_SCHEDULER_JITTER_SECONDS, 0.0)
+        )
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=delay)
+            return
+        except asyncio.TimeoutError:
+            pass
+        try:
+            async with AsyncSessionLocal() as db:
+                await refresh_expiring_tokens(db)
+        except Exception:
+            logger.exception("Background token refresh pass failed")
+
+
+def start_token_refresh_scheduler() -> None:
+    """Start the background refresh loop for this process if enabled and not yet running."""
+    global _scheduler_task, _scheduler_stop
+    if not settings.TOKEN_REFRESH_SCHEDULER_ENABLED:
+        return
+    if _scheduler_task is not None and not _scheduler_task.done():
+        return
+    _scheduler_stop = asyncio.Event()
+    _scheduler_task = asyncio.create_task(_run_scheduler(_scheduler_stop))
+
+
+async def stop_token_refresh_scheduler() -> None:
+    """Stop the background refresh loop and wait for an in-flight pass to finish."""
+    global _scheduler_task, _scheduler_stop
+    task, stop_event = _scheduler_task, _scheduler_stop
+    _scheduler_task = None
+    _scheduler_stop = None
+    if task is None or stop_event is None:
+        return
+    stop_event.set()
+    await task
@@ -0,0 +1,354 @@
+"""In-process item-item co-occurrence index over Votuna playlist activity."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable, Sequence
+from itertools import islice
+
+from sqlalchemy import Row
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.crud.votuna_track_addition import votuna_track_addition_crud
+from app.crud.votuna_track_suggestion import votuna_track_suggestion_crud
+from app.crud.votuna_track_vote import votuna_track_vote_crud
+from app.db.session import SessionLocal
+from app.services.music_providers.base import ProviderTrack
+
+logger = logging.getLogger(__name__)
+
+COOCCURRENCE_TOP_K = 50
+COOCCURRENCE_MAX_BASKET_TRACKS = 500
+# A track only pairs with this many of the tracks added to its basket just before it, which
+# bounds the pair work per basket to MAX_BASKET_TRACKS * PAIR_WINDOW.
+COOCCURRENCE_PAIR_WINDOW = 50
+COOCCURRENCE_REFRESH_BATCH_SIZE = 1000
+# Rows one background pass folds in before checking whether the process is shutting down.
+COOCCURRENCE_BACKGROUND_PASS_ROWS = 20000
+# Postgres hands out serial ids before commit, so a row can become visible after rows with higher
+# ids have been read. Ids skipped by a watermark are re-read until they show up or this long has
+# passed, after which they are taken to be rolled-back inserts or deleted rows.
+COOCCURRENCE_GAP_TIMEOUT_SECONDS = 300.0
+# Skipped ids remembered per table; the oldest are dropped first.
+COOCCURRENCE_MAX_PENDING_GAPS = 1000
+
+# (provider, provider_track_id); track ids are only unique within one provider.
+TrackKey = tuple[str, str]
+
+_refresher_task: asyncio.Task | None = None
+_refresher_stop: asyncio.Event | None = None
+
+
+class _RowCursor:
+    """Id watermark over one table plus the ids below it that have not been read yet."""
+
+    def __init__(self) -> None:
+        self.last_id = 0
+        # Skipped id -> monotonic time it was skipped, lowest id first.
+        self.gaps: dict[int, float] = {}
+
+    def expire_gaps(self, now: float) -> None:
+        cutoff = now - COOCCURRENCE_GAP_TIMEOUT_SECONDS
+        self.gaps = {row_id: skipped_at for row_id, skipped_at in self.gaps.items() if skipped_at > cutoff}
+
+    def advance(self, row_id: int, now: float) -> None:
+        if row_id <= self.last_id:
+            self.gaps.pop(row_id, None)
+            return
+        for skipped_id in range(max(self.last_id + 1, row_id - COOCCURRENCE_MAX_PENDING_GAPS), row_id):
+            self.gaps[skipped_id] = now
+        while len(self.gaps) > COOCCURRENCE_MAX_PENDING_GAPS:
+            del self.gaps[next(iter(self.gaps))]
+        self.last_id = row_id
+
+
+class TrackCooccurrenceIndex:
+    """Sparse co-occurrence counts between tracks that share a basket.
+
+    A basket is every track added to or suggested for one playlist, or every track one user
+    upvoted. Rows are read incrementally by primary key, so a refresh only costs the rows
+    written since the previous one plus a re-read of ids it skipped over, which may belong to
+    transactions that had not committed yet. Removals and changed reactions are not replayed.
+
+    Memory is bounded. Only the most recently active baskets are kept, up to a basket count and
+    a total number of pair entries; evicting a basket takes its counts back out, and a basket
+    that sees new rows afterwards starts over empty. Track metadata is a size-capped LRU.
+    Neighbor lists are ranked by cosine similarity and cached per track until one of that
+    track's counts changes.
+    """
+
+    def __init__(
+        self,
+        max_baskets: int | None = None,
+        *,
+        max_pairs: int | None = None,
+        max_metadata: int | None = None,
+    ) -> None:
+        self._lock = threading.Lock()
+        # Serializes refreshes so two callers never fold the same rows twice.
+        self._refresh_lock = threading.Lock()
+        self._max_baskets = max(1, max_baskets if max_baskets is not None else settings.TRACK_COOCCURRENCE_MAX_BASKETS)
+        self._max_pairs = max(1, max_pairs if max_pairs is not None else settings.TRACK_COOCCURRENCE_MAX_PAIRS)
+        self._max_metadata = max(
+            1, max_metadata if max_metadata is not None else settings.TRACK_COOCCURRENCE_MAX_METADATA
+        )
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop every count and start over from the first row on the next refresh."""
+        with self._lock:
+            # Basket members in the order they were added, least recently active basket first.
+            self._baskets: OrderedDict[Hashable, dict[str, None]] = OrderedDict()
+            self._track_counts: dict[TrackKey, int] = {}
+            self._pair_counts: dict[TrackKey, dict[str, int]] = {}
+            # Entries across every inner dict of ``_pair_counts``.
+            self._pair_entries = 0
+            self._top_neighbors: dict[TrackKey, list[tuple[float, str]]] = {}
+            # Least recently used first.
+            self._metadata: OrderedDict[TrackKey, ProviderTrack] = OrderedDict()
+            self._addition_cursor = _RowCursor()
+            self._suggestion_cursor = _RowCursor()
+            self._vote_cursor = _RowCursor()
+
+    def refresh(self, db: Session, *, max_rows: int | None = None, blocking: bool = True) -> int:
+        """Fold additions, suggestions and upvotes written since the last refresh into the index.
+
+        Reads at most ``max_rows`` rows when given, leaving the rest for the next refresh. With
+        ``blocking=False`` the call returns at once if another refresh is running. Returns the
+        number of rows read.
+        """
+        if not self._refresh_lock.acquire(blocking=blocking):
+            return 0
+        try:
+            return self._refresh(db, max_rows)
+        finally:
+            self._refresh_lock.release()
+
+    def _refresh(self, db: Session, max_rows: int | None) -> int:
+        read = 0
+        now = time.monotonic()
+
+        def _batch_size() -> int:
+            if max_rows is None:
+                return COOCCURRENCE_REFRESH_BATCH_SIZE
+            return min(COOCCURRENCE_REFRESH_BATCH_SIZE, max_rows - read)
+
+        def _read(
+            cursor: _RowCursor,
+            fetch: Callable[..., Sequence[Row]],
+            fold: Callable[[Row], None],
+        ) -> None:
+            nonlocal read
+            cursor.expire_gaps(now)
+            if cursor.gaps and (limit := _batch_size()) > 0:
+                rows = fetch(db, ids=list(cursor.gaps), limit=limit)
+                read += len(rows)
+                self._fold(rows, cursor, fold, now)
+            while (limit := _batch_size()) > 0:
+                rows = fetch(db, after_id=cursor.last_id, limit=limit)
+                read += len(rows)
+                self._fold(rows, cursor, fold, now)
+                if len(rows) < limit:
+                    break
+
+        _read(self._addition_cursor, votuna_track_addition_crud.list_cooccurrence_rows, self._fold_addition)
+        _read(self._suggestion_cursor, votuna_track_suggestion_crud.list_cooccurrence_rows, self._fold_suggestion)
+        _read(self._vote_cursor, votuna_track_vote_crud.list_vote_cooccurrence_rows, self._fold_upvote)
+        return read
+
+    def _fold(self, rows: Sequence[Row], cursor: _RowCursor, fold: Callable[[Row], None], now: float) -> None:
+        with self._lock:
+            for row in rows:
+                fold(row)
+                cursor.advance(row[0], now)
+
+    def _fold_addition(self, row: Row) -> None:
+        _row_id, playlist_id, provider, track_id = row
+        self._add_to_basket(("playlist", playlist_id), provider, track_id)
+
+    def _fold_suggestion(self, row: Row) -> None:
+        _row_id, playlist_id, provider, track_id, title, artist, artwork_url, url = row
+        self._add_to_basket(("playlist", playlist_id), provider, track_id)
+        if title:
+            self._remember(
+                provider,
+                ProviderTrack(
+                    provider_track_id=track_id,
+                    title=title,
+                    artist=artist,
+                    artwork_url=artwork_url,
+                    url=url,
+                ),
+            )
+
+    def _fold_upvote(self, row: Row) -> None:
+        _row_id, user_id, provider, track_id, reaction = row
+        if reaction != "up":
+            return
+        self._add_to_basket(("voter", user_id), provider, track_id)
+
+    def remember_tracks(self, provider: str, tracks: Iterable[ProviderTrack]) -> None:
+        """Keep display metadata for tracks so neighbors can be returned as full tracks."""
+        with self._lock:
+            for track in tracks:
+                self._remember(provider, track)
+
+    def neighbors(self, provider: str, provider_track_id: str, limit: int) -> Sequence[ProviderTrack]:
+        """Return up to ``limit`` tracks that most often share a basket with the given track."""
+        key = (provider, provider_track_id.strip())
+        with self._lock:
+            ranked = self._top_neighbors.get(key)
+            if ranked is None:
+                ranked = self._rank_neighbors(key)
+                # Only tracks with counts are cached, so arbitrary lookups cannot grow the cache.
+                if key in self._pair_counts:
+                    self._top_neighbors[key] = ranked
+            neighbors: list[ProviderTrack] = []
+            for _score, track_id in ranked:
+                track = self._metadata.get((provider, track_id))
+                if track is None:
+                    continue
+                self._metadata.move_to_end((provider, track_id))
+                neighbors.append(track)
+                if len(neighbors) >= limit:
+                    break
+            return neighbors
+
+    def _remember(self, provider: str, track: ProviderTrack) -> None:
+        track_id = (track.provider_track_id or "").strip()
+        if track_id and track.title:
+            key = (provider, track_id)
+            self._metadata[key] = track
+            self._metadata.move_to_end(key)
+            if len(self._metadata) > self._max_metadata:
+                self._metadata.popitem(last=False)
+
+    def _add_to_basket(self, basket_key: Hashable, provider: str, provider_track_id: str) -> None:
+        track_id = (provider_track_id or "").strip()
+        if not track_id:
+            return
+        # A voter can upvote on several providers; only same-provider tracks may pair up.
+        scoped_key = (basket_key, provider)
+        basket = self._baskets.get(scoped_key)
+        if basket is None:
+            basket = self._baskets[scoped_key] = {}
+        else:
+            self._baskets.move_to_end(scoped_key)
+        if track_id not in basket and len(basket) < COOCCURRENCE_MAX_BASKET_TRACKS:
+            key = (provider, track_id)
+            self._track_counts[key] = self._track_counts.get(key, 0) + 1
+            self._top_neighbors.pop(key, None)
+            for other_id in islice(reversed(basket), COOCCURRENCE_PAIR_WINDOW):
+                self._change_pair(provider, track_id, other_id, 1)
+                self._change_pair(provider, other_id, track_id, 1)
+            basket[track_id] = None
+        # The basket just touched is the most recent one, so it is never the one evicted.
+        while len(self._baskets) > 1 and (
+            len(self._baskets) > self._max_baskets or self._pair_entries > self._max_pairs
+        ):
+            self._evict_oldest_basket()
+
+    def _change_pair(self, provider: str, track_id: str, other_id: str, delta: int) -> None:
+        key = (provider, track_id)
+        pairs = self._pair_counts.setdefault(key, {})
+        count = pairs.get(other_id, 0) + delta
+        if count > 0:
+            if other_id not in pairs:
+                self._pair_entries += 1
+            pairs[other_id] = count
+        elif other_id in pairs:
+            del pairs[other_id]
+            self._pair_entries -= 1
+        if not pairs:
+            del self._pair_counts[key]
+        self._top_neighbors.pop(key, None)
+
+    def _evict_oldest_basket(self) -> None:
+        """Drop the least recently active basket and take back out the counts it contributed."""
+        (_basket_key, provider), basket = self._baskets.popitem(last=False)
+        members = list(basket)
+        for position, track_id in enumerate(members):
+            # Mirrors _add_to_basket: each member paired with the window of members before it.
+            for other_id in members[max(0, position - COOCCURRENCE_PAIR_WINDOW) : position]:
+                self._change_pair(provider, track_id, other_id, -1)
+                self._change_pair(provider, other_id, track_id, -1)
+            key = (provider, track_id)
+            count = self._track_counts.get(key, 0) - 1
+            if count > 0:
+                self._track_counts[key] = count
+            else:
+                self._track_counts.pop(key, None)
+            self._top_neighbors.pop(key, None)
+
+    def _rank_neighbors(self, key: TrackKey) -> list[tuple[float, str]]:
+        pairs = self._pair_counts.get(key)
+        if not pairs:
+            return []
+        provider = key[0]
+        track_count = self._track_counts.get(key, 1)
+
+        def _score(item: tuple[str, int]) -> tuple[float, str]:
+            other_id, count = item
+            other_count = self._track_counts.get((provider, other_id), 1)
+            return count / math.sqrt(track_count * other_count), other_id
+
+        # Ties break on track id so the order stays stable between refreshes.
+        return heapq.nsmallest(
+            COOCCURRENCE_TOP_K,
+            (_score(item) for item in pairs.items()),
+            key=lambda entry: (-entry[0], entry[1]),
+        )
+
+
+track_cooccurrence_index = TrackCooccurrenceIndex()
+
+
+def _refresh_in_background() -> int:
+    with SessionLocal() as db:
+        return track_cooccurrence_index.refresh(db, max_rows=COOCCURRENCE_BACKGROUND_PASS_ROWS)
+
+
+async def _run_refresher(stop_event: asyncio.Event) -> None:
+    while not stop_event.is_set():
+        try:
+            read = await asyncio.to_thread(_refresh_in_background)
+        except Exception:
+            logger.exception("Track co-occurrence refresh pass failed")
+            read = 0
+        # A full pass means there is a backlog (e.g. a cold start); keep going until caught up.
+        delay = 0 if read >= COOCCURRENCE_BACKGROUND_PASS_ROWS else settings.TRACK_COOCCURRENCE_REFRESH_INTERVAL_SECONDS
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=delay)
+            return
+        except asyncio.TimeoutError:
+            pass
+
+
+def start_cooccurrence_refresher() -> None:
+    """Build the index in the background on startup and keep folding in new rows, if enabled."""
+    global _refresher_task, _refresher_stop
+    if not settings.TRACK_COOCCURRENCE_REFRESH_ENABLED:
+        return
+    if _refresher_task is not None and not _refresher_task.done():
+        return
+    _refresher_stop = asyncio.Event()
+    _refresher_task = asyncio.create_task(_run_refresher(_refresher_stop))
+
+
+async def stop_cooccurrence_refresher() -> None:
+    """Stop the background refresh loop and wait for an in-flight pass to finish."""
+    global _refresher_task, _refresher_stop
+    task, stop_event = _refresher_task, _refresher_stop
+    _refresher_task = None
+    _refresher_stop = None
+    if task is None or stop_event is None:
+        return
+    stop_event.set()
+    await task
@@ -0,0 +1,266 @@
+"""Ranked track recommendations for Votuna playlists."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+from collections.abc import Collection, Sequence
+from dataclasses import dataclass
+
+from fastapi import BackgroundTasks
+
+from app.config.settings import settings
+from app.services.music_providers import MusicProviderClient, ProviderAPIError, ProviderAuthError
+from app.services.music_providers.base import ProviderTrack
+from app.services.track_cooccurrence import track_cooccurrence_index
+from app.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+RECOMMENDATION_SEED_LIMIT = 8
+RECOMMENDATION_RELATED_LIMIT_PER_SEED = 25
+RECOMMENDATION_MAX_TRACKS_PER_ARTIST = 2
+RECOMMENDATION_SEED_CONCURRENCY = 4
+RECOMMENDATION_SEED_DEADLINE_SECONDS = 4.0
+
+
+@dataclass(frozen=True)
+class RankedRecommendations:
+    # Playlist track ids the ranking was computed from; a mismatch means the entry is outdated.
+    playlist_track_ids: tuple[str, ...]
+    candidates: tuple[ProviderTrack, ...]
+
+
+recommendation_cache: TTLCache[RankedRecommendations] = TTLCache(
+    max_entries=settings.RECOMMENDATION_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.RECOMMENDATION_CACHE_TTL_SECONDS,
+)
+
+
+def provider_has_related_tracks(provider: str) -> bool:
+    """Return whether the provider exposes a related-tracks endpoint."""
+    # Spotify recommendations endpoint is deprecated; those playlists rank from the local index only.
+    return provider != "spotify"
+
+
+def recommendation_cache_key(playlist_id: int, refresh_nonce: str | None) -> tuple[int, str]:
+    """Build the cache key for a playlist's ranking under one refresh nonce."""
+    return playlist_id, (refresh_nonce or "").strip()
+
+
+def _playlist_track_ids(current_tracks: Sequence[ProviderTrack]) -> tuple[str, ...]:
+    track_ids: list[str] = []
+    seen: set[str] = set()
+    for track in current_tracks:
+        track_id = (track.provider_track_id or "").strip()
+        if not track_id or track_id in seen:
+            continue
+        seen.add(track_id)
+        track_ids.append(track_id)
+    return tuple(track_ids)
+
+
+def _ordered_seed_track_ids(
+    track_ids: Sequence[str],
+    refresh_nonce: str | None,
+) -> list[str]:
+    if not track_ids:
+        return []
+    if not refresh_nonce:
+        return list(track_ids[:RECOMMENDATION_SEED_LIMIT])
+    nonce = refresh_nonce.strip()
+    if not nonce:
+        return list(track_ids[:RECOMMENDATION_SEED_LIMIT])
+    ranked = sorted(
+        track_ids,
+        key=lambda track_id: hashlib.sha256(f"{nonce}:{track_id}".encode("utf-8")).hexdigest(),
+    )
+    return ranked[:RECOMMENDATION_SEED_LIMIT]
+
+
+async def _fetch_related_tracks_by_seed(
+    client: MusicProviderClient,
+    seed_track_ids: Sequence[str],
+) -> dict[int, Sequence[ProviderTrack]]:
+    """Fetch related tracks for every seed concurrently, keyed by seed index.
+
+    Seeds that miss the deadline or fail with a provider error are dropped. Auth errors are
+    re-raised, and a provider error is re-raised when no seed succeeded so an outage still
+    surfaces instead of looking like an empty result.
+    """
+    semaphore = asyncio.Semaphore(RECOMMENDATION_SEED_CONCURRENCY)
+
+    async def _fetch(seed_track_id: str) -> Sequence[ProviderTrack]:
+        async with semaphore:
+            return await client.related_tracks(
+                seed_track_id,
+                limit=RECOMMENDATION_RELATED_LIMIT_PER_SEED,
+                offset=0,
+            )
+
+    tasks = [asyncio.create_task(_fetch(seed_track_id)) for seed_track_id in seed_track_ids]
+    done, pending = await asyncio.wait(tasks, timeout=RECOMMENDATION_SEED_DEADLINE_SECONDS)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    related_by_seed: dict[int, Sequence[ProviderTrack]] = {}
+    provider_error: ProviderAPIError | None = None
+    for seed_index, task in enumerate(tasks):
+        if task not in done:
+            continue
+        exc = task.exception()
+        if exc is None:
+            related_by_seed[seed_index] = task.result()
+        elif isinstance(exc, ProviderAPIError):
+            if exc.status_code not in {400, 404} and provider_error is None:
+                provider_error = exc
+        else:
+            raise exc
+    if provider_error is not None and not related_by_seed:
+        raise provider_error
+    return related_by_seed
+
+
+async def _rank_candidates(
+    client: MusicProviderClient,
+    provider: str,
+    playlist_track_ids: Sequence[str],
+    refresh_nonce: str | None,
+) -> tuple[ProviderTrack, ...]:
+    seed_track_ids = _ordered_seed_track_ids(playlist_track_ids, refresh_nonce)
+    if not seed_track_ids:
+        return ()
+    related_by_seed: dict[int, Sequence[ProviderTrack]] = {}
+    provider_error: ProviderAPIError | None = None
+    if provider_has_related_tracks(provider):
+        try:
+            related_by_seed = await _fetch_related_tracks_by_seed(client, seed_track_ids)
+        except ProviderAPIError as exc:
+            provider_error = exc
+    # Seeds the provider could not answer (or never answers) fall back to local co-occurrence.
+    for seed_index, seed_track_id in enumerate(seed_track_ids):
+        if seed_index in related_by_seed:
+            continue
+        neighbors = track_cooccurrence_index.neighbors(
+            provider,
+            seed_track_id,
+            limit=RECOMMENDATION_RELATED_LIMIT_PER_SEED,
+        )
+        if neighbors:
+            related_by_seed[seed_index] = neighbors
+    if provider_error is not None and not related_by_seed:
+        raise provider_error
+
+    score_by_track_id: dict[str, tuple[int, int, ProviderTrack]] = {}
+    # Score in seed order so ties break exactly as they would with sequential fetches.
+    for seed_index in sorted(related_by_seed):
+        for track in related_by_seed[seed_index]:
+            track_id = (track.provider_track_id or "").strip()
+            if not track_id:
+                continue
+            existing_entry = score_by_track_id.get(track_id)
+            if not existing_entry:
+                score_by_track_id[track_id] = (1, seed_index, track)
+                continue
+            score, first_seed_index, existing_track = existing_entry
+            next_first_seed_index = min(seed_index, first_seed_index)
+            score_by_track_id[track_id] = (score + 1, next_first_seed_index, existing_track)
+
+    ranked_entries = sorted(
+        score_by_track_id.items(),
+        key=lambda entry: (
+            -entry[1][0],
+            entry[1][1],
+            entry[0],
+        ),
+    )
+    existing_track_ids = set(playlist_track_ids)
+    return tuple(track for track_id, (_score, _seed, track) in ranked_entries if track_id not in existing_track_ids)
+
+
+async def get_ranked_recommendations(
+    client: MusicProviderClient,
+    playlist_id: int,
+    provider_playlist_id: str,
+    refresh_nonce: str | None = None,
+    *,
+    provider: str,
+) -> tuple[ProviderTrack, ...]:
+    """Return ranked candidates not already in the playlist, served from cache when current.
+
+    The cached ranking is reused only while the playlist still holds the same tracks, so
+    pages requested with ``offset`` slice one ranking instead of refetching related tracks.
+    """
+    current_tracks = await client.list_tracks(provider_playlist_id)
+    track_cooccurrence_index.remember_tracks(provider, current_tracks)
+    playlist_track_ids = _playlist_track_ids(current_tracks)
+    if not playlist_track_ids:
+        return ()
+
+    key = recommendation_cache_key(playlist_id, refresh_nonce)
+    cached = recommendation_cache.get(key)
+    if cached is not None and cached.playlist_track_ids == playlist_track_ids:
+        return cached.candidates
+
+    candidates = await _rank_candidates(client, provider, playlist_track_ids, refresh_nonce)
+    recommendation_cache.set(
+        key,
+        RankedRecommendations(playlist_track_ids=playlist_track_ids, candidates=candidates),
+    )
+    return candidates
+
+
+def select_recommendations(
+    candidates: Sequence[ProviderTrack],
+    *,
+    excluded_track_ids: Collection[str],
+    limit: int,
+    offset: int = 0,
+) -> list[ProviderTrack]:
+    """Apply per-request exclusions and the per-artist cap, then return one page."""
+    selected: list[ProviderTrack] = []
+    artist_counts: dict[str, int] = {}
+    for track in candidates:
+        if len(selected) >= offset + limit:
+            break
+        track_id = (track.provider_track_id or "").strip()
+        if not track_id or track_id in excluded_track_ids:
+            continue
+        artist_key = (track.artist or "").strip().lower()
+        if artist_key:
+            current_count = artist_counts.get(artist_key, 0)
+            if current_count >= RECOMMENDATION_MAX_TRACKS_PER_ARTIST:
+                continue
+            artist_counts[artist_key] = current_count + 1
+        selected.append(track)
+    return selected[offset : offset + limit]
+
+
+async def warm_recommendations(
+    client: MusicProviderClient,
+    playlist_id: int,
+    provider_playlist_id: str,
+    provider: str,
+) -> None:
+    """Recompute the default ranking for a playlist, ignoring provider failures."""
+    try:
+        await get_ranked_recommendations(client, playlist_id, provider_playlist_id, provider=provider)
+    except (ProviderAuthError, ProviderAPIError) as exc:
+        logger.info("Skipped recommendation warm for playlist %s: %s", playlist_id, exc)
+
+
+def schedule_recommendation_warm(
+    background_tasks: BackgroundTasks,
+    client: MusicProviderClient,
+    *,
+    provider: str,
+    playlist_id: int,
+    provider_playlist_id: str,
+) -> None:
+    """Warm the recommendation cache after the response once a playlist's tracks changed."""
+    if not recommendation_cache.enabled:
+        return
+    background_tasks.add_task(warm_recommendations, client, playlist_id, provider_playlist_id, provider)
@@ -0,0 +1,38 @@
+"""Weak ETags and ``If-None-Match`` handling for conditional GETs."""
+
+from __future__ import annotations
+
+import hashlib
+
+from fastapi import Request, Response, status
+
+ETAG_HEADER = "ETag"
+# Clients may keep the body but must revalidate it, and shared caches must not store per-user payloads.
+CONDITIONAL_CACHE_CONTROL = "private, no-cache"
+
+
+def weak_etag(*parts: object) -> str:
+    """Build a weak ETag from the values that determine a response body."""
+    digest = hashlib.sha256("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Apply the weak comparison ``If-None-Match`` uses against one of our ETags."""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def conditional_response(request: Request, response: Response, etag: str) -> Response | None:
+    """Tag ``response`` with ``etag``; return a 304 to send instead when the client already has it."""
+    headers = {ETAG_HEADER: etag, "Cache-Control": CONDITIONAL_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,25 @@
+"""Opaque keyset cursors for paginated list endpoints."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(row_id: int) -> str:
+    """Encode the id of the last row on a page as an opaque cursor."""
+    return base64.urlsafe_b64encode(str(row_id).encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decode a cursor produced by ``encode_cursor``; raise ValueError when malformed."""
+    padded = cursor.strip() + "=" * (-len(cursor.strip()) % 4)
+    try:
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("ascii")
+    except (binascii.Error, UnicodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not raw.isdigit():
+        raise ValueError("Invalid cursor")
+    return int(raw)
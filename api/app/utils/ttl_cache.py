@@ -0,0 +1,108 @@
+"""Small in-process LRU cache with per-entry time-to-live."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+ValueT = TypeVar("ValueT")
+
+
+@dataclass
+class CacheEntry(Generic[ValueT]):
+    value: ValueT
+    stored_at: float
+    is_fresh: bool
+
+
+class TTLCache(Generic[ValueT]):
+    """Bounded LRU mapping whose entries go stale after ``ttl_seconds``.
+
+    Stale entries are kept (until evicted) so callers can revalidate them
+    conditionally instead of refetching from scratch. A non-positive TTL or
+    size disables the cache entirely.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[ValueT, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def get_entry(self, key: Hashable) -> CacheEntry[ValueT] | None:
+        """Return the entry for ``key`` (fresh or stale) and mark it recently used."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            stored = self._entries.get(key)
+            if stored is None:
+                return None
+            self._entries.move_to_end(key)
+        value, stored_at = stored
+        return CacheEntry(
+            value=value,
+            stored_at=stored_at,
+            is_fresh=self._clock() - stored_at < self.ttl_seconds,
+        )
+
+    def get(self, key: Hashable) -> ValueT | None:
+        """Return the cached value only while it is still fresh."""
+        entry = self.get_entry(key)
+        if entry is None or not entry.is_fresh:
+            return None
+        return entry.value
+
+    def set(self, key: Hashable, value: ValueT) -> None:
+        """Store ``value`` and evict the least recently used entries over capacity."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (value, self._clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def touch(self, key: Hashable) -> None:
+        """Restart the TTL of an existing entry after a successful revalidation."""
+        with self._lock:
+            stored = self._entries.get(key)
+            if stored is None:
+                return
+            self._entries[key] = (stored[0], self._clock())
+            self._entries.move_to_end(key)
+
+    def pop(self, key: Hashable) -> None:
+        """Drop ``key`` from the cache if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def pop_where(self, predicate: Callable[[ValueT], bool]) -> int:
+        """Drop every entry whose value matches ``predicate``; return how many were dropped."""
+        with self._lock:
+            keys = [key for key, (value, _) in self._entries.items() if predicate(value)]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
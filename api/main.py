@@ -1,8 +1,9 @@
-from fastapi import FastAPI, Depends, Request, status
+from fastapi import FastAPI, Depends, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from sqlalchemy import text
 from sqlalchemy.orm import Session
+import hmac
 import logging
 import sys
 import time
@@ -10,7 +11,17 @@ import time
 from app.api.v1.router import router as v1_router
 from app.auth.dependencies import AUTH_EXPIRED_HEADER
 from app.config.settings import settings
-from app.db.session import get_db
+from app.db.pool_metrics import pool_snapshot
+from app.db.session import async_engine, engine, get_db
+from app.services.music_providers.http_client import close_shared_client, open_shared_client
+from app.services.music_providers.rate_limit import provider_request_scheduler
+from app.services.music_providers.resilience import provider_health_snapshot
+from app.services.management_jobs import start_management_job_worker, stop_management_job_worker
+from app.services.playlist_events import start_playlist_events, stop_playlist_events
+from app.services.track_cooccurrence import start_cooccurrence_refresher, stop_cooccurrence_refresher
+from app.services.token_refresh_scheduler import start_token_refresh_scheduler, stop_token_refresh_scheduler
+from app.utils.etag import ETAG_HEADER
+from app.utils.pagination import NEXT_CURSOR_HEADER
 
 # Configure structured logging
 logging.basicConfig(
@@ -37,13 +48,24 @@ def _body_preview_from_response(status_code: int, response) -> str | None:
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Handle startup and shutdown logging for the application."""
+    """Handle startup and shutdown for the application."""
     # Startup
     logger.info("Application starting up")
     logger.info(f"Debug mode: {settings.DEBUG}")
+    await open_shared_client()
+    start_token_refresh_scheduler()
+    start_management_job_worker()
+    start_playlist_events()
+    start_cooccurrence_refresher()
     yield
     # Shutdown
     logger.info("Application shutting down")
+    await stop_cooccurrence_refresher()
+    await stop_playlist_events()
+    await stop_management_job_worker()
+    await stop_token_refresh_scheduler()
+    await close_shared_client()
+    await async_engine.dispose()
 
 
 app = FastAPI(
@@ -119,8 +141,8 @@ app.add_middleware(
     allow_origins=settings.ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
-    allow_headers=["Content-Type", "Authorization", "Accept", "Origin"],
-    expose_headers=[AUTH_EXPIRED_HEADER],
+    allow_headers=["Content-Type", "Authorization", "Accept", "Origin", "If-None-Match"],
+    expose_headers=[AUTH_EXPIRED_HEADER, NEXT_CURSOR_HEADER, ETAG_HEADER, "Retry-After"],
 )
 
 
@@ -142,6 +164,32 @@ async def health_check(db: Session = Depends(get_db)):
         return {"status": "unhealthy", "database": "disconnected", "error": str(e)}
 
 
+def require_metrics_token(request: Request) -> None:
+    """Allow /metrics only with the configured bearer token; without one it does not exist."""
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@app.get("/metrics", dependencies=[Depends(require_metrics_token)])
+async def metrics():
+    """Database pool usage and provider queue/circuit state for monitoring"""
+    return {
+        "db_pools": {
+            "sync": pool_snapshot(engine),
+            "async": pool_snapshot(async_engine.sync_engine),
+        },
+        "provider_queues": provider_request_scheduler.snapshot(),
+        "provider_circuits": provider_health_snapshot(),
+    }
+
+
 # Include v1 routes
 app.include_router(v1_router, prefix="/api/v1")
 
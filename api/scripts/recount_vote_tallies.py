@@ -0,0 +1,47 @@
+"""Recompute suggestion vote tallies from votuna_track_votes.
+
+Run from the api directory with ``python -m scripts.recount_vote_tallies``. Tallies are rewritten
+in id-ordered batches, one transaction per batch, so the command is safe to rerun.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select
+
+from app.crud.votuna_track_vote import votuna_track_vote_crud
+from app.db.session import SessionLocal
+from app.models.votuna_suggestions import VotunaTrackSuggestion
+
+
+def _log(message: str) -> None:
+    timestamp = datetime.now(timezone.utc).isoformat()
+    print(f"[recount-tallies][{timestamp}] {message}", flush=True)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        max_id = db.scalar(select(func.max(VotunaTrackSuggestion.id)))
+        if max_id is None:
+            _log("No suggestions to recount")
+            return 0
+        rewritten = 0
+        for min_id in range(1, max_id + 1, args.batch_size):
+            rewritten += votuna_track_vote_crud.recount_tallies(
+                db,
+                min_id=min_id,
+                max_id=min_id + args.batch_size - 1,
+            )
+        _log(f"Recounted tallies for {rewritten} suggestions (max id {max_id})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,8 +4,9 @@ from copy import deepcopy
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.pool import StaticPool
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool, StaticPool
 from sqlalchemy.orm import sessionmaker
 
 os.environ.setdefault(
@@ -14,11 +15,20 @@ os.environ.setdefault(
 )
 os.environ.setdefault("AUTH_SECRET_KEY", "test-secret-key-32-characters-long")
 os.environ.setdefault("USER_FILES_DIR", "user_files_test")
+os.environ.setdefault("TOKEN_REFRESH_SCHEDULER_ENABLED", "False")
+os.environ.setdefault("MANAGEMENT_JOB_WORKER_ENABLED", "False")
+os.environ.setdefault("PLAYLIST_EVENTS_NOTIFY_ENABLED", "False")
+os.environ.setdefault("TRACK_COOCCURRENCE_REFRESH_ENABLED", "False")
 
-from app.db.session import Base, get_db
+from app.db.session import Base, get_async_db, get_db
 import app.models  # noqa: F401
 from main import app
-from app.auth.dependencies import get_current_user, get_optional_current_user
+from app.auth.dependencies import (
+    get_current_principal,
+    get_current_principal_async,
+    get_current_user,
+    get_optional_current_user,
+)
 from app.crud.user import user_crud
 from app.crud.votuna_playlist import votuna_playlist_crud
 from app.crud.votuna_playlist_member import votuna_playlist_member_crud
@@ -26,7 +36,9 @@ from app.crud.votuna_playlist_settings import votuna_playlist_settings_crud
 from app.services.music_providers.base import (
     ProviderAPIError,
     ProviderPlaylist,
+    ProviderRateLimitError,
     ProviderTrack,
+    ProviderUnavailableError,
     ProviderUser,
 )
 
@@ -139,8 +151,13 @@ class DummyProvider:
     search_users_calls = 0
     get_user_calls = 0
     add_tracks_calls: list[dict] = []
+    apply_track_mutation_calls: list[dict] = []
+    reorder_tracks_calls: list[dict] = []
+    iterated_track_ids: list[str] = []
     fail_add_chunk_for_track_ids: set[str] = set()
     fail_add_single_for_track_ids: set[str] = set()
+    rate_limit_add_for_track_ids: set[str] = set()
+    unavailable_add_for_track_ids: set[str] = set()
     related_tracks_by_seed = {
         "track-1": [
             ProviderTrack(
@@ -251,6 +268,14 @@ class DummyProvider:
     async def list_tracks(self, provider_playlist_id: str):
         return self.tracks_by_playlist_id.get(provider_playlist_id, self.tracks)
 
+    def cached_tracks_fingerprint(self, provider_playlist_id: str):
+        return None
+
+    async def iter_tracks(self, provider_playlist_id: str):
+        for track in await self.list_tracks(provider_playlist_id):
+            self.iterated_track_ids.append(track.provider_track_id)
+            yield track
+
     async def search_tracks(self, query: str, limit: int = 10):
         if not query.strip():
             return []
@@ -316,6 +341,10 @@ class DummyProvider:
             raise ProviderAPIError("chunk add failed")
         if len(normalized_ids) == 1 and normalized_ids[0] in self.fail_add_single_for_track_ids:
             raise ProviderAPIError("single add failed")
+        if any(track_id in self.rate_limit_add_for_track_ids for track_id in normalized_ids):
+            raise ProviderRateLimitError("rate limit reached", retry_after=30)
+        if any(track_id in self.unavailable_add_for_track_ids for track_id in normalized_ids):
+            raise ProviderUnavailableError("circuit open", retry_after=30)
 
         playlist_tracks = self.tracks_by_playlist_id.setdefault(provider_playlist_id, [])
         existing_ids = {track.provider_track_id for track in playlist_tracks}
@@ -356,30 +385,92 @@ class DummyProvider:
         ]
         return None
 
+    async def apply_track_mutation(self, provider_playlist_id: str, mutation):
+        self.apply_track_mutation_calls.append({"provider_playlist_id": provider_playlist_id, "mutation": mutation})
+        if mutation.remove:
+            await self.remove_tracks(provider_playlist_id, mutation.remove)
+        if mutation.add:
+            await self.add_tracks(provider_playlist_id, mutation.add)
+        if mutation.order is not None:
+            await self.reorder_tracks(provider_playlist_id, mutation.order)
+        return None
+
+    async def reorder_tracks(self, provider_playlist_id: str, ordered_ids):
+        self.reorder_tracks_calls.append({"provider_playlist_id": provider_playlist_id, "track_ids": list(ordered_ids)})
+        playlist_tracks = list(self.tracks_by_playlist_id.get(provider_playlist_id, self.tracks))
+        position = {str(track_id): index for index, track_id in enumerate(ordered_ids)}
+        playlist_tracks.sort(key=lambda track: position.get(str(track.provider_track_id), len(position)))
+        self.tracks_by_playlist_id[provider_playlist_id] = playlist_tracks
+        return None
+
     async def track_exists(self, provider_playlist_id: str, track_id: str) -> bool:
         return self.track_exists_value
 
 
-TEST_DATABASE_URL = "sqlite+pysqlite://"
+def _enable_sqlite_wal(dbapi_connection, _connection_record):
+    """Let the sync and async test engines read while the other one writes."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
 
 
-def _create_test_engine():
-    """Create an in-memory SQLite engine for tests."""
-    return create_engine(
-        TEST_DATABASE_URL,
+def _create_test_engine(database_path):
+    """Create a file-backed SQLite engine for tests."""
+    engine = create_engine(
+        f"sqlite+pysqlite:///{database_path}",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+    event.listen(engine, "connect", _enable_sqlite_wal)
+    return engine
+
+
+@pytest.fixture(scope="session")
+def test_database_path(tmp_path_factory):
+    """Provide a per-run SQLite file shared by the sync and async test engines."""
+    return tmp_path_factory.mktemp("db") / "votuna-test.sqlite3"
 
 
 @pytest.fixture(scope="session")
-def test_engine():
+def test_engine(test_database_path):
     """Provide a session-scoped SQLAlchemy engine with tables created."""
-    engine = _create_test_engine()
+    engine = _create_test_engine(test_database_path)
     Base.metadata.create_all(bind=engine)
     return engine
 
 
+@pytest.fixture(scope="session")
+def async_test_engine(test_engine, test_database_path):
+    """Provide an aiosqlite engine over the same database file as ``test_engine``."""
+    # NullPool keeps aiosqlite connections from outliving the event loop that opened them.
+    return create_async_engine(f"sqlite+aiosqlite:///{test_database_path}", poolclass=NullPool)
+
+
+@pytest.fixture(autouse=True)
+def clear_provider_caches():
+    """Keep process-wide provider caches from leaking between tests."""
+    from app.auth.principal_cache import principal_cache
+    from app.services.music_providers.rate_limit import provider_request_scheduler
+    from app.services.music_providers.resilience import clear_provider_health
+    from app.services.music_providers.track_cache import playlist_track_cache
+    from app.services.track_cooccurrence import track_cooccurrence_index
+    from app.services.track_recommendations import recommendation_cache
+
+    principal_cache.clear()
+    playlist_track_cache.clear()
+    recommendation_cache.clear()
+    track_cooccurrence_index.clear()
+    provider_request_scheduler.clear()
+    clear_provider_health()
+    yield
+    principal_cache.clear()
+    playlist_track_cache.clear()
+    recommendation_cache.clear()
+    track_cooccurrence_index.clear()
+    provider_request_scheduler.clear()
+    clear_provider_health()
+
+
 @pytest.fixture()
 def db_session(test_engine):
     """Provide a database session bound to the test engine."""
@@ -392,8 +483,8 @@ def db_session(test_engine):
 
 
 @pytest.fixture()
-def client(db_session):
-    """Provide a TestClient with the DB dependency overridden."""
+def client(db_session, async_test_engine):
+    """Provide a TestClient with the DB dependencies overridden."""
 
     def _override_get_db():
         """Yield the test session for dependency overrides."""
@@ -402,7 +493,17 @@ def client(db_session):
         finally:
             pass
 
+    async def _override_get_async_db():
+        """Yield an async session over the test database."""
+        async with AsyncSession(async_test_engine, autoflush=False, expire_on_commit=False) as session:
+            try:
+                yield session
+            finally:
+                # Async routes write through another connection; drop stale state in the test session.
+                db_session.expire_all()
+
     app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_async_db] = _override_get_async_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -452,18 +553,26 @@ def other_user(db_session):
 @pytest.fixture()
 def auth_client(client, user):
     app.dependency_overrides[get_current_user] = lambda: user
+    app.dependency_overrides[get_current_principal] = lambda: user
+    app.dependency_overrides[get_current_principal_async] = lambda: user
     app.dependency_overrides[get_optional_current_user] = lambda: user
     yield client
     app.dependency_overrides.pop(get_current_user, None)
+    app.dependency_overrides.pop(get_current_principal, None)
+    app.dependency_overrides.pop(get_current_principal_async, None)
     app.dependency_overrides.pop(get_optional_current_user, None)
 
 
 @pytest.fixture()
 def other_auth_client(client, other_user):
     app.dependency_overrides[get_current_user] = lambda: other_user
+    app.dependency_overrides[get_current_principal] = lambda: other_user
+    app.dependency_overrides[get_current_principal_async] = lambda: other_user
     app.dependency_overrides[get_optional_current_user] = lambda: other_user
     yield client
     app.dependency_overrides.pop(get_current_user, None)
+    app.dependency_overrides.pop(get_current_principal, None)
+    app.dependency_overrides.pop(get_current_principal_async, None)
     app.dependency_overrides.pop(get_optional_current_user, None)
 
 
@@ -641,8 +750,13 @@ def provider_stub(monkeypatch):
     DummyProvider.search_users_calls = 0
     DummyProvider.get_user_calls = 0
     DummyProvider.add_tracks_calls = []
+    DummyProvider.apply_track_mutation_calls = []
+    DummyProvider.reorder_tracks_calls = []
+    DummyProvider.iterated_track_ids = []
     DummyProvider.fail_add_chunk_for_track_ids = set()
     DummyProvider.fail_add_single_for_track_ids = set()
+    DummyProvider.rate_limit_add_for_track_ids = set()
+    DummyProvider.unavailable_add_for_track_ids = set()
     DummyProvider.related_tracks_by_seed = {
         "track-1": [
             ProviderTrack(
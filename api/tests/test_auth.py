@@ -1,3 +1,7 @@
+import uuid
+from contextlib import asynccontextmanager
+
+import pytest
 from fastapi.responses import RedirectResponse
 
 from app.config.settings import settings
@@ -226,7 +230,116 @@ def test_callback_does_not_auto_accept_targeted_invites_without_invite_context(
     assert refreshed_invite.is_revoked is False
 
 
+class DummyAvatarOpenID(DummyOpenID):
+    avatar_url = "https://cdn.example.com/avatar.jpg"
+
+
+class DummyAvatarSSO(DummySSO):
+    async def verify_and_process(self, request, **kwargs):
+        return DummyAvatarOpenID()
+
+
+def _track_avatar_io(monkeypatch, auth_routes):
+    """Record avatar downloads and deletions together with whether the login transaction was open."""
+    state = {"in_unit_of_work": False, "downloads": [], "deletions": []}
+    real_unit_of_work_async = auth_routes.unit_of_work_async
+
+    @asynccontextmanager
+    async def _tracking_unit_of_work(db):
+        async with real_unit_of_work_async(db):
+            state["in_unit_of_work"] = True
+            try:
+                yield db
+            finally:
+                state["in_unit_of_work"] = False
+
+    async def _save_avatar_from_url(avatar_url, user_id):
+        state["downloads"].append(state["in_unit_of_work"])
+        return f"avatars/user-{user_id}-new.png"
+
+    def _delete_avatar_if_exists(relative_path):
+        state["deletions"].append((relative_path, state["in_unit_of_work"]))
+
+    monkeypatch.setattr(auth_routes, "unit_of_work_async", _tracking_unit_of_work)
+    monkeypatch.setattr(auth_routes, "save_avatar_from_url", _save_avatar_from_url)
+    monkeypatch.setattr(auth_routes, "delete_avatar_if_exists", _delete_avatar_if_exists)
+    monkeypatch.setattr(auth_routes, "get_sso", lambda provider: DummyAvatarSSO())
+    return state
+
+
+def _existing_avatar_user(db_session, monkeypatch, avatar_url: str):
+    provider_user_id = f"sc-avatar-{uuid.uuid4().hex}"
+    monkeypatch.setattr(DummyAvatarOpenID, "id", provider_user_id)
+    return user_crud.create(
+        db_session,
+        {
+            "auth_provider": "soundcloud",
+            "provider_user_id": provider_user_id,
+            "email": "user@example.com",
+            "avatar_url": avatar_url,
+        },
+    )
+
+
+def test_callback_downloads_avatar_outside_the_login_transaction(client, db_session, monkeypatch):
+    import app.api.v1.routes.auth as auth_routes
+
+    state = _track_avatar_io(monkeypatch, auth_routes)
+    existing = _existing_avatar_user(db_session, monkeypatch, "avatars/missing-old.png")
+
+    response = client.get("/api/v1/auth/callback/soundcloud", follow_redirects=False)
+    assert response.status_code in {302, 307}
+    assert state["downloads"] == [False]
+    assert state["deletions"] == [("avatars/missing-old.png", False)]
+    db_session.refresh(existing)
+    assert existing.avatar_url == f"avatars/user-{existing.id}-new.png"
+
+
+def test_callback_keeps_previous_avatar_when_login_transaction_fails(client, db_session, monkeypatch):
+    import app.api.v1.routes.auth as auth_routes
+
+    state = _track_avatar_io(monkeypatch, auth_routes)
+    existing = _existing_avatar_user(db_session, monkeypatch, "avatars/missing-old.png")
+
+    async def _failing_create_async(db, obj_in):
+        raise RuntimeError("settings insert failed")
+
+    monkeypatch.setattr(auth_routes.user_settings_crud, "create_async", _failing_create_async)
+    with pytest.raises(RuntimeError):
+        client.get("/api/v1/auth/callback/soundcloud", follow_redirects=False)
+    assert state["deletions"] == [(f"avatars/user-{existing.id}-new.png", False)]
+    db_session.refresh(existing)
+    assert existing.avatar_url == "avatars/missing-old.png"
+
+
 def test_logout_clears_cookie(client):
     response = client.post("/api/v1/auth/logout")
     assert response.status_code == 200
     assert settings.AUTH_COOKIE_NAME in response.headers.get("set-cookie", "")
+
+
+def test_principal_cache_skips_user_lookup_until_user_is_deactivated(
+    client, db_session, user, votuna_playlist, monkeypatch
+):
+    from app.auth.jwt import create_access_token
+
+    lookups: list[int] = []
+    original_get_auth_columns = user_crud.get_auth_columns
+
+    def _counting_get_auth_columns(db, user_id):
+        lookups.append(user_id)
+        return original_get_auth_columns(db, user_id)
+
+    monkeypatch.setattr(user_crud, "get_auth_columns", _counting_get_auth_columns)
+    headers = {"Authorization": f"Bearer {create_access_token(str(user.id))}"}
+    url = f"/api/v1/votuna/playlists/{votuna_playlist.id}/members"
+
+    assert client.get(url, headers=headers).status_code == 200
+    assert client.get(url, headers=headers).status_code == 200
+    assert lookups == [user.id]
+
+    user_crud.update(db_session, user, {"is_active": False})
+    response = client.get(url, headers=headers)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Inactive user"
+    assert lookups == [user.id, user.id]
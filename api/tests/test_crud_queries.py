@@ -1,14 +1,19 @@
+import asyncio
 from datetime import datetime, timedelta, timezone
 import uuid
 
 import pytest
+from sqlalchemy import event
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.user import user_crud
 from app.crud.votuna_playlist import votuna_playlist_crud
 from app.crud.votuna_playlist_member import votuna_playlist_member_crud
+from app.crud.votuna_track_addition import votuna_track_addition_crud
 from app.crud.votuna_track_suggestion import votuna_track_suggestion_crud
 from app.crud.votuna_track_vote import votuna_track_vote_crud
+from app.db.unit_of_work import unit_of_work, unit_of_work_async
 from app.models.votuna_votes import VotunaTrackVote
 
 
@@ -241,3 +246,261 @@ def test_vote_crud_duplicate_vote_raises_integrity_error(db_session, votuna_play
         )
 
     assert votuna_track_vote_crud.count_reactions(db_session, suggestion.id)["total"] == 1
+
+
+def test_async_crud_variants_round_trip(async_test_engine, user):
+    async def _exercise():
+        async with AsyncSession(async_test_engine, expire_on_commit=False) as session:
+            playlist = await votuna_playlist_crud.create_async(
+                session,
+                {
+                    "owner_user_id": user.id,
+                    "provider": "soundcloud",
+                    "provider_playlist_id": f"async-{uuid.uuid4().hex}",
+                    "title": "Async Playlist",
+                    "description": None,
+                    "image_url": None,
+                    "is_active": True,
+                },
+            )
+            assert await votuna_playlist_crud.exists_async(session, playlist.id)
+            fetched = await votuna_playlist_crud.get_async(session, playlist.id)
+            assert fetched is not None and fetched.title == "Async Playlist"
+
+            updated = await votuna_playlist_crud.update_async(session, fetched, {"title": "Renamed"})
+            assert updated.title == "Renamed"
+
+            assert await votuna_playlist_crud.delete_async(session, playlist.id)
+            assert await votuna_playlist_crud.get_async(session, playlist.id) is None
+
+    asyncio.run(_exercise())
+
+
+def test_bulk_create_inserts_all_rows_in_one_statement(db_session, votuna_playlist, user, test_engine):
+    statements: list[str] = []
+
+    def _record(_conn, _cursor, statement, _parameters, _context, _executemany):
+        if statement.lstrip().upper().startswith("INSERT"):
+            statements.append(statement)
+
+    added_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    event.listen(test_engine, "before_cursor_execute", _record)
+    try:
+        created = votuna_track_addition_crud.bulk_create(
+            db_session,
+            [
+                {
+                    "playlist_id": votuna_playlist.id,
+                    "provider_track_id": f"bulk-track-{index}",
+                    "source": "playlist_utils",
+                    "added_at": added_at,
+                    "added_by_user_id": user.id,
+                }
+                for index in range(25)
+            ],
+        )
+    finally:
+        event.remove(test_engine, "before_cursor_execute", _record)
+
+    assert len(statements) == 1
+    assert [row.provider_track_id for row in created] == [f"bulk-track-{index}" for index in range(25)]
+    assert all(row.id is not None for row in created)
+    assert votuna_track_addition_crud.bulk_create(db_session, []) == []
+
+
+def test_bulk_upsert_updates_conflicting_rows(db_session, votuna_playlist, user, other_user):
+    suggestion = votuna_track_suggestion_crud.create(
+        db_session,
+        {
+            "playlist_id": votuna_playlist.id,
+            "provider_track_id": "track-bulk-upsert",
+            "track_title": "Bulk Upsert",
+            "suggested_by_user_id": user.id,
+            "status": "pending",
+        },
+    )
+    first = votuna_track_vote_crud.set_reaction(db_session, suggestion.id, user.id, "up")
+
+    votes = votuna_track_vote_crud.bulk_upsert(
+        db_session,
+        [
+            {"suggestion_id": suggestion.id, "user_id": user.id, "reaction": "down"},
+            {"suggestion_id": suggestion.id, "user_id": other_user.id, "reaction": "up"},
+        ],
+        conflict_columns=("suggestion_id", "user_id"),
+        update_columns=("reaction",),
+    )
+
+    assert votes[0].id == first.id
+    assert votuna_track_vote_crud.get_reaction_by_user(db_session, suggestion.id) == {
+        user.id: "down",
+        other_user.id: "up",
+    }
+
+
+def test_recount_tallies_counts_only_current_member_votes(db_session, votuna_playlist, user, other_user):
+    suggestion = votuna_track_suggestion_crud.create(
+        db_session,
+        {
+            "playlist_id": votuna_playlist.id,
+            "provider_track_id": "track-recount",
+            "suggested_by_user_id": user.id,
+            "status": "pending",
+        },
+    )
+    votuna_track_vote_crud.bulk_upsert(
+        db_session,
+        [
+            {"suggestion_id": suggestion.id, "user_id": user.id, "reaction": "down"},
+            {"suggestion_id": suggestion.id, "user_id": other_user.id, "reaction": "up"},
+        ],
+        conflict_columns=("suggestion_id", "user_id"),
+        update_columns=("reaction",),
+    )
+    member = votuna_playlist_member_crud.get_member(db_session, votuna_playlist.id, other_user.id)
+    if member is not None:
+        votuna_playlist_member_crud.delete(db_session, member.id)
+
+    rewritten = votuna_track_vote_crud.recount_tallies(db_session, min_id=suggestion.id, max_id=suggestion.id)
+
+    db_session.refresh(suggestion)
+    assert rewritten == 1
+    assert (suggestion.upvote_count, suggestion.downvote_count, suggestion.voter_count) == (0, 1, 1)
+
+
+def test_async_bulk_variants(async_test_engine, votuna_playlist, user):
+    async def _exercise():
+        async with AsyncSession(async_test_engine, expire_on_commit=False) as session:
+            created = await votuna_track_addition_crud.bulk_create_async(
+                session,
+                [
+                    {
+                        "playlist_id": votuna_playlist.id,
+                        "provider_track_id": f"async-bulk-{index}",
+                        "source": "playlist_utils",
+                        "added_at": datetime.now(timezone.utc),
+                        "added_by_user_id": user.id,
+                    }
+                    for index in range(3)
+                ],
+            )
+            assert len(created) == 3
+            suggestion = await votuna_track_suggestion_crud.create_async(
+                session,
+                {
+                    "playlist_id": votuna_playlist.id,
+                    "provider_track_id": "track-async-upsert",
+                    "track_title": "Async Upsert",
+                    "suggested_by_user_id": user.id,
+                    "status": "pending",
+                },
+            )
+            for reaction in ("up", "down"):
+                (vote,) = await votuna_track_vote_crud.bulk_upsert_async(
+                    session,
+                    [{"suggestion_id": suggestion.id, "user_id": user.id, "reaction": reaction}],
+                    conflict_columns=("suggestion_id", "user_id"),
+                    update_columns=("reaction",),
+                )
+                assert vote.reaction == reaction
+
+    asyncio.run(_exercise())
+
+
+def test_unit_of_work_commits_once_and_keeps_server_defaults(db_session, user):
+    commits: list[int] = []
+
+    def _count_commit(_session):
+        commits.append(1)
+
+    event.listen(db_session, "after_commit", _count_commit)
+    try:
+        with unit_of_work(db_session):
+            playlist = votuna_playlist_crud.create(
+                db_session,
+                {
+                    "owner_user_id": user.id,
+                    "provider": "soundcloud",
+                    "provider_playlist_id": f"uow-{uuid.uuid4().hex}",
+                    "title": "Unit Of Work",
+                    "is_active": True,
+                },
+            )
+            # Flushed, so the id and server timestamps are there without a refresh.
+            assert playlist.id is not None
+            assert playlist.created_at is not None
+            votuna_playlist_member_crud.create(
+                db_session,
+                {"playlist_id": playlist.id, "user_id": user.id, "role": "owner"},
+            )
+            votuna_playlist_crud.update(db_session, playlist, {"title": "Renamed"})
+            assert commits == []
+    finally:
+        event.remove(db_session, "after_commit", _count_commit)
+
+    assert commits == [1]
+    assert votuna_playlist_crud.get(db_session, playlist.id).title == "Renamed"
+
+
+def test_unit_of_work_rolls_back_every_write_on_error(async_test_engine, user):
+    provider_playlist_id = f"uow-rollback-{uuid.uuid4().hex}"
+
+    async def _exercise():
+        async with AsyncSession(async_test_engine, expire_on_commit=False) as session:
+            with pytest.raises(RuntimeError):
+                async with unit_of_work_async(session):
+                    await votuna_playlist_crud.create_async(
+                        session,
+                        {
+                            "owner_user_id": user.id,
+                            "provider": "soundcloud",
+                            "provider_playlist_id": provider_playlist_id,
+                            "title": "Rolled Back",
+                            "is_active": True,
+                        },
+                    )
+                    raise RuntimeError("boom")
+            return await session.run_sync(
+                votuna_playlist_crud.get_by_provider_playlist_id, "soundcloud", provider_playlist_id
+            )
+
+    assert asyncio.run(_exercise()) is None
+
+
+def test_reaction_writes_lock_the_playlist_before_the_suggestion(db_session, votuna_playlist, user, test_engine):
+    """Flushes bump the playlist before writing suggestions; reactions must take locks in the same order."""
+    suggestion = votuna_track_suggestion_crud.create(
+        db_session,
+        {
+            "playlist_id": votuna_playlist.id,
+            "provider_track_id": f"lock-order-{uuid.uuid4().hex}",
+            "suggested_by_user_id": user.id,
+            "status": "pending",
+        },
+    )
+    suggestion_id, playlist_id, user_id = suggestion.id, votuna_playlist.id, user.id
+
+    def _tables_touched_in_order(write) -> list[str]:
+        statements: list[str] = []
+
+        def _record(_conn, _cursor, statement, _parameters, _context, _executemany):
+            statements.append(" ".join(statement.split()))
+
+        event.listen(test_engine, "before_cursor_execute", _record)
+        try:
+            write()
+        finally:
+            event.remove(test_engine, "before_cursor_execute", _record)
+        return [
+            statement
+            for statement in statements
+            if "votuna_playlists" in statement or "votuna_track_suggestions" in statement
+        ]
+
+    for write in (
+        lambda: votuna_track_vote_crud.set_reaction(db_session, suggestion_id, user_id, "up"),
+        lambda: votuna_track_vote_crud.clear_reaction(db_session, suggestion_id, user_id),
+        lambda: votuna_track_vote_crud.clear_member_reactions(db_session, playlist_id, user_id),
+    ):
+        touched = _tables_touched_in_order(write)
+        assert touched[0].startswith("SELECT votuna_playlists.id FROM votuna_playlists")
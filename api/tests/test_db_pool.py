@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import create_engine, exc
+from sqlalchemy.pool import NullPool
+
+from app.config.settings import settings
+from app.db.pool_metrics import pool_snapshot, timed_pool_class
+from app.db.session import engine_options
+
+
+def test_engine_options_follow_pool_and_timeout_settings(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 3)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 2)
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 5000)
+
+    sync_options = engine_options("postgresql+psycopg2://u:p@db/votuna", is_async=False)
+    async_options = engine_options("postgresql+asyncpg://u:p@db/votuna", is_async=True)
+
+    assert sync_options["pool_size"] == 3
+    assert sync_options["max_overflow"] == 2
+    assert sync_options["connect_args"] == {"options": "-c statement_timeout=5000"}
+    assert async_options["connect_args"] == {"server_settings": {"statement_timeout": "5000"}}
+    assert "connect_args" not in engine_options("sqlite:///votuna.db", is_async=False)
+
+    monkeypatch.setattr(settings, "DB_USE_NULL_POOL", True)
+    null_options = engine_options("postgresql+psycopg2://u:p@db/votuna", is_async=False)
+    assert null_options["poolclass"] is NullPool
+    assert "pool_size" not in null_options
+
+
+def test_timed_pool_records_checkouts_and_timeouts(tmp_path):
+    test_engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=timed_pool_class(is_async=False),
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    try:
+        held = test_engine.connect()
+        assert pool_snapshot(test_engine)["checked_out"] == 1
+        with pytest.raises(exc.TimeoutError):
+            test_engine.connect()
+        held.close()
+        test_engine.dispose()
+        with test_engine.connect():
+            pass
+
+        snapshot = pool_snapshot(test_engine)
+        assert snapshot["checkouts"] == 2
+        assert snapshot["checkout_timeouts"] == 1
+        assert snapshot["checkout_wait_ms_max"] >= 50
+        assert snapshot["checked_out"] == 0
+    finally:
+        test_engine.dispose()
@@ -1,3 +1,6 @@
+from app.config.settings import settings
+
+
 def test_root(client):
     """Ensure the root endpoint returns the welcome payload."""
     response = client.get("/")
@@ -10,5 +13,31 @@ def test_health(client):
     response = client.get("/health")
     assert response.status_code == 200
     payload = response.json()
-    assert payload["status"] == "healthy"
-    assert payload["database"] == "connected"
+    assert payload == {"status": "healthy", "database": "connected", "version": "1.0.0"}
+
+
+def test_metrics_is_hidden_without_a_token(client):
+    """Ensure the metrics endpoint does not exist unless a token is configured."""
+    assert client.get("/metrics").status_code == 404
+
+
+def test_metrics_requires_the_bearer_token(client, monkeypatch):
+    """Ensure the metrics endpoint rejects requests without the configured token."""
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "metrics-secret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+
+def test_metrics_reports_database_pools(client, monkeypatch):
+    """Ensure the metrics endpoint exposes pool usage and checkout waits for both engines."""
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "metrics-secret")
+    response = client.get("/metrics", headers={"Authorization": "Bearer metrics-secret"})
+    assert response.status_code == 200
+    payload = response.json()
+    for name in ("sync", "async"):
+        pool = payload["db_pools"][name]
+        assert pool["pool"].startswith("Timed")
+        for key in ("size", "checked_out", "overflow", "checkout_wait_ms_max", "checkout_timeouts"):
+            assert key in pool
+    assert "provider_queues" in payload
+    assert "provider_circuits" in payload
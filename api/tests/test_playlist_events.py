@@ -0,0 +1,157 @@
+import asyncio
+import json
+import threading
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.auth.jwt import create_access_token
+from app.db.session import get_async_db, get_db
+from app.services import playlist_events
+from app.services.playlist_events import (
+    PlaylistEvent,
+    PlaylistEventBus,
+    playlist_event_bus,
+    playlist_event_stream,
+)
+from main import app
+
+
+def test_bus_delivers_to_playlist_subscribers_from_any_thread():
+    async def _exercise():
+        bus = PlaylistEventBus()
+        bus.bind(asyncio.get_running_loop())
+        with bus.subscribe(1) as queue, bus.subscribe(2) as other_queue:
+            thread = threading.Thread(target=bus.publish, args=(PlaylistEvent(1, "track.removed", {"id": "t1"}),))
+            thread.start()
+            thread.join()
+            event = await asyncio.wait_for(queue.get(), timeout=1)
+            assert event == PlaylistEvent(1, "track.removed", {"id": "t1"})
+            assert other_queue.empty()
+        assert bus.subscriber_count(1) == 0
+
+    asyncio.run(_exercise())
+
+
+def test_bus_drops_oldest_event_for_slow_subscriber(monkeypatch):
+    monkeypatch.setattr(playlist_events.settings, "PLAYLIST_EVENTS_QUEUE_SIZE", 2)
+
+    async def _exercise():
+        bus = PlaylistEventBus()
+        bus.bind(asyncio.get_running_loop())
+        with bus.subscribe(1) as queue:
+            for index in range(3):
+                bus.publish(PlaylistEvent(1, "track.removed", {"index": index}))
+            assert [queue.get_nowait().data["index"] for _ in range(2)] == [1, 2]
+
+    asyncio.run(_exercise())
+
+
+def test_stream_yields_events_heartbeats_and_ends_on_shutdown(monkeypatch):
+    monkeypatch.setattr(playlist_events.settings, "PLAYLIST_EVENTS_HEARTBEAT_SECONDS", 1.0)
+
+    async def _exercise():
+        playlist_event_bus.bind(asyncio.get_running_loop())
+        stream = playlist_event_stream(7)
+        try:
+            assert await anext(stream) == f"retry: {playlist_events.STREAM_RETRY_MS}\n\n"
+            assert await anext(stream) == ": keep-alive\n\n"
+            playlist_events.publish_playlist_event(7, "suggestion.voted", {"id": 3, "upvote_count": 2})
+            frame = await anext(stream)
+            assert frame.startswith("event: suggestion.voted\ndata: ")
+            assert json.loads(frame.splitlines()[1].removeprefix("data: ")) == {"id": 3, "upvote_count": 2}
+            playlist_event_bus.close_subscribers()
+            assert [frame async for frame in stream] == []
+        finally:
+            playlist_event_bus.bind(None)
+
+    asyncio.run(_exercise())
+
+
+def test_notify_payload_round_trips_with_origin():
+    event = PlaylistEvent(5, "suggestion.created", {"id": 9})
+    origin, decoded = PlaylistEvent.from_notify_payload(event.to_notify_payload())
+    assert origin == playlist_events.ORIGIN_ID
+    assert decoded == event
+
+
+def test_events_endpoint_requires_member(other_auth_client, votuna_playlist):
+    response = other_auth_client.get(f"/api/v1/votuna/playlists/{votuna_playlist.id}/events")
+    assert response.status_code == 403
+
+
+def test_open_stream_holds_no_pooled_connection(monkeypatch, test_database_path, votuna_playlist, user):
+    pooled_engine = create_engine(
+        f"sqlite+pysqlite:///{test_database_path}",
+        connect_args={"check_same_thread": False},
+        poolclass=QueuePool,
+    )
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{test_database_path}", poolclass=AsyncAdaptedQueuePool)
+
+    def _get_db():
+        db = Session(pooled_engine)
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def _get_async_db():
+        async with AsyncSession(async_engine, expire_on_commit=False) as db:
+            yield db
+
+    monkeypatch.setitem(app.dependency_overrides, get_db, _get_db)
+    monkeypatch.setitem(app.dependency_overrides, get_async_db, _get_async_db)
+    token = create_access_token(str(user.id))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "server": ("testserver", 80),
+        "client": ("testclient", 50000),
+        "root_path": "",
+        "path": f"/api/v1/votuna/playlists/{votuna_playlist.id}/events",
+        "raw_path": f"/api/v1/votuna/playlists/{votuna_playlist.id}/events".encode(),
+        "query_string": b"",
+        "headers": [(b"authorization", f"Bearer {token}".encode())],
+    }
+    checked_out_while_streaming: list[tuple[int, int]] = []
+    status_codes: list[int] = []
+
+    async def _exercise():
+        playlist_event_bus.bind(asyncio.get_running_loop())
+        disconnected = asyncio.Event()
+        request_sent = False
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                status_codes.append(message["status"])
+            elif message["type"] == "http.response.body" and message.get("body"):
+                if not checked_out_while_streaming:
+                    checked_out_while_streaming.append(
+                        (pooled_engine.pool.checkedout(), async_engine.pool.checkedout())
+                    )
+                    playlist_event_bus.close_subscribers()
+
+        try:
+            await asyncio.wait_for(app(scope, receive, send), timeout=5)
+        finally:
+            disconnected.set()
+            playlist_event_bus.bind(None)
+            await async_engine.dispose()
+
+    asyncio.run(_exercise())
+    pooled_engine.dispose()
+    assert status_codes == [200]
+    assert checked_out_while_streaming == [(0, 0)]
@@ -0,0 +1,88 @@
+import asyncio
+
+import httpx
+
+from app.services.music_providers import http_client
+from app.services.music_providers.soundcloud import SoundcloudProvider
+
+
+def test_provider_calls_reuse_shared_client_with_base_url(monkeypatch):
+    seen: list[tuple[str, str, dict]] = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.method, str(request.url), dict(request.extensions.get("timeout") or {})))
+        return httpx.Response(200, json={"id": 7, "title": "Shared", "tracks": []})
+
+    constructed: list[dict] = []
+
+    class _UnexpectedAsyncClient:
+        def __init__(self, *args, **kwargs):
+            constructed.append(kwargs)
+
+    async def _run():
+        shared = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+        monkeypatch.setattr(http_client, "_shared_client", shared)
+        monkeypatch.setattr(httpx, "AsyncClient", _UnexpectedAsyncClient)
+        provider = SoundcloudProvider("token")
+        provider.base_url = "https://api.soundcloud.test"
+        first = await provider.get_playlist("7")
+        second = await provider.get_playlist("7")
+        await shared.aclose()
+        return first, second
+
+    first, second = asyncio.run(_run())
+
+    assert first.provider_playlist_id == "7"
+    assert second.title == "Shared"
+    assert constructed == []
+    assert [(method, url) for method, url, _ in seen] == [
+        ("GET", "https://api.soundcloud.test/playlists/7"),
+        ("GET", "https://api.soundcloud.test/playlists/7"),
+    ]
+    assert seen[0][2].get("read") == 15
+
+
+def test_provider_http_client_falls_back_to_per_call_client_without_shared_pool(monkeypatch):
+    captured: dict = {}
+
+    class _FakeAsyncClient:
+        def __init__(self, *args, **kwargs):
+            captured.update(kwargs)
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+    monkeypatch.setattr(http_client, "_shared_client", None)
+    monkeypatch.setattr(httpx, "AsyncClient", _FakeAsyncClient)
+
+    async def _run():
+        async with http_client.provider_http_client(base_url="https://example.test", timeout=20) as client:
+            return client
+
+    client = asyncio.run(_run())
+    assert isinstance(client, _FakeAsyncClient)
+    assert captured == {"base_url": "https://example.test", "timeout": 20}
+
+
+def test_shared_client_open_and_close_use_pool_settings(monkeypatch):
+    monkeypatch.setattr(http_client.settings, "PROVIDER_HTTP_MAX_CONNECTIONS", 12)
+    monkeypatch.setattr(http_client.settings, "PROVIDER_HTTP_MAX_KEEPALIVE_CONNECTIONS", 4)
+    monkeypatch.setattr(http_client, "_shared_client", None)
+
+    async def _run():
+        client = await http_client.open_shared_client()
+        again = await http_client.open_shared_client()
+        assert client is again
+        assert http_client.get_shared_client() is client
+        pool = client._transport._pool
+        limits = (pool._max_connections, pool._max_keepalive_connections)
+        await http_client.close_shared_client()
+        return client, limits
+
+    client, limits = asyncio.run(_run())
+    assert limits == (12, 4)
+    assert client.is_closed
+    assert http_client.get_shared_client() is None
@@ -0,0 +1,110 @@
+import asyncio
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+from app.config.settings import settings
+from app.services.music_providers import ProviderRateLimitError
+from app.services.music_providers import http_client
+from app.services.music_providers.rate_limit import (
+    ProviderRequestScheduler,
+    ScheduledProviderClient,
+    parse_retry_after,
+    provider_request_scheduler,
+)
+from app.services.music_providers.spotify import SpotifyProvider
+
+
+class _FakeTime:
+    def __init__(self) -> None:
+        self.now = 100.0
+        self.sleeps: list[float] = []
+
+    def clock(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_parse_retry_after_accepts_seconds_and_http_dates():
+    def _response(value: str) -> httpx.Response:
+        return httpx.Response(429, headers={"Retry-After": value})
+
+    assert parse_retry_after(_response("7")) == 7.0
+    assert parse_retry_after(httpx.Response(429)) is None
+    assert parse_retry_after(_response("soon")) is None
+    now = datetime(2015, 10, 21, 7, 28, 0, tzinfo=timezone.utc)
+    assert parse_retry_after(_response("Wed, 21 Oct 2015 07:28:30 GMT"), now=now) == 30.0
+
+
+def test_scheduler_spaces_requests_per_token_and_pauses_after_429(monkeypatch):
+    monkeypatch.setattr(settings, "PROVIDER_RATE_LIMIT_PER_TOKEN_PER_SECOND", 2.0)
+    monkeypatch.setattr(settings, "PROVIDER_RATE_LIMIT_PER_TOKEN_BURST", 2)
+    fake_time = _FakeTime()
+    scheduler = ProviderRequestScheduler(clock=fake_time.clock, sleep=fake_time.sleep)
+
+    async def _run() -> None:
+        for _ in range(3):
+            await scheduler.acquire("spotify", "token-a")
+        # Another token has its own bucket and is not held back.
+        await scheduler.acquire("spotify", "token-b")
+        scheduler.pause("spotify", "token-a", 5)
+        assert scheduler.snapshot()["spotify"]["paused_tokens"] == 1
+        await scheduler.acquire("spotify", "token-a")
+
+    asyncio.run(_run())
+
+    assert fake_time.sleeps[0] == pytest.approx(0.5)
+    assert sum(fake_time.sleeps[1:]) == pytest.approx(5)
+    assert scheduler.snapshot()["spotify"] == {"queued_requests": 0, "paused_tokens": 0, "max_pause_seconds": 0.0}
+
+
+def test_scheduled_client_retries_429_after_retry_after():
+    fake_time = _FakeTime()
+    scheduler = ProviderRequestScheduler(clock=fake_time.clock, sleep=fake_time.sleep)
+    statuses = iter([429, 200])
+    calls: list[str] = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        status_code = next(statuses)
+        headers = {"Retry-After": "3"} if status_code == 429 else {}
+        return httpx.Response(status_code, headers=headers, json={})
+
+    async def _run() -> httpx.Response:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(_handler)) as client:
+            scheduled = ScheduledProviderClient(client, provider="spotify", token_key="a", scheduler=scheduler)
+            return await scheduled.post("https://api.test/playlists/1/items", json={"uris": []})
+
+    response = asyncio.run(_run())
+
+    assert response.status_code == 200
+    assert calls == ["/playlists/1/items", "/playlists/1/items"]
+    assert fake_time.sleeps == [pytest.approx(3)]
+
+
+def test_long_retry_after_fails_fast_with_rate_limit_error(monkeypatch):
+    calls: list[str] = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(429, headers={"Retry-After": "120"}, json={"error": {"message": "slow down"}})
+
+    async def _run() -> None:
+        shared = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+        monkeypatch.setattr(http_client, "_shared_client", shared)
+        try:
+            await SpotifyProvider("token").get_playlist("pl1")
+        finally:
+            await shared.aclose()
+
+    with pytest.raises(ProviderRateLimitError) as exc_info:
+        asyncio.run(_run())
+
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.retry_after == 120
+    assert calls == ["/v1/playlists/pl1"]
+    assert provider_request_scheduler.snapshot()["spotify"]["paused_tokens"] == 1
@@ -0,0 +1,96 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.config.settings import settings
+from app.services.music_providers import ProviderUnavailableError
+from app.services.music_providers.rate_limit import ScheduledProviderClient
+from app.services.music_providers.resilience import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    CircuitBreaker,
+    provider_health,
+)
+
+
+def test_circuit_breaker_opens_then_probes_once(monkeypatch):
+    monkeypatch.setattr(settings, "PROVIDER_CIRCUIT_FAILURE_THRESHOLD", 2)
+    monkeypatch.setattr(settings, "PROVIDER_CIRCUIT_OPEN_SECONDS", 30.0)
+    now = [0.0]
+    breaker = CircuitBreaker(clock=lambda: now[0])
+
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CIRCUIT_OPEN
+    assert not breaker.allow_request()
+    assert breaker.retry_after() == pytest.approx(30)
+
+    now[0] = 31.0
+    assert breaker.allow_request()
+    assert breaker.state == CIRCUIT_HALF_OPEN
+    # Only one probe goes out while half-open.
+    assert not breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CIRCUIT_OPEN
+
+    now[0] = 62.0
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CIRCUIT_CLOSED
+    assert breaker.allow_request()
+
+
+def test_open_circuit_fails_fast_without_calling_the_provider(monkeypatch):
+    monkeypatch.setattr(settings, "PROVIDER_CIRCUIT_FAILURE_THRESHOLD", 2)
+    monkeypatch.setattr(settings, "PROVIDER_RETRY_MAX_ATTEMPTS", 1)
+    calls: list[str] = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(503, json={})
+
+    async def _run() -> None:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(_handler)) as client:
+            scheduled = ScheduledProviderClient(client, provider="soundcloud", token_key="a")
+            for _ in range(2):
+                response = await scheduled.get("https://api.test/playlists/1")
+                assert response.status_code == 503
+            await scheduled.get("https://api.test/playlists/1")
+
+    with pytest.raises(ProviderUnavailableError) as exc_info:
+        asyncio.run(_run())
+
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.retry_after is not None and exc_info.value.retry_after > 0
+    assert len(calls) == 2
+
+
+def test_slow_read_is_hedged_after_p95(monkeypatch):
+    monkeypatch.setattr(settings, "PROVIDER_HEDGE_ENABLED", True)
+    monkeypatch.setattr(settings, "PROVIDER_HEDGE_MIN_DELAY_SECONDS", 0.01)
+    latency = provider_health("spotify").read_latency
+    for _ in range(50):
+        latency.record(0.01)
+    calls: list[int] = []
+
+    async def _handler(request: httpx.Request) -> httpx.Response:
+        calls.append(len(calls))
+        if len(calls) == 1:
+            await asyncio.sleep(5)
+        return httpx.Response(200, json={"copy": len(calls)})
+
+    async def _run() -> httpx.Response:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(_handler)) as client:
+            scheduled = ScheduledProviderClient(client, provider="spotify", token_key="a")
+            return await scheduled.get("https://api.test/playlists/1")
+
+    started_at = time.monotonic()
+    response = asyncio.run(_run())
+
+    assert time.monotonic() - started_at < 2
+    assert response.json() == {"copy": 2}
+    assert len(calls) == 2
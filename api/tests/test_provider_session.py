@@ -1,6 +1,8 @@
 import asyncio
+from datetime import datetime, timedelta, timezone
 
 import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.user import user_crud
 from app.services.music_providers import session as provider_session
@@ -98,3 +100,85 @@ def test_refresh_spotify_access_token_returns_none_on_http_failure(db_session, u
     assert updated_user is not None
     assert updated_user.access_token == "expired-access-token"
     assert updated_user.refresh_token == "existing-refresh-token"
+
+
+def test_concurrent_refreshes_are_single_flight(db_session, user, provider_stub, monkeypatch):
+    user = user_crud.update(
+        db_session,
+        user,
+        {
+            "access_token": "expired-access-token",
+            "refresh_token": "rotating-refresh-token",
+            "token_expires_at": datetime.now(timezone.utc) - timedelta(minutes=5),
+        },
+    )
+    refresh_calls: list[str] = []
+
+    async def _refresh_soundcloud_access_token(target_user, db):
+        refresh_calls.append(target_user.refresh_token)
+        await asyncio.sleep(0.05)
+        user_crud.update(
+            db,
+            target_user,
+            {
+                "access_token": "fresh-access-token",
+                "refresh_token": "next-refresh-token",
+                "token_expires_at": datetime.now(timezone.utc) + timedelta(hours=1),
+            },
+        )
+        return "fresh-access-token"
+
+    seen_tokens: list[str] = []
+
+    async def _list_playlists(self):
+        seen_tokens.append(self.access_token)
+        return []
+
+    monkeypatch.setattr(provider_session, "refresh_soundcloud_access_token", _refresh_soundcloud_access_token)
+    monkeypatch.setattr(provider_stub, "list_playlists", _list_playlists)
+
+    async def _burst():
+        clients = [provider_session.ProviderClientWithRefresh("soundcloud", user, db=db_session) for _ in range(5)]
+        await asyncio.gather(*(client.list_playlists() for client in clients))
+
+    asyncio.run(_burst())
+    assert refresh_calls == ["rotating-refresh-token"]
+    assert seen_tokens == ["fresh-access-token"] * 5
+
+
+def test_background_refresh_targets_expiring_playlist_owners(
+    db_session,
+    async_test_engine,
+    user,
+    other_user,
+    votuna_playlist,
+    monkeypatch,
+):
+    from app.services import token_refresh_scheduler
+
+    soon = datetime.now(timezone.utc) + timedelta(minutes=2)
+    for target in (user, other_user):
+        user_crud.update(
+            db_session,
+            target,
+            {"access_token": "old-access-token", "refresh_token": "refresh-token", "token_expires_at": soon},
+        )
+    refreshed_user_ids: list[int] = []
+
+    async def _refresh_soundcloud_access_token(target_user, db):
+        refreshed_user_ids.append(target_user.id)
+        return f"fresh-access-token-{target_user.id}"
+
+    monkeypatch.setattr(provider_session, "refresh_soundcloud_access_token", _refresh_soundcloud_access_token)
+    monkeypatch.setattr(token_refresh_scheduler.settings, "TOKEN_REFRESH_MAX_PER_SECOND", 0)
+    monkeypatch.setattr(token_refresh_scheduler, "_failed_until", {})
+
+    async def _run_pass():
+        async with AsyncSession(async_test_engine, expire_on_commit=False) as db:
+            return await token_refresh_scheduler.refresh_expiring_tokens(db)
+
+    refreshed = asyncio.run(_run_pass())
+    # Only the owner of an active playlist is refreshed; other_user owns nothing.
+    assert user.id in refreshed_user_ids
+    assert other_user.id not in refreshed_user_ids
+    assert refreshed == len(refreshed_user_ids)
@@ -0,0 +1,255 @@
+import asyncio
+from urllib.parse import urlparse
+
+import httpx
+import pytest
+
+from app.services.music_providers.base import ProviderAPIError, ProviderTrack
+from app.services.music_providers.soundcloud import SoundcloudProvider
+from app.services.music_providers.spotify import SpotifyProvider
+from app.services.music_providers.track_cache import playlist_track_cache, track_list_fingerprint
+from app.utils.ttl_cache import TTLCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_evicts_least_recently_used_and_expires():
+    clock = _Clock()
+    cache: TTLCache[str] = TTLCache(max_entries=2, ttl_seconds=10, clock=clock)
+    cache.set("a", "A")
+    cache.set("b", "B")
+    assert cache.get("a") == "A"
+    cache.set("c", "C")
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+
+    clock.now += 11
+    assert cache.get("a") is None
+    entry = cache.get_entry("a")
+    assert entry is not None and entry.value == "A" and not entry.is_fresh
+    cache.touch("a")
+    assert cache.get("a") == "A"
+
+
+def test_cached_tracks_fingerprint_only_for_fresh_entries(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(playlist_track_cache, "_clock", clock)
+    provider = SoundcloudProvider("token")
+    tracks = [ProviderTrack(provider_track_id="1", title="One"), ProviderTrack(provider_track_id="2", title="Two")]
+    assert provider.cached_tracks_fingerprint("fingerprint-playlist") is None
+
+    provider._store_cached_tracks("fingerprint-playlist", tracks)
+    assert provider.cached_tracks_fingerprint("fingerprint-playlist") == track_list_fingerprint(tracks)
+    assert track_list_fingerprint(tracks) != track_list_fingerprint(tracks[::-1])
+
+    assert SoundcloudProvider("other-token").cached_tracks_fingerprint("fingerprint-playlist") is None
+
+    clock.now += playlist_track_cache.ttl_seconds + 1
+    assert provider.cached_tracks_fingerprint("fingerprint-playlist") is None
+    provider.invalidate_cached_tracks("fingerprint-playlist")
+
+
+def test_cached_tracks_are_only_served_to_the_token_that_filled_them(monkeypatch):
+    requests: list[str] = []
+
+    class _FakeAsyncClient:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+        async def get(self, url: str, headers: dict, params: dict):
+            requests.append(headers["Authorization"])
+            request = httpx.Request("GET", f"https://api.soundcloud.com{url}")
+            if headers["Authorization"] != "Bearer owner-token":
+                return httpx.Response(404, request=request, json={"error": "not found"})
+            if headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304, request=request)
+            return httpx.Response(
+                200,
+                request=request,
+                headers={"ETag": '"v1"'},
+                json={"title": "Private", "tracks": [{"id": 1, "title": "One"}]},
+            )
+
+    monkeypatch.setattr(httpx, "AsyncClient", _FakeAsyncClient)
+
+    owner = SoundcloudProvider("owner-token")
+    assert [track.provider_track_id for track in asyncio.run(owner.list_tracks("private-1"))] == ["1"]
+    assert [track.provider_track_id for track in asyncio.run(owner.list_tracks("private-1"))] == ["1"]
+    assert requests == ["Bearer owner-token"]
+
+    with pytest.raises(ProviderAPIError):
+        asyncio.run(SoundcloudProvider("stranger-token").list_tracks("private-1"))
+    assert requests[-1] == "Bearer stranger-token"
+
+
+def test_soundcloud_list_tracks_is_cached_and_revalidated_with_etag(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(playlist_track_cache, "_clock", clock)
+    provider = SoundcloudProvider("token")
+    requests: list[dict] = []
+
+    class _FakeAsyncClient:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+        async def get(self, url: str, headers: dict, params: dict):
+            requests.append(dict(headers))
+            request = httpx.Request("GET", f"https://api.soundcloud.com{url}")
+            if headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304, request=request)
+            return httpx.Response(
+                200,
+                request=request,
+                headers={"ETag": '"v1"'},
+                json={"title": "List", "tracks": [{"id": 1, "title": "One"}]},
+            )
+
+        async def put(self, url: str, headers: dict, params: dict, json: dict):
+            request = httpx.Request("PUT", f"https://api.soundcloud.com{url}")
+            return httpx.Response(
+                200,
+                request=request,
+                headers={"ETag": '"v2"'},
+                json={"title": "List", "tracks": [{"id": 1, "title": "One"}, {"id": 2, "title": "Two"}]},
+            )
+
+    monkeypatch.setattr(httpx, "AsyncClient", _FakeAsyncClient)
+
+    first = asyncio.run(provider.list_tracks("playlist-1"))
+    second = asyncio.run(provider.list_tracks("playlist-1"))
+    assert [track.provider_track_id for track in first] == ["1"]
+    assert [track.provider_track_id for track in second] == ["1"]
+    assert len(requests) == 1
+
+    clock.now += playlist_track_cache.ttl_seconds + 1
+    revalidated = asyncio.run(provider.list_tracks("playlist-1"))
+    assert [track.provider_track_id for track in revalidated] == ["1"]
+    assert len(requests) == 2
+    assert requests[1]["If-None-Match"] == '"v1"'
+
+    asyncio.run(provider.add_tracks("playlist-1", ["2"]))
+    request_count_after_write = len(requests)
+    after_write = asyncio.run(provider.list_tracks("playlist-1"))
+    assert [track.provider_track_id for track in after_write] == ["1", "2"]
+    assert len(requests) == request_count_after_write
+
+
+def test_spotify_list_tracks_revalidates_with_snapshot_and_patches_removals(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(playlist_track_cache, "_clock", clock)
+    provider = SpotifyProvider("token")
+    calls: list[tuple[str, dict | None]] = []
+    first_page = {
+        "items": [
+            {"item": {"id": "track-1", "name": "One"}},
+            {"item": {"id": "track-2", "name": "Two"}},
+        ],
+        "next": None,
+    }
+
+    class _FakeAsyncClient:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+        async def get(self, url: str, headers: dict, params: dict | None = None):
+            path = urlparse(url).path
+            calls.append((path, params))
+            request = httpx.Request("GET", f"https://api.spotify.com/v1{path}")
+            if path.endswith("/playlists/pl-1") and params == {"fields": "snapshot_id"}:
+                return httpx.Response(200, request=request, json={"snapshot_id": "snap-1"})
+            if path.endswith("/playlists/pl-1"):
+                return httpx.Response(200, request=request, json={"snapshot_id": "snap-1", "items": first_page})
+            raise AssertionError(f"Unexpected request to {url}")
+
+        async def request(self, method: str, url: str, headers: dict, json: dict):
+            request = httpx.Request(method, f"https://api.spotify.com/v1{url}")
+            return httpx.Response(200, request=request, json={"snapshot_id": "snap-2"})
+
+    monkeypatch.setattr(httpx, "AsyncClient", _FakeAsyncClient)
+
+    asyncio.run(provider.list_tracks("pl-1"))
+    asyncio.run(provider.list_tracks("spotify:playlist:pl-1"))
+    # A cold read takes the snapshot id and the first page from one playlist fetch.
+    assert calls == [("/playlists/pl-1", None)]
+
+    clock.now += playlist_track_cache.ttl_seconds + 1
+    asyncio.run(provider.list_tracks("pl-1"))
+    assert calls[1:] == [("/playlists/pl-1", {"fields": "snapshot_id"})]
+
+    asyncio.run(provider.remove_tracks("pl-1", ["spotify:track:track-2"]))
+    remaining = asyncio.run(provider.list_tracks("pl-1"))
+    assert [track.provider_track_id for track in remaining] == ["track-1"]
+    assert len(calls) == 2
+
+
+def test_soundcloud_iter_tracks_streams_pages_and_caches_full_reads(monkeypatch):
+    provider = SoundcloudProvider("token")
+    requested_urls: list[str] = []
+    pages = {
+        "/playlists/playlist-1/tracks": {
+            "collection": [{"id": 1, "title": "One"}, {"id": 2, "title": "Two"}],
+            "next_href": "https://api.soundcloud.com/playlists/playlist-1/tracks?cursor=2",
+        },
+        "https://api.soundcloud.com/playlists/playlist-1/tracks?cursor=2": {
+            "collection": [{"id": 3, "title": "Three"}],
+            "next_href": None,
+        },
+    }
+
+    class _FakeAsyncClient:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+        async def get(self, url: str, headers: dict, params: dict | None = None):
+            requested_urls.append(url)
+            request = httpx.Request("GET", f"https://api.soundcloud.com{urlparse(url).path}")
+            return httpx.Response(200, request=request, json=pages[url])
+
+    monkeypatch.setattr(httpx, "AsyncClient", _FakeAsyncClient)
+
+    async def _first_track_id() -> str:
+        async for track in provider.iter_tracks("playlist-1"):
+            return track.provider_track_id
+        raise AssertionError("no tracks")
+
+    async def _all_track_ids() -> list[str]:
+        return [track.provider_track_id async for track in provider.iter_tracks("playlist-1")]
+
+    assert asyncio.run(_first_track_id()) == "1"
+    assert len(requested_urls) == 1
+    assert playlist_track_cache.get(("soundcloud", "playlist-1")) is None
+
+    assert asyncio.run(_all_track_ids()) == ["1", "2", "3"]
+    assert len(requested_urls) == 3
+    assert asyncio.run(_all_track_ids()) == ["1", "2", "3"]
+    assert len(requested_urls) == 3
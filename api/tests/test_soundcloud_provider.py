@@ -3,6 +3,7 @@ import asyncio
 import httpx
 
 from app.services.music_providers.base import ProviderTrack
+from app.services.music_providers.mutations import PlaylistMutation, plan_track_ids
 from app.services.music_providers.soundcloud import SoundcloudProvider
 
 
@@ -153,3 +154,67 @@ def test_resolve_track_url_uses_follow_redirects(monkeypatch):
     mapped = asyncio.run(provider.resolve_track_url("https://soundcloud.com/test/resolved-redirected-track"))
     assert captured["follow_redirects"] is True
     assert mapped.provider_track_id == "321"
+
+
+def test_apply_track_mutation_uses_cached_list_and_retries_on_precondition_failure(monkeypatch):
+    provider = SoundcloudProvider("token")
+    provider._store_cached_tracks(
+        "playlist-1",
+        [ProviderTrack(provider_track_id=str(track_id), title=f"Track {track_id}") for track_id in range(2000)],
+        validator='"v1"',
+        title="Big Playlist",
+    )
+    calls: list[tuple[str, str | None]] = []
+    put_payloads: list[dict] = []
+
+    class _FakeAsyncClient:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+        async def get(self, url: str, headers: dict, params: dict):
+            calls.append(("GET", None))
+            request = httpx.Request("GET", f"https://api.soundcloud.com{url}")
+            payload = {"title": "Big Playlist", "tracks": [{"id": str(track_id)} for track_id in range(2001)]}
+            return httpx.Response(200, request=request, json=payload, headers={"ETag": '"v2"'})
+
+        async def put(self, url: str, headers: dict, params: dict, json: dict):
+            calls.append(("PUT", headers.get("If-Match")))
+            put_payloads.append(json)
+            request = httpx.Request("PUT", f"https://api.soundcloud.com{url}")
+            if headers.get("If-Match") == '"v1"':
+                return httpx.Response(412, request=request)
+            return httpx.Response(
+                200, request=request, json={"title": "Big Playlist", "tracks": json["playlist"]["tracks"]}
+            )
+
+    monkeypatch.setattr(httpx, "AsyncClient", _FakeAsyncClient)
+
+    asyncio.run(
+        provider.apply_track_mutation(
+            "playlist-1",
+            PlaylistMutation(add=["new"], remove=["0"], order=["new", "2000"]),
+        )
+    )
+
+    # The stale cached ETag is rejected once; the batch is replanned against one fresh GET.
+    assert calls == [("PUT", '"v1"'), ("GET", None), ("PUT", '"v2"')]
+    tracks = put_payloads[-1]["playlist"]["tracks"]
+    assert tracks[:3] == [{"id": "new"}, {"id": "2000"}, {"id": "1"}]
+    assert {"id": "0"} not in tracks
+    assert len(tracks) == 2001
+    assert put_payloads[-1]["playlist"]["title"] == "Big Playlist"
+
+
+def test_plan_track_ids_dedupes_and_applies_stable_order():
+    planned = plan_track_ids(
+        ["a", "b", "c", "A"],
+        PlaylistMutation(add=["d", "b"], remove=["c"], order=["d", "missing", "a"]),
+        key=str.lower,
+    )
+    assert planned == ["d", "a", "b"]
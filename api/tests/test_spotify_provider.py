@@ -1,8 +1,11 @@
 import asyncio
+import random
 from urllib.parse import parse_qs, urlparse
 
 import httpx
 
+from app.config.settings import settings
+from app.services.music_providers.mutations import plan_reorder_moves
 from app.services.music_providers.spotify import SpotifyProvider
 
 
@@ -179,6 +182,8 @@ def test_list_tracks_and_add_remove_tracks(monkeypatch):
 
         async def get(self, url: str, headers: dict, params: dict | None = None):
             parsed = urlparse(url)
+            if parsed.path.endswith("/playlists/playlist-1"):
+                return _response("GET", url, {"snapshot_id": "snap-1"})
             if parsed.path.endswith("/playlists/playlist-1/items"):
                 if parse_qs(parsed.query).get("offset") == ["100"]:
                     return _response(
@@ -208,7 +213,7 @@ def test_list_tracks_and_add_remove_tracks(monkeypatch):
                                     "album": {"images": [{"url": "https://img.test/track-2.jpg"}]},
                                     "external_urls": {"spotify": "https://open.spotify.com/track/track-2"},
                                 }
-                            }
+                            },
                         ],
                         "next": "https://api.spotify.com/v1/playlists/playlist-1/items?offset=100",
                     },
@@ -245,6 +250,45 @@ def test_list_tracks_and_add_remove_tracks(monkeypatch):
     assert captured["delete_json"] == {"tracks": [{"uri": "spotify:track:track-2"}]}
 
 
+def test_iter_tracks_streams_the_embedded_first_page_then_follows_next(monkeypatch):
+    provider = SpotifyProvider("token")
+    requested: list[str] = []
+    next_url = "https://api.spotify.com/v1/playlists/pl-stream/items?offset=100&limit=100"
+
+    class _FakeAsyncClient:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+        async def get(self, url: str, headers: dict, params: dict | None = None):
+            requested.append(url)
+            if url == "/playlists/pl-stream":
+                return _response(
+                    "GET",
+                    f"https://api.spotify.com/v1{url}",
+                    {
+                        "snapshot_id": "snap-1",
+                        "items": {"items": [{"item": {"id": "t1", "name": "One"}}], "next": next_url},
+                    },
+                )
+            if url == next_url:
+                return _response("GET", url, {"items": [{"item": {"id": "t2", "name": "Two"}}], "next": None})
+            raise AssertionError(f"Unexpected request to {url}")
+
+    monkeypatch.setattr(httpx, "AsyncClient", _FakeAsyncClient)
+
+    async def _collect() -> list[str]:
+        return [track.provider_track_id async for track in provider.iter_tracks("pl-stream")]
+
+    assert asyncio.run(_collect()) == ["t1", "t2"]
+    assert requested == ["/playlists/pl-stream", next_url]
+
+
 def test_search_and_resolve_track_and_get_user(monkeypatch):
     provider = SpotifyProvider("token")
 
@@ -344,3 +388,127 @@ def test_related_tracks_and_search_users_are_safe_noops():
     provider = SpotifyProvider("token")
     assert asyncio.run(provider.related_tracks("track-1")) == []
     assert asyncio.run(provider.search_users("anything")) == []
+
+
+def _apply_moves(items: list[str], moves: list[tuple[int, int]]) -> list[str]:
+    result = list(items)
+    for range_start, insert_before in moves:
+        item = result.pop(range_start)
+        result.insert(insert_before - 1 if insert_before > range_start else insert_before, item)
+    return result
+
+
+def test_plan_reorder_moves_reaches_target_with_minimal_moves():
+    rng = random.Random(7)
+    for size in (0, 1, 2, 5, 50, 300):
+        current = [f"t{index}" for index in range(size)]
+        target = current.copy()
+        rng.shuffle(target)
+        moves = plan_reorder_moves(current, target)
+        assert _apply_moves(current, moves) == target
+        ranks = [target.index(track_id) for track_id in current]
+        longest = [0] * size
+        for index in range(size):
+            longest[index] = 1 + max((longest[j] for j in range(index) if ranks[j] < ranks[index]), default=0)
+        assert len(moves) == size - max(longest, default=0)
+
+    # Duplicates move together and unlisted tracks keep their order at the end.
+    moves = plan_reorder_moves(["a", "b", "a", "c", "d"], ["c", "a"])
+    assert _apply_moves(["a", "b", "a", "c", "d"], moves) == ["c", "a", "a", "b", "d"]
+
+
+def test_reorder_tracks_moves_items_and_chains_snapshots(monkeypatch):
+    provider = SpotifyProvider("token")
+    playlist = ["t1", "t2", None, "t3"]
+    move_bodies: list[dict] = []
+
+    class _FakeAsyncClient:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+        async def get(self, url: str, headers: dict, params: dict | None = None):
+            full_url = f"https://api.spotify.com/v1{url}"
+            if url == "/playlists/pl1":
+                return _response("GET", full_url, {"snapshot_id": "snap-0"})
+            items = [{"item": {"id": track_id} if track_id else None} for track_id in playlist]
+            return _response("GET", full_url, {"items": items, "next": None})
+
+        async def put(self, url: str, headers: dict, json: dict):
+            move_bodies.append(json)
+            item = playlist.pop(json["range_start"])
+            insert_before = json["insert_before"]
+            playlist.insert(insert_before - 1 if insert_before > json["range_start"] else insert_before, item)
+            return _response("PUT", f"https://api.spotify.com/v1{url}", {"snapshot_id": f"snap-{len(move_bodies)}"})
+
+    monkeypatch.setattr(httpx, "AsyncClient", _FakeAsyncClient)
+
+    asyncio.run(provider.reorder_tracks("pl1", ["t3", "t2", "t1"]))
+
+    # The id-less entry (a local file) keeps its slot relative to the unlisted tail.
+    assert playlist == ["t3", "t2", "t1", None]
+    assert [body["snapshot_id"] for body in move_bodies] == [f"snap-{index}" for index in range(len(move_bodies))]
+    assert len(move_bodies) == 2
+
+
+def test_list_tracks_fetches_offset_pages_concurrently_and_falls_back_on_429(monkeypatch):
+    provider = SpotifyProvider("token")
+    total = 450
+    in_flight = 0
+    peak_in_flight = 0
+    requested_offsets: list[int] = []
+    rate_limited_offsets = {300}
+
+    class _FakeAsyncClient:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+        async def get(self, url: str, headers: dict, params: dict | None = None):
+            nonlocal in_flight, peak_in_flight
+            full_url = f"https://api.spotify.com/v1{url}" if url.startswith("/") else url
+            if url == "/playlists/pl1":
+                return _response("GET", full_url, {"snapshot_id": "snap-1"})
+            query = {key: values[0] for key, values in parse_qs(urlparse(full_url).query).items()}
+            offset = int((params or query).get("offset", 0))
+            requested_offsets.append(offset)
+            in_flight += 1
+            peak_in_flight = max(peak_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if offset in rate_limited_offsets:
+                rate_limited_offsets.discard(offset)
+                return _response("GET", full_url, {"error": {"message": "slow down"}}, status_code=429)
+            items = [
+                {"item": {"id": f"t{index}", "name": f"Track {index}"}}
+                for index in range(offset, min(offset + 100, total))
+            ]
+            next_offset = offset + 100
+            next_url = (
+                f"https://api.spotify.com/v1/playlists/pl1/items?offset={next_offset}&limit=100"
+                if next_offset < total
+                else None
+            )
+            return _response("GET", full_url, {"items": items, "total": total, "next": next_url})
+
+    monkeypatch.setattr(httpx, "AsyncClient", _FakeAsyncClient)
+    # Let the 429 reach the pager instead of being retried by the request scheduler.
+    monkeypatch.setattr(settings, "PROVIDER_RETRY_MAX_ATTEMPTS", 1)
+
+    tracks = asyncio.run(provider.list_tracks("pl1"))
+
+    assert [track.provider_track_id for track in tracks] == [f"t{index}" for index in range(total)]
+    assert peak_in_flight > 1
+    # The rate-limited page and the pages after it were re-fetched one at a time.
+    assert requested_offsets.count(300) == 2
+    assert requested_offsets[-2:] == [300, 400]
@@ -0,0 +1,168 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import func
+
+from app.crud.votuna_track_addition import votuna_track_addition_crud
+from app.crud.votuna_track_suggestion import votuna_track_suggestion_crud
+from app.crud.votuna_track_vote import votuna_track_vote_crud
+from app.models.votuna_track_additions import VotunaTrackAddition
+from app.services import track_cooccurrence
+from app.services.music_providers.base import ProviderTrack
+from app.services.track_cooccurrence import COOCCURRENCE_PAIR_WINDOW, TrackCooccurrenceIndex
+
+
+def _track(track_id: str) -> ProviderTrack:
+    return ProviderTrack(provider_track_id=track_id, title=f"Title {track_id}")
+
+
+def test_neighbors_rank_by_cosine_and_stay_within_provider():
+    index = TrackCooccurrenceIndex()
+    index.remember_tracks("soundcloud", [_track(track_id) for track_id in ("a", "b", "c", "d")])
+    index.remember_tracks("spotify", [_track("b")])
+    for basket, track_ids in {1: ["a", "b"], 2: ["a", "b", "c"], 3: ["c", "d"], 4: ["c", "d"]}.items():
+        for track_id in track_ids:
+            index._add_to_basket(("playlist", basket), "soundcloud", track_id)
+    index._add_to_basket(("voter", 1), "spotify", "a")
+    index._add_to_basket(("voter", 1), "spotify", "b")
+
+    assert [track.provider_track_id for track in index.neighbors("soundcloud", "a", limit=10)] == ["b", "c"]
+    assert [track.provider_track_id for track in index.neighbors("soundcloud", "c", limit=1)] == ["d"]
+    # Spotify "a" has no metadata, so only its same-provider neighbor "b" is returned for that provider.
+    assert [track.provider_track_id for track in index.neighbors("spotify", "a", limit=10)] == ["b"]
+
+
+def test_neighbor_cache_is_rebuilt_when_counts_change():
+    index = TrackCooccurrenceIndex()
+    index.remember_tracks("soundcloud", [_track("a"), _track("b"), _track("c")])
+    index._add_to_basket(("playlist", 1), "soundcloud", "a")
+    index._add_to_basket(("playlist", 1), "soundcloud", "b")
+    assert [track.provider_track_id for track in index.neighbors("soundcloud", "a", limit=10)] == ["b"]
+
+    index._add_to_basket(("playlist", 1), "soundcloud", "c")
+    assert [track.provider_track_id for track in index.neighbors("soundcloud", "a", limit=10)] == ["b", "c"]
+
+
+def test_baskets_are_bounded_by_recency_and_pair_window():
+    index = TrackCooccurrenceIndex(max_baskets=2)
+    for basket in (1, 2, 3):
+        index._add_to_basket(("playlist", basket), "soundcloud", "a")
+    assert list(index._baskets) == [(("playlist", 2), "soundcloud"), (("playlist", 3), "soundcloud")]
+
+    track_ids = [f"t{position}" for position in range(COOCCURRENCE_PAIR_WINDOW + 5)]
+    for track_id in track_ids:
+        index._add_to_basket(("playlist", 4), "soundcloud", track_id)
+    assert len(index._pair_counts[("soundcloud", track_ids[-1])]) == COOCCURRENCE_PAIR_WINDOW
+    assert track_ids[0] not in index._pair_counts[("soundcloud", track_ids[-1])]
+
+
+def test_index_size_stays_under_its_caps():
+    index = TrackCooccurrenceIndex(max_baskets=100, max_pairs=60, max_metadata=5)
+    baskets = {basket: [f"b{basket}-t{position}" for position in range(6)] for basket in range(20)}
+    for basket, track_ids in baskets.items():
+        index.remember_tracks("soundcloud", [_track(track_id) for track_id in track_ids])
+        for track_id in track_ids:
+            index._add_to_basket(("playlist", basket), "soundcloud", track_id)
+            index.neighbors("soundcloud", track_id, limit=10)
+            assert index._pair_entries <= 60
+            assert len(index._metadata) <= 5
+        index.neighbors("soundcloud", "never-seen", limit=10)
+    assert index._pair_entries == sum(len(pairs) for pairs in index._pair_counts.values())
+    assert set(index._top_neighbors) <= set(index._pair_counts)
+
+    # Evicted baskets take their counts with them: what is left matches the kept baskets alone.
+    rebuilt = TrackCooccurrenceIndex(max_baskets=100, max_pairs=10_000)
+    for (basket_key, provider), members in index._baskets.items():
+        for track_id in members:
+            rebuilt._add_to_basket(basket_key, provider, track_id)
+    assert index._track_counts == rebuilt._track_counts
+    assert index._pair_counts == rebuilt._pair_counts
+
+
+def test_refresh_reads_at_most_the_row_budget(db_session, votuna_playlist):
+    now = datetime.now(timezone.utc)
+    votuna_track_addition_crud.bulk_create(
+        db_session,
+        [
+            {
+                "playlist_id": votuna_playlist.id,
+                "provider_track_id": f"budget-{position}",
+                "source": "personal_add",
+                "added_at": now,
+            }
+            for position in range(5)
+        ],
+    )
+    index = TrackCooccurrenceIndex()
+    reads = [index.refresh(db_session, max_rows=3)]
+    while reads[-1]:
+        reads.append(index.refresh(db_session, max_rows=3))
+    assert len(reads) > 2
+    assert all(read <= 3 for read in reads)
+    assert ("soundcloud", "budget-4") in index._track_counts
+
+    index._refresh_lock.acquire()
+    try:
+        assert index.refresh(db_session, blocking=False) == 0
+    finally:
+        index._refresh_lock.release()
+
+
+def test_refresh_picks_up_rows_that_commit_out_of_id_order(db_session, votuna_playlist, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(track_cooccurrence.time, "monotonic", lambda: clock[0])
+    base_id = db_session.query(func.coalesce(func.max(VotunaTrackAddition.id), 0)).scalar()
+
+    def _add(row_id: int, track_id: str) -> None:
+        votuna_track_addition_crud.create(
+            db_session,
+            {
+                "id": row_id,
+                "playlist_id": votuna_playlist.id,
+                "provider_track_id": track_id,
+                "source": "personal_add",
+                "added_at": datetime.now(timezone.utc),
+            },
+        )
+
+    index = TrackCooccurrenceIndex()
+    index.refresh(db_session)
+    # Ids base+1 and base+2 are still held by open transactions when base+3 becomes visible.
+    _add(base_id + 3, "late-c")
+    assert index.refresh(db_session) == 1
+
+    _add(base_id + 1, "late-a")
+    assert index.refresh(db_session) == 1
+    assert ("soundcloud", "late-a") in index._track_counts
+    assert base_id + 1 not in index._addition_cursor.gaps
+    assert base_id + 2 in index._addition_cursor.gaps
+
+    # An id that never shows up is given up on once the timeout has passed.
+    clock[0] += track_cooccurrence.COOCCURRENCE_GAP_TIMEOUT_SECONDS + 1
+    assert index.refresh(db_session) == 0
+    assert index._addition_cursor.gaps == {}
+    _add(base_id + 2, "too-late-b")
+    assert index.refresh(db_session) == 0
+    assert ("soundcloud", "too-late-b") not in index._track_counts
+
+
+def test_refresh_moves_the_vote_watermark_past_down_votes(db_session, votuna_playlist, user, other_user):
+    suggestion = votuna_track_suggestion_crud.create(
+        db_session,
+        {
+            "playlist_id": votuna_playlist.id,
+            "provider_track_id": "voted-track",
+            "track_title": "Voted",
+            "suggested_by_user_id": user.id,
+            "status": "pending",
+        },
+    )
+    down_vote = votuna_track_vote_crud.set_reaction(db_session, suggestion.id, other_user.id, "down")
+    votuna_track_vote_crud.set_reaction(db_session, suggestion.id, user.id, "up")
+
+    index = TrackCooccurrenceIndex()
+    index.refresh(db_session)
+
+    assert down_vote.id <= index._vote_cursor.last_id
+    assert down_vote.id not in index._vote_cursor.gaps
+    assert (("voter", user.id), "soundcloud") in index._baskets
+    assert (("voter", other_user.id), "soundcloud") not in index._baskets
@@ -47,7 +47,8 @@ def test_settings_get_and_update(auth_client):
     assert updated["receive_emails"] is False
 
 
-def test_avatar_upload_and_fetch(auth_client, user):
+def test_avatar_upload_and_fetch(auth_client, user, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "USER_FILES_DIR", str(tmp_path))
     file_bytes = b"\x89PNG\r\n\x1a\n" + b"0" * 10
     files = {"file": ("avatar.png", io.BytesIO(file_bytes), "image/png")}
     response = auth_client.post("/api/v1/users/me/avatar", files=files)
@@ -60,6 +61,7 @@ def test_avatar_upload_and_fetch(auth_client, user):
 
     get_by_id = auth_client.get(f"/api/v1/users/{user.id}/avatar")
     assert get_by_id.status_code == 200
+    assert (tmp_path / data["avatar_url"]).is_file()
 
 
 def test_avatar_redirect_for_remote(auth_client, db_session, user):
@@ -161,3 +161,24 @@ def test_owner_cannot_leave_playlist(auth_client, votuna_playlist):
     response = auth_client.delete(f"/api/v1/votuna/playlists/{votuna_playlist.id}/members/me")
     assert response.status_code == 400
     assert "owner" in response.json()["detail"].lower()
+
+
+def test_list_members_etag_changes_on_membership_and_profile_writes(
+    auth_client, db_session, votuna_playlist, user, other_user
+):
+    url = f"/api/v1/votuna/playlists/{votuna_playlist.id}/members"
+    etag = auth_client.get(url).headers["etag"]
+    assert auth_client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    votuna_playlist_member_crud.create(
+        db_session,
+        {"playlist_id": votuna_playlist.id, "user_id": other_user.id, "role": "member"},
+    )
+    joined = auth_client.get(url, headers={"If-None-Match": etag})
+    assert joined.status_code == 200
+    assert other_user.id in {member["user_id"] for member in joined.json()}
+
+    user_crud.update(db_session, other_user, {"display_name": "Renamed Collaborator"})
+    renamed = auth_client.get(url, headers={"If-None-Match": joined.headers["etag"]})
+    assert renamed.status_code == 200
+    assert "Renamed Collaborator" in {member["display_name"] for member in renamed.json()}
@@ -1,10 +1,17 @@
+import asyncio
 import uuid
+from datetime import datetime, timedelta, timezone
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.votuna_management_job import votuna_management_job_crud
 from app.crud.votuna_playlist import votuna_playlist_crud
 from app.crud.votuna_playlist_member import votuna_playlist_member_crud
 from app.crud.votuna_playlist_settings import votuna_playlist_settings_crud
 from app.crud.votuna_track_addition import votuna_track_addition_crud
-from app.services.music_providers.base import ProviderTrack
+from app.models.votuna_track_additions import VotunaTrackAddition
+from app.services.management_jobs import run_pending_management_jobs
+from app.services.music_providers.base import ProviderRateLimitError, ProviderTrack
 
 
 def _create_owned_votuna_playlist(db_session, owner_user, provider_playlist_id: str | None = None):
@@ -39,6 +46,26 @@ def _create_owned_votuna_playlist(db_session, owner_user, provider_playlist_id:
     return playlist
 
 
+def _run_management_jobs(async_test_engine) -> int:
+    async def _run():
+        async with AsyncSession(async_test_engine, expire_on_commit=False) as session:
+            return await run_pending_management_jobs(session, worker_id="test-worker")
+
+    return asyncio.run(_run())
+
+
+_EXPORT_TO_EXISTING = {
+    "direction": "export_from_current",
+    "counterparty": {
+        "kind": "provider",
+        "provider": "soundcloud",
+        "provider_playlist_id": "export-dest-1",
+    },
+    "selection_mode": "all",
+    "selection_values": [],
+}
+
+
 def test_preview_import_owner_success(auth_client, votuna_playlist, provider_stub):
     provider_stub.tracks_by_playlist_id[votuna_playlist.provider_playlist_id] = [
         ProviderTrack(provider_track_id="track-1", title="Current One", artist="A", genre="House"),
@@ -134,6 +161,43 @@ def test_execute_import_records_playlist_utils_provenance(auth_client, db_sessio
     assert additions["track-a"].added_at is not None
 
 
+def test_execute_import_publishes_track_added(auth_client, votuna_playlist, user, provider_stub, monkeypatch):
+    from app.services import playlist_transfers
+
+    published: list[tuple[int, str, dict]] = []
+    monkeypatch.setattr(
+        playlist_transfers,
+        "publish_playlist_event",
+        lambda playlist_id, event_type, data: published.append((playlist_id, event_type, data)),
+    )
+    provider_stub.tracks_by_playlist_id[votuna_playlist.provider_playlist_id] = []
+    provider_stub.tracks_by_playlist_id["source-for-events"] = [
+        ProviderTrack(provider_track_id="track-a", title="A", artist="One", url="https://example.com/a"),
+        ProviderTrack(provider_track_id="track-b", title="B", artist="Two"),
+    ]
+
+    response = auth_client.post(
+        f"/api/v1/votuna/playlists/{votuna_playlist.id}/management/execute",
+        json={
+            "direction": "import_to_current",
+            "counterparty": {"kind": "provider", "provider": "soundcloud", "provider_playlist_id": "source-for-events"},
+            "selection_mode": "all",
+            "selection_values": [],
+        },
+    )
+    assert response.status_code == 200
+
+    assert [(playlist_id, event_type) for playlist_id, event_type, _data in published] == [
+        (votuna_playlist.id, "track.added"),
+        (votuna_playlist.id, "track.added"),
+    ]
+    first = published[0][2]
+    assert (first["provider_track_id"], first["title"], first["artist"]) == ("track-a", "A", "One")
+    assert first["url"] == "https://example.com/a"
+    assert first["added_source"] == "playlist_utils"
+    assert first["added_by_user_id"] == user.id
+
+
 def test_management_non_owner_forbidden(other_auth_client, votuna_playlist):
     response = other_auth_client.post(
         f"/api/v1/votuna/playlists/{votuna_playlist.id}/management/preview",
@@ -402,6 +466,31 @@ def test_source_tracks_search_and_pagination(auth_client, votuna_playlist, provi
     assert len(page_data["tracks"]) == 1
 
 
+def test_source_tracks_stop_reading_once_the_page_is_full(auth_client, votuna_playlist, provider_stub):
+    provider_stub.tracks_by_playlist_id["source-1"] = [
+        ProviderTrack(provider_track_id=f"t-{index}", title=f"Song {index}") for index in range(10)
+    ]
+
+    response = auth_client.post(
+        f"/api/v1/votuna/playlists/{votuna_playlist.id}/management/source-tracks",
+        json={
+            "source": {
+                "kind": "provider",
+                "provider": "soundcloud",
+                "provider_playlist_id": "source-1",
+            },
+            "limit": 2,
+            "offset": 2,
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [track["provider_track_id"] for track in data["tracks"]] == ["t-2", "t-3"]
+    assert data["has_more"] is True
+    assert data["total_count"] == 5
+    assert provider_stub.iterated_track_ids == [f"t-{index}" for index in range(5)]
+
+
 def test_facets_owner_success_with_sorting_and_normalization(auth_client, votuna_playlist, provider_stub):
     provider_stub.tracks_by_playlist_id["source-1"] = [
         ProviderTrack(provider_track_id="t-1", title="Alpha", artist="DJ Zebra", genre=" House "),
@@ -514,3 +603,365 @@ def test_facets_empty_and_top_100_cap(auth_client, votuna_playlist, provider_stu
     assert cap_data["total_tracks_considered"] == 120
     assert len(cap_data["genres"]) == 100
     assert len(cap_data["artists"]) == 100
+
+
+def test_execute_stops_adding_once_rate_limited(auth_client, votuna_playlist, provider_stub):
+    provider_stub.tracks_by_playlist_id[votuna_playlist.provider_playlist_id] = [
+        ProviderTrack(provider_track_id=f"track-{index}", title=f"Track {index}") for index in range(150)
+    ]
+    provider_stub.tracks_by_playlist_id["export-dest-1"] = []
+    provider_stub.rate_limit_add_for_track_ids = {"track-0"}
+
+    response = auth_client.post(
+        f"/api/v1/votuna/playlists/{votuna_playlist.id}/management/execute",
+        json={
+            "direction": "export_from_current",
+            "counterparty": {
+                "kind": "provider",
+                "provider": "soundcloud",
+                "provider_playlist_id": "export-dest-1",
+            },
+            "selection_mode": "all",
+            "selection_values": [],
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["added_count"] == 0
+    assert data["failed_count"] == 150
+    # The rate-limited chunk is neither retried per track nor followed by the next chunk.
+    assert len(provider_stub.add_tracks_calls) == 1
+
+
+def test_provider_rate_limit_maps_to_429_with_retry_after(auth_client, votuna_playlist, provider_stub, monkeypatch):
+    async def _rate_limited(self, provider_playlist_id: str):
+        raise ProviderRateLimitError("SoundCloud rate limit reached", retry_after=12.2)
+
+    monkeypatch.setattr(provider_stub, "list_tracks", _rate_limited)
+
+    response = auth_client.post(
+        f"/api/v1/votuna/playlists/{votuna_playlist.id}/management/preview",
+        json={
+            "direction": "export_from_current",
+            "counterparty": {
+                "kind": "provider",
+                "provider": "soundcloud",
+                "provider_playlist_id": "export-dest-1",
+            },
+            "selection_mode": "all",
+            "selection_values": [],
+        },
+    )
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "13"
+
+
+def test_management_job_runs_past_the_inline_action_limit(
+    auth_client, db_session, async_test_engine, votuna_playlist, provider_stub
+):
+    provider_stub.tracks_by_playlist_id[votuna_playlist.provider_playlist_id] = [
+        ProviderTrack(provider_track_id=f"track-{index}", title=f"Track {index}") for index in range(650)
+    ]
+    provider_stub.tracks_by_playlist_id["export-dest-1"] = []
+
+    response = auth_client.post(
+        f"/api/v1/votuna/playlists/{votuna_playlist.id}/management/jobs",
+        json=_EXPORT_TO_EXISTING,
+    )
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "queued"
+    assert job["total_count"] == 0
+    assert provider_stub.add_tracks_calls == []
+
+    assert _run_management_jobs(async_test_engine) == 1
+
+    progress = auth_client.get(f"/api/v1/votuna/management/jobs/{job['id']}").json()
+    assert progress["status"] == "succeeded"
+    assert progress["total_count"] == 650
+    assert progress["processed_count"] == 650
+    assert progress["added_count"] == 650
+    assert progress["failed_count"] == 0
+    assert len(provider_stub.add_tracks_calls) == 7
+    assert len(provider_stub.tracks_by_playlist_id["export-dest-1"]) == 650
+
+
+def test_management_job_resumes_after_a_worker_stops_heartbeating(
+    auth_client, db_session, async_test_engine, votuna_playlist, provider_stub
+):
+    track_ids = [f"track-{index}" for index in range(150)]
+    provider_stub.tracks_by_playlist_id[votuna_playlist.provider_playlist_id] = [
+        ProviderTrack(provider_track_id=track_id, title=track_id) for track_id in track_ids
+    ]
+    # The crashed worker finished the first chunk and got one track of the second one in.
+    provider_stub.tracks_by_playlist_id["export-dest-1"] = [
+        ProviderTrack(provider_track_id=track_id, title=track_id) for track_id in track_ids[:101]
+    ]
+    job_id = auth_client.post(
+        f"/api/v1/votuna/playlists/{votuna_playlist.id}/management/jobs",
+        json=_EXPORT_TO_EXISTING,
+    ).json()["id"]
+    job = votuna_management_job_crud.get(db_session, job_id)
+    votuna_management_job_crud.update(
+        db_session,
+        job,
+        {
+            "status": "running",
+            "locked_by": "crashed-worker",
+            "attempts": 1,
+            "heartbeat_at": datetime.now(timezone.utc) - timedelta(hours=1),
+            "track_ids": track_ids,
+            "next_index": 100,
+            "matched_count": 150,
+            "added_count": 100,
+        },
+    )
+
+    assert _run_management_jobs(async_test_engine) == 1
+
+    progress = auth_client.get(f"/api/v1/votuna/management/jobs/{job_id}").json()
+    assert progress["status"] == "succeeded"
+    assert progress["attempts"] == 2
+    assert progress["added_count"] == 150
+    assert provider_stub.add_tracks_calls == [
+        {"provider_playlist_id": "export-dest-1", "track_ids": track_ids[101:]},
+    ]
+
+
+def test_management_job_requeues_when_rate_limited(
+    auth_client, db_session, async_test_engine, votuna_playlist, provider_stub
+):
+    provider_stub.tracks_by_playlist_id[votuna_playlist.provider_playlist_id] = [
+        ProviderTrack(provider_track_id=f"track-{index}", title=f"Track {index}") for index in range(150)
+    ]
+    provider_stub.tracks_by_playlist_id["export-dest-1"] = []
+    provider_stub.rate_limit_add_for_track_ids = {"track-120"}
+
+    job_id = auth_client.post(
+        f"/api/v1/votuna/playlists/{votuna_playlist.id}/management/jobs",
+        json=_EXPORT_TO_EXISTING,
+    ).json()["id"]
+    assert _run_management_jobs(async_test_engine) == 1
+
+    progress = auth_client.get(f"/api/v1/votuna/management/jobs/{job_id}").json()
+    assert progress["status"] == "queued"
+    assert progress["processed_count"] == 100
+    assert progress["added_count"] == 100
+    assert progress["failed_count"] == 0
+    # Not runnable again until the provider's Retry-After has passed.
+    assert _run_management_jobs(async_test_engine) == 0
+
+
+def test_management_job_requeues_while_the_provider_circuit_is_open(
+    auth_client, db_session, async_test_engine, votuna_playlist, provider_stub
+):
+    provider_stub.tracks_by_playlist_id[votuna_playlist.provider_playlist_id] = [
+        ProviderTrack(provider_track_id=f"track-{index}", title=f"Track {index}") for index in range(150)
+    ]
+    provider_stub.tracks_by_playlist_id["export-dest-1"] = []
+    provider_stub.unavailable_add_for_track_ids = {f"track-{index}" for index in range(100, 150)}
+
+    job_id = auth_client.post(
+        f"/api/v1/votuna/playlists/{votuna_playlist.id}/management/jobs",
+        json=_EXPORT_TO_EXISTING,
+    ).json()["id"]
+    assert _run_management_jobs(async_test_engine) == 1
+
+    progress = auth_client.get(f"/api/v1/votuna/management/jobs/{job_id}").json()
+    assert progress["status"] == "queued"
+    assert progress["processed_count"] == 100
+    assert progress["added_count"] == 100
+    # The unavailable chunk is deferred, not failed track by track.
+    assert progress["failed_count"] == 0
+    assert len(provider_stub.add_tracks_calls) == 2
+    assert _run_management_jobs(async_test_engine) == 0
+
+
+def test_execute_maps_an_unavailable_provider_to_503(auth_client, votuna_playlist, provider_stub):
+    provider_stub.tracks_by_playlist_id[votuna_playlist.provider_playlist_id] = [
+        ProviderTrack(provider_track_id=f"track-{index}", title=f"Track {index}") for index in range(150)
+    ]
+    provider_stub.tracks_by_playlist_id["export-dest-1"] = []
+    provider_stub.unavailable_add_for_track_ids = {"track-120"}
+
+    response = auth_client.post(
+        f"/api/v1/votuna/playlists/{votuna_playlist.id}/management/execute",
+        json=_EXPORT_TO_EXISTING,
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "30"
+    assert len(provider_stub.add_tracks_calls) == 2
+    assert len(provider_stub.tracks_by_playlist_id["export-dest-1"]) == 100
+
+
+def test_management_job_is_private_to_its_requester(
+    auth_client, db_session, other_user, votuna_playlist, provider_stub
+):
+    from app.auth.dependencies import get_current_principal_async
+    from main import app
+
+    job_id = auth_client.post(
+        f"/api/v1/votuna/playlists/{votuna_playlist.id}/management/jobs",
+        json=_EXPORT_TO_EXISTING,
+    ).json()["id"]
+
+    app.dependency_overrides[get_current_principal_async] = lambda: other_user
+    response = auth_client.get(f"/api/v1/votuna/management/jobs/{job_id}")
+    assert response.status_code == 404
+    votuna_management_job_crud.delete(db_session, job_id)
+
+
+def test_management_job_over_the_cap_creates_no_destination(
+    auth_client, db_session, async_test_engine, votuna_playlist, provider_stub, monkeypatch
+):
+    from app.config.settings import settings
+
+    provider_stub.tracks_by_playlist_id[votuna_playlist.provider_playlist_id] = [
+        ProviderTrack(provider_track_id=f"track-{index}", title=f"Track {index}") for index in range(6)
+    ]
+    created_titles: list[str] = []
+
+    async def _create_playlist(self, title: str, description: str | None = None, is_public: bool | None = None):
+        created_titles.append(title)
+        raise AssertionError("destination should not be created for a rejected job")
+
+    monkeypatch.setattr(provider_stub, "create_playlist", _create_playlist)
+    monkeypatch.setattr(settings, "MANAGEMENT_JOB_MAX_TRACKS", 5)
+
+    job_id = auth_client.post(
+        f"/api/v1/votuna/playlists/{votuna_playlist.id}/management/jobs",
+        json={
+            "direction": "export_from_current",
+            "destination_create": {"title": "Too Big", "description": None, "is_public": False},
+            "selection_mode": "all",
+            "selection_values": [],
+        },
+    ).json()["id"]
+    assert _run_management_jobs(async_test_engine) == 1
+
+    progress = auth_client.get(f"/api/v1/votuna/management/jobs/{job_id}").json()
+    assert progress["status"] == "failed"
+    assert "max tracks per job (5)" in progress["error"]
+    assert created_titles == []
+
+
+def test_management_job_heartbeats_while_a_step_is_running(
+    auth_client, db_session, async_test_engine, votuna_playlist, provider_stub, monkeypatch
+):
+    from app.config.settings import settings
+
+    provider_stub.tracks_by_playlist_id[votuna_playlist.provider_playlist_id] = [
+        ProviderTrack(provider_track_id="track-1", title="Track 1"),
+    ]
+    provider_stub.tracks_by_playlist_id["export-dest-1"] = []
+    monkeypatch.setattr(settings, "MANAGEMENT_JOB_STALE_AFTER_SECONDS", 0.3)
+
+    job_id = auth_client.post(
+        f"/api/v1/votuna/playlists/{votuna_playlist.id}/management/jobs",
+        json=_EXPORT_TO_EXISTING,
+    ).json()["id"]
+    heartbeats = []
+    list_tracks = provider_stub.list_tracks
+
+    async def _slow_list_tracks(self, provider_playlist_id: str):
+        # One step outlasting the stale window several times over.
+        for _ in range(3):
+            await asyncio.sleep(0.3)
+            db_session.expire_all()
+            heartbeats.append(votuna_management_job_crud.get(db_session, job_id).heartbeat_at)
+        return await list_tracks(self, provider_playlist_id)
+
+    monkeypatch.setattr(provider_stub, "list_tracks", _slow_list_tracks)
+    assert _run_management_jobs(async_test_engine) == 1
+
+    assert auth_client.get(f"/api/v1/votuna/management/jobs/{job_id}").json()["status"] == "succeeded"
+    assert heartbeats == sorted(heartbeats)
+    assert len(set(heartbeats)) > 1
+
+
+def test_management_job_import_publishes_track_added(
+    auth_client, db_session, async_test_engine, votuna_playlist, provider_stub, monkeypatch
+):
+    from app.services import playlist_transfers
+
+    published: list[tuple[int, str, dict]] = []
+    monkeypatch.setattr(
+        playlist_transfers,
+        "publish_playlist_event",
+        lambda playlist_id, event_type, data: published.append((playlist_id, event_type, data)),
+    )
+    provider_stub.tracks_by_playlist_id[votuna_playlist.provider_playlist_id] = []
+    provider_stub.tracks_by_playlist_id["job-source"] = [
+        ProviderTrack(provider_track_id=f"job-track-{index}", title=f"Job Track {index}") for index in range(3)
+    ]
+
+    job_id = auth_client.post(
+        f"/api/v1/votuna/playlists/{votuna_playlist.id}/management/jobs",
+        json={
+            "direction": "import_to_current",
+            "counterparty": {"kind": "provider", "provider": "soundcloud", "provider_playlist_id": "job-source"},
+            "selection_mode": "all",
+            "selection_values": [],
+        },
+    ).json()["id"]
+    assert _run_management_jobs(async_test_engine) == 1
+
+    assert auth_client.get(f"/api/v1/votuna/management/jobs/{job_id}").json()["status"] == "succeeded"
+    assert [(playlist_id, event_type, data["provider_track_id"]) for playlist_id, event_type, data in published] == [
+        (votuna_playlist.id, "track.added", f"job-track-{index}") for index in range(3)
+    ]
+
+
+def test_management_job_records_a_chunk_once_when_its_cursor_save_is_lost(
+    auth_client, db_session, async_test_engine, votuna_playlist, provider_stub, monkeypatch
+):
+    provider_stub.tracks_by_playlist_id[votuna_playlist.provider_playlist_id] = []
+    provider_stub.tracks_by_playlist_id["lease-source"] = [
+        ProviderTrack(provider_track_id=f"lease-track-{index}", title=f"Lease Track {index}") for index in range(3)
+    ]
+    job_id = auth_client.post(
+        f"/api/v1/votuna/playlists/{votuna_playlist.id}/management/jobs",
+        json={
+            "direction": "import_to_current",
+            "counterparty": {"kind": "provider", "provider": "soundcloud", "provider_playlist_id": "lease-source"},
+            "selection_mode": "all",
+            "selection_values": [],
+        },
+    ).json()["id"]
+
+    update_if_locked = votuna_management_job_crud.update_if_locked
+
+    def _lose_lease_on_chunk_save(db, job_id, worker_id, values):
+        if values.get("added_count"):
+            return False
+        return update_if_locked(db, job_id, worker_id, values)
+
+    # The worker added the chunk to the provider, then lost its lease before saving the cursor.
+    monkeypatch.setattr(votuna_management_job_crud, "update_if_locked", _lose_lease_on_chunk_save)
+    assert _run_management_jobs(async_test_engine) == 1
+    monkeypatch.setattr(votuna_management_job_crud, "update_if_locked", update_if_locked)
+
+    def _recorded_track_ids() -> list[str]:
+        rows = (
+            db_session.query(VotunaTrackAddition.provider_track_id)
+            .filter(
+                VotunaTrackAddition.playlist_id == votuna_playlist.id,
+                VotunaTrackAddition.provider_track_id.like("lease-track-%"),
+            )
+            .all()
+        )
+        return sorted(row.provider_track_id for row in rows)
+
+    assert _recorded_track_ids() == []
+
+    job = votuna_management_job_crud.get(db_session, job_id)
+    db_session.refresh(job)
+    votuna_management_job_crud.update(
+        db_session,
+        job,
+        {"heartbeat_at": datetime.now(timezone.utc) - timedelta(hours=1)},
+    )
+    assert _run_management_jobs(async_test_engine) == 1
+
+    assert auth_client.get(f"/api/v1/votuna/management/jobs/{job_id}").json()["status"] == "succeeded"
+    assert _recorded_track_ids() == [f"lease-track-{index}" for index in range(3)]
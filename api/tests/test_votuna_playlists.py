@@ -1,6 +1,8 @@
 from datetime import datetime, timezone
 import uuid
 
+from sqlalchemy import event
+
 from app.crud.votuna_playlist_invite import votuna_playlist_invite_crud
 from app.crud.votuna_playlist_member import votuna_playlist_member_crud
 from app.crud.votuna_playlist_settings import votuna_playlist_settings_crud
@@ -32,6 +34,31 @@ def test_get_votuna_playlist_detail(auth_client, votuna_playlist):
     assert data["settings"]["tie_break_mode"] == "add"
 
 
+def test_get_votuna_playlist_detail_loads_access_in_one_query(auth_client, db_session, user, votuna_playlist):
+    url = f"/api/v1/votuna/playlists/{votuna_playlist.id}"
+    # Load the overridden principal up front so only the route's own queries are counted.
+    assert user.id
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        response = auth_client.get(url)
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+    assert response.status_code == 200
+    assert response.json()["settings"]["required_vote_percent"] == 60
+    assert len(statements) == 1
+
+
+def test_get_votuna_playlist_missing_returns_404(auth_client):
+    response = auth_client.get("/api/v1/votuna/playlists/999999")
+    assert response.status_code == 404
+
+
 def test_get_votuna_playlist_non_member_forbidden(other_auth_client, votuna_playlist):
     response = other_auth_client.get(f"/api/v1/votuna/playlists/{votuna_playlist.id}")
     assert response.status_code == 403
@@ -126,6 +153,46 @@ def test_list_votuna_tracks(auth_client, votuna_playlist, provider_stub):
     assert data[0]["suggested_by_display_name"] is None
 
 
+def test_list_votuna_tracks_is_conditional_on_tracks_and_provenance(
+    auth_client, db_session, votuna_playlist, user, provider_stub
+):
+    url = f"/api/v1/votuna/playlists/{votuna_playlist.id}/tracks"
+    etag = auth_client.get(url).headers["etag"]
+    assert auth_client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    votuna_track_addition_crud.bulk_create(
+        db_session,
+        [
+            {
+                "playlist_id": votuna_playlist.id,
+                "provider_track_id": "track-1",
+                "source": "playlist_utils",
+                "added_by_user_id": user.id,
+                "added_at": datetime.now(timezone.utc),
+            }
+        ],
+    )
+    relabelled = auth_client.get(url, headers={"If-None-Match": etag})
+    assert relabelled.status_code == 200
+    assert relabelled.json()[0]["added_source"] == "playlist_utils"
+
+    etag = relabelled.headers["etag"]
+    provider_stub.tracks_by_playlist_id[votuna_playlist.provider_playlist_id] = provider_stub.tracks[1:]
+    assert auth_client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_list_votuna_playlists_is_conditional(auth_client, db_session, votuna_playlist):
+    url = "/api/v1/votuna/playlists"
+    etag = auth_client.get(url).headers["etag"]
+    assert auth_client.get(url, headers={"If-None-Match": f'"other", {etag}'}).status_code == 304
+
+    votuna_playlist.title = "Renamed Playlist"
+    db_session.commit()
+    renamed = auth_client.get(url, headers={"If-None-Match": etag})
+    assert renamed.status_code == 200
+    assert renamed.json()[0]["title"] == "Renamed Playlist"
+
+
 def test_remove_track_owner_success(auth_client, votuna_playlist, provider_stub):
     provider_stub.tracks_by_playlist_id[votuna_playlist.provider_playlist_id] = [
         provider_stub.tracks[0],
@@ -150,6 +217,33 @@ def test_remove_track_non_owner_forbidden(other_auth_client, votuna_playlist, pr
     assert response.status_code == 403
 
 
+def test_shuffle_reorders_tracks_in_place(auth_client, votuna_playlist, provider_stub, monkeypatch):
+    from app.api.v1.routes.votuna import playlists as playlist_routes
+
+    published: list[tuple[int, str, dict]] = []
+    monkeypatch.setattr(
+        playlist_routes,
+        "publish_playlist_event",
+        lambda playlist_id, event_type, data: published.append((playlist_id, event_type, data)),
+    )
+    provider_stub.tracks_by_playlist_id[votuna_playlist.provider_playlist_id] = [
+        provider_stub.tracks[0],
+        provider_stub.tracks[1],
+    ]
+    response = auth_client.post(f"/api/v1/votuna/playlists/{votuna_playlist.id}/shuffle")
+    assert response.status_code == 200
+
+    assert len(provider_stub.reorder_tracks_calls) == 1
+    ordered_ids = provider_stub.reorder_tracks_calls[0]["track_ids"]
+    assert sorted(ordered_ids) == ["track-1", "track-2"]
+    assert provider_stub.add_tracks_calls == []
+    track_ids = [
+        track.provider_track_id for track in provider_stub.tracks_by_playlist_id[votuna_playlist.provider_playlist_id]
+    ]
+    assert track_ids == ordered_ids
+    assert published == [(votuna_playlist.id, "track.reordered", {"track_count": 2})]
+
+
 def test_list_votuna_tracks_includes_suggester(auth_client, db_session, votuna_playlist, user, provider_stub):
     votuna_track_suggestion_crud.create(
         db_session,
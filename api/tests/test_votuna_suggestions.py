@@ -1,13 +1,24 @@
+import asyncio
+from datetime import datetime, timezone
+import uuid
+
+from sqlalchemy import event
+
+from app.crud.votuna_playlist import votuna_playlist_crud
 from app.crud.votuna_playlist_member import votuna_playlist_member_crud
 from app.crud.votuna_playlist_settings import votuna_playlist_settings_crud
+from app.crud.votuna_track_addition import votuna_track_addition_crud
 from app.crud.votuna_track_recommendation_decline import (
     votuna_track_recommendation_decline_crud,
 )
 from app.crud.votuna_track_suggestion import votuna_track_suggestion_crud
 from app.crud.votuna_track_vote import votuna_track_vote_crud
-from app.auth.dependencies import get_current_user, get_optional_current_user
+from app.auth.dependencies import get_current_principal, get_current_user, get_optional_current_user
 from app.services.music_providers.base import ProviderTrack
 from app.services.music_providers import ProviderAPIError, ProviderAuthError
+from app.services import track_recommendations
+from app.api.v1.routes.votuna import suggestions as suggestion_routes
+from app.utils.pagination import encode_cursor
 from main import app
 
 
@@ -34,6 +45,7 @@ def _set_known_members(db_session, playlist, owner_user_id: int, member_user_ids
 
 def _client_as(client, acting_user):
     app.dependency_overrides[get_current_user] = lambda: acting_user
+    app.dependency_overrides[get_current_principal] = lambda: acting_user
     app.dependency_overrides[get_optional_current_user] = lambda: acting_user
     return client
 
@@ -232,6 +244,140 @@ def test_list_suggestions_with_status_filter(auth_client, db_session, votuna_pla
     assert all(item["status"] == "accepted" for item in data)
 
 
+def test_list_suggestions_paginates_with_keyset_cursor(auth_client, db_session, votuna_playlist, user):
+    created_ids = [
+        votuna_track_suggestion_crud.create(
+            db_session,
+            {
+                "playlist_id": votuna_playlist.id,
+                "provider_track_id": f"track-page-{index}",
+                "track_title": f"Page {index}",
+                "suggested_by_user_id": user.id,
+                "status": "pending",
+            },
+        ).id
+        for index in range(5)
+    ]
+
+    seen_ids: list[int] = []
+    params: dict[str, str | int] = {"status": "pending", "limit": 2}
+    for _ in range(5):
+        response = auth_client.get(f"/api/v1/votuna/playlists/{votuna_playlist.id}/suggestions", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 2
+        seen_ids.extend(item["id"] for item in page)
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if not next_cursor:
+            break
+        params["cursor"] = next_cursor
+
+    # Rows created within the same second tie on created_at and fall back to id ordering.
+    assert seen_ids == sorted(created_ids, reverse=True)
+
+    invalid = auth_client.get(
+        f"/api/v1/votuna/playlists/{votuna_playlist.id}/suggestions",
+        params={"cursor": "not a cursor"},
+    )
+    assert invalid.status_code == 400
+
+    deleted_anchor = votuna_track_suggestion_crud.create(
+        db_session,
+        {
+            "playlist_id": votuna_playlist.id,
+            "provider_track_id": "track-page-deleted",
+            "track_title": "Deleted",
+            "suggested_by_user_id": user.id,
+            "status": "pending",
+        },
+    )
+    stale_cursor = encode_cursor(deleted_anchor.id)
+    votuna_track_suggestion_crud.delete(db_session, deleted_anchor.id)
+    stale = auth_client.get(
+        f"/api/v1/votuna/playlists/{votuna_playlist.id}/suggestions",
+        params={"status": "pending", "limit": 2, "cursor": stale_cursor},
+    )
+    assert stale.status_code == 400
+
+
+def test_list_suggestions_without_limit_or_cursor_returns_everything(
+    auth_client, db_session, votuna_playlist, user, monkeypatch
+):
+    monkeypatch.setattr(suggestion_routes, "SUGGESTIONS_PAGE_DEFAULT_LIMIT", 2)
+    for index in range(3):
+        votuna_track_suggestion_crud.create(
+            db_session,
+            {
+                "playlist_id": votuna_playlist.id,
+                "provider_track_id": f"track-all-{index}",
+                "track_title": f"All {index}",
+                "suggested_by_user_id": user.id,
+                "status": "pending",
+            },
+        )
+
+    response = auth_client.get(
+        f"/api/v1/votuna/playlists/{votuna_playlist.id}/suggestions",
+        params={"status": "pending"},
+    )
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+    assert response.headers.get("X-Next-Cursor") is None
+
+
+def test_list_suggestions_uses_constant_query_count(auth_client, db_session, votuna_playlist, user, other_user):
+    _set_known_members(db_session, votuna_playlist, user.id, [other_user.id])
+
+    def _add_suggestions(start: int, count: int) -> None:
+        for index in range(start, start + count):
+            suggestion = votuna_track_suggestion_crud.create(
+                db_session,
+                {
+                    "playlist_id": votuna_playlist.id,
+                    "provider_track_id": f"track-batch-{index}",
+                    "track_title": f"Batch {index}",
+                    "suggested_by_user_id": user.id,
+                    "status": "pending",
+                },
+            )
+            votuna_track_vote_crud.set_reaction(db_session, suggestion.id, user.id, "up")
+            if index % 2:
+                votuna_track_vote_crud.set_reaction(db_session, suggestion.id, other_user.id, "down")
+
+    def _list_with_query_count() -> tuple[list[dict], int]:
+        statements: list[str] = []
+
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", _count)
+        try:
+            response = auth_client.get(f"/api/v1/votuna/playlists/{votuna_playlist.id}/suggestions")
+        finally:
+            event.remove(engine, "before_cursor_execute", _count)
+        assert response.status_code == 200
+        return response.json(), len(statements)
+
+    _add_suggestions(0, 2)
+    small_page, small_count = _list_with_query_count()
+    _add_suggestions(2, 8)
+    large_page, large_count = _list_with_query_count()
+
+    assert len(small_page) == 2
+    assert len(large_page) == 10
+    assert large_count == small_count
+    by_track = {item["provider_track_id"]: item for item in large_page}
+    odd = by_track["track-batch-3"]
+    assert odd["upvote_count"] == 1
+    assert odd["downvote_count"] == 1
+    assert odd["my_reaction"] == "up"
+    assert odd["collaborators_left_to_vote_count"] == 0
+    even = by_track["track-batch-4"]
+    assert even["downvote_count"] == 0
+    assert even["collaborators_left_to_vote_count"] == 1
+
+
 def test_create_suggestion_from_track_url_resolves_metadata(auth_client, votuna_playlist, provider_stub):
     response = auth_client.post(
         f"/api/v1/votuna/playlists/{votuna_playlist.id}/suggestions",
@@ -522,6 +668,48 @@ def test_tie_mode_add_accepts(
     assert data["resolution_reason"] == "tie_add"
 
 
+def test_suggestion_changes_publish_live_events(
+    client,
+    db_session,
+    votuna_playlist,
+    user,
+    other_user,
+    provider_stub,
+    monkeypatch,
+):
+    published: list[tuple[int, str, dict]] = []
+    monkeypatch.setattr(
+        suggestion_routes,
+        "publish_playlist_event",
+        lambda playlist_id, event_type, data: published.append((playlist_id, event_type, data)),
+    )
+    _set_known_members(db_session, votuna_playlist, user.id, [other_user.id])
+    suggestion_id = (
+        _client_as(client, user)
+        .post(
+            f"/api/v1/votuna/playlists/{votuna_playlist.id}/suggestions",
+            json={"provider_track_id": "track-live-events"},
+        )
+        .json()["id"]
+    )
+    _client_as(client, other_user).put(
+        f"/api/v1/votuna/suggestions/{suggestion_id}/reaction",
+        json={"reaction": "down"},
+    )
+
+    assert [event_type for _playlist_id, event_type, _data in published] == [
+        "suggestion.created",
+        "track.added",
+        "suggestion.resolved",
+    ]
+    assert {playlist_id for playlist_id, _event_type, _data in published} == {votuna_playlist.id}
+    resolved = published[-1][2]
+    assert resolved["id"] == suggestion_id
+    assert resolved["resolution_reason"] == "tie_add"
+    assert (resolved["upvote_count"], resolved["downvote_count"]) == (1, 1)
+    assert "my_reaction" not in resolved
+
+
 def test_tie_mode_reject_rejects(
     client,
     db_session,
@@ -724,6 +912,60 @@ def test_collaborators_left_to_vote_names(
     assert data["collaborators_left_to_vote_names"] == [other_user.display_name]
 
 
+def test_reactions_keep_suggestion_tallies_in_step(
+    auth_client,
+    db_session,
+    votuna_playlist,
+    user,
+    other_user,
+    provider_stub,
+):
+    _set_known_members(db_session, votuna_playlist, user.id, [other_user.id])
+    suggestion_id = auth_client.post(
+        f"/api/v1/votuna/playlists/{votuna_playlist.id}/suggestions",
+        json={"provider_track_id": "track-tallies"},
+    ).json()["id"]
+
+    def _tally():
+        suggestion = votuna_track_suggestion_crud.get(db_session, suggestion_id)
+        db_session.refresh(suggestion)
+        return suggestion.upvote_count, suggestion.downvote_count, suggestion.voter_count
+
+    assert _tally() == (1, 0, 1)
+    auth_client.put(f"/api/v1/votuna/suggestions/{suggestion_id}/reaction", json={"reaction": "down"})
+    assert _tally() == (0, 1, 1)
+    auth_client.put(f"/api/v1/votuna/suggestions/{suggestion_id}/reaction", json={"reaction": None})
+    assert _tally() == (0, 0, 0)
+
+
+def test_leaving_member_reactions_drop_out_of_pending_tallies(
+    client,
+    db_session,
+    votuna_playlist,
+    user,
+    other_user,
+    provider_stub,
+):
+    _set_known_members(db_session, votuna_playlist, user.id, [other_user.id])
+    suggestion_id = (
+        _client_as(client, other_user)
+        .post(
+            f"/api/v1/votuna/playlists/{votuna_playlist.id}/suggestions",
+            json={"provider_track_id": "track-member-leaves"},
+        )
+        .json()["id"]
+    )
+
+    leave_response = _client_as(client, other_user).delete(f"/api/v1/votuna/playlists/{votuna_playlist.id}/members/me")
+    assert leave_response.status_code == 204
+
+    suggestion = votuna_track_suggestion_crud.get(db_session, suggestion_id)
+    db_session.refresh(suggestion)
+    assert suggestion.status == "pending"
+    assert (suggestion.upvote_count, suggestion.downvote_count, suggestion.voter_count) == (0, 0, 0)
+    assert votuna_track_vote_crud.get_vote(db_session, suggestion_id, other_user.id) is None
+
+
 def test_recommendations_default_limit_and_filters(
     auth_client,
     db_session,
@@ -779,6 +1021,56 @@ def test_recommendations_for_spotify_return_empty(
     assert provider_stub.related_tracks_calls == []
 
 
+def test_recommendations_for_spotify_use_local_cooccurrence(
+    auth_client,
+    db_session,
+    user,
+    votuna_playlist,
+    provider_stub,
+):
+    votuna_playlist.provider = "spotify"
+    db_session.add(votuna_playlist)
+    other_playlist = votuna_playlist_crud.create(
+        db_session,
+        {
+            "owner_user_id": user.id,
+            "provider": "spotify",
+            "provider_playlist_id": f"pl-{uuid.uuid4().hex}",
+            "title": "Neighbor Playlist",
+            "is_active": True,
+        },
+    )
+    seed_id = f"seed-{uuid.uuid4().hex}"
+    neighbor_id = f"neighbor-{uuid.uuid4().hex}"
+    now = datetime.now(timezone.utc)
+    votuna_track_addition_crud.create(
+        db_session,
+        {"playlist_id": other_playlist.id, "provider_track_id": seed_id, "source": "personal_add", "added_at": now},
+    )
+    votuna_track_suggestion_crud.create(
+        db_session,
+        {
+            "playlist_id": other_playlist.id,
+            "provider_track_id": neighbor_id,
+            "track_title": "Neighbor Track",
+            "track_artist": "Neighbor Artist",
+            "status": "accepted",
+        },
+    )
+    provider_stub.tracks_by_playlist_id[votuna_playlist.provider_playlist_id] = [
+        ProviderTrack(provider_track_id=seed_id, title="Seed Track", artist="Seed Artist"),
+    ]
+
+    response = auth_client.get(
+        f"/api/v1/votuna/playlists/{votuna_playlist.id}/tracks/recommendations",
+    )
+    assert response.status_code == 200
+    assert [(track["provider_track_id"], track["title"]) for track in response.json()] == [
+        (neighbor_id, "Neighbor Track")
+    ]
+    assert provider_stub.related_tracks_calls == []
+
+
 def test_recommendation_decline_is_idempotent(auth_client, db_session, votuna_playlist, user):
     payload = {"provider_track_id": "track-related-1"}
     first = auth_client.post(
@@ -853,6 +1145,35 @@ def test_recommendations_offset_pagination_with_same_nonce(auth_client, votuna_p
     assert set(ids_page_one).isdisjoint(set(ids_page_two))
 
 
+def test_recommendations_pages_reuse_cached_ranking_until_tracks_change(auth_client, votuna_playlist, provider_stub):
+    provider_stub.tracks_by_playlist_id[votuna_playlist.provider_playlist_id] = [
+        provider_stub.tracks[0],
+        provider_stub.tracks[1],
+    ]
+    url = f"/api/v1/votuna/playlists/{votuna_playlist.id}/tracks/recommendations"
+
+    first_page = auth_client.get(url, params={"limit": 2, "offset": 0})
+    calls_after_first_page = len(provider_stub.related_tracks_calls)
+    second_page = auth_client.get(url, params={"limit": 2, "offset": 2})
+    assert first_page.status_code == 200
+    assert second_page.status_code == 200
+    assert calls_after_first_page == 2
+    assert len(provider_stub.related_tracks_calls) == calls_after_first_page
+
+    # Removing a track warms the default ranking in the background, so the next read is served from cache.
+    removed = auth_client.delete(
+        f"/api/v1/votuna/playlists/{votuna_playlist.id}/tracks/{provider_stub.tracks[1].provider_track_id}"
+    )
+    assert removed.status_code == 204
+    calls_after_warm = len(provider_stub.related_tracks_calls)
+    assert calls_after_warm == calls_after_first_page + 1
+
+    after_change = auth_client.get(url, params={"limit": 10})
+    assert after_change.status_code == 200
+    assert len(provider_stub.related_tracks_calls) == calls_after_warm
+    assert "track-2" in {track["provider_track_id"] for track in after_change.json()}
+
+
 def test_recommendations_refresh_nonce_changes_order(auth_client, votuna_playlist, provider_stub):
     nonce_a = auth_client.get(
         f"/api/v1/votuna/playlists/{votuna_playlist.id}/tracks/recommendations",
@@ -961,6 +1282,46 @@ def test_recommendations_provider_api_error_returns_502(
     assert response.json()["detail"] == "provider unavailable"
 
 
+def test_recommendations_drop_slow_and_failed_seeds(
+    auth_client,
+    votuna_playlist,
+    provider_stub,
+    monkeypatch,
+):
+    def _track(track_id: str) -> ProviderTrack:
+        return ProviderTrack(
+            provider_track_id=track_id,
+            title=track_id,
+            artist=f"Artist {track_id}",
+            genre=None,
+            artwork_url=None,
+            url=f"https://soundcloud.com/test/{track_id}",
+        )
+
+    monkeypatch.setattr(
+        provider_stub,
+        "tracks_by_playlist_id",
+        {votuna_playlist.provider_playlist_id: [_track("seed-slow"), _track("seed-broken"), _track("seed-ok")]},
+    )
+    monkeypatch.setattr(track_recommendations, "RECOMMENDATION_SEED_DEADLINE_SECONDS", 0.2)
+
+    async def _related_tracks(self, provider_track_id: str, limit: int = 25, offset: int = 0):
+        if provider_track_id == "seed-slow":
+            await asyncio.sleep(5)
+            return [_track("from-slow")]
+        if provider_track_id == "seed-broken":
+            raise ProviderAPIError("provider unavailable", status_code=500)
+        return [_track("from-ok-1"), _track("from-ok-2")]
+
+    monkeypatch.setattr(provider_stub, "related_tracks", _related_tracks)
+    response = auth_client.get(
+        f"/api/v1/votuna/playlists/{votuna_playlist.id}/tracks/recommendations",
+        params={"limit": 10},
+    )
+    assert response.status_code == 200
+    assert [track["provider_track_id"] for track in response.json()] == ["from-ok-1", "from-ok-2"]
+
+
 def test_recommendations_requires_member(other_auth_client, votuna_playlist):
     list_response = other_auth_client.get(
         f"/api/v1/votuna/playlists/{votuna_playlist.id}/tracks/recommendations",
@@ -971,3 +1332,33 @@ def test_recommendations_requires_member(other_auth_client, votuna_playlist):
     )
     assert list_response.status_code == 403
     assert decline_response.status_code == 403
+
+
+def test_list_suggestions_is_conditional_on_playlist_version(auth_client, votuna_playlist, provider_stub):
+    created = auth_client.post(
+        f"/api/v1/votuna/playlists/{votuna_playlist.id}/suggestions",
+        json={"provider_track_id": "track-etag", "track_title": "ETag Track"},
+    )
+    assert created.status_code == 200
+    url = f"/api/v1/votuna/playlists/{votuna_playlist.id}/suggestions"
+
+    first = auth_client.get(url)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    cached = auth_client.get(url, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    filtered = auth_client.get(url, params={"status": "accepted"}, headers={"If-None-Match": etag})
+    assert filtered.status_code == 200
+
+    voted = auth_client.put(f"/api/v1/votuna/suggestions/{created.json()['id']}/reaction", json={"reaction": "down"})
+    assert voted.status_code == 200
+    refreshed = auth_client.get(url, headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+    assert refreshed.json()[0]["downvote_count"] == 1
@@ -18,13 +18,14 @@ export default function MergingBulkEditingSection({ management }: MergingBulkEdi
     limit: sourceTrackLimit,
     offset: sourceTrackOffset,
     totalCount: sourceTrackTotalCount,
+    hasMore: sourceTrackHasMore,
     setOffset: setSourceTrackOffset,
   } = sourcePicker.pagination
 
   const selectedSongIdSet = new Set(sourcePicker.selectedSongIds)
   const canPageBack = sourceTrackOffset > 0
   const nextOffset = sourceTrackOffset + sourceTrackLimit
-  const canPageForward = nextOffset < sourceTrackTotalCount
+  const canPageForward = sourceTrackHasMore || nextOffset < sourceTrackTotalCount
   const rangeStart = sourceTrackTotalCount === 0 ? 0 : sourceTrackOffset + 1
   const rangeEnd =
     sourceTrackTotalCount === 0
@@ -354,6 +355,7 @@ export default function MergingBulkEditingSection({ management }: MergingBulkEdi
                     <div className="flex items-center justify-between">
                       <p className="text-xs text-[color:rgb(var(--votuna-ink)/0.56)]">
                         Showing {rangeStart}-{rangeEnd} of {sourceTrackTotalCount}
+                        {sourceTrackHasMore ? '+' : ''}
                       </p>
                       <div className="flex gap-2">
                         <button
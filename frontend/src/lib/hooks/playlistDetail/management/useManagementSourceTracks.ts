@@ -83,6 +83,7 @@ export function useManagementSourceTracks({
     sourceTrackLimit: MANAGEMENT_SOURCE_TRACK_LIMIT,
     sourceTrackOffset,
     sourceTrackTotalCount: sourceTracksQuery.data?.total_count ?? 0,
+    sourceTrackHasMore: sourceTracksQuery.data?.has_more ?? false,
     setSourceTrackOffset,
     sourceTrackSearch,
     setSourceTrackSearch,
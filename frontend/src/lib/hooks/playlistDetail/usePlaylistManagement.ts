@@ -112,6 +112,7 @@ export type PlaylistManagementState = {
         limit: number
         offset: number
         totalCount: number
+        hasMore: boolean
         setOffset: (value: number) => void
       }
       tracks: ManagementSourceTracksResponse['tracks']
@@ -500,6 +501,7 @@ export function usePlaylistManagement({
           limit: sourceTrackState.sourceTrackLimit,
           offset: sourceTrackState.sourceTrackOffset,
           totalCount: sourceTrackState.sourceTrackTotalCount,
+          hasMore: sourceTrackState.sourceTrackHasMore,
           setOffset: sourceTrackState.setSourceTrackOffset,
         },
         tracks: sourceTrackState.sourceTracks,
@@ -116,6 +116,7 @@ export type ManagementSourceTracksRequest = {
 export type ManagementSourceTracksResponse = {
   tracks: ProviderTrack[]
   total_count: number
+  has_more: boolean
   limit: number
   offset: number
 }